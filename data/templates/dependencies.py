@@ -5,7 +5,19 @@ This file is generated by l2tdevtools update-dependencies.py, any dependency
 related changes should be made in dependencies.ini.
 """
 
+import importlib.util
 import re
+import sys
+
+# Note that packages_distributions() was added to importlib.metadata in Python
+# 3.10, hence the importlib_metadata backport is used on earlier versions.
+if sys.version_info >= (3, 10):
+  from importlib import metadata as importlib_metadata
+else:
+  try:
+    import importlib_metadata
+  except ImportError:
+    importlib_metadata = None
 
 
 # Dictionary that contains version tuples per module name.
@@ -20,6 +32,9 @@ ${python_dependencies}}
 
 _VERSION_SPLIT_REGEX = re.compile(r'\.|\-')
 
+# Names of the distributions per top-level module name.
+_PACKAGES_DISTRIBUTIONS = None
+
 
 def _CheckPythonModule(
     module_name, version_attribute_name, minimum_version,
@@ -41,8 +56,15 @@ def _CheckPythonModule(
     bool: True if the Python module is available and conforms to
         the minimum required version, False otherwise.
   """
-  module_object = _ImportPythonModule(module_name)
-  if not module_object:
+  module_object = None
+  is_available, module_version = _GetPythonModuleVersionFromMetadata(
+      module_name, version_attribute_name)
+
+  if is_available is None:
+    module_object = _ImportPythonModule(module_name)
+    is_available = module_object is not None
+
+  if not is_available:
     if not is_required:
       print('[OPTIONAL]\tmissing: {0:s}.'.format(module_name))
       return True
@@ -55,13 +77,14 @@ def _CheckPythonModule(
       print('[OK]\t\t{0:s}'.format(module_name))
     return True
 
-  module_version = None
-  if not version_attribute_name.endswith('()'):
-    module_version = getattr(module_object, version_attribute_name, None)
-  else:
-    version_method = getattr(module_object, version_attribute_name[:-2], None)
-    if version_method:
-      module_version = version_method()
+  if module_object:
+    if not version_attribute_name.endswith('()'):
+      module_version = getattr(module_object, version_attribute_name, None)
+    else:
+      version_method = getattr(
+          module_object, version_attribute_name[:-2], None)
+      if version_method:
+        module_version = version_method()
 
   if not module_version:
     if not is_required:
@@ -125,6 +148,60 @@ def _CheckPythonModule(
   return True
 
 
+def _GetPythonModuleVersionFromMetadata(module_name, version_attribute_name):
+  """Retrieves the availability and version of a Python module.
+
+  The module is located and its version is read from the metadata of the
+  distribution that provides it, without importing the module.
+
+  Args:
+    module_name (str): name of the module.
+    version_attribute_name (str): name of the attribute that contains
+       the module version or method to retrieve the module version.
+
+  Returns:
+    tuple: containing:
+
+      bool: True if the Python module is available, False if not or None
+          if the availability or version could not be determined without
+          importing the module.
+      str: version of the Python module or None if not available.
+  """
+  global _PACKAGES_DISTRIBUTIONS  # pylint: disable=global-statement
+
+  # Note that find_spec() imports the parent package of a submodule.
+  if '.' in module_name:
+    return None, None
+
+  try:
+    module_spec = importlib.util.find_spec(module_name)
+  except (ImportError, ValueError):
+    module_spec = None
+
+  if not module_spec:
+    return False, None
+
+  if not version_attribute_name:
+    return True, None
+
+  if _PACKAGES_DISTRIBUTIONS is None:
+    # Note that older versions of the importlib_metadata backport do not
+    # provide packages_distributions().
+    packages_distributions = getattr(
+        importlib_metadata, 'packages_distributions', None)
+    _PACKAGES_DISTRIBUTIONS = {}
+    if packages_distributions is not None:
+      _PACKAGES_DISTRIBUTIONS = packages_distributions()
+
+  for distribution_name in _PACKAGES_DISTRIBUTIONS.get(module_name, []):
+    try:
+      return True, importlib_metadata.version(distribution_name)
+    except importlib_metadata.PackageNotFoundError:
+      pass
+
+  return None, None
+
+
 def _ImportPythonModule(module_name):
   """Imports a Python module.
 
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Build accelerator for configure and make based builds."""
+
+import hashlib
+import os
+import platform
+import shlex
+import shutil
+import subprocess
+import threading
+
+
+class BuildAccelerator(object):
+  """Build accelerator for configure and make based builds.
+
+  Speeds up builds by running make with multiple jobs, by compiling through
+  ccache when available and, opt-in, by sharing the autoconf configure cache
+  between the builds of the same distribution, build target, compiler and
+  compiler flags.
+
+  The settings are passed to the build commands as environment variables:
+  DEB_BUILD_OPTIONS parallel=N for dpkg builds, CONFIG_SITE for configure
+  and PATH with the ccache compiler wrappers first. rpmbuild is passed the
+  number of make jobs as the _smp_mflags macro.
+
+  Attributes:
+    configure_cache_path (str): path of the directory with the shared
+        configure caches or None if configure results are not cached.
+    make_jobs (int): number of make jobs or None to use the default.
+    use_ccache (bool): True if ccache should be used when available.
+  """
+
+  # Directories with the ccache compiler wrappers, such as gcc and cc.
+  _CCACHE_WRAPPER_PATHS = [
+      '/usr/lib/ccache', '/usr/lib64/ccache', '/usr/local/lib/ccache',
+      '/usr/local/opt/ccache/libexec']
+
+  # The environment variables that configure records in its cache and
+  # requires to be unchanged when the cache is reused.
+  _PRECIOUS_VARIABLES = [
+      'CC', 'CFLAGS', 'CPP', 'CPPFLAGS', 'CXX', 'CXXFLAGS', 'CXXCPP',
+      'LDFLAGS', 'LIBS']
+
+  _CONFIG_SITE_TEMPLATE = '\n'.join([
+      '# Generated by l2tdevtools, shared configure cache.',
+      'if test "x${{cache_file}}" = "x/dev/null"; then',
+      '  cache_file="{cache_file:s}"',
+      'fi',
+      ''])
+
+  def __init__(
+      self, configure_cache_path=None, make_jobs=None, use_ccache=True):
+    """Initializes a build accelerator.
+
+    Args:
+      configure_cache_path (Optional[str]): path of the directory with the
+          shared configure caches, where None represents configure results
+          are not cached.
+      make_jobs (Optional[int]): number of make jobs, where None represents
+          the default of the build system.
+      use_ccache (Optional[bool]): True if ccache should be used when
+          available.
+    """
+    super(BuildAccelerator, self).__init__()
+    self._ccache_wrapper_path = None
+    self._compiler_fingerprint = None
+    self._lock = threading.Lock()
+
+    self.configure_cache_path = configure_cache_path
+    self.make_jobs = make_jobs
+    self.use_ccache = use_ccache
+
+  def _GetCCacheWrapperPath(self):
+    """Retrieves the path of the directory with the ccache compiler wrappers.
+
+    Returns:
+      str: path of the directory with the ccache compiler wrappers or None
+          if ccache is not available.
+    """
+    if self._ccache_wrapper_path is None:
+      self._ccache_wrapper_path = ''
+
+      if shutil.which('ccache'):
+        for path in self._CCACHE_WRAPPER_PATHS:
+          if os.path.isfile(os.path.join(path, 'gcc')) or os.path.isfile(
+              os.path.join(path, 'cc')):
+            self._ccache_wrapper_path = path
+            break
+
+    return self._ccache_wrapper_path or None
+
+  def _GetCompilerFingerprint(self):
+    """Retrieves a fingerprint of the compiler.
+
+    The configure cache is only valid for the compiler that produced it.
+
+    Returns:
+      str: fingerprint of the compiler.
+    """
+    if self._compiler_fingerprint is None:
+      compiler = os.environ.get('CC', None) or 'cc'
+
+      try:
+        output = subprocess.check_output(
+            [compiler, '--version'], stderr=subprocess.STDOUT)
+      except (OSError, subprocess.CalledProcessError):
+        output = b''
+
+      hash_context = hashlib.sha256()
+      hash_context.update(platform.machine().encode('utf-8'))
+      hash_context.update(output)
+
+      self._compiler_fingerprint = hash_context.hexdigest()[:16]
+
+    return self._compiler_fingerprint
+
+  def _GetPreciousVariablesFingerprint(self, environment):
+    """Retrieves a fingerprint of the precious variables of configure.
+
+    Args:
+      environment (dict[str, str]): environment variables.
+
+    Returns:
+      str: fingerprint of the precious variables.
+    """
+    hash_context = hashlib.sha256()
+    for name in self._PRECIOUS_VARIABLES:
+      value = environment.get(name, None)
+      if value is not None:
+        hash_context.update('{0:s}={1:s}\0'.format(name, value).encode(
+            'utf-8'))
+
+    return hash_context.hexdigest()[:16]
+
+  def GetConfigSitePath(self, distribution, build_target='', environment=None):
+    """Retrieves the path of the config.site file of a distribution.
+
+    The config.site file makes configure use the shared configure cache
+    unless another cache file was specified. configure fails if a precious
+    variable, such as CFLAGS, changed since the cache was created. Build
+    targets pass different compiler flags to configure, for example rpmbuild
+    sets CFLAGS and dpkg-buildpackage exports the flags of dpkg-buildflags,
+    hence the cache is specific to the build target and the precious
+    variables of the environment.
+
+    Args:
+      distribution (str): name of the distribution, where an empty string
+          represents the build host.
+      build_target (Optional[str]): build target, such as "dpkg", "rpm" or
+          "source".
+      environment (Optional[dict[str, str]]): environment variables of the
+          build command, where None represents the environment of the current
+          process.
+
+    Returns:
+      str: path of the config.site file or None if configure results are not
+          cached.
+    """
+    if not self.configure_cache_path:
+      return None
+
+    if environment is None:
+      environment = os.environ
+
+    cache_name = '{0:s}-{1:s}-{2:s}-{3:s}'.format(
+        distribution or 'host', build_target or 'configure',
+        self._GetCompilerFingerprint(),
+        self._GetPreciousVariablesFingerprint(environment))
+    cache_path = os.path.join(
+        os.path.abspath(self.configure_cache_path), cache_name)
+
+    config_site_path = os.path.join(cache_path, 'config.site')
+
+    with self._lock:
+      if not os.path.exists(config_site_path):
+        os.makedirs(cache_path, exist_ok=True)
+
+        config_site = self._CONFIG_SITE_TEMPLATE.format(
+            cache_file=os.path.join(cache_path, 'config.cache'))
+
+        temporary_path = '{0:s}.tmp'.format(config_site_path)
+        with open(temporary_path, 'w', encoding='utf-8') as file_object:
+          file_object.write(config_site)
+
+        os.replace(temporary_path, config_site_path)
+
+    return config_site_path
+
+  def GetEnvironment(self, build_target='', distribution=''):
+    """Retrieves the environment variables of a build command.
+
+    Args:
+      build_target (Optional[str]): build target, such as "dpkg", "rpm" or
+          "source".
+      distribution (Optional[str]): name of the distribution, where an empty
+          string represents the build host.
+
+    Returns:
+      dict[str, str]: environment variables to set.
+    """
+    environment = {}
+
+    config_site_path = self.GetConfigSitePath(
+        distribution, build_target=build_target)
+    if config_site_path:
+      environment['CONFIG_SITE'] = config_site_path
+
+    if build_target == 'dpkg' and self.make_jobs:
+      deb_build_options = [
+          option for option in os.environ.get(
+              'DEB_BUILD_OPTIONS', '').split()
+          if not option.startswith('parallel=')]
+      deb_build_options.append('parallel={0:d}'.format(self.make_jobs))
+      environment['DEB_BUILD_OPTIONS'] = ' '.join(deb_build_options)
+
+    if self.use_ccache:
+      ccache_wrapper_path = self._GetCCacheWrapperPath()
+      if ccache_wrapper_path:
+        environment['PATH'] = os.pathsep.join([
+            ccache_wrapper_path, os.environ.get('PATH', os.defpath)])
+
+    return environment
+
+  def GetCommandPrefix(self, build_target='', distribution=''):
+    """Retrieves the shell prefix that sets the environment of a command.
+
+    Args:
+      build_target (Optional[str]): build target, such as "dpkg", "rpm" or
+          "source".
+      distribution (Optional[str]): name of the distribution, where an empty
+          string represents the build host.
+
+    Returns:
+      str: shell variable assignments, followed by a space, or an empty string
+          if there are none.
+    """
+    environment = self.GetEnvironment(
+        build_target=build_target, distribution=distribution)
+
+    return ''.join([
+        '{0:s}={1:s} '.format(name, shlex.quote(value))
+        for name, value in sorted(environment.items())])
+
+  def GetMakeFlags(self):
+    """Retrieves the make flags.
+
+    Returns:
+      str: make flags or an empty string if there are none.
+    """
+    if not self.make_jobs:
+      return ''
+
+    return '-j{0:d}'.format(self.make_jobs)
+
+  def GetRPMBuildFlags(self):
+    """Retrieves the rpmbuild flags.
+
+    Returns:
+      str: rpmbuild flags or an empty string if there are none.
+    """
+    if not self.make_jobs:
+      return ''
+
+    return '--define {0:s}'.format(shlex.quote(
+        '_smp_mflags -j{0:d}'.format(self.make_jobs)))
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """Helper for building projects from source."""
 
-import datetime
+import concurrent.futures
 import glob
 import io
 import logging
@@ -11,10 +11,10 @@ import re
 import shutil
 import subprocess
 import sys
-import tarfile
-import zipfile
 
+from l2tdevtools import build_index
 from l2tdevtools import dpkg_files
+from l2tdevtools import source_archive
 from l2tdevtools.build_helpers import interface
 from l2tdevtools.lib import definitions
 
@@ -24,6 +24,8 @@ class DPKGBuildHelper(interface.BuildHelper):
 
   Attributes:
     architecture (str): dpkg target architecture.
+    build_sandbox_pool (BuildSandboxPool): pool of build roots to build in
+        or None to build on the host.
     distribution (str): dpkg target distributions.
     version_suffix (str): dpkg version suffix.
   """
@@ -83,6 +85,7 @@ class DPKGBuildHelper(interface.BuildHelper):
     self._post_script = 'post-dpkg.sh'
 
     self.architecture = None
+    self.build_sandbox_pool = None
     self.distribution = None
     self.version_suffix = None
 
@@ -107,8 +110,8 @@ class DPKGBuildHelper(interface.BuildHelper):
       command = 'sh ../{0:s} {1:s} {2!s} {3:s} {4:s} {5:s}'.format(
           self._prep_script, project_name, project_version, version_suffix,
           distribution, architecture)
-      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-          source_directory, command), shell=True)
+      exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+          source_directory, command), 'prepare')
       if exit_code != 0:
         logging.error('Running: "{0:s}" failed.'.format(command))
         return False
@@ -137,8 +140,8 @@ class DPKGBuildHelper(interface.BuildHelper):
       command = 'sh ../{0:s} {1:s} {2!s} {3:s} {4:s} {5:s}'.format(
           self._post_script, project_name, project_version, version_suffix,
           distribution, architecture)
-      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-          source_directory, command), shell=True)
+      exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+          source_directory, command), 'finalize')
       if exit_code != 0:
         logging.error('Running: "{0:s}" failed.'.format(command))
         return False
@@ -155,6 +158,9 @@ class DPKGBuildHelper(interface.BuildHelper):
       bool: True if the package is installed, False otherwise.
     """
     command = 'dpkg-query -s {0:s} >/dev/null 2>&1'.format(package_name)
+    if self.installed_package_cache:
+      return self.installed_package_cache.CheckIsInstalled('dpkg', command)
+
     exit_code = subprocess.call(command, shell=True)
     return exit_code == 0
 
@@ -189,36 +195,8 @@ class DPKGBuildHelper(interface.BuildHelper):
       source_filename (str): name of the source package file.
       orig_source_filename (str): name of the .orig.tar.gz source package file.
     """
-    posix_epoch = datetime.datetime(1970, 1, 1)
-
-    with zipfile.ZipFile(source_filename, 'r') as zip_file:
-      with tarfile.open(name=orig_source_filename, mode='w:gz') as tar_file:
-        for filename in zip_file.namelist():
-          with zip_file.open(filename) as file_object:
-            zip_info = zip_file.getinfo(filename)
-
-            tar_info = tarfile.TarInfo(filename)
-
-            if zip_info.is_dir():
-              tar_info.mode = 0o755
-            else:
-              tar_info.mode = 0o644
-
-            tar_info.uid = os.getuid()
-            tar_info.gid = os.getgid()
-            tar_info.size = zip_info.file_size
-
-            # Populate modification times from zip file into tar archive,
-            # as launchpad refuses to build packages containing files with
-            # timestamps too far in the past.
-            date_time = zip_info.date_time
-            modification_time = datetime.datetime(*date_time)
-            modification_time = int(
-                (modification_time - posix_epoch).total_seconds())
-
-            tar_info.mtime = modification_time
-
-            tar_file.addfile(tar_info, fileobj=file_object)
+    converter = source_archive.ZipToTarConverter()
+    converter.Convert(source_filename, orig_source_filename)
 
   def _CreatePackagingFiles(self, source_directory, project_version):
     """Creates packaging files.
@@ -309,6 +287,47 @@ class DPKGBuildHelper(interface.BuildHelper):
 
     return distribution_name
 
+  def _GetFilenameSafeProjectInformation(self, source_helper_object):
+    """Determines the filename safe project name and version.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      tuple: contains:
+
+        * str: filename safe project name.
+        * str: version.
+    """
+    return (
+        source_helper_object.project_name,
+        source_helper_object.GetProjectVersion())
+
+  def _PrepareSourceDirectory(
+      self, source_directory, project_name, project_version):
+    """Prepares a source directory for building the dpkg packages.
+
+    Args:
+      source_directory (str): name of the source directory.
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    if not self._CreatePackagingFiles(source_directory, project_version):
+      return False
+
+    # If there is a temporary packaging directory remove it.
+    temporary_directory = os.path.join(source_directory, 'tmp')
+    if os.path.exists(temporary_directory):
+      logging.info('Removing: {0:s}'.format(temporary_directory))
+      shutil.rmtree(temporary_directory)
+
+    return self._BuildPrepare(
+        source_directory, project_name, project_version, self.version_suffix,
+        self.distribution, self.architecture)
+
   def _ReadLSBReleaseConfigurationFile(self, path):
     """Reads a lsb-release configuration (/etc/lsb-release) file.
 
@@ -351,26 +370,13 @@ class DPKGBuildHelper(interface.BuildHelper):
         project_name, project_version)
     filenames_to_ignore = re.compile(filenames_to_ignore)
 
-    # Remove files of previous versions in the format:
+    # Remove files of previous versions in the formats:
     # <project>[-_][0-9]*-[1-9]_<architecture>.*
-    filenames_glob = '{0:s}[-_][0-9]*-[1-9]_{1:s}.*'.format(
-        project_name, self.architecture)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
-
-    # Remove files of previous versions in the format:
     # <project>[-_][0-9]*-[1-9].*
-    filenames_glob = '{0:s}[-_][0-9]*-[1-9].*'.format(project_name)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    build_directory_index.RemoveOlderVersions([
+        '{0:s}[-_][0-9]*-[1-9]_{1:s}.*'.format(project_name, self.architecture),
+        '{0:s}[-_][0-9]*-[1-9].*'.format(project_name)], filenames_to_ignore)
 
   def _RemoveOlderOriginalSourcePackage(
       self, project_name, project_version, version_suffix=None,
@@ -393,25 +399,17 @@ class DPKGBuildHelper(interface.BuildHelper):
 
     # Remove files of previous versions in the format:
     # <project>_[0-9]*<suffix>.orig.tar.gz
-    filenames_glob = '{0:s}_[0-9]*.orig.tar.gz'.format(project_name)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+    filenames_globs = ['{0:s}_[0-9]*.orig.tar.gz'.format(project_name)]
 
     # Remove files of previous versions in the format:
     # <project>_[0-9]*<suffix>~<distribution>.orig.tar.gz
     if version_suffix and distribution:
-      filenames_glob = '{0:s}_[0-9]*{1:s}~{2:s}.orig.tar.gz'.format(
-          project_name, version_suffix, distribution)
-      filenames = glob.glob(filenames_glob)
+      filenames_globs.append('{0:s}_[0-9]*{1:s}~{2:s}.orig.tar.gz'.format(
+          project_name, version_suffix, distribution))
 
-      for filename in filenames:
-        if not filenames_to_ignore.match(filename):
-          logging.info('Removing: {0:s}'.format(filename))
-          os.remove(filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    build_directory_index.RemoveOlderVersions(
+        filenames_globs, filenames_to_ignore)
 
   def _RemoveOlderSourceDPKGPackages(self, project_name, project_version):
     """Removes previous versions of source dpkg packages.
@@ -427,27 +425,17 @@ class DPKGBuildHelper(interface.BuildHelper):
         project_name, project_version)
     filenames_to_ignore = re.compile(filenames_to_ignore)
 
-    # Remove files of previous versions in the format:
+    # Remove files of previous versions in the formats:
     # <project>[-_][0-9]*-[1-9]<suffix>~<distribution>_<architecture>.*
-    filenames_glob = '{0:s}[-_][0-9]*-[1-9]{1:s}~{2:s}_{3:s}.*'.format(
-        project_name, self.version_suffix, self.distribution, self.architecture)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
-
-    # Remove files of previous versions in the format:
-    # <project>[-_][0-9]*-[1-9]i<suffix>~<distribution>.*
-    filenames_glob = '{0:s}[-_][0-9]*-[1-9]{1:s}~{2:s}.*'.format(
-        project_name, self.version_suffix, self.distribution)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+    # <project>[-_][0-9]*-[1-9]<suffix>~<distribution>.*
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    build_directory_index.RemoveOlderVersions([
+        '{0:s}[-_][0-9]*-[1-9]{1:s}~{2:s}_{3:s}.*'.format(
+            project_name, self.version_suffix, self.distribution,
+            self.architecture),
+        '{0:s}[-_][0-9]*-[1-9]{1:s}~{2:s}.*'.format(
+            project_name, self.version_suffix, self.distribution)],
+        filenames_to_ignore)
 
   def _RewriteControlFile(self, debian_directory):
     """Rewrites the packing control file for the current distribution.
@@ -469,6 +457,72 @@ class DPKGBuildHelper(interface.BuildHelper):
     with io.open(control_file_path, 'w', encoding='utf8') as file_object:
       file_object.write(file_content)
 
+  def _RunBuildCommand(self, source_directory, command, distribution=None):
+    """Runs a build command in the source directory.
+
+    If a build sandbox pool is set the command is run in a fresh sandbox of
+    the build root of the target distribution, in which the build
+    dependencies of the project are installed first. Otherwise the command is
+    run on the host.
+
+    Args:
+      source_directory (str): name of the source directory.
+      command (str): build command.
+      distribution (Optional[str]): target distribution, where None represents
+          the distribution of the build helper.
+
+    Returns:
+      int: exit code of the command.
+    """
+    if not self.build_sandbox_pool:
+      return self._RunCommand('(cd {0:s} && {1:s})'.format(
+          source_directory, command), 'build')
+
+    distribution = (
+        distribution or self.distribution or self._build_host_distribution)
+
+    with self._RecordPhase('build') as event:
+      exit_code = self._RunBuildCommandInSandbox(
+          source_directory, command, distribution)
+
+      if event:
+        event.command = command
+        event.exit_code = exit_code
+
+    return exit_code
+
+  def _RunBuildCommandInSandbox(
+      self, source_directory, command, distribution):
+    """Runs a build command in the source directory in a build sandbox.
+
+    Args:
+      source_directory (str): name of the source directory.
+      command (str): build command.
+      distribution (str): target distribution.
+
+    Returns:
+      int: exit code of the command.
+    """
+    if not self.build_sandbox_pool.ProvisionBuildRoot(
+        distribution, sorted(self._BUILD_DEPENDENCIES)):
+      logging.error('Unable to provision build root of: {0:s}'.format(
+          distribution))
+      return 1
+
+    try:
+      with self.build_sandbox_pool.CreateSandbox(distribution) as sandbox:
+        if not sandbox.InstallPackages(
+            self._project_definition.dpkg_build_dependencies):
+          return 1
+
+        return sandbox.RunCommand(command, source_directory)
+
+    except (IOError, OSError, subprocess.CalledProcessError) as exception:
+      logging.error((
+          'Unable to run build command in sandbox of: {0:s} with error: '
+          '{1!s}').format(distribution, exception))
+      return 1
+
   def _RunLSBReleaseCommand(self, option='-a'):
     """Runs the lsb-release command (/usr/bin/lsb_release).
 
@@ -499,22 +553,135 @@ class DPKGBuildHelper(interface.BuildHelper):
 
     return output
 
+  def BuildForDistributions(self, source_helper_object, distributions):
+    """Builds the source dpkg packages for multiple distributions.
+
+    Every distribution is prepared in its own working copy of the source
+    directory, since the packaging files, such as debian/changelog, differ
+    per distribution, after which the source dpkg packages of all
+    distributions are built concurrently. The build log of a distribution is
+    written to the file returned by GetDistributionLogFilename().
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+      distributions (list[str]): names of the distributions.
+
+    Returns:
+      list[str]: names of the distributions that failed to build or an empty
+          list.
+    """
+    source_filename = source_helper_object.GetSourcePackageFilename()
+    if not source_filename:
+      logging.info('Missing source package of: {0:s}'.format(
+          source_helper_object.project_name))
+      return list(distributions)
+
+    source_directory = source_helper_object.GetSourceDirectoryPath()
+    if not source_directory:
+      logging.info('Missing source directory of: {0:s}'.format(
+          source_helper_object.project_name))
+      return list(distributions)
+
+    project_name, project_version = self._GetFilenameSafeProjectInformation(
+        source_helper_object)
+
+    self._CreateOriginalSourcePackage(
+        source_filename, source_helper_object.project_name, project_version)
+
+    default_distribution = self.distribution
+    failed_distributions = []
+    working_directories = {}
+
+    try:
+      for distribution in distributions:
+        self.distribution = distribution
+
+        build_required = self.CheckBuildRequired(source_helper_object)
+        self.Clean(source_helper_object)
+        if not build_required:
+          continue
+
+        working_directory = '{0:s}~{1:s}'.format(
+            source_directory, distribution)
+        if os.path.exists(working_directory):
+          shutil.rmtree(working_directory)
+
+        shutil.copytree(source_directory, working_directory, symlinks=True)
+        working_directories[distribution] = working_directory
+
+        logging.info('Preparing source deb of: {0:s} for: {1:s}'.format(
+            source_filename, distribution))
+
+        if not self._PrepareSourceDirectory(
+            working_directory, project_name, project_version):
+          failed_distributions.append(distribution)
+
+      futures = {}
+      with concurrent.futures.ThreadPoolExecutor(
+          max_workers=max(len(working_directories), 1)) as executor:
+        for distribution, working_directory in working_directories.items():
+          if distribution in failed_distributions:
+            continue
+
+          logging.info('Building source deb of: {0:s} for: {1:s}'.format(
+              source_filename, distribution))
+
+          log_file_path = os.path.join(
+              '..', self.GetDistributionLogFilename(distribution))
+          command = 'debuild -S -sa > {0:s} 2>&1'.format(log_file_path)
+
+          future = executor.submit(
+              self._RunBuildCommand, working_directory, command,
+              distribution=distribution)
+          futures[future] = (distribution, command)
+
+      for future, (distribution, command) in futures.items():
+        exit_code = future.result()
+        if exit_code != 0:
+          logging.error((
+              'Failed to run: "(cd {0:s} && {1:s})" with exit code '
+              '{2:d}.').format(
+                  working_directories[distribution], command, exit_code))
+          failed_distributions.append(distribution)
+          continue
+
+        self.distribution = distribution
+        if not self._BuildFinalize(
+            working_directories[distribution], project_name, project_version,
+            self.version_suffix, distribution, self.architecture):
+          failed_distributions.append(distribution)
+
+    finally:
+      self.distribution = default_distribution
+
+      for working_directory in working_directories.values():
+        if os.path.exists(working_directory):
+          shutil.rmtree(working_directory, True)
+
+    return [
+        distribution for distribution in distributions
+        if distribution in failed_distributions]
+
   def CheckBuildDependencies(self):
     """Checks if the build dependencies are met.
 
     Returns:
       list[str]: build dependency names that are not met or an empty list.
     """
-    missing_packages = []
-    for package_name in self._BUILD_DEPENDENCIES:
-      if not self._CheckIsInstalled(package_name):
-        missing_packages.append(package_name)
-
     for name in self._project_definition.build_dependencies:
       package_name = self._BUILD_DEPENDENCY_PACKAGE_NAMES.get(name, name)
       if package_name not in self._project_definition.dpkg_build_dependencies:
         self._project_definition.dpkg_build_dependencies.append(package_name)
 
+    # The build dependencies are installed in the build sandbox instead.
+    if self.build_sandbox_pool:
+      return []
+
+    missing_packages = []
+    for package_name in self._BUILD_DEPENDENCIES:
+      if not self._CheckIsInstalled(package_name):
+        missing_packages.append(package_name)
+
     for package_name in self._project_definition.dpkg_build_dependencies:
       if not self._CheckIsInstalled(package_name):
         missing_packages.append(package_name)
@@ -541,6 +708,18 @@ class DPKGBuildHelper(interface.BuildHelper):
 
     return result
 
+  def GetDistributionLogFilename(self, distribution):
+    """Retrieves the name of the build log file of a specific distribution.
+
+    Args:
+      distribution (str): name of the distribution.
+
+    Returns:
+      str: name of the build log file.
+    """
+    log_filename, _, extension = self.LOG_FILENAME.rpartition('.')
+    return '{0:s}-{1:s}.{2:s}'.format(log_filename, distribution, extension)
+
 
 class ConfigureMakeDPKGBuildHelper(DPKGBuildHelper):
   """Helper to build dpkg packages (.deb)."""
@@ -611,11 +790,16 @@ class ConfigureMakeDPKGBuildHelper(DPKGBuildHelper):
         self.version_suffix, self.distribution, self.architecture):
       return False
 
+    # The build accelerator paths only exist on the host.
+    command_prefix = ''
+    if not self.build_sandbox_pool:
+      command_prefix = self._GetBuildCommandPrefix(
+          'dpkg', distribution=self.distribution)
+
     log_file_path = os.path.join('..', self.LOG_FILENAME)
-    command = 'dpkg-buildpackage -uc -us -rfakeroot > {0:s} 2>&1'.format(
-        log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    command = '{0:s}dpkg-buildpackage -uc -us -rfakeroot > {1:s} 2>&1'.format(
+        command_prefix, log_file_path)
+    exit_code = self._RunBuildCommand(source_directory, command)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -641,7 +825,8 @@ class ConfigureMakeDPKGBuildHelper(DPKGBuildHelper):
     deb_filename = '{0:s}_{1!s}-1_{2:s}.deb'.format(
         source_helper_object.project_name, project_version, self.architecture)
 
-    return not os.path.exists(deb_filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    return not build_directory_index.Exists(deb_filename)
 
   def Clean(self, source_helper_object):
     """Cleans the dpkg packages in the current directory.
@@ -709,24 +894,13 @@ class ConfigureMakeSourceDPKGBuildHelper(DPKGBuildHelper):
     logging.info('Building source deb of: {0:s} for: {1:s}'.format(
         source_filename, self.distribution))
 
-    if not self._CreatePackagingFiles(source_directory, project_version):
-      return False
-
-    # If there is a temporary packaging directory remove it.
-    temporary_directory = os.path.join(source_directory, 'tmp')
-    if os.path.exists(temporary_directory):
-      logging.info('Removing: {0:s}'.format(temporary_directory))
-      shutil.rmtree(temporary_directory)
-
-    if not self._BuildPrepare(
-        source_directory, source_helper_object.project_name, project_version,
-        self.version_suffix, self.distribution, self.architecture):
+    if not self._PrepareSourceDirectory(
+        source_directory, source_helper_object.project_name, project_version):
       return False
 
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     command = 'debuild -S -sa > {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    exit_code = self._RunBuildCommand(source_directory, command)
     if exit_code != 0:
       logging.error(
           'Failed to run: "(cd {0:s} && {1:s})" with exit code {2:d}.'.format(
@@ -755,7 +929,8 @@ class ConfigureMakeSourceDPKGBuildHelper(DPKGBuildHelper):
         source_helper_object.project_name, project_version,
         self.version_suffix, self.distribution, self.architecture)
 
-    return not os.path.exists(changes_filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    return not build_directory_index.Exists(changes_filename)
 
   def Clean(self, source_helper_object):
     """Cleans the source dpkg packages in the current directory.
@@ -793,8 +968,8 @@ class SetupPyDPKGBuildHelperBase(DPKGBuildHelper):
     command = (
         '{0:s} setup.py install --root=installroot > /dev/null 2>&1').format(
             sys.executable)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+        source_directory, command), 'prepare')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       build_configuration = None
@@ -946,8 +1121,7 @@ class SetupPyDPKGBuildHelper(SetupPyDPKGBuildHelperBase):
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     command = 'dpkg-buildpackage -uc -us -rfakeroot > {0:s} 2>&1'.format(
         log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    exit_code = self._RunBuildCommand(source_directory, command)
     if exit_code != 0:
       logging.error(
           'Failed to run: "(cd {0:s} && {1:s})" with exit code {2:d}.'.format(
@@ -976,7 +1150,8 @@ class SetupPyDPKGBuildHelper(SetupPyDPKGBuildHelperBase):
     deb_filename = '{0:s}_{1!s}-1_{2:s}.deb'.format(
         project_name, project_version, self.architecture)
 
-    return not os.path.exists(deb_filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    return not build_directory_index.Exists(deb_filename)
 
   def Clean(self, source_helper_object):
     """Cleans the dpkg packages in the current directory.
@@ -1080,24 +1255,13 @@ class SetupPySourceDPKGBuildHelper(SetupPyDPKGBuildHelperBase):
     logging.info('Building source deb of: {0:s} for: {1:s}'.format(
         source_filename, self.distribution))
 
-    if not self._CreatePackagingFiles(source_directory, project_version):
-      return False
-
-    # If there is a temporary packaging directory remove it.
-    temporary_directory = os.path.join(source_directory, 'tmp')
-    if os.path.exists(temporary_directory):
-      logging.info('Removing: {0:s}'.format(temporary_directory))
-      shutil.rmtree(temporary_directory)
-
-    if not self._BuildPrepare(
-        source_directory, project_name, project_version, self.version_suffix,
-        self.distribution, self.architecture):
+    if not self._PrepareSourceDirectory(
+        source_directory, project_name, project_version):
       return False
 
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     command = 'debuild -S -sa > {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    exit_code = self._RunBuildCommand(source_directory, command)
     if exit_code != 0:
       logging.error(
           'Failed to run: "(cd {0:s} && {1:s})" with exit code {2:d}.'.format(
@@ -1126,7 +1290,8 @@ class SetupPySourceDPKGBuildHelper(SetupPyDPKGBuildHelperBase):
         project_name, project_version, self.version_suffix, self.distribution,
         self.architecture)
 
-    return not os.path.exists(changes_filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    return not build_directory_index.Exists(changes_filename)
 
   def Clean(self, source_helper_object):
     """Cleans the dpkg packages in the current directory.
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Cache of the installed package checks of the build helpers."""
+
+import os
+import subprocess
+import threading
+
+
+class InstalledPackageCache(object):
+  """Cache of installed package checks.
+
+  The result of a check, such as "dpkg-query -s", is reused until the package
+  database changes, which is determined from the modification time and size
+  of the package database files. This allows a long-running process to check
+  the build dependencies of many projects without running the same check
+  again.
+  """
+
+  # The package database files per package format.
+  _DATABASE_PATHS = {
+      'dpkg': ['/var/lib/dpkg/status'],
+      'rpm': ['/var/lib/rpm/rpmdb.sqlite', '/var/lib/rpm/Packages']}
+
+  def __init__(self, database_paths=None):
+    """Initializes an installed package cache.
+
+    Args:
+      database_paths (Optional[dict[str, list[str]]]): paths of the package
+          database files per package format, where None represents the
+          default paths.
+    """
+    super(InstalledPackageCache, self).__init__()
+    self._database_paths = database_paths or self._DATABASE_PATHS
+    self._lock = threading.Lock()
+    self._results = {}
+
+  def _GetDatabaseFingerprint(self, package_format):
+    """Retrieves the fingerprint of a package database.
+
+    Args:
+      package_format (str): package format, such as "dpkg" or "rpm".
+
+    Returns:
+      tuple[tuple[str, int, int]]: path, modification time and size of the
+          package database files or None if no package database file exists.
+    """
+    fingerprint = []
+    for path in self._database_paths.get(package_format, None) or []:
+      try:
+        stat_object = os.stat(path)
+      except OSError:
+        continue
+
+      fingerprint.append((path, stat_object.st_mtime_ns, stat_object.st_size))
+
+    return tuple(fingerprint) or None
+
+  def CheckIsInstalled(self, package_format, command):
+    """Checks if a package is installed.
+
+    Args:
+      package_format (str): package format, such as "dpkg" or "rpm".
+      command (str): shell command that checks if the package is installed,
+          which exits with 0 if the package is installed.
+
+    Returns:
+      bool: True if the package is installed, False otherwise.
+    """
+    fingerprint = self._GetDatabaseFingerprint(package_format)
+
+    lookup_key = (package_format, command)
+    with self._lock:
+      cached_fingerprint, result = self._results.get(
+          lookup_key, (None, None))
+
+    # Without a package database file changes cannot be detected, hence the
+    # check is not cached.
+    if fingerprint and cached_fingerprint == fingerprint:
+      return result
+
+    exit_code = subprocess.call(command, shell=True)
+    result = exit_code == 0
+
+    if fingerprint:
+      with self._lock:
+        self._results[lookup_key] = (fingerprint, result)
+
+    return result
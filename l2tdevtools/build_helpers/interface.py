@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 """Helper for building projects from source."""
 
+import contextlib
 import os
+import subprocess
 
 
 class BuildHelper(object):
-  """Helper to build projects from source."""
+  """Helper to build projects from source.
+
+  Attributes:
+    build_accelerator (BuildAccelerator): build accelerator of configure and
+        make based builds or None if not set.
+    build_log_recorder (BuildLogRecorder): build log recorder to record the
+        timing and resource usage of the build phases or None if not set.
+    installed_package_cache (InstalledPackageCache): cache of the installed
+        package checks or None if not set.
+  """
 
   LOG_FILENAME = 'build.log'
 
@@ -25,6 +36,63 @@ class BuildHelper(object):
     self._dependency_definitions = dependency_definitions
     self._project_definition = project_definition
 
+    self.build_accelerator = None
+    self.build_log_recorder = None
+    self.installed_package_cache = None
+
+  def _GetBuildCommandPrefix(self, build_target, distribution=''):
+    """Retrieves the shell prefix that sets the environment of a build command.
+
+    Args:
+      build_target (str): build target, such as "dpkg", "rpm" or "source".
+      distribution (Optional[str]): name of the distribution, where an empty
+          string represents the build host.
+
+    Returns:
+      str: shell variable assignments, followed by a space, or an empty string
+          if no build accelerator is set.
+    """
+    if not self.build_accelerator:
+      return ''
+
+    return self.build_accelerator.GetCommandPrefix(
+        build_target=build_target, distribution=distribution)
+
+  @contextlib.contextmanager
+  def _RecordPhase(self, phase):
+    """Records a build phase that runs within the current process.
+
+    Args:
+      phase (str): name of the phase.
+
+    Yields:
+      BuildPhaseEvent: build phase event or None if no build log recorder
+          is set.
+    """
+    if not self.build_log_recorder:
+      yield None
+    else:
+      with self.build_log_recorder.RecordPhase(
+          self._project_definition.name, phase) as event:
+        yield event
+
+  def _RunCommand(self, command, phase, shell=True):
+    """Runs a command of a build phase.
+
+    Args:
+      command (Union[str, list[str]]): command to run.
+      phase (str): name of the phase, such as "prepare" or "build".
+      shell (Optional[bool]): True if the command should be run by the shell.
+
+    Returns:
+      int: exit code of the command.
+    """
+    if not self.build_log_recorder:
+      return subprocess.call(command, shell=shell)
+
+    return self.build_log_recorder.RunCommand(
+        self._project_definition.name, phase, command, shell=shell)
+
   def CheckBuildDependencies(self):
     """Checks if the build dependencies are met.
 
@@ -55,3 +123,14 @@ class BuildHelper(object):
       bool: True if the project configuration is correct, False otherwise.
     """
     return True
+
+  def Clean(self, source_helper_object):
+    """Cleans the build and intermediate files in the current directory.
+
+    Build helpers that create packages override this function to remove the
+    packages of older versions. By default nothing is cleaned.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+    """
+    return
@@ -8,7 +8,6 @@ import os
 import platform
 import re
 import shutil
-import subprocess
 import sys
 
 from l2tdevtools import source_helper
@@ -87,7 +86,7 @@ class MSIBuildHelper(interface.BuildHelper):
 
       command = '\"{0:s}\" --force --binary --input {1:s}'.format(
           patch_exe_path, filename)
-      exit_code = subprocess.call(command, shell=False)
+      exit_code = self._RunCommand(command, 'prepare', shell=False)
       if exit_code != 0:
         logging.error('Running: "{0:s}" failed.'.format(command))
         return False
@@ -111,7 +110,7 @@ class MSIBuildHelper(interface.BuildHelper):
     elif filepath.endswith('py'):
       command = '{0:s} "{1:s}"'.format(sys.executable, filepath)
 
-    exit_code = subprocess.call(command, shell=False)
+    exit_code = self._RunCommand(command, 'prepare', shell=False)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -285,7 +284,7 @@ class ConfigureMakeMSIBuildHelper(MSIBuildHelper):
         '\"{0:s}\" /p:Configuration=Release /p:Platform={1:s} '
         '/noconsolelogger /fileLogger /maxcpucount {2:s}').format(
             msbuild, msvscpp_platform, solution_filename)
-    exit_code = subprocess.call(command, shell=False)
+    exit_code = self._RunCommand(command, 'build', shell=False)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -392,7 +391,7 @@ class ConfigureMakeMSIBuildHelper(MSIBuildHelper):
       os.environ['VS90COMNTOOLS'] = os.environ['VCINSTALLDIR']
 
     command = '\"{0:s}\" setup.py bdist_msi'.format(sys.executable)
-    exit_code = subprocess.call(command, shell=False)
+    exit_code = self._RunCommand(command, 'build', shell=False)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -423,7 +422,8 @@ class ConfigureMakeMSIBuildHelper(MSIBuildHelper):
       logging.warning('MSI file already exists.')
     else:
       logging.info('Moving: {0:s}'.format(filenames[0]))
-      shutil.move(filenames[0], build_directory)
+      with self._RecordPhase('move'):
+        shutil.move(filenames[0], build_directory)
 
     return True
 
@@ -700,8 +700,8 @@ class SetupPyMSIBuildHelper(MSIBuildHelper):
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     command = '\"{0:s}\" setup.py bdist_msi > {1:s} 2>&1'.format(
         sys.executable, log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+        source_directory, command), 'build')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -723,7 +723,8 @@ class SetupPyMSIBuildHelper(MSIBuildHelper):
       logging.warning('MSI file already exists.')
     else:
       logging.info('Moving: {0:s}'.format(filenames[0]))
-      shutil.move(filenames[0], '.')
+      with self._RecordPhase('move'):
+        shutil.move(filenames[0], '.')
 
     return True
 
@@ -396,30 +396,35 @@ class SetupPyOSCBuildHelper(OSCBuildHelper):
 
     spec_file_generator = spec_file.RPMSpecFileGenerator(self._data_path)
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
-    if not spec_file_generator.GenerateWithSetupPy(
-        source_directory, log_file_path):
-      return False
-
     project_name = source_helper_object.project_name
     if project_name.startswith('python-') and project_name != 'python-gflags':
       project_name = project_name[7:]
 
     project_version = source_helper_object.GetProjectVersion()
 
-    input_file_path = self._GetSetupPySpecFilePath(
-        source_helper_object, source_directory)
-
     spec_filename = '{0:s}.spec'.format(project_name)
     osc_spec_file_path = os.path.join(osc_package_path, spec_filename)
 
     # Determine if the output file exists before it is generated.
     output_file_exists = os.path.exists(osc_spec_file_path)
 
-    if not spec_file_generator.RewriteSetupPyGeneratedFile(
+    # Generating the spec file from the package metadata does not require
+    # running setup.py, which is used as a fallback.
+    if not spec_file_generator.GenerateWithMetadata(
         self._project_definition, source_directory, source_filename,
-        project_name, project_version, input_file_path, osc_spec_file_path):
-      return None
+        project_name, project_version, osc_spec_file_path):
+      log_file_path = os.path.join('..', self.LOG_FILENAME)
+      if not spec_file_generator.GenerateWithSetupPy(
+          source_directory, log_file_path):
+        return False
+
+      input_file_path = self._GetSetupPySpecFilePath(
+          source_helper_object, source_directory)
+
+      if not spec_file_generator.RewriteSetupPyGeneratedFile(
+          self._project_definition, source_directory, source_filename,
+          project_name, project_version, input_file_path, osc_spec_file_path):
+        return False
 
     if not spec_file_generator.RewriteSetupPyGeneratedFileForOSC(
         osc_spec_file_path):
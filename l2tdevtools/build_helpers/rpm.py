@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Helper for building projects from source."""
 
-import glob
 import logging
 import os
 import platform
@@ -9,8 +8,9 @@ import re
 import shutil
 import subprocess
 
-from l2tdevtools.build_helpers import interface
+from l2tdevtools import build_index
 from l2tdevtools import spec_file
+from l2tdevtools.build_helpers import interface
 
 
 class BaseRPMBuildHelper(interface.BuildHelper):
@@ -88,7 +88,7 @@ class BaseRPMBuildHelper(interface.BuildHelper):
 
     command = 'rpmbuild {0:s} {1:s} > {2:s} 2>&1'.format(
         rpmbuild_flags, spec_filename, self.LOG_FILENAME)
-    exit_code = subprocess.call(command, shell=True)
+    exit_code = self._RunCommand(command, 'build')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
 
@@ -109,9 +109,19 @@ class BaseRPMBuildHelper(interface.BuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    command = 'rpmbuild {0:s} {1:s} > {2:s} 2>&1'.format(
-        rpmbuild_flags, source_package_filename, self.LOG_FILENAME)
-    exit_code = subprocess.call(command, shell=True)
+    command_prefix = ''
+    if self.build_accelerator:
+      command_prefix = self._GetBuildCommandPrefix('rpm')
+
+      accelerator_flags = self.build_accelerator.GetRPMBuildFlags()
+      if accelerator_flags:
+        rpmbuild_flags = '{0:s} {1:s}'.format(
+            accelerator_flags, rpmbuild_flags)
+
+    command = '{0:s}rpmbuild {1:s} {2:s} > {3:s} 2>&1'.format(
+        command_prefix, rpmbuild_flags, source_package_filename,
+        self.LOG_FILENAME)
+    exit_code = self._RunCommand(command, 'build')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -128,6 +138,9 @@ class BaseRPMBuildHelper(interface.BuildHelper):
       bool: True if the package is installed, False otherwise.
     """
     command = 'rpm -qi {0:s} >/dev/null 2>&1'.format(package_name)
+    if self.installed_package_cache:
+      return self.installed_package_cache.CheckIsInstalled('rpm', command)
+
     exit_code = subprocess.call(command, shell=True)
     return exit_code == 0
 
@@ -230,15 +243,19 @@ class BaseRPMBuildHelper(interface.BuildHelper):
     Args:
       filenames_glob (str): glob of the filenames to move.
     """
-    filenames = glob.glob(filenames_glob)
-    for filename in filenames:
-      logging.info('Moving: {0:s}'.format(filename))
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+
+    with self._RecordPhase('move'):
+      filenames = build_index.Glob(filenames_glob)
+      for filename in filenames:
+        logging.info('Moving: {0:s}'.format(filename))
 
-      local_filename = os.path.basename(filename)
-      if os.path.exists(local_filename):
-        os.remove(local_filename)
+        local_filename = os.path.basename(filename)
+        if build_directory_index.Exists(local_filename):
+          build_directory_index.RemovePath(local_filename)
 
-      shutil.move(filename, '.')
+        shutil.move(filename, '.')
+        build_directory_index.AddPath(local_filename)
 
   def CheckBuildDependencies(self):
     """Checks if the build dependencies are met.
@@ -292,14 +309,11 @@ class RPMBuildHelper(BaseRPMBuildHelper):
         project_name, project_version)
     filenames_to_ignore = re.compile(filenames_to_ignore)
 
-    filenames_glob = os.path.join(
-        self.rpmbuild_path, 'BUILD', '{0:s}-*'.format(project_name))
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        shutil.rmtree(filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex(
+        os.path.join(self.rpmbuild_path, 'BUILD'))
+    build_directory_index.RemoveOlderVersions(
+        ['{0:s}-*'.format(project_name)], filenames_to_ignore,
+        directories=True)
 
   def _RemoveOlderRPMs(self, project_name, project_version):
     """Removes previous versions of .rpm files.
@@ -314,21 +328,12 @@ class RPMBuildHelper(BaseRPMBuildHelper):
 
     rpm_filenames_glob = '*{0:s}-*-1.{1:s}.rpm'.format(
         project_name, self.architecture)
-    filenames = glob.glob(rpm_filenames_glob)
 
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
-
-    filenames_glob = os.path.join(
-        self.rpmbuild_path, 'RPMS', self.architecture, rpm_filenames_glob)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+    for path in ('.', os.path.join(
+        self.rpmbuild_path, 'RPMS', self.architecture)):
+      build_directory_index = build_index.GetBuildDirectoryIndex(path)
+      build_directory_index.RemoveOlderVersions(
+          [rpm_filenames_glob], filenames_to_ignore)
 
   def CheckBuildRequired(self, source_helper_object):
     """Checks if a build is required.
@@ -345,7 +350,8 @@ class RPMBuildHelper(BaseRPMBuildHelper):
     rpm_filename = '{0:s}-{1!s}-1.{2:s}.rpm'.format(
         project_name, project_version, self.architecture)
 
-    return not os.path.exists(rpm_filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    return not build_directory_index.Exists(rpm_filename)
 
 
 class ConfigureMakeRPMBuildHelper(RPMBuildHelper):
@@ -462,20 +468,29 @@ class SetupPyRPMBuildHelper(RPMBuildHelper):
 
     spec_file_generator = spec_file.RPMSpecFileGenerator(self._data_path)
 
+    if project_name.startswith('python-'):
+      project_name = project_name[7:]
+
+    spec_filename = '{0:s}.spec'.format(project_name)
+    output_file_path = os.path.join(self._rpmbuild_specs_path, spec_filename)
+
+    self._CreateRPMbuildDirectories()
+
+    # Generating the spec file from the package metadata does not require
+    # running setup.py, which is used as a fallback.
+    if spec_file_generator.GenerateWithMetadata(
+        self._project_definition, source_directory, source_package_filename,
+        project_name, project_version, output_file_path):
+      return output_file_path
+
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     if not spec_file_generator.GenerateWithSetupPy(
         source_directory, log_file_path):
       return None
 
-    if project_name.startswith('python-'):
-      project_name = project_name[7:]
-
     input_file_path = self._GetSetupPySpecFilePath(
         source_helper_object, source_directory)
 
-    spec_filename = '{0:s}.spec'.format(project_name)
-    output_file_path = os.path.join(self._rpmbuild_specs_path, spec_filename)
-
     if not spec_file_generator.RewriteSetupPyGeneratedFile(
         self._project_definition, source_directory, source_package_filename,
         project_name, project_version, input_file_path, output_file_path):
@@ -604,21 +619,11 @@ class SRPMBuildHelper(BaseRPMBuildHelper):
     filenames_to_ignore = re.compile(filenames_to_ignore)
 
     src_rpm_filenames_glob = '{0:s}-*-1.src.rpm'.format(project_name)
-    filenames = glob.glob(src_rpm_filenames_glob)
 
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
-
-    filenames_glob = os.path.join(
-        self.rpmbuild_path, 'SRPMS', src_rpm_filenames_glob)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+    for path in ('.', os.path.join(self.rpmbuild_path, 'SRPMS')):
+      build_directory_index = build_index.GetBuildDirectoryIndex(path)
+      build_directory_index.RemoveOlderVersions(
+          [src_rpm_filenames_glob], filenames_to_ignore)
 
   def CheckBuildRequired(self, source_helper_object):
     """Checks if a build is required.
@@ -635,7 +640,8 @@ class SRPMBuildHelper(BaseRPMBuildHelper):
     srpm_filename = '{0:s}-{1!s}-1.src.rpm'.format(
         project_name, project_version)
 
-    return not os.path.exists(srpm_filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
+    return not build_directory_index.Exists(srpm_filename)
 
   def Clean(self, source_helper_object):
     """Cleans the rpmbuild directory.
@@ -733,20 +739,29 @@ class SetupPySRPMBuildHelper(SRPMBuildHelper):
 
     spec_file_generator = spec_file.RPMSpecFileGenerator(self._data_path)
 
+    if project_name.startswith('python-'):
+      project_name = project_name[7:]
+
+    spec_filename = '{0:s}.spec'.format(project_name)
+    output_file_path = os.path.join(self._rpmbuild_specs_path, spec_filename)
+
+    self._CreateRPMbuildDirectories()
+
+    # Generating the spec file from the package metadata does not require
+    # running setup.py, which is used as a fallback.
+    if spec_file_generator.GenerateWithMetadata(
+        self._project_definition, source_directory, source_package_filename,
+        project_name, project_version, output_file_path):
+      return output_file_path
+
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     if not spec_file_generator.GenerateWithSetupPy(
         source_directory, log_file_path):
       return None
 
-    if project_name.startswith('python-'):
-      project_name = project_name[7:]
-
     input_file_path = self._GetSetupPySpecFilePath(
         source_helper_object, source_directory)
 
-    spec_filename = '{0:s}.spec'.format(project_name)
-    output_file_path = os.path.join(self._rpmbuild_specs_path, spec_filename)
-
     if not spec_file_generator.RewriteSetupPyGeneratedFile(
         self._project_definition, source_directory, source_package_filename,
         project_name, project_version, input_file_path, output_file_path):
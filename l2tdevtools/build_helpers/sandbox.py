@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""Build sandboxes with copy-on-write overlays of pre-provisioned build roots.
+
+A build sandbox runs build commands, such as dpkg-buildpackage, inside a build
+root of a specific distribution instead of directly on the host. Every build
+gets a fresh copy-on-write overlay of the build root, hence changes made by a
+build, such as installed build dependencies, are discarded afterwards and
+multiple builds can run in parallel on the same build root.
+"""
+
+import io
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+
+
+class BuildSandbox(object):
+  """Build sandbox interface."""
+
+  def __init__(self, build_sandbox_pool, distribution):
+    """Initializes a build sandbox.
+
+    Args:
+      build_sandbox_pool (BuildSandboxPool): pool the sandbox originates from.
+      distribution (str): name of the distribution of the build root.
+    """
+    super(BuildSandbox, self).__init__()
+    self._build_sandbox_pool = build_sandbox_pool
+    self.distribution = distribution
+
+  def __enter__(self):
+    """Make this work with the 'with' statement."""
+    self.Open()
+    return self
+
+  def __exit__(self, unused_type, unused_value, unused_traceback):
+    """Make this work with the 'with' statement."""
+    self.Close()
+
+  def Close(self):
+    """Closes the sandbox and discards the copy-on-write overlay."""
+    raise NotImplementedError()
+
+  def InstallPackages(self, package_names):
+    """Installs packages in the sandbox.
+
+    Args:
+      package_names (list[str]): names of the packages to install.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    if not package_names:
+      return True
+
+    command = (
+        'apt-get -o APT::Sandbox::User=root install -y '
+        '--no-install-recommends {0:s} > /dev/null 2>&1').format(
+            ' '.join(package_names))
+    exit_code = self.RunCommand(command, '/', as_root=True)
+    if exit_code != 0:
+      logging.error('Running: "{0:s}" failed.'.format(command))
+      return False
+
+    return True
+
+  def Open(self):
+    """Opens the sandbox and creates the copy-on-write overlay.
+
+    Raises:
+      IOError: if the sandbox cannot be opened.
+      OSError: if the sandbox cannot be opened.
+    """
+    raise NotImplementedError()
+
+  def RunCommand(self, command, working_directory, as_root=False):
+    """Runs a command inside the sandbox.
+
+    Args:
+      command (str): shell command to run.
+      working_directory (str): path of the working directory of the command,
+          relative to the current working directory or absolute.
+      as_root (Optional[bool]): True if the command should be run as root.
+
+    Returns:
+      int: exit code of the command.
+    """
+    raise NotImplementedError()
+
+
+class OverlayBuildSandbox(BuildSandbox):
+  """Build sandbox that uses an unshare based overlay file system.
+
+  The build root is used as the lower directory of an overlay file system,
+  which is mounted in a user and mount namespace, hence no root privileges
+  are required. The current working directory, that contains the source
+  packages, is bind mounted into the sandbox at the same path.
+  """
+
+  def __init__(self, build_sandbox_pool, distribution):
+    """Initializes a build sandbox.
+
+    Args:
+      build_sandbox_pool (BuildSandboxPool): pool the sandbox originates from.
+      distribution (str): name of the distribution of the build root.
+    """
+    super(OverlayBuildSandbox, self).__init__(
+        build_sandbox_pool, distribution)
+    self._path = None
+
+  def _GetMountScript(self, command, working_directory):
+    """Retrieves the shell script that mounts the overlay and runs a command.
+
+    Args:
+      command (str): shell command to run.
+      working_directory (str): absolute path of the working directory of the
+          command.
+
+    Returns:
+      str: shell script.
+    """
+    build_root_path = self._build_sandbox_pool.GetBuildRootPath(
+        self.distribution)
+
+    current_working_directory = os.getcwd()
+
+    merged_path = os.path.join(self._path, 'merged')
+    bind_path = '{0:s}{1:s}'.format(merged_path, current_working_directory)
+
+    chroot_command = 'cd {0:s} && {1:s}'.format(
+        shlex.quote(working_directory), command)
+
+    lines = [
+        'set -e',
+        ('mount -t overlay overlay -o lowerdir={0:s},upperdir={1:s},'
+         'workdir={2:s} {3:s}').format(
+             build_root_path, os.path.join(self._path, 'upper'),
+             os.path.join(self._path, 'work'), merged_path),
+        'mkdir -p {0:s}'.format(shlex.quote(bind_path)),
+        'mount --rbind {0:s} {1:s}'.format(
+            shlex.quote(current_working_directory), shlex.quote(bind_path)),
+        'mount --rbind /dev {0:s}/dev'.format(merged_path),
+        'mount -t proc proc {0:s}/proc'.format(merged_path),
+        'cp /etc/resolv.conf {0:s}/etc/resolv.conf'.format(merged_path),
+        'exec chroot {0:s} /bin/sh -c {1:s}'.format(
+            merged_path, shlex.quote(chroot_command))]
+
+    return '\n'.join(lines)
+
+  def Close(self):
+    """Closes the sandbox and discards the copy-on-write overlay."""
+    if self._path:
+      # The overlay work directory contains directories without permissions
+      # for the user that are only accessible within the user namespace.
+      try:
+        subprocess.call([
+            'unshare', '--map-root-user', 'rm', '-rf', self._path])
+      except OSError:
+        pass
+
+      shutil.rmtree(self._path, True)
+      self._path = None
+
+  def Open(self):
+    """Opens the sandbox and creates the copy-on-write overlay.
+
+    Raises:
+      IOError: if the sandbox cannot be opened.
+      OSError: if the sandbox cannot be opened.
+    """
+    build_root_path = self._build_sandbox_pool.GetBuildRootPath(
+        self.distribution)
+    if not os.path.isdir(build_root_path):
+      raise IOError('Missing build root: {0:s}'.format(build_root_path))
+
+    self._path = tempfile.mkdtemp(
+        prefix='{0:s}-'.format(self.distribution),
+        dir=self._build_sandbox_pool.GetOverlaysPath())
+
+    for name in ('merged', 'upper', 'work'):
+      os.mkdir(os.path.join(self._path, name))
+
+  def RunCommand(self, command, working_directory, as_root=False):
+    """Runs a command inside the sandbox.
+
+    Args:
+      command (str): shell command to run.
+      working_directory (str): path of the working directory of the command,
+          relative to the current working directory or absolute.
+      as_root (Optional[bool]): True if the command should be run as root.
+
+    Returns:
+      int: exit code of the command.
+    """
+    # Within the user namespace the user is always mapped to root.
+    working_directory = os.path.abspath(working_directory)
+    script = self._GetMountScript(command, working_directory)
+
+    arguments = [
+        'unshare', '--map-root-user', '--mount', '--pid', '--fork',
+        '/bin/sh', '-c', script]
+    return subprocess.call(arguments)
+
+
+class SchrootBuildSandbox(BuildSandbox):
+  """Build sandbox that uses a schroot session.
+
+  The schroot chroot of the distribution needs to be configured with
+  "union-type=overlay", for schroot to create a copy-on-write overlay per
+  session, and needs to have the build directory mounted, for example by
+  its fstab.
+  """
+
+  def __init__(self, build_sandbox_pool, distribution):
+    """Initializes a build sandbox.
+
+    Args:
+      build_sandbox_pool (BuildSandboxPool): pool the sandbox originates from.
+      distribution (str): name of the distribution of the build root.
+    """
+    super(SchrootBuildSandbox, self).__init__(build_sandbox_pool, distribution)
+    self._session_name = None
+
+  def Close(self):
+    """Closes the sandbox and discards the copy-on-write overlay."""
+    if self._session_name:
+      subprocess.call([
+          'schroot', '--end-session', '--chroot', self._session_name])
+      self._session_name = None
+
+  def Open(self):
+    """Opens the sandbox and creates the copy-on-write overlay.
+
+    Raises:
+      IOError: if the sandbox cannot be opened.
+      OSError: if the sandbox cannot be opened.
+    """
+    chroot_name = self._build_sandbox_pool.GetSchrootName(self.distribution)
+
+    output = subprocess.check_output([
+        'schroot', '--begin-session', '--chroot', chroot_name])
+
+    self._session_name = output.decode('utf-8').strip()
+    if not self._session_name:
+      raise IOError('Unable to begin schroot session of: {0:s}'.format(
+          chroot_name))
+
+  def RunCommand(self, command, working_directory, as_root=False):
+    """Runs a command inside the sandbox.
+
+    Args:
+      command (str): shell command to run.
+      working_directory (str): path of the working directory of the command,
+          relative to the current working directory or absolute.
+      as_root (Optional[bool]): True if the command should be run as root.
+
+    Returns:
+      int: exit code of the command.
+    """
+    arguments = [
+        'schroot', '--run-session', '--chroot', self._session_name,
+        '--directory', os.path.abspath(working_directory)]
+
+    if as_root:
+      arguments.extend(['--user', 'root'])
+
+    arguments.extend(['--', '/bin/sh', '-c', command])
+    return subprocess.call(arguments)
+
+
+class BuildSandboxPool(object):
+  """Pool of pre-provisioned build roots keyed by distribution.
+
+  The pool is stored in a local directory with the layout:
+
+    <pool>/<distribution>/root: build root of the distribution.
+    <pool>/<distribution>/packages: names of the packages provisioned in
+        the build root.
+    <pool>/overlays: copy-on-write overlays of the active sandboxes.
+
+  Attributes:
+    sandbox_type (str): type of the sandboxes, either "overlay" or "schroot".
+  """
+
+  _PACKAGES_FILENAME = 'packages'
+
+  _SANDBOX_CLASSES = {
+      'overlay': OverlayBuildSandbox,
+      'schroot': SchrootBuildSandbox,
+  }
+
+  # Name of the schroot chroot of a distribution.
+  _SCHROOT_NAME_FORMAT = 'l2tbuilds-{0:s}'
+
+  SANDBOX_TYPES = frozenset(_SANDBOX_CLASSES.keys())
+
+  def __init__(self, path, sandbox_type='overlay'):
+    """Initializes a build sandbox pool.
+
+    Args:
+      path (str): path of the directory that contains the build roots.
+      sandbox_type (Optional[str]): type of the sandboxes.
+
+    Raises:
+      ValueError: if the sandbox type is not supported.
+    """
+    super(BuildSandboxPool, self).__init__()
+
+    if sandbox_type not in self._SANDBOX_CLASSES:
+      raise ValueError('Unsupported sandbox type: {0:s}'.format(sandbox_type))
+
+    self._lock = threading.Lock()
+    self._path = os.path.abspath(path)
+
+    self.sandbox_type = sandbox_type
+
+  def _ReadProvisionedPackages(self, distribution):
+    """Reads the names of the packages provisioned in a build root.
+
+    Args:
+      distribution (str): name of the distribution.
+
+    Returns:
+      set[str]: names of the provisioned packages.
+    """
+    path = os.path.join(self._path, distribution, self._PACKAGES_FILENAME)
+    if not os.path.exists(path):
+      return set()
+
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      return set(line.strip() for line in file_object if line.strip())
+
+  def _RunInBuildRoot(self, distribution, command):
+    """Runs a command inside a build root, without an overlay.
+
+    Args:
+      distribution (str): name of the distribution.
+      command (str): shell command to run.
+
+    Returns:
+      int: exit code of the command.
+    """
+    build_root_path = self.GetBuildRootPath(distribution)
+    script = (
+        'mount --rbind /dev {0:s}/dev && '
+        'cp /etc/resolv.conf {0:s}/etc/resolv.conf && '
+        'exec chroot {0:s} /bin/sh -c {1:s}').format(
+            build_root_path, shlex.quote(command))
+
+    return subprocess.call([
+        'unshare', '--map-root-user', '--mount', '/bin/sh', '-c', script])
+
+  def _WriteProvisionedPackages(self, distribution, package_names):
+    """Writes the names of the packages provisioned in a build root.
+
+    Args:
+      distribution (str): name of the distribution.
+      package_names (set[str]): names of the provisioned packages.
+    """
+    path = os.path.join(self._path, distribution, self._PACKAGES_FILENAME)
+    with io.open(path, 'w', encoding='utf-8') as file_object:
+      for package_name in sorted(package_names):
+        file_object.write('{0:s}\n'.format(package_name))
+
+  def CreateSandbox(self, distribution):
+    """Creates a sandbox of a build root.
+
+    The sandbox is opened when used in a with statement.
+
+    Args:
+      distribution (str): name of the distribution.
+
+    Returns:
+      BuildSandbox: build sandbox.
+    """
+    sandbox_class = self._SANDBOX_CLASSES[self.sandbox_type]
+    return sandbox_class(self, distribution)
+
+  def GetBuildRootPath(self, distribution):
+    """Retrieves the path of the build root of a distribution.
+
+    Args:
+      distribution (str): name of the distribution.
+
+    Returns:
+      str: path of the build root.
+    """
+    return os.path.join(self._path, distribution, 'root')
+
+  def GetOverlaysPath(self):
+    """Retrieves the path of the directory that contains the overlays.
+
+    Returns:
+      str: path of the overlays directory.
+    """
+    path = os.path.join(self._path, 'overlays')
+    if not os.path.exists(path):
+      os.makedirs(path, exist_ok=True)
+
+    return path
+
+  def GetSchrootName(self, distribution):
+    """Retrieves the name of the schroot chroot of a distribution.
+
+    Args:
+      distribution (str): name of the distribution.
+
+    Returns:
+      str: name of the schroot chroot.
+    """
+    return self._SCHROOT_NAME_FORMAT.format(distribution)
+
+  def ProvisionBuildRoot(self, distribution, package_names):
+    """Provisions the build root of a distribution.
+
+    The build root is created with mmdebstrap if it does not exist and the
+    packages that were not provisioned before are installed. Schroot build
+    roots are managed by schroot and are not provisioned.
+
+    Args:
+      distribution (str): name of the distribution.
+      package_names (list[str]): names of the packages to install in the
+          build root, such as the common build dependencies.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    if self.sandbox_type == 'schroot':
+      return True
+
+    with self._lock:
+      build_root_path = self.GetBuildRootPath(distribution)
+      if not os.path.exists(build_root_path):
+        os.makedirs(os.path.dirname(build_root_path), exist_ok=True)
+
+        logging.info('Creating build root: {0:s}'.format(build_root_path))
+        command = [
+            'mmdebstrap', '--mode=unshare', '--variant=buildd',
+            distribution, build_root_path]
+        exit_code = subprocess.call(command)
+        if exit_code != 0:
+          logging.error('Running: "{0:s}" failed.'.format(' '.join(command)))
+          shutil.rmtree(build_root_path, True)
+          return False
+
+      provisioned_packages = self._ReadProvisionedPackages(distribution)
+      missing_packages = sorted(set(package_names) - provisioned_packages)
+      if missing_packages:
+        command = (
+            'apt-get -o APT::Sandbox::User=root update && '
+            'apt-get -o APT::Sandbox::User=root install -y '
+            '--no-install-recommends {0:s}').format(' '.join(missing_packages))
+        exit_code = self._RunInBuildRoot(distribution, command)
+        if exit_code != 0:
+          logging.error('Running: "{0:s}" failed.'.format(command))
+          return False
+
+        provisioned_packages.update(missing_packages)
+        self._WriteProvisionedPackages(distribution, provisioned_packages)
+
+    return True
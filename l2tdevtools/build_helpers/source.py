@@ -3,7 +3,6 @@
 
 import logging
 import os
-import subprocess
 import sys
 
 from l2tdevtools.build_helpers import interface
@@ -43,17 +42,26 @@ class ConfigureMakeSourceBuildHelper(SourceBuildHelper):
       # TODO: add self._ApplyPatches
       pass
 
+    command_prefix = self._GetBuildCommandPrefix('source')
+
     log_file_path = os.path.join('..', self.LOG_FILENAME)
-    command = './configure > {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    command = '{0:s}./configure > {1:s} 2>&1'.format(
+        command_prefix, log_file_path)
+    exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+        source_directory, command), 'prepare')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
 
-    command = 'make >> {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    make_command = 'make'
+    if self.build_accelerator and self.build_accelerator.make_jobs:
+      make_command = 'make {0:s}'.format(
+          self.build_accelerator.GetMakeFlags())
+
+    command = '{0:s}{1:s} >> {2:s} 2>&1'.format(
+        command_prefix, make_command, log_file_path)
+    exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+        source_directory, command), 'build')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -104,8 +112,8 @@ class SetupPySourceBuildHelper(SourceBuildHelper):
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     command = '{0:s} setup.py build > {1:s} 2>&1'.format(
         sys.executable, log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+        source_directory, command), 'build')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
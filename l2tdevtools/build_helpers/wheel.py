@@ -7,7 +7,6 @@ import os
 import platform
 import re
 import shutil
-import subprocess
 import sys
 
 from l2tdevtools.build_helpers import interface
@@ -96,7 +95,8 @@ class WheelBuildHelper(interface.BuildHelper):
       logging.warning('Wheel file already exists.')
     else:
       logging.info('Moving: {0:s}'.format(filenames[0]))
-      shutil.move(filenames[0], '.')
+      with self._RecordPhase('move'):
+        shutil.move(filenames[0], '.')
 
     return True
 
@@ -194,8 +194,8 @@ class ConfigureMakeWheelBuildHelper(WheelBuildHelper):
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     command = '\"{0:s}\" setup.py bdist_wheel > {1:s} 2>&1'.format(
         sys.executable, log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+        source_directory, command), 'build')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -235,8 +235,8 @@ class SetupPyWheelBuildHelper(WheelBuildHelper):
     log_file_path = os.path.join('..', self.LOG_FILENAME)
     command = '\"{0:s}\" setup.py bdist_wheel > {1:s} 2>&1'.format(
         sys.executable, log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    exit_code = self._RunCommand('(cd {0:s} && {1:s})'.format(
+        source_directory, command), 'build')
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
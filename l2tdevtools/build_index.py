@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""Index of the artifacts in a build directory."""
+
+import bisect
+import fnmatch
+import logging
+import os
+import shutil
+import threading
+import time
+
+
+class BuildDirectoryIndex(object):
+  """Index of the artifacts in a build directory.
+
+  The directory is scanned once and the index is maintained incrementally
+  for changes made through the index. The directory is only scanned again
+  when its modification time changes for other reasons, such as a build
+  command that writes artifacts.
+
+  The modification time has a coarse granularity, hence a change within the
+  same clock tick as the last scan does not change the modification time.
+  Similar to the racy index check of git, the directory is scanned again as
+  long as its modification time is too close to the time of the last scan.
+
+  Artifact names are kept sorted, which allows a glob pattern to be matched
+  against only the names that start with the literal prefix of the pattern,
+  typically the project name, instead of all the names in the directory.
+  """
+
+  _GLOB_CHARACTERS = frozenset(['*', '?', '['])
+
+  # Interval in nanoseconds in which a modification time is considered too
+  # close to the time of the last scan, which is the granularity of the
+  # modification time on file systems such as ext3 and HFS+.
+  _RACY_INTERVAL = 1000000000
+
+  def __init__(self, path):
+    """Initializes a build directory index.
+
+    Args:
+      path (str): path of the build directory.
+    """
+    super(BuildDirectoryIndex, self).__init__()
+    self._absolute_path = os.path.abspath(path)
+    self._directories = set()
+    self._lock = threading.RLock()
+    self._modification_time = None
+    self._names = {}
+    self._path = path
+    self._scan_time = None
+    self._sorted_names = None
+
+  def _GetAbsolutePath(self, name):
+    """Retrieves the absolute path of an artifact.
+
+    Args:
+      name (str): name of the artifact.
+
+    Returns:
+      str: absolute path of the artifact.
+    """
+    return os.path.join(self._absolute_path, name)
+
+  def _GetModificationTime(self):
+    """Retrieves the modification time of the build directory.
+
+    Returns:
+      int: modification time in nanoseconds or None if the build directory
+          does not exist.
+    """
+    try:
+      return os.stat(self._absolute_path).st_mtime_ns
+    except OSError:
+      return None
+
+  def _GetPath(self, name):
+    """Retrieves the path of an artifact.
+
+    Args:
+      name (str): name of the artifact.
+
+    Returns:
+      str: path of the artifact, which is relative to the current working
+          directory if the build directory is.
+    """
+    if self._path == '.':
+      return name
+
+    return os.path.join(self._path, name)
+
+  def _GetSortedNames(self):
+    """Retrieves the sorted normalized names of the artifacts.
+
+    Returns:
+      list[str]: sorted normalized names.
+    """
+    modification_time = self._GetModificationTime()
+    if (self._sorted_names is None or
+        modification_time != self._modification_time or
+        self._IsRacy()):
+      self._Scan()
+
+    return self._sorted_names
+
+  def _GetTime(self):
+    """Retrieves the current time.
+
+    Returns:
+      int: current time in nanoseconds.
+    """
+    return int(time.time() * 1000000000)
+
+  def _IsRacy(self):
+    """Determines if the modification time is too close to the last scan.
+
+    Returns:
+      bool: True if the build directory could have changed without changing
+          its modification time.
+    """
+    if self._modification_time is None:
+      return False
+
+    return self._scan_time - self._modification_time < self._RACY_INTERVAL
+
+  def _Scan(self):
+    """Scans the build directory."""
+    self._directories = set()
+    self._names = {}
+    self._modification_time = self._GetModificationTime()
+
+    try:
+      directory_entries = list(os.scandir(self._absolute_path))
+    except OSError:
+      directory_entries = []
+
+    for directory_entry in directory_entries:
+      normalized_name = os.path.normcase(directory_entry.name)
+      self._names[normalized_name] = directory_entry.name
+
+      try:
+        if directory_entry.is_dir():
+          self._directories.add(normalized_name)
+      except OSError:
+        pass
+
+    self._scan_time = self._GetTime()
+    self._sorted_names = sorted(self._names.keys())
+
+  def _UpdateModificationTime(self, modification_time):
+    """Updates the modification time after a change made through the index.
+
+    Args:
+      modification_time (int): modification time before the change.
+    """
+    # The directory changed for other reasons as well if the modification
+    # time before the change differs from the time of the last scan.
+    if modification_time == self._modification_time:
+      self._modification_time = self._GetModificationTime()
+      self._scan_time = self._GetTime()
+
+  def AddPath(self, name):
+    """Adds an artifact that was created in the build directory.
+
+    Args:
+      name (str): name of the artifact.
+    """
+    with self._lock:
+      modification_time = self._GetModificationTime()
+      self._GetSortedNames()
+
+      normalized_name = os.path.normcase(name)
+      if normalized_name not in self._names:
+        self._names[normalized_name] = name
+        bisect.insort(self._sorted_names, normalized_name)
+
+      if os.path.isdir(self._GetAbsolutePath(name)):
+        self._directories.add(normalized_name)
+
+      self._UpdateModificationTime(modification_time)
+
+  def Exists(self, name):
+    """Determines if an artifact exists in the build directory.
+
+    Args:
+      name (str): name of the artifact.
+
+    Returns:
+      bool: True if the artifact exists.
+    """
+    with self._lock:
+      self._GetSortedNames()
+      return os.path.normcase(name) in self._names
+
+  def Glob(self, pattern):
+    """Retrieves the artifacts that match a glob pattern.
+
+    Args:
+      pattern (str): glob pattern of the names of the artifacts.
+
+    Returns:
+      list[str]: paths of the matching artifacts, sorted by name.
+    """
+    normalized_pattern = os.path.normcase(pattern)
+
+    prefix_size = 0
+    for character in normalized_pattern:
+      if character in self._GLOB_CHARACTERS:
+        break
+      prefix_size += 1
+
+    prefix = normalized_pattern[:prefix_size]
+
+    with self._lock:
+      sorted_names = self._GetSortedNames()
+
+      paths = []
+      index = bisect.bisect_left(sorted_names, prefix)
+      while index < len(sorted_names):
+        normalized_name = sorted_names[index]
+        if not normalized_name.startswith(prefix):
+          break
+
+        index += 1
+
+        # Similar to glob, hidden names only match explicitly hidden patterns.
+        if normalized_name.startswith('.') and not prefix.startswith('.'):
+          continue
+
+        if fnmatch.fnmatchcase(normalized_name, normalized_pattern):
+          paths.append(self._GetPath(self._names[normalized_name]))
+
+    return paths
+
+  def IsDirectory(self, name):
+    """Determines if an artifact is a directory.
+
+    Args:
+      name (str): name of the artifact.
+
+    Returns:
+      bool: True if the artifact is a directory.
+    """
+    with self._lock:
+      self._GetSortedNames()
+      return os.path.normcase(name) in self._directories
+
+  def RemoveOlderVersions(
+      self, patterns, filenames_to_ignore, directories=False):
+    """Removes the artifacts of previous versions.
+
+    Args:
+      patterns (list[str]): glob patterns of the names of the artifacts.
+      filenames_to_ignore (re.Pattern): regular expression of the paths of
+          the artifacts to keep, such as those of the current version.
+      directories (Optional[bool]): True if only directories should be
+          removed, False if only files.
+
+    Returns:
+      list[str]: paths of the removed artifacts.
+    """
+    removed_paths = []
+
+    with self._lock:
+      paths = []
+      for pattern in patterns:
+        for path in self.Glob(pattern):
+          if path not in paths:
+            paths.append(path)
+
+      modification_time = self._GetModificationTime()
+
+      for path in paths:
+        if filenames_to_ignore.match(path):
+          continue
+
+        normalized_name = os.path.normcase(os.path.basename(path))
+        is_directory = normalized_name in self._directories
+        if is_directory != directories:
+          continue
+
+        logging.info('Removing: {0:s}'.format(path))
+        absolute_path = self._GetAbsolutePath(os.path.basename(path))
+        if is_directory:
+          shutil.rmtree(absolute_path)
+        else:
+          os.remove(absolute_path)
+
+        self._directories.discard(normalized_name)
+        del self._names[normalized_name]
+
+        removed_paths.append(path)
+
+      if removed_paths:
+        self._sorted_names = [
+            normalized_name for normalized_name in self._sorted_names
+            if normalized_name in self._names]
+        self._UpdateModificationTime(modification_time)
+
+    return removed_paths
+
+  def RemovePath(self, name):
+    """Removes an artifact from the build directory.
+
+    Args:
+      name (str): name of the artifact.
+    """
+    with self._lock:
+      modification_time = self._GetModificationTime()
+      self._GetSortedNames()
+
+      path = self._GetAbsolutePath(name)
+      if os.path.isdir(path):
+        shutil.rmtree(path)
+      elif os.path.exists(path):
+        os.remove(path)
+
+      normalized_name = os.path.normcase(name)
+      if normalized_name in self._names:
+        self._directories.discard(normalized_name)
+        del self._names[normalized_name]
+        self._sorted_names.remove(normalized_name)
+
+      self._UpdateModificationTime(modification_time)
+
+
+_build_directory_indexes = {}
+_build_directory_indexes_lock = threading.Lock()
+
+
+def GetBuildDirectoryIndex(path='.'):
+  """Retrieves the shared index of a build directory.
+
+  Args:
+    path (Optional[str]): path of the build directory.
+
+  Returns:
+    BuildDirectoryIndex: index of the build directory.
+  """
+  # The index is looked up by the path argument as well since the paths of
+  # the artifacts are relative to the current working directory if the path
+  # argument is.
+  lookup_key = (os.path.abspath(path), path)
+  with _build_directory_indexes_lock:
+    build_directory_index = _build_directory_indexes.get(lookup_key, None)
+    if not build_directory_index:
+      build_directory_index = BuildDirectoryIndex(path)
+      _build_directory_indexes[lookup_key] = build_directory_index
+
+  return build_directory_index
+
+
+def Glob(path_pattern):
+  """Retrieves the artifacts that match a glob pattern.
+
+  Only the last path segment of the pattern can contain glob characters.
+
+  Args:
+    path_pattern (str): glob pattern of the paths of the artifacts.
+
+  Returns:
+    list[str]: paths of the matching artifacts, sorted by name.
+  """
+  path, pattern = os.path.split(path_pattern)
+  build_directory_index = GetBuildDirectoryIndex(path or '.')
+  return build_directory_index.Glob(pattern)
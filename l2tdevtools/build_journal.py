@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Journal of the completed build phases of a build run."""
+
+import hashlib
+import io
+import json
+import os
+import threading
+
+
+def CalculateFileHash(path):
+  """Calculates the SHA-256 of a file.
+
+  Args:
+    path (str): path of the file.
+
+  Returns:
+    str: hexadecimal SHA-256 of the file or None if the file does not exist.
+  """
+  hash_context = hashlib.sha256()
+
+  try:
+    with open(path, 'rb') as file_object:
+      for data in iter(lambda: file_object.read(1024 * 1024), b''):
+        hash_context.update(data)
+  except IOError:
+    return None
+
+  return hash_context.hexdigest()
+
+
+def CalculateInputsHash(inputs):
+  """Calculates the SHA-256 of the inputs of a build phase.
+
+  Args:
+    inputs (object): JSON serializable inputs, where objects are serialized
+        as their attributes.
+
+  Returns:
+    str: hexadecimal SHA-256 of the inputs.
+  """
+  json_string = json.dumps(
+      inputs, default=lambda value: getattr(value, '__dict__', str(value)),
+      sort_keys=True)
+  return hashlib.sha256(json_string.encode('utf-8')).hexdigest()
+
+
+class BuildJournal(object):
+  """Journal of the completed build phases of a build run.
+
+  The journal is stored as JSON-lines, where every line records a build phase
+  of a project that completed successfully, the hash of the inputs of the
+  phase and values the phase produced, such as the filename of the source
+  package. A phase is written as soon as it completes, such that a run that
+  is interrupted can be resumed.
+  """
+
+  FILENAME = 'build_journal.jsonl'
+
+  def __init__(self, path):
+    """Initializes a build journal.
+
+    Args:
+      path (str): path of the JSON-lines journal file.
+    """
+    super(BuildJournal, self).__init__()
+    self._file_object = None
+    self._lock = threading.Lock()
+    self._path = path
+    self._phases = {}
+
+  def Close(self):
+    """Closes the journal file."""
+    with self._lock:
+      if self._file_object:
+        self._file_object.close()
+        self._file_object = None
+
+  def GetPhase(self, project_name, phase, inputs_hash):
+    """Retrieves a completed build phase.
+
+    Args:
+      project_name (str): name of the project.
+      phase (str): name of the phase, such as "download" or "build".
+      inputs_hash (str): hash of the inputs of the phase.
+
+    Returns:
+      dict[str, object]: values the phase produced or None if the phase did
+          not complete with the same inputs.
+    """
+    with self._lock:
+      entry = self._phases.get((project_name, phase), None)
+
+    if not entry or entry.get('inputs_hash', None) != inputs_hash:
+      return None
+
+    return dict(entry.get('values', None) or {})
+
+  def Open(self, resume=False):
+    """Opens the journal file.
+
+    Args:
+      resume (Optional[bool]): True if the phases of the previous run should
+          be read and the journal continued, False if a new journal should
+          be started.
+    """
+    with self._lock:
+      if self._file_object:
+        return
+
+      self._phases = {}
+      line = '\n'
+
+      if resume and os.path.exists(self._path):
+        with io.open(self._path, 'r', encoding='utf-8') as file_object:
+          for line in file_object:
+            try:
+              entry = json.loads(line)
+            except ValueError:
+              # The last line can be incomplete if the run was interrupted.
+              continue
+
+            key = (entry.get('project', None), entry.get('phase', None))
+            self._phases[key] = entry
+
+      mode = 'a' if resume else 'w'
+      self._file_object = io.open(self._path, mode, encoding='utf-8')
+
+      # Make sure the next phase is not appended to an incomplete line.
+      if resume and not line.endswith('\n'):
+        self._file_object.write('\n')
+
+  def RecordPhase(self, project_name, phase, inputs_hash, values=None):
+    """Records a completed build phase.
+
+    Args:
+      project_name (str): name of the project.
+      phase (str): name of the phase, such as "download" or "build".
+      inputs_hash (str): hash of the inputs of the phase.
+      values (Optional[dict[str, object]]): JSON serializable values the
+          phase produced.
+    """
+    entry = {
+        'inputs_hash': inputs_hash,
+        'phase': phase,
+        'project': project_name,
+        'values': values or {}}
+
+    with self._lock:
+      self._phases[(project_name, phase)] = entry
+
+      if self._file_object:
+        self._file_object.write(json.dumps(entry, sort_keys=True))
+        self._file_object.write('\n')
+        self._file_object.flush()
+        os.fsync(self._file_object.fileno())
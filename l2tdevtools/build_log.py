@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""Structured build log with timing and resource usage per build phase."""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+try:
+  import resource
+except ImportError:
+  resource = None
+
+
+class BuildPhaseEvent(object):
+  """Build phase event.
+
+  Attributes:
+    command (str): command that was run during the phase or None if the phase
+        was not a single command.
+    cpu_time (float): user and system CPU time in seconds or None if not
+        available.
+    exit_code (int): exit code of the phase, where 0 represents success.
+    peak_rss (int): peak resident set size in KiB or None if not available.
+    phase (str): name of the phase, such as "download" or "build".
+    project_name (str): name of the project.
+    timestamp (float): POSIX timestamp of the start of the phase.
+    wall_time (float): elapsed wall clock time in seconds.
+  """
+
+  def __init__(self, project_name, phase, command=None):
+    """Initializes a build phase event.
+
+    Args:
+      project_name (str): name of the project.
+      phase (str): name of the phase.
+      command (Optional[str]): command that was run during the phase.
+    """
+    super(BuildPhaseEvent, self).__init__()
+    self.command = command
+    self.cpu_time = None
+    self.exit_code = 0
+    self.peak_rss = None
+    self.phase = phase
+    self.project_name = project_name
+    self.timestamp = None
+    self.wall_time = None
+
+  def CopyToDict(self):
+    """Copies the event to a dictionary.
+
+    Returns:
+      dict[str, object]: event values.
+    """
+    return {
+        'command': self.command,
+        'cpu_time': self.cpu_time,
+        'exit_code': self.exit_code,
+        'peak_rss': self.peak_rss,
+        'phase': self.phase,
+        'project': self.project_name,
+        'timestamp': self.timestamp,
+        'wall_time': self.wall_time}
+
+
+class BuildLogRecorder(object):
+  """Records the timing and resource usage of build phases.
+
+  The build phases are: download, extract, prepare, build, finalize and move.
+  The events are kept in memory and, if a path is provided, written as
+  JSON-lines to the build log file as soon as a phase completes.
+  """
+
+  def __init__(self, path=None):
+    """Initializes a build log recorder.
+
+    Args:
+      path (Optional[str]): path of the JSON-lines build log file, where None
+          represents the events are only kept in memory.
+    """
+    super(BuildLogRecorder, self).__init__()
+    self._events = []
+    self._file_object = None
+    self._lock = threading.Lock()
+    self._path = path
+
+  def _GetPeakRSS(self, resource_usage):
+    """Retrieves the peak resident set size from resource usage.
+
+    Args:
+      resource_usage (resource.struct_rusage): resource usage.
+
+    Returns:
+      int: peak resident set size in KiB.
+    """
+    # Note that on Mac OS the maximum resident set size is in bytes.
+    if sys.platform == 'darwin':
+      return resource_usage.ru_maxrss // 1024
+
+    return resource_usage.ru_maxrss
+
+  def _RecordEvent(self, event):
+    """Records a build phase event.
+
+    Args:
+      event (BuildPhaseEvent): build phase event.
+    """
+    with self._lock:
+      self._events.append(event)
+
+      if self._file_object:
+        self._file_object.write(json.dumps(event.CopyToDict(), sort_keys=True))
+        self._file_object.write('\n')
+        self._file_object.flush()
+
+  def _WaitForProcess(self, process, event):
+    """Waits for a process to exit and determines its resource usage.
+
+    Args:
+      process (subprocess.Popen): process.
+      event (BuildPhaseEvent): build phase event to update.
+
+    Returns:
+      int: exit code of the process.
+    """
+    if not hasattr(os, 'wait4'):
+      return process.wait()
+
+    # Note that os.wait4() includes the resource usage of the descendants the
+    # process waited for, such as the commands run by the shell.
+    _, status, resource_usage = os.wait4(process.pid, 0)
+
+    if os.WIFSIGNALED(status):
+      exit_code = -os.WTERMSIG(status)
+    else:
+      exit_code = os.WEXITSTATUS(status)
+
+    # Let subprocess know the process was already waited for.
+    process.returncode = exit_code
+
+    event.cpu_time = resource_usage.ru_utime + resource_usage.ru_stime
+    event.peak_rss = self._GetPeakRSS(resource_usage)
+
+    return exit_code
+
+  def Close(self):
+    """Closes the build log file."""
+    with self._lock:
+      if self._file_object:
+        self._file_object.close()
+        self._file_object = None
+
+  def GetEvents(self):
+    """Retrieves the recorded build phase events.
+
+    Returns:
+      list[BuildPhaseEvent]: build phase events.
+    """
+    with self._lock:
+      return list(self._events)
+
+  def Open(self):
+    """Opens the build log file for appending."""
+    if self._path and not self._file_object:
+      self._file_object = io.open(self._path, 'a', encoding='utf-8')
+
+  @contextlib.contextmanager
+  def RecordPhase(self, project_name, phase):
+    """Records a build phase that runs within the current process.
+
+    The CPU time and peak resident set size are determined for the process
+    and its waited for children, which is an approximation when phases
+    run concurrently.
+
+    Args:
+      project_name (str): name of the project.
+      phase (str): name of the phase.
+
+    Yields:
+      BuildPhaseEvent: build phase event, of which the exit code can be set
+          to indicate the phase failed.
+
+    Raises:
+      Exception: if the phase failed with an exception, which is re-raised
+          after the build phase event is recorded.
+    """
+    event = BuildPhaseEvent(project_name, phase)
+
+    cpu_time = None
+    if resource:
+      cpu_time = time.process_time() + sum(resource.getrusage(
+          resource.RUSAGE_CHILDREN)[0:2])
+
+    event.timestamp = time.time()
+    start_time = time.monotonic()
+
+    try:
+      yield event
+
+    except Exception:
+      event.exit_code = 1
+      raise
+
+    finally:
+      event.wall_time = time.monotonic() - start_time
+
+      if resource:
+        resource_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        event.cpu_time = time.process_time() + sum(
+            resource_usage[0:2]) - cpu_time
+        event.peak_rss = max(
+            self._GetPeakRSS(resource.getrusage(resource.RUSAGE_SELF)),
+            self._GetPeakRSS(resource_usage))
+
+      self._RecordEvent(event)
+
+  def RunCommand(self, project_name, phase, command, shell=True):
+    """Runs a command and records its timing and resource usage.
+
+    Args:
+      project_name (str): name of the project.
+      phase (str): name of the phase.
+      command (Union[str, list[str]]): command to run.
+      shell (Optional[bool]): True if the command should be run by the shell.
+
+    Returns:
+      int: exit code of the command.
+
+    Raises:
+      OSError: if the command cannot be run.
+    """
+    if isinstance(command, str):
+      command_string = command
+    else:
+      command_string = ' '.join(command)
+
+    event = BuildPhaseEvent(project_name, phase, command=command_string)
+
+    event.timestamp = time.time()
+    start_time = time.monotonic()
+
+    try:
+      process = subprocess.Popen(command, shell=shell)
+      event.exit_code = self._WaitForProcess(process, event)
+
+    except OSError:
+      event.exit_code = 127
+      raise
+
+    finally:
+      event.wall_time = time.monotonic() - start_time
+
+      self._RecordEvent(event)
+
+    return event.exit_code
+
+
+class BuildLogSummary(object):
+  """Summary of the build phase events.
+
+  Attributes:
+    phases (dict[str, float]): total wall clock time in seconds per phase.
+    projects (dict[str, float]): total wall clock time in seconds per project.
+    total_wall_time (float): total wall clock time in seconds of all phases.
+  """
+
+  def __init__(self):
+    """Initializes a build log summary."""
+    super(BuildLogSummary, self).__init__()
+    self._events = []
+    self.phases = {}
+    self.projects = {}
+    self.total_wall_time = 0.0
+
+  def AddEvent(self, event):
+    """Adds a build phase event to the summary.
+
+    Args:
+      event (BuildPhaseEvent): build phase event.
+    """
+    wall_time = event.wall_time or 0.0
+
+    self._events.append(event)
+    self.phases[event.phase] = self.phases.get(event.phase, 0.0) + wall_time
+    self.projects[event.project_name] = self.projects.get(
+        event.project_name, 0.0) + wall_time
+    self.total_wall_time += wall_time
+
+  def GetSlowestEvents(self, maximum_number_of_events=10):
+    """Retrieves the slowest build phase events.
+
+    Args:
+      maximum_number_of_events (Optional[int]): maximum number of events.
+
+    Returns:
+      list[BuildPhaseEvent]: build phase events sorted by wall clock time in
+          descending order.
+    """
+    events = sorted(
+        self._events, key=lambda event: event.wall_time or 0.0, reverse=True)
+    return events[:maximum_number_of_events]
+
+  def GetSlowestProjects(self, maximum_number_of_projects=10):
+    """Retrieves the slowest projects.
+
+    Args:
+      maximum_number_of_projects (Optional[int]): maximum number of projects.
+
+    Returns:
+      list[tuple[str, float]]: project names and total wall clock times in
+          seconds sorted by wall clock time in descending order.
+    """
+    projects = sorted(
+        self.projects.items(), key=lambda item: (-item[1], item[0]))
+    return projects[:maximum_number_of_projects]
+
+  def Write(self, output_writer, maximum_number_of_entries=10):
+    """Writes the summary.
+
+    Args:
+      output_writer (file): file-like object to write the summary to.
+      maximum_number_of_entries (Optional[int]): maximum number of projects
+          and phases to list.
+    """
+    output_writer.write('Total wall time: {0:.1f}s\n'.format(
+        self.total_wall_time))
+
+    output_writer.write('\nTime per phase:\n')
+    for phase, wall_time in sorted(
+        self.phases.items(), key=lambda item: (-item[1], item[0])):
+      output_writer.write('\t{0:s}\t{1:.1f}s\n'.format(phase, wall_time))
+
+    output_writer.write('\nSlowest projects:\n')
+    for project_name, wall_time in self.GetSlowestProjects(
+        maximum_number_of_projects=maximum_number_of_entries):
+      output_writer.write('\t{0:s}\t{1:.1f}s\n'.format(
+          project_name, wall_time))
+
+    output_writer.write('\nSlowest phases:\n')
+    for event in self.GetSlowestEvents(
+        maximum_number_of_events=maximum_number_of_entries):
+      cpu_time = '-'
+      if event.cpu_time is not None:
+        cpu_time = '{0:.1f}s'.format(event.cpu_time)
+
+      peak_rss = '-'
+      if event.peak_rss is not None:
+        peak_rss = '{0:d} KiB'.format(event.peak_rss)
+
+      output_writer.write((
+          '\t{0:s}\t{1:s}\t{2:.1f}s\tcpu: {3:s}\tpeak rss: {4:s}\t'
+          'exit code: {5:d}\n').format(
+              event.project_name, event.phase, event.wall_time or 0.0,
+              cpu_time, peak_rss, event.exit_code))
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Planner of the builds that are needed to update the package repositories."""
+
+import logging
+
+from concurrent import futures
+
+from l2tdevtools import download_helper
+from l2tdevtools import project_graph
+from l2tdevtools import versions
+
+
+class PlannedBuild(object):
+  """Build that is needed to update the package repositories.
+
+  Attributes:
+    name (str): name of the project.
+    published_versions (dict[str, str]): published version per repository
+        name, where None represents the project is not published in the
+        repository.
+    upstream_version (str): latest upstream version.
+  """
+
+  def __init__(self, name, upstream_version):
+    """Initializes a planned build.
+
+    Args:
+      name (str): name of the project.
+      upstream_version (str): latest upstream version.
+    """
+    super(PlannedBuild, self).__init__()
+    self.name = name
+    self.published_versions = {}
+    self.upstream_version = upstream_version
+
+
+class BuildPlanner(object):
+  """Planner of the builds that are needed to update the package repositories.
+
+  The latest upstream versions of the projects are compared with the versions
+  published in the package repositories. A project needs to be built if it is
+  not published in one of the repositories or if its upstream version is newer
+  than the published version.
+  """
+
+  _DEFAULT_NUMBER_OF_WORKERS = 8
+
+  def __init__(self, project_definitions, number_of_workers=None):
+    """Initializes a build planner.
+
+    Args:
+      project_definitions (dict[str, ProjectDefinition]): project definitions
+          per project name.
+      number_of_workers (Optional[int]): number of versions to retrieve
+          concurrently, where None represents the default.
+    """
+    super(BuildPlanner, self).__init__()
+    self._dependency_graph = project_graph.ProjectDependencyGraph(
+        project_definitions.values())
+    self._number_of_workers = (
+        number_of_workers or self._DEFAULT_NUMBER_OF_WORKERS)
+    self._project_definitions = project_definitions
+
+  def _GetPublishedVersions(self, packages):
+    """Retrieves the published versions per project.
+
+    Args:
+      packages (dict[str, str]): published package names and versions.
+
+    Returns:
+      dict[str, str]: published versions per project name.
+    """
+    published_versions = {}
+    for package_name, package_version in packages.items():
+      project_name = self._dependency_graph.ResolveDependency(package_name)
+      if not project_name:
+        continue
+
+      package_version = self._NormalizeVersion(package_version)
+
+      published_version = published_versions.get(project_name, None)
+      if published_version and versions.CompareVersions(
+          package_version.split('.'), published_version.split('.')) < 0:
+        continue
+
+      published_versions[project_name] = package_version
+
+    return published_versions
+
+  def _GetUpstreamVersion(self, project_name):
+    """Retrieves the latest upstream version of a project.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      str: latest upstream version or None if not available.
+    """
+    project_definition = self._project_definitions[project_name]
+
+    try:
+      download_helper_object = (
+          download_helper.DownloadHelperFactory.NewDownloadHelper(
+              project_definition))
+    except ValueError as exception:
+      logging.warning(
+          'Unable to determine upstream version of: {0:s} with error: '
+          '{1!s}'.format(project_name, exception))
+      return None
+
+    version_definition = getattr(project_definition, 'version', None)
+    return download_helper_object.GetLatestVersion(
+        project_name, version_definition)
+
+  def _NormalizeVersion(self, version):
+    """Normalizes a version for comparison.
+
+    Args:
+      version (str): version, such as "1:1.16.0" or "1!1.16.0".
+
+    Returns:
+      str: version without dpkg or setuptools epoch.
+    """
+    _, _, version = version.rpartition(':')
+    _, _, version = version.rpartition('!')
+    return version
+
+  def Plan(self, project_names, repository_functions):
+    """Determines the builds that are needed to update the repositories.
+
+    The upstream versions and the published packages are retrieved
+    concurrently.
+
+    Args:
+      project_names (list[str]): names of the projects to consider.
+      repository_functions (dict[str, function]): functions that retrieve
+          the published packages, as a dictionary of package names and
+          versions, per repository name.
+
+    Returns:
+      list[PlannedBuild]: builds that are needed, in build order, or None if
+          the published packages could not be determined for any of the
+          repositories.
+    """
+    project_names = [
+        project_name for project_name in project_names
+        if project_name in self._project_definitions]
+
+    with futures.ThreadPoolExecutor(
+        max_workers=self._number_of_workers) as executor:
+      repository_futures = {
+          repository_name: executor.submit(function)
+          for repository_name, function in repository_functions.items()}
+      upstream_futures = {
+          project_name: executor.submit(self._GetUpstreamVersion, project_name)
+          for project_name in project_names}
+
+    published_versions_per_repository = {}
+    for repository_name, future in repository_futures.items():
+      packages = future.result()
+      if packages is None:
+        logging.warning(
+            'Unable to determine packages published in: {0:s}'.format(
+                repository_name))
+        continue
+
+      published_versions_per_repository[repository_name] = (
+          self._GetPublishedVersions(packages))
+
+    if repository_functions and not published_versions_per_repository:
+      return None
+
+    planned_builds = []
+    for project_name in self._dependency_graph.GetBuildOrder(
+        project_names=project_names):
+      upstream_version = upstream_futures[project_name].result()
+      if not upstream_version:
+        logging.warning('Unable to determine upstream version of: {0:s}'.format(
+            project_name))
+        continue
+
+      upstream_version = self._NormalizeVersion(upstream_version)
+
+      planned_build = PlannedBuild(project_name, upstream_version)
+      is_outdated = False
+      for repository_name, published_versions in sorted(
+          published_versions_per_repository.items()):
+        published_version = published_versions.get(project_name, None)
+        planned_build.published_versions[repository_name] = published_version
+
+        if not published_version or versions.CompareVersions(
+            upstream_version.split('.'), published_version.split('.')) > 0:
+          is_outdated = True
+
+      if is_outdated:
+        planned_builds.append(planned_build)
+
+    return planned_builds
@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+"""Build service that runs jobs in a long-running process.
+
+The build service accepts jobs, such as builds, over a Unix socket and runs
+them on a pool of worker threads per job type. Since the process keeps
+running, the jobs share warm caches, such as the parsed project definitions,
+the download helpers and the installed package checks. A job that is
+identical to a job that is queued or running is not queued again, instead
+the existing job is returned.
+
+Requests and responses are exchanged as size prefixed JSON messages, as
+used by the distributed builds, one request per connection.
+"""
+
+import collections
+import concurrent.futures
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+
+from l2tdevtools import build_journal
+from l2tdevtools import distributed_build
+from l2tdevtools.lib import errors
+
+
+class BuildServiceJob(object):
+  """Build service job.
+
+  Attributes:
+    end_time (float): POSIX timestamp of the end of the job or None.
+    error (str): description of the error the job failed with or None.
+    identifier (int): identifier of the job.
+    job_type (str): type of the job, such as "build".
+    lookup_key (str): hash of the type and parameters of the job, used to
+        detect identical jobs.
+    parameters (dict[str, object]): parameters of the job.
+    result (object): JSON serializable result of the job or None.
+    start_time (float): POSIX timestamp of the start of the job or None.
+    status (str): status of the job, which is "queued", "running",
+        "completed" or "failed".
+    submit_time (float): POSIX timestamp of the submission of the job.
+  """
+
+  def __init__(self, identifier, job_type, parameters):
+    """Initializes a build service job.
+
+    Args:
+      identifier (int): identifier of the job.
+      job_type (str): type of the job.
+      parameters (dict[str, object]): parameters of the job.
+    """
+    super(BuildServiceJob, self).__init__()
+    self.end_time = None
+    self.error = None
+    self.identifier = identifier
+    self.job_type = job_type
+    self.lookup_key = build_journal.CalculateInputsHash({
+        'job_type': job_type, 'parameters': parameters})
+    self.parameters = parameters
+    self.result = None
+    self.start_time = None
+    self.status = 'queued'
+    self.submit_time = time.time()
+
+  def CopyToDict(self):
+    """Copies the job to a dictionary.
+
+    Returns:
+      dict[str, object]: job values.
+    """
+    return {
+        'end_time': self.end_time,
+        'error': self.error,
+        'identifier': self.identifier,
+        'job_type': self.job_type,
+        'parameters': self.parameters,
+        'result': self.result,
+        'start_time': self.start_time,
+        'status': self.status,
+        'submit_time': self.submit_time}
+
+
+class _BuildServiceRequestHandler(socketserver.BaseRequestHandler):
+  """Passes the request of a client to the build service."""
+
+  def handle(self):
+    """Handles a connection."""
+    try:
+      request, _ = distributed_build.ReceiveMessage(self.request)
+      response = self.server.build_service.HandleRequest(request)
+      distributed_build.SendMessage(self.request, response)
+
+    except (OSError, errors.Error) as exception:
+      logging.warning('Request failed with error: {0!s}'.format(exception))
+
+
+class BuildService(object):
+  """Runs jobs on pools of worker threads per job type."""
+
+  # Maximum number of finished jobs that are kept for status requests.
+  _MAXIMUM_NUMBER_OF_FINISHED_JOBS = 100
+
+  def __init__(self):
+    """Initializes a build service."""
+    super(BuildService, self).__init__()
+    self._condition = threading.Condition()
+    self._executors = {}
+    self._job_functions = {}
+    self._jobs = collections.OrderedDict()
+    self._jobs_per_lookup_key = {}
+    self._next_identifier = 1
+    self._path = None
+    self._server = None
+
+  def _RemoveFinishedJobs(self):
+    """Removes the oldest finished jobs.
+
+    This function should be called with the condition acquired.
+    """
+    finished_jobs = [
+        job for job in self._jobs.values()
+        if job.status in ('completed', 'failed')]
+
+    number_of_jobs = (
+        len(finished_jobs) - self._MAXIMUM_NUMBER_OF_FINISHED_JOBS)
+    for job in finished_jobs[:max(number_of_jobs, 0)]:
+      del self._jobs[job.identifier]
+
+  def _RunJob(self, job):
+    """Runs a job.
+
+    Args:
+      job (BuildServiceJob): job.
+    """
+    with self._condition:
+      job.start_time = time.time()
+      job.status = 'running'
+
+    logging.info('Running job: {0:d} of type: {1:s}'.format(
+        job.identifier, job.job_type))
+
+    result = None
+    error = None
+    try:
+      result = self._job_functions[job.job_type](job.parameters)
+
+    # The service should keep running if a job raises.
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.error('Job: {0:d} failed with error: {1!s}'.format(
+          job.identifier, exception))
+      error = '{0!s}'.format(exception) or type(exception).__name__
+
+    with self._condition:
+      job.end_time = time.time()
+      job.error = error
+      job.result = result
+      job.status = 'failed' if error is not None else 'completed'
+
+      if self._jobs_per_lookup_key.get(job.lookup_key, None) is job:
+        del self._jobs_per_lookup_key[job.lookup_key]
+
+      self._RemoveFinishedJobs()
+      self._condition.notify_all()
+
+  def GetJob(self, identifier):
+    """Retrieves a job.
+
+    Args:
+      identifier (int): identifier of the job.
+
+    Returns:
+      BuildServiceJob: job or None if not available.
+    """
+    with self._condition:
+      return self._jobs.get(identifier, None)
+
+  def GetJobs(self):
+    """Retrieves the jobs.
+
+    Returns:
+      list[BuildServiceJob]: jobs that are queued, running or finished
+          recently, in order of submission.
+    """
+    with self._condition:
+      return list(self._jobs.values())
+
+  def HandleRequest(self, request):
+    """Handles a request of a client.
+
+    Args:
+      request (dict[str, object]): request.
+
+    Returns:
+      dict[str, object]: response.
+    """
+    action = request.get('action', None)
+    identifier = request.get('identifier', None)
+
+    if action == 'jobs':
+      return {
+          'jobs': [job.CopyToDict() for job in self.GetJobs()],
+          'type': 'jobs'}
+
+    if action == 'submit':
+      try:
+        job = self.SubmitJob(
+            request.get('job_type', None),
+            request.get('parameters', None) or {})
+      except ValueError as exception:
+        return {'error': '{0!s}'.format(exception), 'type': 'error'}
+
+      if request.get('wait', False):
+        job = self.WaitForJob(job.identifier)
+
+    elif action == 'status':
+      job = self.GetJob(identifier)
+
+    elif action == 'wait':
+      job = self.WaitForJob(identifier)
+
+    else:
+      return {
+          'error': 'Unsupported action: {0!s}'.format(action),
+          'type': 'error'}
+
+    if not job:
+      return {
+          'error': 'No such job: {0!s}'.format(identifier), 'type': 'error'}
+
+    return {'job': job.CopyToDict(), 'type': 'job'}
+
+  def RegisterJobType(self, job_type, job_function, number_of_workers=1):
+    """Registers a job type.
+
+    Args:
+      job_type (str): type of the job, such as "build".
+      job_function (function): function that runs a job, which is called
+          with the parameters of the job and returns a JSON serializable
+          result.
+      number_of_workers (Optional[int]): number of jobs of the type that
+          run concurrently.
+    """
+    self._executors[job_type] = concurrent.futures.ThreadPoolExecutor(
+        max_workers=number_of_workers)
+    self._job_functions[job_type] = job_function
+
+  def Serve(self):
+    """Serves clients until stopped.
+
+    The service must have been started before.
+    """
+    self._server.serve_forever()
+
+  def Start(self, path):
+    """Starts listening for clients.
+
+    Args:
+      path (str): path of the Unix socket.
+
+    Raises:
+      OSError: if another service listens on the Unix socket, the directory
+          of the Unix socket is accessible by other users or the service
+          cannot listen on the Unix socket.
+    """
+    # Unix sockets are not supported on Windows.
+    if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+      raise OSError('Unix sockets are not supported.')
+
+    path = os.path.abspath(path)
+
+    # Only the user that runs the service can submit jobs, hence the Unix
+    # socket is created in a directory that only the user can access.
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    stat_object = os.stat(directory)
+    if stat.S_IMODE(stat_object.st_mode) & 0o077:
+      if stat_object.st_uid != os.getuid():
+        raise OSError('Directory: {0:s} is accessible by other users.'.format(
+            directory))
+
+      os.chmod(directory, 0o700)
+
+    # Remove the Unix socket of a service that did not stop cleanly.
+    if os.path.exists(path):
+      with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        try:
+          client_socket.connect(path)
+        except OSError:
+          os.remove(path)
+        else:
+          raise OSError('Service already running on: {0:s}'.format(path))
+
+    # The Unix socket is created with mode 0600 when it is bound.
+    umask = os.umask(0o177)
+    try:
+      self._server = socketserver.ThreadingUnixStreamServer(
+          path, _BuildServiceRequestHandler)
+    finally:
+      os.umask(umask)
+
+    self._server.build_service = self
+    self._server.daemon_threads = True
+    self._path = path
+
+  def Stop(self):
+    """Stops serving clients and waits for the running jobs."""
+    if self._server:
+      self._server.shutdown()
+      self._server.server_close()
+      self._server = None
+
+      if os.path.exists(self._path):
+        os.remove(self._path)
+
+    for executor in self._executors.values():
+      executor.shutdown(wait=True)
+
+  def SubmitJob(self, job_type, parameters):
+    """Submits a job.
+
+    Args:
+      job_type (str): type of the job, such as "build".
+      parameters (dict[str, object]): JSON serializable parameters of the
+          job.
+
+    Returns:
+      BuildServiceJob: job or the queued or running job with the same type
+          and parameters.
+
+    Raises:
+      ValueError: if the job type is not supported.
+    """
+    if job_type not in self._job_functions:
+      raise ValueError('Unsupported job type: {0!s}'.format(job_type))
+
+    with self._condition:
+      job = BuildServiceJob(self._next_identifier, job_type, parameters)
+
+      existing_job = self._jobs_per_lookup_key.get(job.lookup_key, None)
+      if existing_job:
+        logging.info('Submitted job is identical to job: {0:d}'.format(
+            existing_job.identifier))
+        return existing_job
+
+      self._next_identifier += 1
+      self._jobs[job.identifier] = job
+      self._jobs_per_lookup_key[job.lookup_key] = job
+
+    self._executors[job_type].submit(self._RunJob, job)
+
+    return job
+
+  def WaitForJob(self, identifier, timeout=None):
+    """Waits for a job to finish.
+
+    Args:
+      identifier (int): identifier of the job.
+      timeout (Optional[float]): number of seconds to wait, where None
+          represents waiting until the job finished.
+
+    Returns:
+      BuildServiceJob: job or None if not available.
+    """
+    with self._condition:
+      job = self._jobs.get(identifier, None)
+      if job:
+        self._condition.wait_for(
+            lambda: job.status in ('completed', 'failed'), timeout=timeout)
+
+    return job
+
+
+class BuildServiceClient(object):
+  """Client of a build service."""
+
+  def __init__(self, path):
+    """Initializes a build service client.
+
+    Args:
+      path (str): path of the Unix socket of the service.
+    """
+    super(BuildServiceClient, self).__init__()
+    self._path = path
+
+  def _SendRequest(self, request):
+    """Sends a request to the service.
+
+    Args:
+      request (dict[str, object]): request.
+
+    Returns:
+      dict[str, object]: response.
+
+    Raises:
+      ConnectivityError: if the service cannot be reached.
+      ProtocolError: if the service returned an error.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+      try:
+        client_socket.connect(self._path)
+        distributed_build.SendMessage(client_socket, request)
+        response, _ = distributed_build.ReceiveMessage(client_socket)
+
+      except OSError as exception:
+        raise errors.ConnectivityError(
+            'Unable to reach service: {0:s} with error: {1!s}'.format(
+                self._path, exception))
+
+    if response.get('type', None) == 'error':
+      raise errors.ProtocolError(response.get('error', None))
+
+    return response
+
+  def GetJob(self, identifier):
+    """Retrieves a job.
+
+    Args:
+      identifier (int): identifier of the job.
+
+    Returns:
+      dict[str, object]: job values.
+
+    Raises:
+      ConnectivityError: if the service cannot be reached.
+      ProtocolError: if the service returned an error.
+    """
+    response = self._SendRequest({
+        'action': 'status', 'identifier': identifier})
+    return response['job']
+
+  def GetJobs(self):
+    """Retrieves the jobs.
+
+    Returns:
+      list[dict[str, object]]: job values.
+
+    Raises:
+      ConnectivityError: if the service cannot be reached.
+      ProtocolError: if the service returned an error.
+    """
+    response = self._SendRequest({'action': 'jobs'})
+    return response['jobs']
+
+  def SubmitJob(self, job_type, parameters, wait=False):
+    """Submits a job.
+
+    Args:
+      job_type (str): type of the job, such as "build".
+      parameters (dict[str, object]): JSON serializable parameters of the
+          job.
+      wait (Optional[bool]): True if the response should be sent when the
+          job finished.
+
+    Returns:
+      dict[str, object]: job values.
+
+    Raises:
+      ConnectivityError: if the service cannot be reached.
+      ProtocolError: if the service returned an error.
+    """
+    response = self._SendRequest({
+        'action': 'submit', 'job_type': job_type, 'parameters': parameters,
+        'wait': wait})
+    return response['job']
+
+  def WaitForJob(self, identifier):
+    """Waits for a job to finish.
+
+    Args:
+      identifier (int): identifier of the job.
+
+    Returns:
+      dict[str, object]: job values.
+
+    Raises:
+      ConnectivityError: if the service cannot be reached.
+      ProtocolError: if the service returned an error.
+    """
+    response = self._SendRequest({'action': 'wait', 'identifier': identifier})
+    return response['job']
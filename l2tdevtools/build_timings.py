@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""Historical build timings and longest-first build scheduling."""
+
+import heapq
+import os
+import sqlite3
+import statistics
+import threading
+import time
+
+
+def FormatDuration(seconds):
+  """Formats a duration for progress output.
+
+  Args:
+    seconds (float): duration in seconds.
+
+  Returns:
+    str: formatted duration, such as "1h02m", "3m05s" or "12s".
+  """
+  seconds = int(round(seconds))
+  if seconds >= 3600:
+    return '{0:d}h{1:02d}m'.format(seconds // 3600, (seconds % 3600) // 60)
+
+  if seconds >= 60:
+    return '{0:d}m{1:02d}s'.format(seconds // 60, seconds % 60)
+
+  return '{0:d}s'.format(seconds)
+
+
+class BuildTimingDatabase(object):
+  """SQLite-backed store of the build times per project and build target.
+
+  The estimated build time of a project is the median of its most recent
+  successful builds, such that a single slow or fast build does not skew
+  the estimate.
+  """
+
+  # Number of recent successful builds to estimate the build time from.
+  _NUMBER_OF_SAMPLES = 5
+
+  # Factor and minimum number of seconds the build time must exceed the
+  # estimate by to be considered a regression.
+  _REGRESSION_FACTOR = 1.5
+  _REGRESSION_MINIMUM = 30.0
+
+  _SCHEMA = [
+      ('CREATE TABLE IF NOT EXISTS builds ('
+       'project TEXT, build_target TEXT, timestamp REAL, wall_time REAL, '
+       'exit_code INTEGER)'),
+      ('CREATE INDEX IF NOT EXISTS builds_project_build_target '
+       'ON builds (project, build_target, timestamp)')]
+
+  def __init__(self, path=':memory:'):
+    """Initializes a build timing database.
+
+    Args:
+      path (Optional[str]): path of the SQLite database file, where
+          ":memory:" represents an in-memory database.
+    """
+    super(BuildTimingDatabase, self).__init__()
+    self._connection = None
+    self._lock = threading.Lock()
+    self._path = path
+
+  def AddBuildTime(
+      self, project_name, build_target, wall_time, exit_code=0,
+      timestamp=None):
+    """Adds the build time of a project.
+
+    Args:
+      project_name (str): name of the project.
+      build_target (str): build target.
+      wall_time (float): elapsed wall clock time of the build in seconds.
+      exit_code (Optional[int]): exit code of the build, where 0 represents
+          success.
+      timestamp (Optional[float]): POSIX timestamp of the start of the build,
+          where None represents the current time minus the build time.
+    """
+    if timestamp is None:
+      timestamp = time.time() - wall_time
+
+    with self._lock:
+      with self._connection:
+        self._connection.execute(
+            'INSERT INTO builds VALUES (?, ?, ?, ?, ?)',
+            (project_name, build_target, timestamp, wall_time, exit_code))
+
+  def CheckRegression(self, project_name, build_target, wall_time):
+    """Checks if a build time is a regression compared to earlier builds.
+
+    This function should be called before the build time is added.
+
+    Args:
+      project_name (str): name of the project.
+      build_target (str): build target.
+      wall_time (float): elapsed wall clock time of the build in seconds.
+
+    Returns:
+      float: estimated build time in seconds the build time regressed from
+          or None if the build time is not a regression.
+    """
+    estimated_build_time = self.GetEstimatedBuildTime(
+        project_name, build_target)
+    if estimated_build_time is None:
+      return None
+
+    if (wall_time < estimated_build_time * self._REGRESSION_FACTOR or
+        wall_time - estimated_build_time < self._REGRESSION_MINIMUM):
+      return None
+
+    return estimated_build_time
+
+  def Close(self):
+    """Closes the database."""
+    with self._lock:
+      if self._connection:
+        self._connection.close()
+        self._connection = None
+
+  def GetEstimatedBuildTime(self, project_name, build_target):
+    """Retrieves the estimated build time of a project.
+
+    Args:
+      project_name (str): name of the project.
+      build_target (str): build target.
+
+    Returns:
+      float: estimated build time in seconds or None if the project has not
+          been built successfully before.
+    """
+    with self._lock:
+      rows = self._connection.execute((
+          'SELECT wall_time FROM builds WHERE project = ? AND '
+          'build_target = ? AND exit_code = 0 ORDER BY timestamp DESC '
+          'LIMIT ?'), (project_name, build_target, self._NUMBER_OF_SAMPLES))
+      wall_times = [row[0] for row in rows]
+
+    if not wall_times:
+      return None
+
+    return statistics.median(wall_times)
+
+  def Open(self):
+    """Opens the database and creates the tables if needed."""
+    with self._lock:
+      if not self._connection:
+        if self._path != ':memory:':
+          directory = os.path.dirname(os.path.abspath(self._path))
+          os.makedirs(directory, exist_ok=True)
+
+        # The database is shared by the threads that build concurrently.
+        self._connection = sqlite3.connect(
+            self._path, check_same_thread=False)
+
+        with self._connection:
+          for statement in self._SCHEMA:
+            self._connection.execute(statement)
+
+
+class BuildScheduler(object):
+  """Longest-processing-time-first scheduler of builds.
+
+  Builds are started in order of their estimated build time, longest first,
+  and each build is assigned to the worker that becomes available first.
+  This keeps the workers busy until the end of the run, instead of a slow
+  build that is started late dominating the run time.
+
+  Projects without an estimated build time are assumed to take the average
+  of the estimated build times of the other projects.
+  """
+
+  def __init__(self, timing_database, build_target):
+    """Initializes a build scheduler.
+
+    Args:
+      timing_database (BuildTimingDatabase): build timing database.
+      build_target (str): build target.
+    """
+    super(BuildScheduler, self).__init__()
+    self._build_target = build_target
+    self._estimated_build_times = {}
+    self._timing_database = timing_database
+
+  def EstimateRemainingTime(self, project_names, number_of_workers=1):
+    """Estimates the time remaining to build projects.
+
+    Args:
+      project_names (list[str]): names of the projects that remain to be
+          built.
+      number_of_workers (Optional[int]): number of concurrent builds.
+
+    Returns:
+      float: estimated remaining time in seconds.
+    """
+    return max(self.Schedule(
+        project_names, number_of_workers=number_of_workers)[1] or [0.0])
+
+  def GetBuildOrder(self, project_names):
+    """Retrieves the order to start the builds in, longest first.
+
+    Args:
+      project_names (list[str]): names of the projects.
+
+    Returns:
+      list[str]: names of the projects, in order of their estimated build
+          time in descending order.
+    """
+    estimated_build_times = self.GetEstimatedBuildTimes(project_names)
+    return sorted(project_names, key=lambda project_name: (
+        -estimated_build_times[project_name], project_name))
+
+  def GetEstimatedBuildTimes(self, project_names):
+    """Retrieves the estimated build times of projects.
+
+    Args:
+      project_names (list[str]): names of the projects.
+
+    Returns:
+      dict[str, float]: estimated build time in seconds per project name.
+    """
+    for project_name in project_names:
+      if project_name not in self._estimated_build_times:
+        self._estimated_build_times[project_name] = (
+            self._timing_database.GetEstimatedBuildTime(
+                project_name, self._build_target))
+
+    known_build_times = [
+        self._estimated_build_times[project_name]
+        for project_name in project_names
+        if self._estimated_build_times[project_name] is not None]
+
+    default_build_time = 0.0
+    if known_build_times:
+      default_build_time = statistics.mean(known_build_times)
+
+    estimated_build_times = {}
+    for project_name in project_names:
+      estimated_build_time = self._estimated_build_times[project_name]
+      if estimated_build_time is None:
+        estimated_build_time = default_build_time
+      estimated_build_times[project_name] = estimated_build_time
+
+    return estimated_build_times
+
+  def Schedule(self, project_names, number_of_workers=1):
+    """Assigns builds to workers, longest first.
+
+    Args:
+      project_names (list[str]): names of the projects.
+      number_of_workers (Optional[int]): number of concurrent builds.
+
+    Returns:
+      tuple[list[list[str]], list[float]]: names of the projects and
+          estimated busy time in seconds per worker.
+    """
+    estimated_build_times = self.GetEstimatedBuildTimes(project_names)
+
+    schedules = [[] for _ in range(number_of_workers)]
+    busy_times = [0.0] * number_of_workers
+
+    workers_heap = [(0.0, index) for index in range(number_of_workers)]
+    for project_name in self.GetBuildOrder(project_names):
+      busy_time, index = heapq.heappop(workers_heap)
+      busy_time += estimated_build_times[project_name]
+
+      schedules[index].append(project_name)
+      busy_times[index] = busy_time
+      heapq.heappush(workers_heap, (busy_time, index))
+
+    return schedules, busy_times
@@ -2,8 +2,22 @@
 """Helper to check for availability and version of dependencies."""
 
 import configparser
+import hashlib
+import importlib.util
+import json
 import os
 import re
+import sys
+
+# Note that packages_distributions() was added to importlib.metadata in Python
+# 3.10, hence the importlib_metadata backport is used on earlier versions.
+if sys.version_info >= (3, 10):
+  from importlib import metadata as importlib_metadata
+else:
+  try:
+    import importlib_metadata
+  except ImportError:
+    importlib_metadata = None
 
 
 class DependencyDefinition(object):
@@ -109,16 +123,24 @@ class DependencyDefinitionReader(object):
 class DependencyHelper(object):
   """Dependency helper.
 
+  The version of a dependency is determined from the metadata of the
+  distribution that provides the module where possible, which does not
+  require the module to be imported. Modules without distribution metadata,
+  or all modules if the distribution metadata cannot be looked up, are
+  imported to determine their version.
+
   Attributes:
     dependencies (dict[str, DependencyDefinition]): dependencies.
   """
 
+  _CACHE_FORMAT_VERSION = 1
+
   _VERSION_NUMBERS_REGEX = re.compile(r'[0-9.]+')
   _VERSION_SPLIT_REGEX = re.compile(r'\.|\-')
 
   def __init__(
       self, dependencies_file='dependencies.ini',
-      test_dependencies_file='test_dependencies.ini'):
+      test_dependencies_file='test_dependencies.ini', cache_path=None):
     """Initializes a dependency helper.
 
     Args:
@@ -126,8 +148,17 @@ class DependencyHelper(object):
           file.
       test_dependencies_file (Optional[str]): path to the test dependencies
           configuration file.
+      cache_path (Optional[str]): path of the file to cache the availability
+          and versions of the modules in, where None represents no cache is
+          used. The cache is only used for the same Python interpreter and
+          installed packages.
     """
     super(DependencyHelper, self).__init__()
+    self._cache_path = cache_path
+    self._dependency_views = {}
+    self._fingerprint = None
+    self._module_versions = None
+    self._packages_distributions = None
     self._test_dependencies = {}
     self.dependencies = {}
 
@@ -155,17 +186,17 @@ class DependencyHelper(object):
             the minimum required version, False otherwise.
         str: status message.
     """
-    module_object = self._ImportPythonModule(dependency.name)
-    if not module_object:
+    is_available, module_version = self._GetPythonModuleVersion(dependency)
+    if not is_available:
       status_message = 'missing: {0:s}'.format(dependency.name)
       return False, status_message
 
     if not dependency.version_property:
       return True, dependency.name
 
-    return self._CheckPythonModuleVersion(
-        dependency.name, module_object, dependency.version_property,
-        dependency.minimum_version, dependency.maximum_version)
+    return self._CompareVersions(
+        dependency.name, module_version, dependency.minimum_version,
+        dependency.maximum_version)
 
   def _CheckPythonModuleVersion(
       self, module_name, module_object, version_property, minimum_version,
@@ -186,15 +217,30 @@ class DependencyHelper(object):
             the minimum required version, False otherwise.
         str: status message.
     """
-    module_version = None
-    if not version_property.endswith('()'):
-      module_version = getattr(module_object, version_property, None)
-    else:
-      version_method = getattr(
-          module_object, version_property[:-2], None)
-      if version_method:
-        module_version = version_method()
+    module_version = self._GetPythonModuleVersionFromModule(
+        module_object, version_property)
+
+    return self._CompareVersions(
+        module_name, module_version, minimum_version, maximum_version)
+
+  def _CompareVersions(
+      self, module_name, module_version, minimum_version, maximum_version):
+    """Compares the version of a Python module.
+
+    Args:
+      module_name (str): name of the Python module.
+      module_version (str): version of the Python module or None if not
+          available.
+      minimum_version (str): minimum version.
+      maximum_version (str): maximum version.
+
+    Returns:
+      tuple: containing:
 
+        bool: True if the Python module conforms to the minimum required
+            version, False otherwise.
+        str: status message.
+    """
     if not module_version:
       status_message = (
           'unable to determine version information for: {0:s}').format(
@@ -254,6 +300,147 @@ class DependencyHelper(object):
     status_message = '{0:s} version: {1!s}'.format(module_name, module_version)
     return True, status_message
 
+  def _GetPackagesDistributions(self):
+    """Retrieves the distributions that provide top-level modules.
+
+    Returns:
+      dict[str, list[str]]: names of the distributions per top-level module
+          name, which is empty if the distribution metadata cannot be looked
+          up.
+    """
+    if self._packages_distributions is None:
+      self._packages_distributions = {}
+
+      # Note that older versions of the importlib_metadata backport do not
+      # provide packages_distributions().
+      packages_distributions = getattr(
+          importlib_metadata, 'packages_distributions', None)
+      if packages_distributions is not None:
+        self._packages_distributions = packages_distributions()
+
+    return self._packages_distributions
+
+  def _GetPythonModuleVersion(self, dependency):
+    """Retrieves the availability and version of a Python module.
+
+    Args:
+      dependency (DependencyDefinition): dependency definition.
+
+    Returns:
+      tuple: containing:
+
+        bool: True if the Python module is available.
+        str: version of the Python module or None if not available.
+    """
+    if self._module_versions is None:
+      self._ReadCache()
+
+    cache_key = '{0:s}:{1:s}'.format(
+        dependency.name, dependency.version_property or '')
+
+    if cache_key not in self._module_versions:
+      is_available, module_version = (
+          self._GetPythonModuleVersionFromMetadata(dependency))
+
+      if is_available is None:
+        module_object = self._ImportPythonModule(dependency.name)
+        is_available = module_object is not None
+
+        if is_available and dependency.version_property:
+          module_version = self._GetPythonModuleVersionFromModule(
+              module_object, dependency.version_property)
+          if module_version:
+            # Make sure the module version is a string.
+            module_version = '{0!s}'.format(module_version)
+
+      self._module_versions[cache_key] = (is_available, module_version)
+
+    return self._module_versions[cache_key]
+
+  def _GetPythonModuleVersionFromMetadata(self, dependency):
+    """Retrieves the availability and version of a Python module.
+
+    The module is located and its version is read from the metadata of the
+    distribution that provides it, without importing the module.
+
+    Args:
+      dependency (DependencyDefinition): dependency definition.
+
+    Returns:
+      tuple: containing:
+
+        bool: True if the Python module is available, False if not or None
+            if the availability or version could not be determined without
+            importing the module.
+        str: version of the Python module or None if not available.
+    """
+    # Note that find_spec() imports the parent package of a submodule.
+    if '.' in dependency.name:
+      return None, None
+
+    try:
+      module_spec = importlib.util.find_spec(dependency.name)
+    except (ImportError, ValueError):
+      module_spec = None
+
+    if not module_spec:
+      return False, None
+
+    if not dependency.version_property:
+      return True, None
+
+    for distribution_name in self._GetPackagesDistributions().get(
+        dependency.name, []):
+      try:
+        return True, importlib_metadata.version(distribution_name)
+      except importlib_metadata.PackageNotFoundError:
+        pass
+
+    return None, None
+
+  def _GetPythonModuleVersionFromModule(self, module_object, version_property):
+    """Retrieves the version of an imported Python module.
+
+    Args:
+      module_object (module): Python module.
+      version_property (str): version attribute or function.
+
+    Returns:
+      object: version of the Python module or None if not available.
+    """
+    if not version_property.endswith('()'):
+      return getattr(module_object, version_property, None)
+
+    version_method = getattr(module_object, version_property[:-2], None)
+    if not version_method:
+      return None
+
+    return version_method()
+
+  def _GetSitePackagesFingerprint(self):
+    """Retrieves a fingerprint of the interpreter and installed packages.
+
+    The fingerprint changes when a package is installed or removed, since
+    this changes the modification time of the directory it is installed in.
+
+    Returns:
+      str: fingerprint.
+    """
+    hash_context = hashlib.sha256()
+    hash_context.update(sys.executable.encode('utf-8'))
+    hash_context.update(sys.version.encode('utf-8'))
+
+    for path in sys.path:
+      try:
+        modification_time = os.stat(path or '.').st_mtime_ns
+      except OSError:
+        modification_time = 0
+
+      hash_context.update('{0:s}:{1:d}\n'.format(
+          path, modification_time).encode('utf-8'))
+
+    return hash_context.hexdigest()
+
   def _ImportPythonModule(self, module_name):
     """Imports a Python module.
 
@@ -275,6 +462,56 @@ class DependencyHelper(object):
 
     return module_object
 
+  def _ReadCache(self):
+    """Reads the cached availability and versions of the modules.
+
+    Cached values of a different interpreter or installed packages are
+    ignored.
+    """
+    self._module_versions = {}
+
+    if not self._cache_path:
+      return
+
+    self._fingerprint = self._GetSitePackagesFingerprint()
+
+    try:
+      with open(self._cache_path, 'r', encoding='utf-8') as file_object:
+        cache_values = json.load(file_object)
+    except (IOError, ValueError):
+      return
+
+    if not isinstance(cache_values, dict):
+      return
+
+    if (cache_values.get('format_version', None) != self._CACHE_FORMAT_VERSION
+        or cache_values.get('fingerprint', None) != self._fingerprint):
+      return
+
+    for cache_key, values in cache_values.get('modules', {}).items():
+      self._module_versions[cache_key] = tuple(values)
+
+  def _WriteCache(self):
+    """Writes the cached availability and versions of the modules."""
+    if not self._cache_path or self._module_versions is None:
+      return
+
+    cache_values = {
+        'fingerprint': self._fingerprint,
+        'format_version': self._CACHE_FORMAT_VERSION,
+        'modules': self._module_versions}
+
+    temporary_path = '{0:s}.tmp'.format(self._cache_path)
+    try:
+      with open(temporary_path, 'w', encoding='utf-8') as file_object:
+        json.dump(cache_values, file_object, sort_keys=True)
+
+      os.replace(temporary_path, self._cache_path)
+
+    except (IOError, OSError):
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+
   def _PrintCheckDependencyStatus(
       self, dependency, result, status_message, verbose_output=True):
     """Prints the check dependency status.
@@ -321,6 +558,8 @@ class DependencyHelper(object):
       self._PrintCheckDependencyStatus(
           dependency, result, status_message, verbose_output=verbose_output)
 
+    self._WriteCache()
+
     if check_result and not verbose_output:
       print('[OK]')
 
@@ -355,6 +594,8 @@ class DependencyHelper(object):
       self._PrintCheckDependencyStatus(
           dependency, result, status_message, verbose_output=verbose_output)
 
+    self._WriteCache()
+
     if check_result and not verbose_output:
       print('[OK]')
 
@@ -363,6 +604,39 @@ class DependencyHelper(object):
 
   # The following functions should not be included in utils/dependencies.py
 
+  def _GetDependencyView(
+      self, view_function, test_dependencies=False, **kwargs):
+    """Retrieves a view of the dependencies.
+
+    Views are computed once per set of arguments, since they are requested
+    by multiple dependency file writers.
+
+    Args:
+      view_function (function): function to compute the view from
+          the dependencies.
+      test_dependencies (Optional[bool]): True if the test dependencies should
+          returned instead of the regual dependencies.
+      kwargs (dict[str, object]): keyword arguments of the view function.
+
+    Returns:
+      list[str]: copy of the view, which the caller is free to change.
+    """
+    lookup_key = (
+        view_function.__name__, test_dependencies,
+        tuple(sorted(kwargs.items())))
+
+    view = self._dependency_views.get(lookup_key, None)
+    if view is None:
+      if test_dependencies:
+        dependencies = self._test_dependencies
+      else:
+        dependencies = self.dependencies
+
+      view = view_function(dependencies, **kwargs)
+      self._dependency_views[lookup_key] = view
+
+    return list(view)
+
   def _GetDPKGDepends(self, dependencies, exclude_version=False):
     """Retrieves the DPKG control file installation requirements.
 
@@ -498,12 +772,9 @@ class DependencyHelper(object):
     Returns:
       list[str]: dependency definitions for requires for DPKG control file.
     """
-    if test_dependencies:
-      dependencies = self._test_dependencies
-    else:
-      dependencies = self.dependencies
-
-    return self._GetDPKGDepends(dependencies, exclude_version=exclude_version)
+    return self._GetDependencyView(
+        self._GetDPKGDepends, exclude_version=exclude_version,
+        test_dependencies=test_dependencies)
 
   def GetL2TBinaries(self, test_dependencies=False):
     """Retrieves the l2tbinaries requirements.
@@ -515,12 +786,8 @@ class DependencyHelper(object):
     Returns:
       list[str]: dependency definitions for l2tbinaries.
     """
-    if test_dependencies:
-      dependencies = self._test_dependencies
-    else:
-      dependencies = self.dependencies
-
-    return self._GetL2TBinaries(dependencies)
+    return self._GetDependencyView(
+        self._GetL2TBinaries, test_dependencies=test_dependencies)
 
   def GetInstallRequires(self, exclude_version=False, test_dependencies=False):
     """Retrieves the setup.py installation requirements.
@@ -534,13 +801,9 @@ class DependencyHelper(object):
     Returns:
       list[str]: dependency definitions for install_requires in setup.py.
     """
-    if test_dependencies:
-      dependencies = self._test_dependencies
-    else:
-      dependencies = self.dependencies
-
-    return self._GetInstallRequires(
-        dependencies, exclude_version=exclude_version)
+    return self._GetDependencyView(
+        self._GetInstallRequires, exclude_version=exclude_version,
+        test_dependencies=test_dependencies)
 
   def GetPylintRcExtensionPkgs(self):
     """Retrieves the .pylintrc extension packages.
@@ -608,9 +871,6 @@ class DependencyHelper(object):
     Returns:
       list[str]: dependency definitions for requires for setup.cfg.
     """
-    if test_dependencies:
-      dependencies = self._test_dependencies
-    else:
-      dependencies = self.dependencies
-
-    return self._GetRPMRequires(dependencies, exclude_version=exclude_version)
+    return self._GetDependencyView(
+        self._GetRPMRequires, exclude_version=exclude_version,
+        test_dependencies=test_dependencies)
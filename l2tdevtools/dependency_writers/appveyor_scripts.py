@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Writer for AppVeyor script files."""
 
-import io
 import os
 
 from l2tdevtools.dependency_writers import interface
@@ -28,8 +27,7 @@ class AppVeyorInstallPS1ScriptWriter(interface.DependencyFileWriter):
     template_file = os.path.join(self._l2tdevtools_path, self._TEMPLATE_FILE)
     file_content = self._GenerateFromTemplate(template_file, template_mappings)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class AppVeyorInstallSHScriptWriter(interface.DependencyFileWriter):
@@ -47,8 +45,7 @@ class AppVeyorInstallSHScriptWriter(interface.DependencyFileWriter):
     template_file = os.path.join(self._l2tdevtools_path, self._TEMPLATE_FILE)
     file_content = self._GenerateFromTemplate(template_file, template_mappings)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class AppVeyorRuntestsSHScriptWriter(interface.DependencyFileWriter):
@@ -66,5 +63,4 @@ class AppVeyorRuntestsSHScriptWriter(interface.DependencyFileWriter):
     template_file = os.path.join(self._l2tdevtools_path, self._TEMPLATE_FILE)
     file_content = self._GenerateFromTemplate(template_file, template_mappings)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
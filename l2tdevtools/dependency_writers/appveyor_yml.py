@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Writer for appveyor.yml files."""
 
-import io
 import os
 
 from l2tdevtools.dependency_writers import interface
@@ -71,5 +70,4 @@ class AppveyorYmlWriter(interface.DependencyFileWriter):
 
     file_content = ''.join(file_content)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Writer for Debian packaging (dpkg) files."""
 
-import io
 import os
 
 from l2tdevtools.dependency_writers import interface
@@ -16,8 +15,7 @@ class DPKGCompatWriter(interface.DependencyFileWriter):
 
   def Write(self):
     """Writes a dpkg control file."""
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(self._FILE_CONTENT)
+    self._WriteFile(self.PATH, self._FILE_CONTENT)
 
 
 class DPKGControlWriter(interface.DependencyFileWriter):
@@ -114,8 +112,7 @@ class DPKGControlWriter(interface.DependencyFileWriter):
     file_content = '\n'.join(file_content)
     file_content = file_content.format(**template_mappings)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class DPKGRulesWriter(interface.DependencyFileWriter):
@@ -142,5 +139,4 @@ class DPKGRulesWriter(interface.DependencyFileWriter):
     file_content = '\n'.join(self._FILE_CONTENT)
     file_content = file_content.format(**template_mappings)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Writer for GitHub actions workflow files."""
 
-import io
 import os
 
 from l2tdevtools.dependency_writers import interface
@@ -32,8 +31,7 @@ class GitHubActionsTestDockerYmlWriter(interface.DependencyFileWriter):
     template_file = os.path.join(self._l2tdevtools_path, self._TEMPLATE_FILE)
     file_content = self._GenerateFromTemplate(template_file, template_mappings)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class GitHubActionsTestToxYmlWriter(interface.DependencyFileWriter):
@@ -57,5 +55,4 @@ class GitHubActionsTestToxYmlWriter(interface.DependencyFileWriter):
     template_file = os.path.join(self._l2tdevtools_path, self._TEMPLATE_FILE)
     file_content = self._GenerateFromTemplate(template_file, template_mappings)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
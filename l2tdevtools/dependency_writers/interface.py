@@ -3,25 +3,41 @@
 
 import abc
 import io
+import os
 import string
+import threading
 
 
 class DependencyFileWriter(object):
-  """Base class for dependency file writers."""
+  """Base class for dependency file writers.
+
+  Attributes:
+    changed_paths (list[str]): paths of the files that were changed, or
+        would be changed when only checking.
+  """
+
+  # Template strings per template path, shared by the writers.
+  _templates = {}
+  _templates_lock = threading.Lock()
 
   def __init__(
-      self, l2tdevtools_path, project_definition, dependency_helper):
+      self, l2tdevtools_path, project_definition, dependency_helper,
+      check_only=False):
     """Initializes a dependency file writer.
 
     Args:
       l2tdevtools_path (str): path to l2tdevtools.
       project_definition (ProjectDefinition): project definition.
       dependency_helper (DependencyHelper): dependency helper.
+      check_only (Optional[bool]): True if the files should only be checked
+          for changes and not written.
     """
     super(DependencyFileWriter, self).__init__()
+    self._check_only = check_only
     self._dependency_helper = dependency_helper
     self._l2tdevtools_path = l2tdevtools_path
     self._project_definition = project_definition
+    self.changed_paths = []
 
   def _GenerateFromTemplate(self, template_filename, template_mappings):
     """Generates file context based on a template file.
@@ -144,10 +160,34 @@ class DependencyFileWriter(object):
     Returns:
       string.Template: template string.
     """
-    with io.open(filename, 'r', encoding='utf-8') as file_object:
-      file_data = file_object.read()
+    with self._templates_lock:
+      template_string = self._templates.get(filename, None)
+      if not template_string:
+        with io.open(filename, 'r', encoding='utf-8') as file_object:
+          file_data = file_object.read()
+
+        template_string = string.Template(file_data)
+        self._templates[filename] = template_string
+
+    return template_string
+
+  def _WriteFile(self, path, file_content):
+    """Writes a file if its content changed.
+
+    Args:
+      path (str): path of the file.
+      file_content (str): content of the file.
+    """
+    if os.path.isfile(path):
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        if file_object.read() == file_content:
+          return
+
+    self.changed_paths.append(path)
 
-    return string.Template(file_data)
+    if not self._check_only:
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write(file_content)
 
   @abc.abstractmethod
   def Write(self):
@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 """Writer for requirements.txt files."""
 
-import io
-
 from l2tdevtools.dependency_writers import interface
 
 
@@ -27,8 +25,7 @@ class RequirementsWriter(interface.DependencyFileWriter):
 
     file_content = '\n'.join(file_content)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class TestRequirementsWriter(interface.DependencyFileWriter):
@@ -48,5 +45,4 @@ class TestRequirementsWriter(interface.DependencyFileWriter):
 
     file_content = '\n'.join(file_content)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
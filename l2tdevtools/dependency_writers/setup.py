@@ -2,7 +2,6 @@
 """Writer for setup configuration and script files."""
 
 import glob
-import io
 import os
 import textwrap
 
@@ -88,8 +87,7 @@ class SetupCfgWriter(interface.DependencyFileWriter):
 
     file_content = ''.join(file_content)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class SetupPyWriter(interface.DependencyFileWriter):
@@ -387,5 +385,4 @@ class SetupPyWriter(interface.DependencyFileWriter):
 
     file_content = ''.join(file_content)
 
-    with io.open(self.PATH, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
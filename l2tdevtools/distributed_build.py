@@ -0,0 +1,870 @@
+# -*- coding: utf-8 -*-
+"""Distributed builds by build workers on one or more hosts.
+
+A build coordinator distributes build jobs over build workers that run the
+build.py worker command, on the local host or on other hosts. Every worker
+receives the packaging inputs, which are the data directory of l2tdevtools
+and the project definitions, once per connection and the source package of
+every build job. The worker builds the project in an empty job directory and
+sends back the files the build created, such as the packages and build logs,
+and the result of the build.
+
+Messages are exchanged over TCP as a size prefixed JSON header followed by
+the data of the files listed in the header. Workers run the builds of any
+coordinator that knows their secret, hence a worker requires a secret and
+checks it before it accepts any file. The connection is not encrypted, hence
+workers on other hosts should be reached through an SSH tunnel.
+"""
+
+import hmac
+import io
+import json
+import logging
+import os
+import shutil
+import socket
+import socketserver
+import struct
+import tarfile
+import tempfile
+import threading
+import time
+
+from l2tdevtools import build_journal
+from l2tdevtools.lib import errors
+
+
+# Port the build workers listen on by default.
+DEFAULT_PORT = 8750
+
+# Name of the environment variable with the secret shared by the coordinator
+# and the workers.
+SECRET_ENVIRONMENT_VARIABLE = 'L2TDEVTOOLS_BUILD_SECRET'
+
+_HEADER_SIZE = struct.Struct('>I')
+
+_MAXIMUM_HEADER_SIZE = 16 * 1024 * 1024
+
+_READ_BUFFER_SIZE = 1024 * 1024
+
+
+def ParseAddress(address):
+  """Parses a worker address.
+
+  Args:
+    address (str): address in the format "host:port" or "host".
+
+  Returns:
+    tuple[str, int]: host and port.
+
+  Raises:
+    ValueError: if the address is not supported.
+  """
+  host, separator, port_string = address.rpartition(':')
+  if not separator:
+    host, port_string = address, '{0:d}'.format(DEFAULT_PORT)
+
+  try:
+    port = int(port_string, 10)
+  except ValueError:
+    port = -1
+
+  if not host or port < 0 or port > 65535:
+    raise ValueError('Unsupported worker address: {0:s}'.format(address))
+
+  return host, port
+
+
+def _ReceiveData(connection, size):
+  """Receives data from a connection.
+
+  Args:
+    connection (socket.socket): connection.
+    size (int): number of bytes to receive.
+
+  Yields:
+    bytes: received data.
+
+  Raises:
+    ConnectivityError: if the connection was closed.
+  """
+  while size > 0:
+    data = connection.recv(min(size, _READ_BUFFER_SIZE))
+    if not data:
+      raise errors.ConnectivityError('Connection closed.')
+
+    size -= len(data)
+    yield data
+
+
+def ReceiveMessage(connection, path=None, secret=None):
+  """Receives a message.
+
+  Args:
+    connection (socket.socket): connection.
+    path (Optional[str]): path of the directory to write the files of the
+        message to, where None represents the message should not contain
+        files.
+    secret (Optional[str]): secret the header of the message must contain,
+        which is checked before any file of the message is received, where
+        None represents the message is not authenticated.
+
+  Returns:
+    tuple[dict[str, object], list[str]]: message and paths of the received
+        files.
+
+  Raises:
+    AuthenticationError: if the message does not contain the secret.
+    ConnectivityError: if the connection was closed.
+    ProtocolError: if the message is not supported.
+  """
+  header_size = _HEADER_SIZE.unpack(b''.join(_ReceiveData(
+      connection, _HEADER_SIZE.size)))[0]
+  if header_size > _MAXIMUM_HEADER_SIZE:
+    raise errors.ProtocolError('Unsupported header size: {0:d}'.format(
+        header_size))
+
+  try:
+    message = json.loads(b''.join(_ReceiveData(
+        connection, header_size)).decode('utf-8'))
+  except ValueError as exception:
+    raise errors.ProtocolError('Unsupported header with error: {0!s}'.format(
+        exception))
+
+  if not isinstance(message, dict):
+    raise errors.ProtocolError('Unsupported header.')
+
+  if secret is not None and not hmac.compare_digest(
+      str(message.get('secret', None) or '').encode('utf-8'),
+      secret.encode('utf-8')):
+    raise errors.AuthenticationError('Invalid secret.')
+
+  paths = []
+  for file_entry in message.pop('files', None) or []:
+    filename = file_entry.get('name', None) or ''
+    file_size = file_entry.get('size', None)
+
+    # Only plain filenames are accepted to prevent writing outside the path.
+    if (filename != os.path.basename(filename) or filename in ('.', '..') or
+        not isinstance(file_size, int) or file_size < 0):
+      raise errors.ProtocolError('Unsupported file entry: {0!s}'.format(
+          file_entry))
+
+    if not path:
+      raise errors.ProtocolError('Unexpected file: {0:s}'.format(filename))
+
+    file_path = os.path.join(path, filename)
+    with open(file_path, 'wb') as file_object:
+      for data in _ReceiveData(connection, file_size):
+        file_object.write(data)
+
+    paths.append(file_path)
+
+  return message, paths
+
+
+def SendMessage(connection, message, paths=None):
+  """Sends a message.
+
+  Args:
+    connection (socket.socket): connection.
+    message (dict[str, object]): JSON serializable message.
+    paths (Optional[list[str]]): paths of the files to send with the message.
+
+  Raises:
+    OSError: if the message cannot be sent.
+  """
+  paths = paths or []
+
+  message = dict(message)
+  message['files'] = [
+      {'name': os.path.basename(path), 'size': os.path.getsize(path)}
+      for path in paths]
+
+  header = json.dumps(message).encode('utf-8')
+  connection.sendall(_HEADER_SIZE.pack(len(header)) + header)
+
+  for path, file_entry in zip(paths, message['files']):
+    with open(path, 'rb') as file_object:
+      size = file_entry['size']
+      while size > 0:
+        data = file_object.read(min(size, _READ_BUFFER_SIZE))
+        if not data:
+          raise IOError('File: {0:s} was truncated.'.format(path))
+
+        connection.sendall(data)
+        size -= len(data)
+
+
+class _BuildWorkerRequestHandler(socketserver.BaseRequestHandler):
+  """Passes the connection of a coordinator to the build worker."""
+
+  def handle(self):
+    """Handles a connection."""
+    self.server.build_worker.HandleConnection(self.request)
+
+
+class _BuildWorkerServer(socketserver.TCPServer):
+  """TCP server of a build worker.
+
+  Attributes:
+    build_worker (BuildWorker): build worker.
+  """
+
+  allow_reuse_address = True
+
+  def __init__(self, build_worker, server_address):
+    """Initializes a TCP server of a build worker.
+
+    Args:
+      build_worker (BuildWorker): build worker.
+      server_address (tuple[str, int]): host and port to listen on.
+    """
+    super(_BuildWorkerServer, self).__init__(
+        server_address, _BuildWorkerRequestHandler)
+    self.build_worker = build_worker
+
+
+class BuildJob(object):
+  """Build job.
+
+  Attributes:
+    build_target (str): build target.
+    distributions (list[str]): names of the distributions to build.
+    project_name (str): name of the project.
+    project_version (str): version of the project.
+    source_filename (str): filename of the source package.
+  """
+
+  def __init__(
+      self, project_name, project_version, source_filename, build_target,
+      distributions=None):
+    """Initializes a build job.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+      source_filename (str): filename of the source package.
+      build_target (str): build target.
+      distributions (Optional[list[str]]): names of the distributions to
+          build.
+    """
+    super(BuildJob, self).__init__()
+    self.build_target = build_target
+    self.distributions = [name for name in distributions or [] if name]
+    self.project_name = project_name
+    self.project_version = project_version
+    self.source_filename = source_filename
+
+  def CopyToDict(self):
+    """Copies the job to a dictionary.
+
+    Returns:
+      dict[str, object]: job values.
+    """
+    return {
+        'build_target': self.build_target,
+        'distributions': self.distributions,
+        'project_name': self.project_name,
+        'project_version': self.project_version,
+        'source_filename': os.path.basename(self.source_filename)}
+
+
+class BuildResult(object):
+  """Build result.
+
+  Attributes:
+    artifacts (list[str]): filenames of the files the build created.
+    error (str): description of the error that prevented the build or None.
+    missing_dependencies (list[str]): names of the missing build dependencies.
+    project_name (str): name of the project.
+    result (bool): True if the build was successful.
+    wall_time (float): elapsed wall clock time of the build in seconds or None
+        if the project was not built.
+    worker (str): address of the worker that built the project or None.
+  """
+
+  def __init__(self, project_name):
+    """Initializes a build result.
+
+    Args:
+      project_name (str): name of the project.
+    """
+    super(BuildResult, self).__init__()
+    self.artifacts = []
+    self.error = None
+    self.missing_dependencies = []
+    self.project_name = project_name
+    self.result = False
+    self.wall_time = None
+    self.worker = None
+
+  def CopyToDict(self):
+    """Copies the result to a dictionary.
+
+    Returns:
+      dict[str, object]: result values.
+    """
+    return {
+        'artifacts': self.artifacts,
+        'error': self.error,
+        'missing_dependencies': self.missing_dependencies,
+        'project_name': self.project_name,
+        'result': self.result,
+        'wall_time': self.wall_time,
+        'worker': self.worker}
+
+
+class BuildCoordinator(object):
+  """Distributes build jobs over build workers.
+
+  Every worker has its own connection and takes the next job when it
+  finished the previous one, hence faster hosts build more projects. The jobs
+  are started longest first if a build scheduler is provided. The job of a
+  worker that fails is built by another worker.
+  """
+
+  RESULTS_FILENAME = 'build_results.jsonl'
+
+  # Maximum number of workers a job is attempted on.
+  _MAXIMUM_NUMBER_OF_ATTEMPTS = 2
+
+  def __init__(
+      self, worker_addresses, data_path, projects_file, build_scheduler=None,
+      connection_timeout=30.0, secret=None):
+    """Initializes a build coordinator.
+
+    Args:
+      worker_addresses (list[str]): addresses of the workers in the format
+          "host:port".
+      data_path (str): path of the l2tdevtools data directory with the
+          packaging templates and patches.
+      projects_file (str): path of the projects.ini file.
+      build_scheduler (Optional[BuildScheduler]): scheduler to order the
+          jobs longest first, where None represents the jobs are started in
+          the order they are provided.
+      connection_timeout (Optional[float]): number of seconds to wait for
+          a connection to a worker.
+      secret (Optional[str]): secret shared with the workers.
+
+    Raises:
+      ValueError: if a worker address is not supported or no secret is
+          provided.
+    """
+    if not secret:
+      raise ValueError('Missing secret shared with the workers.')
+
+    super(BuildCoordinator, self).__init__()
+    self._build_scheduler = build_scheduler
+    self._condition = threading.Condition()
+    self._connection_timeout = connection_timeout
+    self._data_path = data_path
+    self._pending_jobs = []
+    self._projects_file = projects_file
+    self._results = {}
+    self._results_file_object = None
+    self._running_jobs = 0
+    self._secret = secret
+    self._worker_addresses = [
+        ParseAddress(address) for address in worker_addresses]
+
+  def _BuildJob(self, connection, worker_name, job, output_path):
+    """Builds a job on a worker.
+
+    Args:
+      connection (socket.socket): connection to the worker.
+      worker_name (str): name of the worker.
+      job (BuildJob): job.
+      output_path (str): path of the directory that contains the source
+          packages and to write the artifacts to.
+
+    Returns:
+      BuildResult: result.
+
+    Raises:
+      ConnectivityError: if the connection was closed.
+      OSError: if the job cannot be sent.
+      ProtocolError: if the response of the worker is not supported.
+    """
+    logging.info('Building: {0:s} on: {1:s}'.format(
+        job.project_name, worker_name))
+
+    source_path = os.path.join(output_path, job.source_filename)
+    SendMessage(connection, {
+        'job': job.CopyToDict(), 'type': 'build'}, paths=[source_path])
+
+    # The artifacts are received in a temporary directory, such that the
+    # build directory only contains complete files.
+    incoming_path = tempfile.mkdtemp(dir=output_path, prefix='.incoming-')
+    try:
+      message, paths = ReceiveMessage(connection, path=incoming_path)
+      if message.get('type', None) != 'result':
+        raise errors.ProtocolError('Unsupported response: {0!s}'.format(
+            message.get('error', message.get('type', None))))
+
+      values = message.get('result', None) or {}
+
+      build_result = BuildResult(job.project_name)
+      build_result.missing_dependencies = list(
+          values.get('missing_dependencies', None) or [])
+      build_result.result = bool(values.get('result', False))
+      build_result.wall_time = values.get('wall_time', None)
+      build_result.worker = worker_name
+
+      for path in paths:
+        filename = os.path.basename(path)
+        os.replace(path, os.path.join(output_path, filename))
+        build_result.artifacts.append(filename)
+
+    finally:
+      shutil.rmtree(incoming_path, ignore_errors=True)
+
+    return build_result
+
+  def _CreatePackagingArchive(self, path):
+    """Creates the archive with the packaging inputs.
+
+    Args:
+      path (str): path of the archive.
+
+    Returns:
+      str: hash of the archive.
+    """
+    projects_file = os.path.abspath(self._projects_file)
+
+    def _FilterProjectsFile(tar_info):
+      """Excludes projects.ini and cached bytecode from the data directory."""
+      if (tar_info.name == 'data/projects.ini' or
+          '__pycache__' in tar_info.name):
+        return None
+      return tar_info
+
+    with tarfile.open(path, 'w:gz') as archive:
+      archive.add(self._data_path, arcname='data', filter=_FilterProjectsFile)
+      archive.add(projects_file, arcname='data/projects.ini')
+
+    return build_journal.CalculateFileHash(path)
+
+  def _AddResult(self, build_result):
+    """Adds the result of a job.
+
+    This function should be called with the condition acquired.
+
+    Args:
+      build_result (BuildResult): result.
+    """
+    self._results[build_result.project_name] = build_result
+
+    if self._results_file_object:
+      self._results_file_object.write(json.dumps(
+          build_result.CopyToDict(), sort_keys=True))
+      self._results_file_object.write('\n')
+      self._results_file_object.flush()
+
+  def _FinishJob(self, build_result):
+    """Finishes a running job.
+
+    Args:
+      build_result (BuildResult): result of the job.
+    """
+    with self._condition:
+      self._AddResult(build_result)
+      self._running_jobs -= 1
+      self._condition.notify_all()
+
+  def _GetNextJob(self):
+    """Retrieves the next job to build.
+
+    A worker waits while jobs are built by other workers, since these jobs
+    are rescheduled if the other worker fails.
+
+    Returns:
+      BuildJob: job or None if all jobs are finished.
+    """
+    with self._condition:
+      while not self._pending_jobs and self._running_jobs:
+        self._condition.wait()
+
+      if not self._pending_jobs:
+        return None
+
+      self._running_jobs += 1
+      return self._pending_jobs.pop(0)
+
+  def _RescheduleJob(self, job, worker_name, attempts, exception):
+    """Reschedules a job of a worker that failed.
+
+    Args:
+      job (BuildJob): job.
+      worker_name (str): name of the worker that failed.
+      attempts (dict[str, int]): number of attempts per project name.
+      exception (Exception): error the worker failed with.
+    """
+    error = 'Worker: {0:s} failed with error: {1!s}'.format(
+        worker_name, exception)
+    logging.warning('Unable to build: {0:s}. {1:s}'.format(
+        job.project_name, error))
+
+    with self._condition:
+      attempts[job.project_name] = attempts.get(job.project_name, 0) + 1
+      if attempts[job.project_name] < self._MAXIMUM_NUMBER_OF_ATTEMPTS:
+        self._pending_jobs.insert(0, job)
+        self._running_jobs -= 1
+        self._condition.notify_all()
+        return
+
+    build_result = BuildResult(job.project_name)
+    build_result.error = error
+    build_result.worker = worker_name
+    self._FinishJob(build_result)
+
+  def _RunWorker(
+      self, worker_address, packaging_path, packaging_hash, output_path,
+      attempts):
+    """Builds jobs on a worker until all jobs are finished.
+
+    Args:
+      worker_address (tuple[str, int]): host and port of the worker.
+      packaging_path (str): path of the archive with the packaging inputs.
+      packaging_hash (str): hash of the archive with the packaging inputs.
+      output_path (str): path of the directory that contains the source
+          packages and to write the artifacts to.
+      attempts (dict[str, int]): number of attempts per project name.
+    """
+    worker_name = '{0:s}:{1:d}'.format(*worker_address)
+
+    try:
+      connection = socket.create_connection(
+          worker_address, timeout=self._connection_timeout)
+    except OSError as exception:
+      logging.warning((
+          'Unable to connect to worker: {0:s} with error: {1!s}').format(
+              worker_name, exception))
+      return
+
+    with connection:
+      # Builds can take hours, hence there is no timeout once connected.
+      connection.settimeout(None)
+
+      try:
+        SendMessage(connection, {
+            'packaging_hash': packaging_hash, 'secret': self._secret,
+            'type': 'setup'}, paths=[packaging_path])
+
+        message, _ = ReceiveMessage(connection)
+
+      except (OSError, errors.Error) as exception:
+        logging.warning((
+            'Unable to set up worker: {0:s} with error: {1!s}').format(
+                worker_name, exception))
+        return
+
+      if message.get('type', None) != 'ready':
+        logging.warning((
+            'Unable to set up worker: {0:s} with error: {1!s}').format(
+                worker_name, message.get('error', None) or (
+                    'Unsupported response: {0!s}'.format(
+                        message.get('type', None)))))
+        return
+
+      job = self._GetNextJob()
+      while job:
+        try:
+          build_result = self._BuildJob(
+              connection, worker_name, job, output_path)
+        except (OSError, errors.Error) as exception:
+          self._RescheduleJob(job, worker_name, attempts, exception)
+          return
+
+        self._FinishJob(build_result)
+        job = self._GetNextJob()
+
+  def Build(self, jobs, output_path):
+    """Builds jobs on the workers.
+
+    Args:
+      jobs (list[BuildJob]): jobs.
+      output_path (str): path of the directory that contains the source
+          packages and to write the artifacts and results to.
+
+    Returns:
+      dict[str, BuildResult]: result per project name.
+    """
+    output_path = os.path.abspath(output_path)
+
+    jobs_per_name = {job.project_name: job for job in jobs}
+    project_names = [job.project_name for job in jobs]
+    if self._build_scheduler:
+      project_names = self._build_scheduler.GetBuildOrder(project_names)
+
+    self._pending_jobs = [
+        jobs_per_name[project_name] for project_name in project_names]
+    self._results = {}
+    self._running_jobs = 0
+
+    attempts = {}
+    results_path = os.path.join(output_path, self.RESULTS_FILENAME)
+
+    with tempfile.NamedTemporaryFile(
+        dir=output_path, prefix='.packaging-',
+        suffix='.tar.gz') as temporary_file:
+      packaging_hash = self._CreatePackagingArchive(temporary_file.name)
+
+      with io.open(results_path, 'w', encoding='utf-8') as file_object:
+        self._results_file_object = file_object
+
+        threads = []
+        for worker_address in self._worker_addresses:
+          thread = threading.Thread(target=self._RunWorker, args=(
+              worker_address, temporary_file.name, packaging_hash, output_path,
+              attempts))
+          thread.start()
+          threads.append(thread)
+
+        for thread in threads:
+          thread.join()
+
+        # Jobs that remain pending could not be built since no worker was
+        # available.
+        with self._condition:
+          for job in self._pending_jobs:
+            build_result = BuildResult(job.project_name)
+            build_result.error = 'No worker available.'
+            self._AddResult(build_result)
+
+          self._pending_jobs = []
+          self._results_file_object = None
+
+    return dict(self._results)
+
+
+class BuildWorker(object):
+  """Builds the jobs received from build coordinators.
+
+  The worker handles one connection at a time and builds one job at a time.
+  To build concurrently on a host run multiple workers on different ports.
+  """
+
+  def __init__(self, build_function, work_path, secret=None):
+    """Initializes a build worker.
+
+    Args:
+      build_function (function): function to build a job, which is called
+          with the job, the path of the job directory and the path of the
+          directory that contains the packaging inputs as data directory,
+          and returns a tuple of a boolean that is True if the build was
+          successful and the names of the missing build dependencies.
+      work_path (str): path of the directory to build the jobs in.
+      secret (Optional[str]): secret shared with the coordinators.
+
+    Raises:
+      ValueError: if no secret is provided.
+    """
+    if not secret:
+      raise ValueError('Missing secret shared with the coordinators.')
+
+    super(BuildWorker, self).__init__()
+    self._build_function = build_function
+    self._secret = secret
+    self._server = None
+    self._work_path = os.path.abspath(work_path)
+
+  def _BuildJob(self, message, job_path, source_paths, packaging_path):
+    """Builds a job.
+
+    Args:
+      message (dict[str, object]): build message.
+      job_path (str): path of the job directory.
+      source_paths (list[str]): paths of the received source package.
+      packaging_path (str): path of the directory that contains the packaging
+          inputs as data directory.
+
+    Returns:
+      tuple[dict[str, object], list[str]]: result values and paths of the
+          files the build created.
+
+    Raises:
+      ProtocolError: if the build message is not supported.
+    """
+    values = message.get('job', None) or {}
+
+    try:
+      job = BuildJob(
+          values['project_name'], values['project_version'],
+          values['source_filename'], values['build_target'],
+          distributions=values.get('distributions', None))
+    except KeyError as exception:
+      raise errors.ProtocolError('Missing job value: {0!s}'.format(exception))
+
+    if [os.path.basename(path) for path in source_paths] != [
+        job.source_filename]:
+      raise errors.ProtocolError('Missing source package: {0:s}'.format(
+          job.source_filename))
+
+    logging.info('Building: {0:s}'.format(job.project_name))
+
+    start_time = time.monotonic()
+    try:
+      result, missing_dependencies = self._build_function(
+          job, job_path, packaging_path)
+
+    # The worker should keep serving other jobs if a build raises.
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.error('Build of: {0:s} failed with error: {1!s}'.format(
+          job.project_name, exception))
+      result, missing_dependencies = False, []
+
+    wall_time = time.monotonic() - start_time
+
+    artifacts = [
+        os.path.join(job_path, filename)
+        for filename in sorted(os.listdir(job_path))
+        if filename != job.source_filename and
+        os.path.isfile(os.path.join(job_path, filename))]
+
+    result_values = {
+        'missing_dependencies': list(missing_dependencies or []),
+        'result': bool(result),
+        'wall_time': wall_time}
+
+    return result_values, artifacts
+
+  def _ExtractPackagingArchive(self, archive_path, packaging_hash):
+    """Extracts the archive with the packaging inputs.
+
+    Archives are extracted once per hash, such that consecutive connections
+    with the same packaging inputs reuse the extracted files.
+
+    Args:
+      archive_path (str): path of the archive.
+      packaging_hash (str): hash of the archive.
+
+    Returns:
+      str: path of the directory that contains the packaging inputs as data
+          directory.
+
+    Raises:
+      ProtocolError: if the archive is not supported.
+    """
+    if build_journal.CalculateFileHash(archive_path) != packaging_hash:
+      raise errors.ProtocolError('Packaging inputs hash mismatch.')
+
+    packaging_path = os.path.join(
+        self._work_path, 'packaging-{0:s}'.format(packaging_hash[:16]))
+    if os.path.isdir(packaging_path):
+      return packaging_path
+
+    temporary_path = tempfile.mkdtemp(
+        dir=self._work_path, prefix='.packaging-')
+    try:
+      with tarfile.open(archive_path, 'r:gz') as archive:
+        members = []
+        for tar_info in archive.getmembers():
+          path_segments = tar_info.name.split('/')
+          if (path_segments[0] != 'data' or '..' in path_segments or
+              not (tar_info.isdir() or tar_info.isfile())):
+            raise errors.ProtocolError(
+                'Unsupported packaging inputs file: {0:s}'.format(
+                    tar_info.name))
+
+          members.append(tar_info)
+
+        archive.extractall(path=temporary_path, members=members)
+
+      os.replace(temporary_path, packaging_path)
+
+    finally:
+      shutil.rmtree(temporary_path, ignore_errors=True)
+
+    return packaging_path
+
+  def HandleConnection(self, connection):
+    """Handles the messages of a coordinator.
+
+    The first message of a connection must be a setup message with the
+    secret, which is checked before the files of the message are received.
+
+    Args:
+      connection (socket.socket): connection to the coordinator.
+    """
+    os.makedirs(self._work_path, exist_ok=True)
+
+    job_path = os.path.join(self._work_path, 'job')
+    packaging_path = None
+
+    try:
+      while True:
+        if os.path.exists(job_path):
+          shutil.rmtree(job_path)
+        os.mkdir(job_path)
+
+        secret = None
+        if not packaging_path:
+          secret = self._secret
+
+        try:
+          message, paths = ReceiveMessage(
+              connection, path=job_path, secret=secret)
+        except errors.AuthenticationError as exception:
+          SendMessage(connection, {
+              'error': '{0!s}'.format(exception), 'type': 'error'})
+          break
+        except errors.ConnectivityError:
+          # The coordinator closes the connection when all jobs are built.
+          break
+
+        message_type = message.get('type', None)
+        if message_type == 'setup' and not packaging_path:
+          packaging_path = self._ExtractPackagingArchive(
+              paths[0] if paths else '', message.get('packaging_hash', None))
+          SendMessage(connection, {'type': 'ready'})
+
+        elif message_type == 'build' and packaging_path:
+          result_values, artifacts = self._BuildJob(
+              message, job_path, paths, packaging_path)
+          SendMessage(
+              connection, {'result': result_values, 'type': 'result'},
+              paths=artifacts)
+
+        else:
+          SendMessage(connection, {
+              'error': 'Unsupported message: {0!s}'.format(message_type),
+              'type': 'error'})
+          break
+
+    except (OSError, errors.Error) as exception:
+      logging.warning('Connection failed with error: {0!s}'.format(exception))
+
+    finally:
+      if os.path.exists(job_path):
+        shutil.rmtree(job_path, ignore_errors=True)
+
+  def Serve(self):
+    """Serves coordinators until stopped.
+
+    The worker must have been started before.
+    """
+    self._server.serve_forever()
+
+  def Start(self, host, port):
+    """Starts listening for coordinators.
+
+    Args:
+      host (str): host to listen on.
+      port (int): port to listen on, where 0 represents any available port.
+
+    Returns:
+      tuple[str, int]: host and port the worker listens on.
+
+    Raises:
+      OSError: if the worker cannot listen on the host and port.
+    """
+    self._server = _BuildWorkerServer(self, (host, port))
+    return self._server.server_address[:2]
+
+  def Stop(self):
+    """Stops serving coordinators."""
+    if self._server:
+      self._server.shutdown()
+      self._server.server_close()
+      self._server = None
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """Download helper object implementations."""
 
+import threading
+import time
+
 from l2tdevtools.download_helpers import github
 from l2tdevtools.download_helpers import pypi
 from l2tdevtools.download_helpers import sourceforge
@@ -49,3 +52,58 @@ class DownloadHelperFactory(object):
 
     raise ValueError('Unsupported download URL: {0:s}.'.format(
         project_definition.download_url))
+
+
+class DownloadHelperCache(object):
+  """Cache of download helpers.
+
+  Download helpers cache the content of the last page they downloaded, such
+  as the releases page the latest version is determined from. Reusing the
+  download helper of a project prevents downloading the page again. Download
+  helpers expire after a lifetime, such that new releases are picked up by
+  long-running processes.
+  """
+
+  def __init__(self, lifetime=600.0):
+    """Initializes a download helper cache.
+
+    Args:
+      lifetime (Optional[float]): number of seconds a download helper is
+          reused.
+    """
+    super(DownloadHelperCache, self).__init__()
+    self._download_helpers = {}
+    self._lifetime = lifetime
+    self._lock = threading.Lock()
+
+  def GetDownloadHelper(self, project_definition):
+    """Retrieves the download helper of a project.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      DownloadHelper: download helper.
+
+    Raises:
+      ValueError: if no corresponding helper could be found for the download
+          URL.
+    """
+    lookup_key = (
+        project_definition.name, project_definition.download_url,
+        project_definition.pypi_source_name)
+    timestamp = time.monotonic()
+
+    with self._lock:
+      creation_time, download_helper = self._download_helpers.get(
+          lookup_key, (None, None))
+      if download_helper and timestamp - creation_time < self._lifetime:
+        return download_helper
+
+    download_helper = DownloadHelperFactory.NewDownloadHelper(
+        project_definition)
+
+    with self._lock:
+      self._download_helpers[lookup_key] = (timestamp, download_helper)
+
+    return download_helper
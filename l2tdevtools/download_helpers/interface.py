@@ -18,8 +18,9 @@ class DownloadHelper(object):
       download_url (str): download URL.
     """
     super(DownloadHelper, self).__init__()
-    self._cached_url = ''
-    self._cached_page_content = b''
+    # The URL and page content are stored as one tuple, such that threads
+    # that share the download helper see a consistent cache.
+    self._cached_page = ('', b'')
     self._download_url = download_url
 
   def DownloadFile(self, download_url):
@@ -72,7 +73,8 @@ class DownloadHelper(object):
     if not download_url:
       return None
 
-    if self._cached_url != download_url:
+    cached_url, cached_page_content = self._cached_page
+    if cached_url != download_url:
       try:
         url_object = urllib_request.urlopen(download_url)
       except urllib_error.URLError as exception:
@@ -89,7 +91,7 @@ class DownloadHelper(object):
       if encoding and isinstance(page_content, bytes):
         page_content = page_content.decode(encoding)
 
-      self._cached_page_content = page_content
-      self._cached_url = download_url
+      cached_page_content = page_content
+      self._cached_page = (download_url, page_content)
 
-    return self._cached_page_content
+    return cached_page_content
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""Cache of local git mirror repositories."""
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from urllib import parse as urllib_parse
+
+
+class GitMirrorCache(object):
+  """Cache of local bare git mirror repositories.
+
+  There is one mirror per git URL, which is created once and updated with
+  git fetch at most once per cache object. Clones are made from the mirror,
+  such that objects are only downloaded once, and have their origin set to
+  the original git URL.
+  """
+
+  _GIT_VERSION_REGEX = re.compile(r'git version ([0-9]+)\.([0-9]+)')
+
+  # GIT_CONFIG_COUNT, which is used to rewrite URLs, was added to git 2.31.
+  _MINIMUM_URL_REWRITE_GIT_VERSION = (2, 31)
+
+  _SYNCLIBS_LOCAL_LIBS_REGEX = re.compile(
+      r'^LOCAL_LIBS="([^"]*)"', re.MULTILINE)
+
+  _SYNCLIBS_URL_PREFIX_REGEX = re.compile(
+      r'^GIT_URL_PREFIX="([^"]*)"', re.MULTILINE)
+
+  def __init__(self, path=None):
+    """Initializes a git mirror cache.
+
+    Args:
+      path (Optional[str]): path of the directory to store the mirrors in,
+          where None represents ~/.cache/l2tdevtools/git.
+    """
+    if not path:
+      path = os.path.join(
+          os.path.expanduser('~'), '.cache', 'l2tdevtools', 'git')
+
+    super(GitMirrorCache, self).__init__()
+    self._git_version = None
+    self._lock = threading.Lock()
+    self._mirror_locks = {}
+    self._path = path
+    self._updated_mirrors = set()
+
+  def _GetGitVersion(self):
+    """Retrieves the version of git.
+
+    Returns:
+      tuple[int, int]: major and minor version of git or None if not
+          available.
+    """
+    if self._git_version is None:
+      try:
+        output = subprocess.check_output(['git', '--version'])
+      except (OSError, subprocess.CalledProcessError):
+        return None
+
+      version_match = self._GIT_VERSION_REGEX.match(output.decode('utf-8'))
+      if not version_match:
+        return None
+
+      self._git_version = (
+          int(version_match.group(1), 10), int(version_match.group(2), 10))
+
+    return self._git_version
+
+  def _GetMirrorLock(self, git_url):
+    """Retrieves the lock of a mirror.
+
+    Args:
+      git_url (str): git URL.
+
+    Returns:
+      threading.Lock: lock of the mirror.
+    """
+    with self._lock:
+      mirror_lock = self._mirror_locks.get(git_url, None)
+      if not mirror_lock:
+        mirror_lock = threading.Lock()
+        self._mirror_locks[git_url] = mirror_lock
+
+    return mirror_lock
+
+  def _RunCommand(self, arguments, env=None):
+    """Runs a git command.
+
+    The command is not run by the shell, hence paths and URLs do not need to
+    be quoted.
+
+    Args:
+      arguments (list[str]): command and its arguments.
+      env (Optional[dict[str, str]]): environment variables of the command.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    exit_code = subprocess.call(arguments, env=env)
+    if exit_code != 0:
+      logging.error('Running: "{0:s}" failed.'.format(' '.join(arguments)))
+      return False
+
+    return True
+
+  def GetMirrorPath(self, git_url):
+    """Retrieves the path of the mirror of a git URL.
+
+    Args:
+      git_url (str): git URL.
+
+    Returns:
+      str: path of the mirror, which is derived from the host and path of the
+          git URL.
+    """
+    url_object = urllib_parse.urlparse(git_url)
+
+    path_segments = [url_object.netloc or 'local']
+    path_segments.extend([
+        path_segment for path_segment in url_object.path.split('/')
+        if path_segment and path_segment not in ('.', '..')])
+
+    path_segments = [
+        re.sub(r'[^A-Za-z0-9._-]', '_', path_segment)
+        for path_segment in path_segments]
+
+    if not path_segments[-1].endswith('.git'):
+      path_segments[-1] = '{0:s}.git'.format(path_segments[-1])
+
+    return os.path.join(self._path, *path_segments)
+
+  def Clone(
+      self, git_url, destination, branch=None, depth=None, filter_spec=None):
+    """Clones a git repository from its mirror.
+
+    Args:
+      git_url (str): git URL.
+      destination (str): path of the directory to clone into.
+      branch (Optional[str]): name of the branch or tag to check out, where
+          None represents the default branch.
+      depth (Optional[int]): number of commits of a shallow clone, where None
+          represents the full history.
+      filter_spec (Optional[str]): object filter of a partial clone, such as
+          "blob:none", where None represents all objects.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    mirror_path = self.UpdateMirror(git_url)
+    if not mirror_path:
+      return False
+
+    arguments = ['git', 'clone', '--quiet']
+    if branch:
+      arguments.extend(['--branch', branch])
+
+    if depth or filter_spec:
+      if depth:
+        arguments.extend(['--depth', '{0:d}'.format(depth)])
+      if filter_spec:
+        arguments.extend(['--filter', filter_spec])
+
+      # Shallow and partial clones are not supported for local paths.
+      mirror_url = 'file://{0:s}'.format(os.path.abspath(mirror_path))
+    else:
+      # A clone from a local path hard links the objects of the mirror.
+      mirror_url = mirror_path
+
+    arguments.extend(['--', mirror_url, destination])
+
+    if not self._RunCommand(arguments):
+      return False
+
+    return self._RunCommand([
+        'git', '-C', destination, 'remote', 'set-url', 'origin', git_url])
+
+  def GetURLRewriteEnvironment(self, git_urls):
+    """Retrieves an environment that rewrites git URLs to their mirrors.
+
+    This allows scripts that run git clone, such as synclibs.sh, to clone
+    from the mirrors without changes. The URLs are rewritten with the
+    GIT_CONFIG_COUNT environment variable, which requires git 2.31 or later.
+
+    Args:
+      git_urls (list[str]): git URLs.
+
+    Returns:
+      dict[str, str]: environment variables, which include those of
+          the current process.
+    """
+    env = dict(os.environ)
+
+    git_version = self._GetGitVersion()
+    if not git_version or git_version < self._MINIMUM_URL_REWRITE_GIT_VERSION:
+      logging.warning((
+          'Unable to clone from the git mirrors since git {0:d}.{1:d} or '
+          'later is required.').format(*self._MINIMUM_URL_REWRITE_GIT_VERSION))
+      return env
+
+    number_of_rewrites = int(env.get('GIT_CONFIG_COUNT', None) or '0', 10)
+    for git_url in git_urls:
+      mirror_path = self.UpdateMirror(git_url)
+      if not mirror_path:
+        continue
+
+      env['GIT_CONFIG_KEY_{0:d}'.format(number_of_rewrites)] = (
+          'url.{0:s}.insteadOf'.format(os.path.abspath(mirror_path)))
+      env['GIT_CONFIG_VALUE_{0:d}'.format(number_of_rewrites)] = git_url
+      number_of_rewrites += 1
+
+    env['GIT_CONFIG_COUNT'] = '{0:d}'.format(number_of_rewrites)
+    return env
+
+  def ReadSynclibsURLs(self, path):
+    """Reads the git URLs of the libraries of a libyal synclibs.sh script.
+
+    Args:
+      path (str): path of the synclibs.sh script.
+
+    Returns:
+      list[str]: git URLs of the libraries, or an empty list if they cannot
+          be determined.
+    """
+    try:
+      with open(path, 'r', encoding='utf-8') as file_object:
+        script = file_object.read()
+    except IOError:
+      return []
+
+    url_prefix_match = self._SYNCLIBS_URL_PREFIX_REGEX.search(script)
+    local_libs_match = self._SYNCLIBS_LOCAL_LIBS_REGEX.search(script)
+    if not url_prefix_match or not local_libs_match:
+      return []
+
+    url_prefix = url_prefix_match.group(1).rstrip('/')
+    return [
+        '{0:s}/{1:s}.git'.format(url_prefix, library_name)
+        for library_name in local_libs_match.group(1).split()]
+
+  def UpdateMirror(self, git_url):
+    """Creates or updates the mirror of a git URL.
+
+    The mirror is only updated once per cache object, which allows multiple
+    projects that depend on the same repository to share one update.
+
+    Args:
+      git_url (str): git URL.
+
+    Returns:
+      str: path of the mirror or None on error.
+    """
+    mirror_path = self.GetMirrorPath(git_url)
+
+    with self._GetMirrorLock(git_url):
+      if git_url in self._updated_mirrors:
+        return mirror_path
+
+      if os.path.isdir(mirror_path):
+        logging.info('Updating mirror: {0:s}'.format(mirror_path))
+        if not self._RunCommand([
+            'git', '--git-dir', mirror_path, 'fetch', '--quiet', '--prune',
+            'origin']):
+          return None
+
+      else:
+        logging.info('Creating mirror: {0:s}'.format(mirror_path))
+        os.makedirs(os.path.dirname(mirror_path), exist_ok=True)
+
+        temporary_path = '{0:s}.tmp'.format(mirror_path)
+        if os.path.exists(temporary_path):
+          shutil.rmtree(temporary_path)
+
+        if not self._RunCommand([
+            'git', 'clone', '--quiet', '--mirror', '--', git_url,
+            temporary_path]):
+          return None
+
+        # Allow partial clones from the mirror.
+        if not self._RunCommand([
+            'git', '--git-dir', temporary_path, 'config',
+            'uploadpack.allowFilter', 'true']):
+          return None
+
+        os.rename(temporary_path, mirror_path)
+
+      self._updated_mirrors.add(git_url)
+
+    return mirror_path
@@ -6,5 +6,13 @@ class Error(Exception):
   """Generic error."""
 
 
+class AuthenticationError(Error):
+  """Authentication error."""
+
+
 class ConnectivityError(Error):
   """Connectivity error."""
+
+
+class ProtocolError(Error):
+  """Protocol error."""
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""Python source package metadata."""
+
+import configparser
+import email.parser
+import io
+import logging
+import os
+import re
+
+# Note that tomllib was added to Python 3.11, hence the tomli backport, which
+# provides the same interface, is used on earlier versions.
+try:
+  import tomllib
+except ImportError:
+  try:
+    import tomli as tomllib
+  except ImportError:
+    tomllib = None
+
+
+class PythonPackageMetadata(object):
+  """Python source package metadata.
+
+  Attributes:
+    build_requires (list[str]): RPM build requirements.
+    description (str): long description of the package.
+    has_data_package (bool): True if the package defines a separate data
+        sub package.
+    has_tools_package (bool): True if the package defines a separate tools
+        sub package.
+    license (str): license of the package.
+    maintainer (str): name and email address of the maintainer.
+    name (str): name of the package.
+    packager (str): name and email address of the packager.
+    requires (list[str]): RPM requirements.
+    summary (str): short description of the package.
+    url (str): homepage URL of the package.
+    version (str): version of the package.
+  """
+
+  def __init__(self):
+    """Initializes Python source package metadata."""
+    super(PythonPackageMetadata, self).__init__()
+    self.build_requires = []
+    self.description = None
+    self.has_data_package = False
+    self.has_tools_package = False
+    self.license = None
+    self.maintainer = None
+    self.name = None
+    self.packager = None
+    self.requires = []
+    self.summary = None
+    self.url = None
+    self.version = None
+
+
+class PythonPackageMetadataReader(object):
+  """Python source package metadata reader.
+
+  The metadata is read from the PKG-INFO, setup.cfg and pyproject.toml files
+  in the source directory, without running setup.py. Values from PKG-INFO take
+  precedence, since it contains the metadata as generated by the build system
+  of the package.
+
+  The RPM requirements are read from "requires" in the [bdist_rpm] section of
+  setup.cfg. If not defined, they are converted from the Python requirements
+  in "install_requires" in the [options] section of setup.cfg or from
+  "dependencies" in the [project] table of pyproject.toml, where the Python
+  package names are prefixed with "python3-".
+  """
+
+  # Markers in setup.py that indicate a custom bdist_rpm command, as generated
+  # by the l2tdevtools setup.py templates, that defines a data or tools sub
+  # package.
+  _DATA_PACKAGE_MARKER = '%package -n %{name}-data'
+  _TOOLS_PACKAGE_MARKER = '%package -n %{name}-tools'
+
+  _REQUIREMENT_RE = re.compile(
+      r'^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^]]*\])?\s*'
+      r'(?:(>=|==)\s*([^,;\s]+))?')
+
+  def _GetConfigValue(self, config_parser, section_name, value_name):
+    """Retrieves a value from the config parser.
+
+    Args:
+      config_parser (ConfigParser): configuration parser.
+      section_name (str): name of the section that contains the value.
+      value_name (str): name of the value.
+
+    Returns:
+      str: value or None if the value does not exists.
+    """
+    try:
+      return config_parser.get(section_name, value_name)
+    except (configparser.NoOptionError, configparser.NoSectionError):
+      return None
+
+  def _GetPKGInfoDescription(self, message):
+    """Retrieves the long description from a PKG-INFO message.
+
+    Args:
+      message (email.message.Message): PKG-INFO message.
+
+    Returns:
+      str: long description or None if not available.
+    """
+    description = message.get_payload()
+    if not description or not description.strip():
+      description = message.get('Description', None)
+      if not description:
+        return None
+
+      # Older metadata versions store the description in the header with
+      # continuation lines prefixed by 8 spaces and a "|".
+      lines = description.split('\n')
+      for index, line in enumerate(lines[1:]):
+        if line.startswith('        |'):
+          lines[index + 1] = line[9:]
+        else:
+          lines[index + 1] = line.strip()
+
+      description = '\n'.join(lines)
+
+    description = description.strip()
+    if not description or description == 'UNKNOWN':
+      return None
+
+    return description
+
+  def _GetRequiresFromPythonRequirements(self, requirements):
+    """Converts Python requirements into RPM requirements.
+
+    Args:
+      requirements (list[str]): Python requirements, such as "dfvfs >= 2021".
+
+    Returns:
+      list[str]: RPM requirements, such as "python3-dfvfs >= 2021".
+    """
+    requires = []
+    for requirement in requirements or []:
+      matches = self._REQUIREMENT_RE.match(requirement.strip())
+      if not matches:
+        continue
+
+      name, operator, version = matches.groups()
+      name = 'python3-{0:s}'.format(name.lower().replace('_', '-'))
+      if operator and version:
+        name = '{0:s} {1:s} {2:s}'.format(name, operator, version)
+
+      requires.append(name)
+
+    return requires
+
+  def _ReadPKGInfo(self, path, package_metadata):
+    """Reads the metadata from a PKG-INFO file.
+
+    Args:
+      path (str): path of the PKG-INFO file.
+      package_metadata (PythonPackageMetadata): package metadata to update.
+    """
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      message = email.parser.Parser().parse(file_object)
+
+    maintainer = message.get('Maintainer', None)
+    maintainer_email = message.get('Maintainer-email', None)
+    if not maintainer:
+      maintainer = message.get('Author', None)
+      maintainer_email = message.get('Author-email', None)
+
+    if maintainer and maintainer_email:
+      maintainer = '{0:s} <{1:s}>'.format(maintainer, maintainer_email)
+
+    package_metadata.description = self._GetPKGInfoDescription(message)
+    package_metadata.license = message.get('License', None)
+    package_metadata.maintainer = maintainer or maintainer_email
+    package_metadata.name = message.get('Name', None)
+    package_metadata.summary = message.get('Summary', None)
+    package_metadata.url = message.get('Home-page', None)
+    package_metadata.version = message.get('Version', None)
+
+    for value_name in ('license', 'maintainer', 'summary', 'url'):
+      if getattr(package_metadata, value_name, None) == 'UNKNOWN':
+        setattr(package_metadata, value_name, None)
+
+  def _ReadPyProjectToml(self, path, package_metadata):
+    """Reads the metadata from a pyproject.toml file.
+
+    Args:
+      path (str): path of the pyproject.toml file.
+      package_metadata (PythonPackageMetadata): package metadata to update.
+    """
+    if not tomllib:
+      logging.warning((
+          'Unable to read: {0:s} since tomllib or tomli is not '
+          'available.').format(path))
+      return
+
+    with io.open(path, 'rb') as file_object:
+      try:
+        pyproject = tomllib.load(file_object)
+      except tomllib.TOMLDecodeError:
+        return
+
+    project = pyproject.get('project', None) or {}
+
+    maintainers = project.get('maintainers', None) or project.get(
+        'authors', None) or []
+    maintainer = None
+    if maintainers:
+      name = maintainers[0].get('name', None)
+      email_address = maintainers[0].get('email', None)
+      if name and email_address:
+        maintainer = '{0:s} <{1:s}>'.format(name, email_address)
+      else:
+        maintainer = name or email_address
+
+    package_license = project.get('license', None)
+    if isinstance(package_license, dict):
+      package_license = package_license.get('text', None)
+
+    urls = project.get('urls', None) or {}
+    url = urls.get('Homepage', None) or urls.get('homepage', None)
+
+    package_metadata.license = package_metadata.license or package_license
+    package_metadata.maintainer = package_metadata.maintainer or maintainer
+    package_metadata.name = package_metadata.name or project.get('name', None)
+    package_metadata.summary = package_metadata.summary or project.get(
+        'description', None)
+    package_metadata.url = package_metadata.url or url
+    package_metadata.version = package_metadata.version or project.get(
+        'version', None)
+
+    if not package_metadata.requires:
+      package_metadata.requires = self._GetRequiresFromPythonRequirements(
+          project.get('dependencies', None))
+
+  def _ReadSetupCfg(self, path, package_metadata):
+    """Reads the metadata from a setup.cfg file.
+
+    Args:
+      path (str): path of the setup.cfg file.
+      package_metadata (PythonPackageMetadata): package metadata to update.
+    """
+    config_parser = configparser.ConfigParser(interpolation=None)
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      try:
+        config_parser.read_file(file_object)
+      except configparser.Error:
+        return
+
+    maintainer = self._GetConfigValue(config_parser, 'metadata', 'maintainer')
+    maintainer_email = self._GetConfigValue(
+        config_parser, 'metadata', 'maintainer_email')
+    if maintainer and maintainer_email:
+      maintainer = '{0:s} <{1:s}>'.format(maintainer, maintainer_email)
+
+    package_metadata.license = package_metadata.license or (
+        self._GetConfigValue(config_parser, 'metadata', 'license'))
+    package_metadata.maintainer = package_metadata.maintainer or maintainer
+    package_metadata.name = package_metadata.name or self._GetConfigValue(
+        config_parser, 'metadata', 'name')
+    package_metadata.summary = package_metadata.summary or (
+        self._GetConfigValue(config_parser, 'metadata', 'description'))
+    package_metadata.url = package_metadata.url or self._GetConfigValue(
+        config_parser, 'metadata', 'url')
+
+    # Note that the version in setup.cfg can refer to an attribute such as
+    # "attr: plaso.__version__" which cannot be resolved without importing.
+    version = self._GetConfigValue(config_parser, 'metadata', 'version')
+    if version and ':' not in version:
+      package_metadata.version = package_metadata.version or version
+
+    package_metadata.packager = self._GetConfigValue(
+        config_parser, 'bdist_rpm', 'packager')
+
+    build_requires = self._GetConfigValue(
+        config_parser, 'bdist_rpm', 'build_requires')
+    if build_requires:
+      package_metadata.build_requires = self._SplitConfigList(build_requires)
+
+    requires = self._GetConfigValue(config_parser, 'bdist_rpm', 'requires')
+    if requires:
+      package_metadata.requires = self._SplitConfigList(requires)
+
+    else:
+      install_requires = self._GetConfigValue(
+          config_parser, 'options', 'install_requires')
+      if install_requires:
+        # Note that a Python requirement can contain a comma, such as
+        # "PyYAML >= 3.10, < 7", hence it is only split by line.
+        package_metadata.requires = self._GetRequiresFromPythonRequirements(
+            install_requires.split('\n'))
+
+  def _ReadSetupPy(self, path, package_metadata):
+    """Reads the sub package definitions from a setup.py file.
+
+    Args:
+      path (str): path of the setup.py file.
+      package_metadata (PythonPackageMetadata): package metadata to update.
+    """
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      data = file_object.read()
+
+    package_metadata.has_data_package = self._DATA_PACKAGE_MARKER in data
+    package_metadata.has_tools_package = self._TOOLS_PACKAGE_MARKER in data
+
+  def _SplitConfigList(self, value):
+    """Splits a multi line or comma separated configuration value.
+
+    Args:
+      value (str): configuration value.
+
+    Returns:
+      list[str]: individual values.
+    """
+    values = []
+    for line in value.split('\n'):
+      values.extend([
+          segment.strip() for segment in line.split(',') if segment.strip()])
+
+    return values
+
+  def Read(self, source_directory):
+    """Reads the metadata of a Python source package.
+
+    Args:
+      source_directory (str): path of the source directory.
+
+    Returns:
+      PythonPackageMetadata: package metadata or None if the name or version
+          of the package could not be determined.
+    """
+    package_metadata = PythonPackageMetadata()
+
+    path = os.path.join(source_directory, 'PKG-INFO')
+    if os.path.isfile(path):
+      self._ReadPKGInfo(path, package_metadata)
+
+    path = os.path.join(source_directory, 'setup.cfg')
+    if os.path.isfile(path):
+      self._ReadSetupCfg(path, package_metadata)
+
+    path = os.path.join(source_directory, 'pyproject.toml')
+    if os.path.isfile(path):
+      self._ReadPyProjectToml(path, package_metadata)
+
+    path = os.path.join(source_directory, 'setup.py')
+    if os.path.isfile(path):
+      self._ReadSetupPy(path, package_metadata)
+
+    if not package_metadata.name or not package_metadata.version:
+      return None
+
+    return package_metadata
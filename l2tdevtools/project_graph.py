@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""Project dependency graph."""
+
+import heapq
+import re
+
+
+class ProjectDependencyGraph(object):
+  """Project dependency graph.
+
+  The dependencies of a project are defined as free-form package names in
+  build_dependencies, dpkg_build_dependencies, dpkg_dependencies and
+  rpm_build_dependencies, such as "python3-six", "libffi-devel" or
+  "libbde-python3". These package names are resolved to the projects that
+  provide them, using the project name and the dpkg_name, rpm_name,
+  srpm_name, pypi_name, setup_name and wheel_name aliases. Package names that
+  do not resolve to a project, such as system libraries, are kept as
+  unresolved dependencies.
+
+  Results of the graph queries are cached.
+  """
+
+  _DEPENDENCY_ATTRIBUTES = (
+      'build_dependencies', 'dpkg_build_dependencies', 'dpkg_dependencies',
+      'rpm_build_dependencies')
+
+  _ALIAS_ATTRIBUTES = (
+      'dpkg_name', 'rpm_name', 'srpm_name', 'pypi_name', 'setup_name',
+      'wheel_name')
+
+  _PACKAGE_NAME_PREFIXES = ('python2-', 'python3-', 'python-')
+
+  _PACKAGE_NAME_SUFFIXES = ('-devel', '-dev', '-python2', '-python3', '-python')
+
+  _VERSION_CONSTRAINT_RE = re.compile(r'[\s(<>=!~]')
+
+  def __init__(self, project_definitions):
+    """Initializes a project dependency graph.
+
+    Args:
+      project_definitions (list[ProjectDefinition]): project definitions.
+    """
+    super(ProjectDependencyGraph, self).__init__()
+    self._aliases = {}
+    self._build_order = None
+    self._cycles = None
+    self._dependencies = {}
+    self._project_names = {}
+    self._reverse_dependencies = {}
+    self._transitive_dependencies = {}
+    self._transitive_reverse_dependencies = {}
+    self._unresolved_dependencies = {}
+
+    project_definitions = list(project_definitions)
+    for project_definition in project_definitions:
+      self._project_names[project_definition.name.lower()] = (
+          project_definition.name)
+
+    for project_definition in project_definitions:
+      for alias in self._GetAliases(project_definition):
+        self._aliases.setdefault(alias, project_definition.name)
+
+    for project_definition in project_definitions:
+      self._dependencies[project_definition.name] = set()
+      self._reverse_dependencies.setdefault(project_definition.name, set())
+
+    for project_definition in project_definitions:
+      self._AddDependencies(project_definition)
+
+  def _AddDependencies(self, project_definition):
+    """Adds the dependencies of a project to the graph.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+    """
+    dependencies = self._dependencies[project_definition.name]
+    unresolved_dependencies = set()
+
+    for attribute_name in self._DEPENDENCY_ATTRIBUTES:
+      for package_name in getattr(project_definition, attribute_name) or []:
+        package_name = package_name.strip()
+        if not package_name:
+          continue
+
+        dependency = self.ResolveDependency(package_name)
+        if not dependency:
+          unresolved_dependencies.add(package_name)
+
+        # A project can depend on packages it provides itself, such as
+        # the Python bindings of a library.
+        elif dependency != project_definition.name:
+          dependencies.add(dependency)
+          self._reverse_dependencies[dependency].add(project_definition.name)
+
+    if unresolved_dependencies:
+      self._unresolved_dependencies[project_definition.name] = sorted(
+          unresolved_dependencies)
+
+  def _GetAliases(self, project_definition):
+    """Retrieves the normalized aliases of a project.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      set[str]: normalized aliases.
+    """
+    names = [project_definition.name]
+    for attribute_name in self._ALIAS_ATTRIBUTES:
+      name = getattr(project_definition, attribute_name, None)
+      if name:
+        names.append(name)
+
+    aliases = set()
+    for name in names:
+      name = self._NormalizePackageName(name)
+      aliases.add(name)
+      aliases.add(self._StripPackageName(name))
+
+    return aliases
+
+  def _GetClosure(self, project_name, edges, cache):
+    """Retrieves the transitive closure of a project.
+
+    Args:
+      project_name (str): name of the project.
+      edges (dict[str, set[str]]): edges of the graph per project.
+      cache (dict[str, list[str]]): cached closures per project.
+
+    Returns:
+      list[str]: names of the projects in the closure, in alphabetical order.
+    """
+    closure = cache.get(project_name, None)
+    if closure is None:
+      visited = set()
+      projects_to_visit = list(edges.get(project_name, []))
+      while projects_to_visit:
+        name = projects_to_visit.pop()
+        if name in visited:
+          continue
+
+        visited.add(name)
+        cached_closure = cache.get(name, None)
+        if cached_closure is not None:
+          visited.update(cached_closure)
+        else:
+          projects_to_visit.extend(edges[name])
+
+      # A project that is part of a cycle is not its own dependency.
+      visited.discard(project_name)
+
+      closure = sorted(visited)
+      cache[project_name] = closure
+
+    return closure
+
+  def _GetProjectName(self, project_name):
+    """Retrieves the name of a project as defined.
+
+    Args:
+      project_name (str): name of the project, which is case insensitive.
+
+    Returns:
+      str: name of the project.
+
+    Raises:
+      KeyError: if the project is not defined.
+    """
+    name = self._project_names.get(project_name.lower(), None)
+    if not name:
+      raise KeyError('Undefined project: {0:s}'.format(project_name))
+
+    return name
+
+  def _NormalizePackageName(self, package_name):
+    """Normalizes a package name.
+
+    Args:
+      package_name (str): package name, which can contain a version
+          constraint, such as "python3-six (>= 1.1.0)".
+
+    Returns:
+      str: normalized package name.
+    """
+    package_name = self._VERSION_CONSTRAINT_RE.split(package_name.strip())[0]
+    return package_name.lower().replace('_', '-')
+
+  def _StripPackageName(self, package_name):
+    """Strips the packaging prefix and suffix from a normalized package name.
+
+    Args:
+      package_name (str): normalized package name, such as "python3-six" or
+          "libbde-devel".
+
+    Returns:
+      str: package name without prefix and suffix.
+    """
+    for prefix in self._PACKAGE_NAME_PREFIXES:
+      if package_name.startswith(prefix):
+        package_name = package_name[len(prefix):]
+        break
+
+    for suffix in self._PACKAGE_NAME_SUFFIXES:
+      if package_name.endswith(suffix):
+        package_name = package_name[:-len(suffix)]
+        break
+
+    return package_name
+
+  def GetBuildOrder(self, project_names=None):
+    """Retrieves the order in which projects should be built.
+
+    Dependencies are built before the projects that depend on them. Projects
+    that do not depend on each other are in alphabetical order. Projects that
+    are part of a dependency cycle are built last.
+
+    Args:
+      project_names (Optional[list[str]]): names of the projects to order,
+          where None represents all projects.
+
+    Returns:
+      list[str]: names of the projects in build order.
+
+    Raises:
+      KeyError: if a project is not defined.
+    """
+    if self._build_order is None:
+      number_of_dependencies = {
+          name: len(dependencies)
+          for name, dependencies in self._dependencies.items()}
+
+      projects_heap = [
+          name for name, number in number_of_dependencies.items()
+          if number == 0]
+      heapq.heapify(projects_heap)
+
+      build_order = []
+      while projects_heap:
+        name = heapq.heappop(projects_heap)
+        build_order.append(name)
+
+        for reverse_dependency in self._reverse_dependencies[name]:
+          number_of_dependencies[reverse_dependency] -= 1
+          if number_of_dependencies[reverse_dependency] == 0:
+            heapq.heappush(projects_heap, reverse_dependency)
+
+      if len(build_order) < len(self._dependencies):
+        ordered_projects = set(build_order)
+        build_order.extend(sorted(
+            name for name in self._dependencies
+            if name not in ordered_projects))
+
+      self._build_order = {name: index for index, name in enumerate(
+          build_order)}
+
+    if project_names is None:
+      return sorted(self._build_order, key=self._build_order.get)
+
+    project_names = {self._GetProjectName(name) for name in project_names}
+    return sorted(project_names, key=self._build_order.get)
+
+  def GetCycles(self):
+    """Retrieves the dependency cycles.
+
+    Returns:
+      list[list[str]]: names of the projects per dependency cycle.
+    """
+    if self._cycles is None:
+      # Iterative version of Tarjan's strongly connected components algorithm.
+      indexes = {}
+      low_links = {}
+      stack = []
+      on_stack = set()
+      cycles = []
+
+      for root_name in sorted(self._dependencies):
+        if root_name in indexes:
+          continue
+
+        work_stack = [(root_name, iter(sorted(self._dependencies[root_name])))]
+        indexes[root_name] = low_links[root_name] = len(indexes)
+        stack.append(root_name)
+        on_stack.add(root_name)
+
+        while work_stack:
+          name, dependencies_iterator = work_stack[-1]
+
+          dependency = next(dependencies_iterator, None)
+          if dependency is not None:
+            if dependency not in indexes:
+              indexes[dependency] = low_links[dependency] = len(indexes)
+              stack.append(dependency)
+              on_stack.add(dependency)
+              work_stack.append((dependency, iter(sorted(
+                  self._dependencies[dependency]))))
+
+            elif dependency in on_stack:
+              low_links[name] = min(low_links[name], indexes[dependency])
+
+            continue
+
+          work_stack.pop()
+          if work_stack:
+            parent_name = work_stack[-1][0]
+            low_links[parent_name] = min(
+                low_links[parent_name], low_links[name])
+
+          if low_links[name] == indexes[name]:
+            component = []
+            while True:
+              component_name = stack.pop()
+              on_stack.remove(component_name)
+              component.append(component_name)
+              if component_name == name:
+                break
+
+            if len(component) > 1:
+              cycles.append(sorted(component))
+
+      self._cycles = sorted(cycles)
+
+    return [list(cycle) for cycle in self._cycles]
+
+  def GetDependencies(self, project_name, transitive=False):
+    """Retrieves the projects a project depends on.
+
+    Args:
+      project_name (str): name of the project.
+      transitive (Optional[bool]): True if the dependencies of dependencies
+          should be included.
+
+    Returns:
+      list[str]: names of the projects, in alphabetical order.
+
+    Raises:
+      KeyError: if the project is not defined.
+    """
+    project_name = self._GetProjectName(project_name)
+    if not transitive:
+      return sorted(self._dependencies[project_name])
+
+    return list(self._GetClosure(
+        project_name, self._dependencies, self._transitive_dependencies))
+
+  def GetReverseDependencies(self, project_name, transitive=False):
+    """Retrieves the projects that depend on a project.
+
+    The transitive reverse dependencies of a project are the projects that
+    must be rebuilt if the project changes.
+
+    Args:
+      project_name (str): name of the project.
+      transitive (Optional[bool]): True if the reverse dependencies of reverse
+          dependencies should be included.
+
+    Returns:
+      list[str]: names of the projects, in alphabetical order.
+
+    Raises:
+      KeyError: if the project is not defined.
+    """
+    project_name = self._GetProjectName(project_name)
+    if not transitive:
+      return sorted(self._reverse_dependencies[project_name])
+
+    return list(self._GetClosure(
+        project_name, self._reverse_dependencies,
+        self._transitive_reverse_dependencies))
+
+  def GetUnresolvedDependencies(self):
+    """Retrieves the dependencies that do not resolve to a project.
+
+    Returns:
+      dict[str, list[str]]: package names of the unresolved dependencies per
+          project name.
+    """
+    return {
+        name: list(package_names)
+        for name, package_names in self._unresolved_dependencies.items()}
+
+  def ResolveDependency(self, package_name):
+    """Resolves a dependency package name to a project.
+
+    Args:
+      package_name (str): package name, such as "python3-six",
+          "libbde-devel" or "python3-six (>= 1.1.0)".
+
+    Returns:
+      str: name of the project that provides the package or None if the
+          package is not provided by a project.
+    """
+    package_name = self._NormalizePackageName(package_name)
+
+    project_name = self._aliases.get(package_name, None)
+    if not project_name:
+      project_name = self._aliases.get(
+          self._StripPackageName(package_name), None)
+
+    return project_name
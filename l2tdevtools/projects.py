@@ -46,7 +46,12 @@ class ProjectDefinition(object):
     pypi_name (str): name of the project on PyPI.
     pypi_source_name (str): name used in the source package file on PyPI.
     rpm_build_dependencies (list[str]): rpm build dependencies.
+    rpm_exclude_files (list[str]): paths of the files to exclude from the rpm
+        package, such as "%{_bindir}/*".
     rpm_name (str): RPM package name.
+    rpm_source_directory (str): name of the source directory in the source
+        package, as used in the rpm spec file, such as
+        "%{name}-release-%{version}".
     rpm_template_spec (str): name of the rpm spec file.
     setup_name (str): project name used in setup.py.
     srpm_name (str): source RPM package name.
@@ -88,7 +93,9 @@ class ProjectDefinition(object):
     self.name = name
     self.msi_prebuild = None
     self.rpm_build_dependencies = None
+    self.rpm_exclude_files = None
     self.rpm_name = None
+    self.rpm_source_directory = None
     self.rpm_template_spec = None
     self.patches = None
     self.pkg_configure_options = None
@@ -257,8 +264,12 @@ class ProjectDefinitionReader(object):
           config_parser, section_name, 'msi_prebuild')
       project_definition.rpm_build_dependencies = self._GetConfigValue(
           config_parser, section_name, 'rpm_build_dependencies')
+      project_definition.rpm_exclude_files = self._GetConfigValue(
+          config_parser, section_name, 'rpm_exclude_files')
       project_definition.rpm_name = self._GetConfigValue(
           config_parser, section_name, 'rpm_name')
+      project_definition.rpm_source_directory = self._GetConfigValue(
+          config_parser, section_name, 'rpm_source_directory')
       project_definition.rpm_template_spec = self._GetConfigValue(
           config_parser, section_name, 'rpm_template_spec')
       project_definition.patches = self._GetConfigValue(
@@ -338,6 +349,12 @@ class ProjectDefinitionReader(object):
         project_definition.rpm_build_dependencies = (
             project_definition.rpm_build_dependencies.split(','))
 
+      if project_definition.rpm_exclude_files is None:
+        project_definition.rpm_exclude_files = []
+      elif isinstance(project_definition.rpm_exclude_files, str):
+        project_definition.rpm_exclude_files = (
+            project_definition.rpm_exclude_files.split(','))
+
       if project_definition.patches is None:
         project_definition.patches = []
       elif isinstance(project_definition.patches, str):
@@ -2,12 +2,45 @@
 """Helper for interacting with git."""
 
 import os
+import threading
 
 from l2tdevtools.review_helpers import cli
 
 
+class GitRepositoryState(object):
+  """Snapshot of the state of a git repository.
+
+  Attributes:
+    active_branch (str): name of the active branch or None if not available,
+        for example if HEAD is detached.
+    branches (list[str]): names of the local branches.
+    changed_files (dict[str, list[str]]): names of the changed files per
+        diffbase, where None represents all files tracked by git.
+    head (str): commit identifier of HEAD or None if not available.
+    remotes (list[str]): git repository remotes, in the format of the output
+        of "git remote -v".
+    status (list[str]): entries of the status of the working tree, in the
+        format of the output of "git status --porcelain=v2".
+  """
+
+  def __init__(self):
+    """Initializes a git repository state."""
+    super(GitRepositoryState, self).__init__()
+    self.active_branch = None
+    self.branches = []
+    self.changed_files = {}
+    self.head = None
+    self.remotes = []
+    self.status = []
+
+
 class GitHelper(cli.CLIHelper):
-  """Git command helper."""
+  """Git command helper.
+
+  Questions about the state of the git repository are answered from a
+  snapshot of the state, which is gathered with a minimal number of git
+  invocations on first use and discarded by commands that change the state.
+  """
 
   def __init__(self, git_repo_url):
     """Initializes a git helper.
@@ -17,20 +50,67 @@ class GitHelper(cli.CLIHelper):
     """
     super(GitHelper, self).__init__()
     self._git_repo_url = git_repo_url
-    self._remotes = []
+    self._lock = threading.Lock()
+    self._state = None
 
   def _GetRemotes(self):
     """Retrieves the git repository remotes.
 
     Returns:
-      list[str]: git repository remotes or None.
+      list[str]: git repository remotes.
+    """
+    return self.GetState().remotes
+
+  def _InvalidateState(self):
+    """Discards the snapshot of the state of the git repository."""
+    with self._lock:
+      self._state = None
+
+  def _ReadBranches(self, state):
+    """Reads the local branches into the state.
+
+    Args:
+      state (GitRepositoryState): state of the git repository.
     """
-    if not self._remotes:
-      exit_code, output, _ = self.RunCommand('git remote -v')
-      if exit_code == 0:
-        self._remotes = list(filter(None, output.split('\n')))
+    exit_code, output, _ = self.RunCommand(
+        'git for-each-ref --format=%(refname:short) refs/heads/')
+    if exit_code == 0:
+      state.branches = list(filter(None, output.split('\n')))
 
-    return self._remotes
+  def _ReadRemotes(self, state):
+    """Reads the remotes into the state.
+
+    Args:
+      state (GitRepositoryState): state of the git repository.
+    """
+    exit_code, output, _ = self.RunCommand('git remote -v')
+    if exit_code == 0:
+      state.remotes = list(filter(None, output.split('\n')))
+
+  def _ReadStatus(self, state):
+    """Reads the active branch, HEAD and status into the state.
+
+    Args:
+      state (GitRepositoryState): state of the git repository.
+    """
+    exit_code, output, _ = self.RunCommand(
+        'git status --porcelain=v2 --branch')
+    if exit_code != 0:
+      return
+
+    for line in output.split('\n'):
+      if line.startswith('# branch.head '):
+        branch = line[14:]
+        if branch != '(detached)':
+          state.active_branch = branch
+
+      elif line.startswith('# branch.oid '):
+        head = line[13:]
+        if head != '(initial)':
+          state.head = head
+
+      elif line and not line.startswith('# '):
+        state.status.append(line)
 
   def AddPath(self, path):
     """Adds a specific path to be managed by git.
@@ -43,6 +123,7 @@ class GitHelper(cli.CLIHelper):
     """
     command = 'git add -A {0:s}'.format(path)
     exit_code, _, _ = self.RunCommand(command)
+    self._InvalidateState()
     return exit_code == 0
 
   def CheckHasBranch(self, branch):
@@ -54,16 +135,7 @@ class GitHelper(cli.CLIHelper):
     Returns:
       bool: True if git repo has the specific branch.
     """
-    exit_code, output, _ = self.RunCommand('git branch')
-    if exit_code != 0:
-      return False
-
-    # Check for remote entries starting with upstream.
-    for line in output.split('\n'):
-      # Ignore the first 2 characters of the line.
-      if line[2:] == branch:
-        return True
-    return False
+    return branch in self.GetState().branches
 
   def CheckHasProjectOrigin(self):
     """Checks if the git repo has the project remote origin defined.
@@ -97,15 +169,7 @@ class GitHelper(cli.CLIHelper):
     Returns:
       bool: True if the git repo has uncommitted changes.
     """
-    exit_code, output, _ = self.RunCommand('git status -s')
-    if exit_code != 0:
-      return False
-
-    # Check if 'git status -s' yielded any output.
-    for line in output.split('\n'):
-      if line:
-        return True
-    return False
+    return bool(self.GetState().status)
 
   def CheckSynchronizedWithUpstream(self):
     """Checks if the git repo is synchronized with upstream.
@@ -117,6 +181,7 @@ class GitHelper(cli.CLIHelper):
     # the main branch. Otherwise the information about the current
     # upstream HEAD is not updated.
     exit_code, _, _ = self.RunCommand('git fetch upstream')
+    self._InvalidateState()
     if exit_code != 0:
       return False
 
@@ -130,6 +195,7 @@ class GitHelper(cli.CLIHelper):
     """Drops the uncommitted changes."""
     self.RunCommand('git stash')
     self.RunCommand('git stash drop')
+    self._InvalidateState()
 
   def GetActiveBranch(self):
     """Retrieves the active branch.
@@ -137,16 +203,7 @@ class GitHelper(cli.CLIHelper):
     Returns:
       str: name of the active branch or None if not available.
     """
-    exit_code, output, _ = self.RunCommand('git branch')
-    if exit_code != 0:
-      return False
-
-    # Check for remote entries starting with upstream.
-    for line in output.split('\n'):
-      if line.startswith('* '):
-        # Ignore the first 2 characters of the line.
-        return line[2:]
-    return None
+    return self.GetState().active_branch
 
   def GetChangedFiles(self, diffbase=None):
     """Retrieves the changed files.
@@ -157,16 +214,27 @@ class GitHelper(cli.CLIHelper):
     Returns:
       list[str]: names of the changed files.
     """
-    if diffbase:
-      command = 'git diff --name-only {0:s}'.format(diffbase)
-    else:
-      command = 'git ls-files'
+    state = self.GetState()
 
-    exit_code, output, _ = self.RunCommand(command)
-    if exit_code != 0:
-      return []
+    with self._lock:
+      changed_files = state.changed_files.get(diffbase, None)
+
+    if changed_files is None:
+      if diffbase:
+        command = 'git diff --name-only {0:s}'.format(diffbase)
+      else:
+        command = 'git ls-files'
+
+      exit_code, output, _ = self.RunCommand(command)
+      if exit_code != 0:
+        return []
+
+      changed_files = output.split('\n')
 
-    return output.split('\n')
+      with self._lock:
+        state.changed_files[diffbase] = changed_files
+
+    return list(changed_files)
 
   def GetChangedPythonFiles(self, diffbase=None):
     """Retrieves the changed Python files.
@@ -231,6 +299,22 @@ class GitHelper(cli.CLIHelper):
 
     return None
 
+  def GetState(self):
+    """Retrieves a snapshot of the state of the git repository.
+
+    Returns:
+      GitRepositoryState: state of the git repository.
+    """
+    with self._lock:
+      if not self._state:
+        state = GitRepositoryState()
+        self._ReadStatus(state)
+        self._ReadBranches(state)
+        self._ReadRemotes(state)
+        self._state = state
+
+      return self._state
+
   def PullFromFork(self, git_repo_url, branch):
     """Pulls changes from a feature branch on a fork.
 
@@ -243,6 +327,7 @@ class GitHelper(cli.CLIHelper):
     """
     command = 'git pull --squash {0:s} {1:s}'.format(git_repo_url, branch)
     exit_code, _, _ = self.RunCommand(command)
+    self._InvalidateState()
     return exit_code == 0
 
   def PushToOrigin(self, branch, force=False):
@@ -274,6 +359,7 @@ class GitHelper(cli.CLIHelper):
 
     self.RunCommand('git push origin --delete {0:s}'.format(branch))
     self.RunCommand('git branch -D {0:s}'.format(branch))
+    self._InvalidateState()
 
   def SynchronizeWithOrigin(self):
     """Synchronizes git with origin.
@@ -286,6 +372,7 @@ class GitHelper(cli.CLIHelper):
       return False
 
     exit_code, _, _ = self.RunCommand('git pull --no-edit origin main')
+    self._InvalidateState()
 
     return exit_code == 0
 
@@ -301,6 +388,7 @@ class GitHelper(cli.CLIHelper):
 
     exit_code, _, _ = self.RunCommand(
         'git pull --no-edit --rebase upstream main')
+    self._InvalidateState()
     if exit_code != 0:
       return False
 
@@ -315,4 +403,5 @@ class GitHelper(cli.CLIHelper):
       bool: True if the git repository has switched to the main branch.
     """
     exit_code, _, _ = self.RunCommand('git checkout main')
+    self._InvalidateState()
     return exit_code == 0
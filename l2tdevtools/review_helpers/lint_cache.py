@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Cache of lint results."""
+
+import hashlib
+import io
+import json
+import os
+
+
+class LintResultCache(object):
+  """Cache of the files that were linted without errors.
+
+  A file is considered clean if its content, identified by the git blob hash,
+  was linted without errors by a linter with the same configuration before.
+  The configuration key identifies the linter configuration, such as the
+  linter version, its configuration file and the disabled checks. All cached
+  results are discarded when the configuration key changes.
+  """
+
+  _FORMAT_VERSION = 1
+
+  def __init__(self, path, configuration_key):
+    """Initializes a lint result cache.
+
+    Args:
+      path (str): path of the cache file.
+      configuration_key (str): key that identifies the linter configuration.
+    """
+    super(LintResultCache, self).__init__()
+    self._blob_hashes = {}
+    self._configuration_key = configuration_key
+    self._path = path
+
+  def _GetBlobHash(self, filename):
+    """Calculates the git blob hash of a file.
+
+    Args:
+      filename (str): name of the file.
+
+    Returns:
+      str: git blob hash of the file or None if the file cannot be read.
+    """
+    try:
+      with io.open(filename, 'rb') as file_object:
+        data = file_object.read()
+    except IOError:
+      return None
+
+    hash_context = hashlib.sha1()
+    hash_context.update('blob {0:d}\x00'.format(len(data)).encode('ascii'))
+    hash_context.update(data)
+    return hash_context.hexdigest()
+
+  def IsClean(self, filename):
+    """Determines if a file was linted without errors before.
+
+    Args:
+      filename (str): name of the file.
+
+    Returns:
+      bool: True if the current content of the file was linted without
+          errors before.
+    """
+    blob_hash = self._blob_hashes.get(os.path.normpath(filename), None)
+    if not blob_hash:
+      return False
+
+    return blob_hash == self._GetBlobHash(filename)
+
+  def MarkClean(self, filename):
+    """Marks the current content of a file as linted without errors.
+
+    Args:
+      filename (str): name of the file.
+    """
+    blob_hash = self._GetBlobHash(filename)
+    if blob_hash:
+      self._blob_hashes[os.path.normpath(filename)] = blob_hash
+
+  def MarkFailed(self, filename):
+    """Marks a file as linted with errors.
+
+    Args:
+      filename (str): name of the file.
+    """
+    self._blob_hashes.pop(os.path.normpath(filename), None)
+
+  def Read(self):
+    """Reads the cache file.
+
+    Cached results of a different format or configuration are ignored.
+    """
+    self._blob_hashes = {}
+
+    try:
+      with io.open(self._path, 'r', encoding='utf-8') as file_object:
+        cache_values = json.load(file_object)
+    except (IOError, ValueError):
+      return
+
+    if not isinstance(cache_values, dict):
+      return
+
+    if (cache_values.get('format_version', None) != self._FORMAT_VERSION or
+        cache_values.get('configuration', None) != self._configuration_key):
+      return
+
+    blob_hashes = cache_values.get('files', None)
+    if isinstance(blob_hashes, dict):
+      self._blob_hashes = blob_hashes
+
+  def Write(self):
+    """Writes the cache file."""
+    cache_values = {
+        'configuration': self._configuration_key,
+        'files': self._blob_hashes,
+        'format_version': self._FORMAT_VERSION}
+
+    # Write to a temporary file first so that an interrupted write does not
+    # leave a corrupt cache file.
+    temporary_path = '{0:s}.tmp'.format(self._path)
+    try:
+      with io.open(temporary_path, 'w', encoding='utf-8') as file_object:
+        json.dump(cache_values, file_object, indent=1, sort_keys=True)
+
+      os.replace(temporary_path, self._path)
+
+    except (IOError, OSError):
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 """Helper for interacting with pylint."""
 
+import concurrent.futures
+import hashlib
 import os
-import subprocess
 
 from l2tdevtools.review_helpers import cli
+from l2tdevtools.review_helpers import lint_cache
 
 
 class PylintHelper(cli.CLIHelper):
@@ -15,8 +17,50 @@ class PylintHelper(cli.CLIHelper):
   _MINIMUM_VERSION_TUPLE = tuple(
       [int(digit, 10) for digit in MINIMUM_VERSION.split('.')])
 
+  _MESSAGE_TEMPLATE = '{path}:{line}:{column}: {msg_id}: {msg} ({symbol})'
+
   _RCFILE_NAME = '.pylintrc'
 
+  def _GetConfigurationKey(self, rcfile, version_tuple):
+    """Retrieves a key that identifies the linter configuration.
+
+    Args:
+      rcfile (str): path to the pylint configuration file to use.
+      version_tuple (tuple[int]): pylint version as a tuple of integers.
+
+    Returns:
+      str: key that identifies the linter configuration.
+    """
+    hash_context = hashlib.sha256()
+    hash_context.update('{0!s}\n{1:s}\n'.format(
+        version_tuple, ','.join(self._GetDisabledChecks(
+            version_tuple))).encode('utf-8'))
+
+    try:
+      with open(rcfile, 'rb') as file_object:
+        hash_context.update(file_object.read())
+    except IOError:
+      pass
+
+    return hash_context.hexdigest()
+
+  def _GetDisabledChecks(self, version_tuple):
+    """Retrieves the checks to disable in addition to the configuration file.
+
+    Args:
+      version_tuple (tuple[int]): pylint version as a tuple of integers.
+
+    Returns:
+      list[str]: names of the checks to disable.
+    """
+    # For now disable pylint 2.1.1 and later specific checks.
+    if version_tuple >= (2, 1, 1):
+      return [
+          'assignment-from-none', 'chained-comparison',
+          'useless-object-inheritance']
+
+    return []
+
   def _GetVersion(self):
     """Retrieves the pylint version.
 
@@ -39,39 +83,209 @@ class PylintHelper(cli.CLIHelper):
 
     return version_tuple
 
-  def CheckFiles(self, filenames, rcfile):
+  def _GetCommand(self, filenames, rcfile, version_tuple):
+    """Retrieves the pylint command to lint a batch of files.
+
+    Args:
+      filenames (list[str]): names of the files to lint.
+      rcfile (str): path to the pylint configuration file to use.
+      version_tuple (tuple[int]): pylint version as a tuple of integers.
+
+    Returns:
+      str: pylint command.
+    """
+    command = (
+        'pylint --rcfile="{0:s}" --score=n --msg-template="{1:s}"').format(
+            rcfile, self._MESSAGE_TEMPLATE)
+
+    disabled_checks = self._GetDisabledChecks(version_tuple)
+    if disabled_checks:
+      command = '{0:s} --disable={1:s}'.format(
+          command, ','.join(disabled_checks))
+
+    return '{0:s} {1:s}'.format(command, ' '.join(filenames))
+
+  def _ParseOutput(self, output, filenames):
+    """Parses the combined pylint output of a batch of files.
+
+    Args:
+      output (str): output of pylint.
+      filenames (list[str]): names of the files that were linted.
+
+    Returns:
+      tuple[dict[str, list[str]], list[str]]: linter messages per filename and
+          messages that could not be attributed to a file.
+    """
+    filenames_per_path = {
+        os.path.normpath(filename): filename for filename in filenames}
+
+    messages_per_filename = {filename: [] for filename in filenames}
+    unattributed_messages = []
+    for line in (output or '').split('\n'):
+      line = line.rstrip()
+      if not line or line.startswith('*************'):
+        continue
+
+      path, _, _ = line.partition(':')
+      filename = filenames_per_path.get(os.path.normpath(path), None)
+      if filename:
+        messages_per_filename[filename].append(line)
+      else:
+        unattributed_messages.append(line)
+
+    return messages_per_filename, unattributed_messages
+
+  def _PartitionFiles(self, filenames, number_of_batches):
+    """Partitions files into batches of roughly equal total file size.
+
+    Args:
+      filenames (list[str]): names of the files to partition.
+      number_of_batches (int): number of batches.
+
+    Returns:
+      list[list[str]]: batches of filenames, where every batch is non-empty.
+    """
+    file_sizes = {}
+    for filename in filenames:
+      try:
+        file_sizes[filename] = os.path.getsize(filename)
+      except OSError:
+        file_sizes[filename] = 0
+
+    number_of_batches = min(number_of_batches, len(filenames))
+    batch_sizes = [0] * number_of_batches
+
+    # Assign the largest files first, each to the batch with the smallest
+    # total size.
+    batch_indexes = {}
+    for filename in sorted(
+        filenames, key=lambda filename: (-file_sizes[filename], filename)):
+      batch_index = batch_sizes.index(min(batch_sizes))
+      batch_indexes[filename] = batch_index
+      batch_sizes[batch_index] += file_sizes[filename]
+
+    # Keep the files within a batch in their original order.
+    batches = [[] for _ in range(number_of_batches)]
+    for filename in filenames:
+      batches[batch_indexes[filename]].append(filename)
+
+    return [batch for batch in batches if batch]
+
+  def _RunBatch(self, filenames, rcfile, version_tuple):
+    """Lints a batch of files with a single pylint invocation.
+
+    Args:
+      filenames (list[str]): names of the files to lint.
+      rcfile (str): path to the pylint configuration file to use.
+      version_tuple (tuple[int]): pylint version as a tuple of integers.
+
+    Returns:
+      tuple[dict[str, list[str]], list[str]]: linter messages per filename and
+          names of the files that failed linting.
+    """
+    command = self._GetCommand(filenames, rcfile, version_tuple)
+    exit_code, output, error = self.RunCommand(command)
+
+    messages_per_filename, unattributed_messages = self._ParseOutput(
+        output, filenames)
+
+    failed_filenames = [
+        filename for filename in filenames
+        if messages_per_filename[filename]]
+
+    # If pylint failed without reporting messages for a specific file, such as
+    # on a usage error or crash, consider every file in the batch as failed.
+    if exit_code != 0 and not failed_filenames:
+      failed_filenames = list(filenames)
+      for filename in filenames:
+        messages_per_filename[filename] = unattributed_messages or [
+            line for line in (error or '').split('\n') if line.strip()]
+
+    return messages_per_filename, failed_filenames
+
+  def CheckFiles(
+      self, filenames, rcfile, cache_path=None, number_of_jobs=None):
     """Checks if the linting of the files is correct using pylint.
 
+    The files are partitioned by file size into batches, which are linted
+    concurrently, each by a single pylint invocation, to reduce the start up
+    and import parsing overhead of running pylint per file.
+
     Args:
       filenames (list[str]): names of the files to lint.
       rcfile (str): path to the pylint configuration file to use.
+      cache_path (Optional[str]): path of the lint result cache file, where
+          None represents no cache is used. Files of which the content was
+          linted without errors with the same pylint version, configuration
+          file and disabled checks before are not linted again.
+      number_of_jobs (Optional[int]): number of concurrent pylint invocations,
+          where None represents the number of CPUs.
 
     Returns:
       bool: True if the files were linted without errors.
     """
+    if not filenames:
+      return True
+
     version_tuple = self._GetVersion()
 
+    lint_result_cache = None
+    if cache_path:
+      configuration_key = self._GetConfigurationKey(rcfile, version_tuple)
+      lint_result_cache = lint_cache.LintResultCache(
+          cache_path, configuration_key)
+      lint_result_cache.Read()
+
     print('Running linter on changed files.')
-    failed_filenames = []
-    for filename in filenames:
+
+    filenames_to_lint = filenames
+    if lint_result_cache:
+      filenames_to_lint = [
+          filename for filename in filenames
+          if not lint_result_cache.IsClean(filename)]
+
+      number_of_skipped_files = len(filenames) - len(filenames_to_lint)
+      if number_of_skipped_files:
+        print('Skipping: {0:d} unchanged files without linter errors.'.format(
+            number_of_skipped_files))
+
+    if not filenames_to_lint:
+      return True
+
+    number_of_jobs = number_of_jobs or os.cpu_count() or 1
+    batches = self._PartitionFiles(filenames_to_lint, number_of_jobs)
+
+    messages_per_filename = {}
+    failed_filenames = set()
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(batches)) as executor:
+      futures = [
+          executor.submit(self._RunBatch, batch, rcfile, version_tuple)
+          for batch in batches]
+
+      for future in futures:
+        batch_messages, batch_failed_filenames = future.result()
+        messages_per_filename.update(batch_messages)
+        failed_filenames.update(batch_failed_filenames)
+
+    for filename in filenames_to_lint:
       print('Checking: {0:s}'.format(filename))
+      for message in messages_per_filename.get(filename, []):
+        print(message)
 
-      command = 'pylint --rcfile="{0:s}" {1:s}'.format(rcfile, filename)
-      # For now disable pylint 2.1.1 and later specific checks.
-      if version_tuple >= (2, 1, 1):
-        additional_checks = [
-            'assignment-from-none', 'chained-comparison',
-            'useless-object-inheritance']
-        command = '{0:s} --disable={1:s}'.format(
-            command, ','.join(additional_checks))
+    if lint_result_cache:
+      for filename in filenames_to_lint:
+        if filename in failed_filenames:
+          lint_result_cache.MarkFailed(filename)
+        else:
+          lint_result_cache.MarkClean(filename)
 
-      exit_code = subprocess.call(command, shell=True)
-      if exit_code != 0:
-        failed_filenames.append(filename)
+      lint_result_cache.Write()
 
     if failed_filenames:
-      print('\nFiles with linter errors:\n{0:s}\n'.format(
-          '\n'.join(failed_filenames)))
+      print('\nFiles with linter errors:\n{0:s}\n'.format('\n'.join([
+          filename for filename in filenames_to_lint
+          if filename in failed_filenames])))
       return False
 
     return True
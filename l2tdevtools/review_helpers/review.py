@@ -2,6 +2,7 @@
 """Helper for conducting code reviews."""
 
 
+import concurrent.futures
 import os
 import re
 import subprocess
@@ -11,11 +12,19 @@ from l2tdevtools.helpers import project
 from l2tdevtools.review_helpers import git
 from l2tdevtools.review_helpers import github
 from l2tdevtools.review_helpers import pylint
+from l2tdevtools.review_helpers import test_impact
+from l2tdevtools.review_helpers import test_runner
 
 
 class ReviewHelper(object):
   """Helper for conducting code reviews."""
 
+  _IMPORT_GRAPH_CACHE_FILENAME = 'l2tdevtools-import-graph.json'
+
+  _LINT_CACHE_FILENAME = 'l2tdevtools-lint-cache.json'
+
+  _TEST_DURATIONS_FILENAME = 'l2tdevtools-test-durations.json'
+
   _PROJECT_NAME_PREFIX_REGEX = re.compile(
       r'\[({0:s})\] '.format(
           '|'.join(project.ProjectHelper.SUPPORTED_PROJECTS)))
@@ -26,7 +35,8 @@ class ReviewHelper(object):
 
   def __init__(
       self, command, project_path, github_origin, feature_branch,
-      all_files=False):
+      all_files=False, number_of_test_workers=None,
+      only_impacted_tests=False):
     """Initializes a review helper.
 
     Args:
@@ -35,7 +45,13 @@ class ReviewHelper(object):
       github_origin (str): GitHub origin.
       feature_branch (str): feature branch.
       all_files (Optional[bool]): True if the command should apply to all
-          files. Currently this only affects the lint command.
+          files. Currently this affects the lint command and the selection
+          of tests to run.
+      number_of_test_workers (Optional[int]): number of worker processes to
+          run the tests in, where 0 represents the number of CPUs and None
+          represents running the tests with run_tests.py.
+      only_impacted_tests (Optional[bool]): True if only the tests impacted
+          by the changed files should be run.
     """
     super(ReviewHelper, self).__init__()
     self._active_branch = None
@@ -50,6 +66,8 @@ class ReviewHelper(object):
     self._fork_feature_branch = None
     self._fork_username = None
     self._maintainer = None
+    self._number_of_test_workers = number_of_test_workers
+    self._only_impacted_tests = only_impacted_tests
     self._project_helper = None
     self._project_name = None
     self._project_path = project_path
@@ -187,7 +205,16 @@ class ReviewHelper(object):
         diffbase=diffbase)
 
     pylint_configuration = pylint_helper.GetRCFile(self._project_path)
-    if not pylint_helper.CheckFiles(changed_python_files, pylint_configuration):
+
+    # Keep the lint result cache in the .git directory so that it persists
+    # across runs without being part of the working tree.
+    cache_path = None
+    git_directory = os.path.join(self._project_path, '.git')
+    if os.path.isdir(git_directory):
+      cache_path = os.path.join(git_directory, self._LINT_CACHE_FILENAME)
+
+    if not pylint_helper.CheckFiles(
+        changed_python_files, pylint_configuration, cache_path=cache_path):
       print('{0:s} aborted - unable to pass linter.'.format(
           self._command.title()))
 
@@ -195,6 +222,21 @@ class ReviewHelper(object):
 
     return True
 
+  def LintAndTest(self):
+    """Lints and tests a review concurrently.
+
+    Returns:
+      bool: True if linting and testing were successful.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+      lint_future = executor.submit(self.Lint)
+      test_future = executor.submit(self.Test)
+
+      lint_result = lint_future.result()
+      test_result = test_future.result()
+
+    return lint_result and test_result
+
   def Test(self):
     """Tests a review.
 
@@ -208,11 +250,44 @@ class ReviewHelper(object):
         'create-pr', 'create_pr', 'lint-test', 'lint_test', 'test'):
       return True
 
-    # TODO: determine why this alters the behavior of argparse.
-    # Currently affects this script being used in plaso.
-    command = '{0:s} run_tests.py'.format(sys.executable)
-    exit_code = subprocess.call(command, shell=True)
-    if exit_code != 0:
+    if self._only_impacted_tests or self._number_of_test_workers is not None:
+      durations_path = None
+      import_graph_cache_path = None
+      git_directory = os.path.join(self._project_path, '.git')
+      if os.path.isdir(git_directory):
+        durations_path = os.path.join(
+            git_directory, self._TEST_DURATIONS_FILENAME)
+        import_graph_cache_path = os.path.join(
+            git_directory, self._IMPORT_GRAPH_CACHE_FILENAME)
+
+      sharded_test_runner = test_runner.ShardedTestRunner(
+          self._project_path, durations_path=durations_path,
+          number_of_workers=self._number_of_test_workers or None)
+
+      module_names = None
+      if self._only_impacted_tests and not self._all_files:
+        changed_files = self._git_helper.GetChangedFiles(
+            diffbase='origin/main')
+
+        test_impact_selector = test_impact.TestImpactSelector(
+            self._project_path, cache_path=import_graph_cache_path)
+        module_names = test_impact_selector.SelectTestModules(
+            changed_files, sharded_test_runner.DiscoverTestModules())
+
+        print((
+            'Running {0:d} test modules impacted by {1:d} changed '
+            'files.').format(len(module_names), len(changed_files)))
+
+      result = sharded_test_runner.Run(module_names=module_names)
+
+    else:
+      # TODO: determine why this alters the behavior of argparse.
+      # Currently affects this script being used in plaso.
+      command = '{0:s} run_tests.py'.format(sys.executable)
+      exit_code = subprocess.call(command, shell=True)
+      result = exit_code == 0
+
+    if not result:
       print('{0:s} aborted - unable to pass review.'.format(
           self._command.title()))
 
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""Selection of the test modules impacted by changed files."""
+
+import ast
+import io
+import json
+import os
+
+
+class ImportGraph(object):
+  """Import graph of the Python modules of a project."""
+
+  def __init__(self):
+    """Initializes an import graph."""
+    super(ImportGraph, self).__init__()
+    self._imported_by = {}
+    self._module_names = set()
+
+  def AddModule(self, module_name, imported_module_names):
+    """Adds a module to the graph.
+
+    Args:
+      module_name (str): name of the module, such as "l2tdevtools.projects".
+      imported_module_names (list[str]): names of the modules imported by
+          the module.
+    """
+    self._module_names.add(module_name)
+
+    for imported_module_name in imported_module_names:
+      self._imported_by.setdefault(imported_module_name, set()).add(
+          module_name)
+
+  def GetDependentModules(self, module_names):
+    """Retrieves the modules that transitively import specific modules.
+
+    Args:
+      module_names (list[str]): names of the modules.
+
+    Returns:
+      set[str]: names of the modules that transitively import the modules,
+          including the modules themselves if part of the graph.
+    """
+    dependent_module_names = set()
+
+    module_names_to_check = list(module_names)
+    while module_names_to_check:
+      module_name = module_names_to_check.pop()
+      if module_name in dependent_module_names:
+        continue
+
+      if module_name in self._module_names:
+        dependent_module_names.add(module_name)
+
+      module_names_to_check.extend(
+          self._imported_by.get(module_name, set()) - dependent_module_names)
+
+    return dependent_module_names
+
+
+class ImportGraphBuilder(object):
+  """Builds the import graph of the Python modules of a project.
+
+  The imports of every module are determined by parsing its source. Parsed
+  imports can be cached in a file, where the modification time and size of
+  the source file are used to determine if it needs to be parsed again.
+  """
+
+  _CACHE_FORMAT_VERSION = 1
+
+  # Directories that do not contain Python modules of the project.
+  _EXCLUDED_DIRECTORIES = frozenset([
+      '.git', '.tox', 'build', 'dist', 'test_data'])
+
+  def __init__(self, project_path, cache_path=None):
+    """Initializes an import graph builder.
+
+    Args:
+      project_path (str): path of the root of the project.
+      cache_path (Optional[str]): path of the cache file, where None represents
+          no cache is used.
+    """
+    super(ImportGraphBuilder, self).__init__()
+    self._cache_path = cache_path
+    self._project_path = os.path.abspath(project_path)
+
+  def _GetImportedModuleNames(self, path, module_name, is_package):
+    """Determines the names of the modules imported by a module.
+
+    Args:
+      path (str): path of the source file of the module.
+      module_name (str): name of the module.
+      is_package (bool): True if the module is the __init__.py of a package.
+
+    Returns:
+      list[str]: names of the imported modules, including their parent
+          packages.
+    """
+    try:
+      with io.open(path, 'rb') as file_object:
+        syntax_tree = ast.parse(file_object.read(), filename=path)
+    except (IOError, SyntaxError, ValueError):
+      return []
+
+    package_name = module_name
+    if not is_package:
+      package_name, _, _ = module_name.rpartition('.')
+
+    imported_module_names = set()
+    for node in ast.walk(syntax_tree):
+      if isinstance(node, ast.Import):
+        for alias in node.names:
+          imported_module_names.add(alias.name)
+
+      elif isinstance(node, ast.ImportFrom):
+        base_module_name = node.module or ''
+        if node.level:
+          package_segments = package_name.split('.') if package_name else []
+          if node.level > 1:
+            package_segments = package_segments[:1 - node.level]
+
+          base_module_name = '.'.join(
+              package_segments + ([node.module] if node.module else []))
+
+        if not base_module_name:
+          continue
+
+        imported_module_names.add(base_module_name)
+
+        # "from package import name" can import the module package.name.
+        for alias in node.names:
+          if alias.name != '*':
+            imported_module_names.add('{0:s}.{1:s}'.format(
+                base_module_name, alias.name))
+
+    # Importing a module also imports its parent packages.
+    for imported_module_name in list(imported_module_names):
+      segments = imported_module_name.split('.')
+      for index in range(1, len(segments)):
+        imported_module_names.add('.'.join(segments[:index]))
+
+    return sorted(imported_module_names)
+
+  def _ReadCache(self):
+    """Reads the cached imports.
+
+    Returns:
+      dict[str, dict[str, object]]: cached imports per relative path.
+    """
+    if not self._cache_path:
+      return {}
+
+    try:
+      with io.open(self._cache_path, 'r', encoding='utf-8') as file_object:
+        cache_values = json.load(file_object)
+    except (IOError, ValueError):
+      return {}
+
+    if (not isinstance(cache_values, dict) or
+        cache_values.get('format_version', None) != self._CACHE_FORMAT_VERSION):
+      return {}
+
+    return cache_values.get('modules', None) or {}
+
+  def _WriteCache(self, cached_modules):
+    """Writes the cached imports.
+
+    Args:
+      cached_modules (dict[str, dict[str, object]]): cached imports per
+          relative path.
+    """
+    if not self._cache_path:
+      return
+
+    cache_values = {
+        'format_version': self._CACHE_FORMAT_VERSION,
+        'modules': cached_modules}
+
+    temporary_path = '{0:s}.tmp'.format(self._cache_path)
+    try:
+      with io.open(temporary_path, 'w', encoding='utf-8') as file_object:
+        json.dump(cache_values, file_object, sort_keys=True)
+
+      os.replace(temporary_path, self._cache_path)
+
+    except (IOError, OSError):
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+
+  def GetModuleName(self, relative_path):
+    """Determines the name of the module of a source file.
+
+    Args:
+      relative_path (str): path of the source file relative to the root of
+          the project.
+
+    Returns:
+      str: name of the module or None if the source file is not a module.
+    """
+    if not relative_path.endswith('.py'):
+      return None
+
+    segments = os.path.normpath(relative_path[:-3]).split(os.path.sep)
+    if segments[-1] == '__init__':
+      segments.pop()
+
+    if not segments or segments[0] in ('', '.', '..'):
+      return None
+
+    return '.'.join(segments)
+
+  def Build(self):
+    """Builds the import graph.
+
+    Returns:
+      ImportGraph: import graph.
+    """
+    cached_modules = self._ReadCache()
+    modules = {}
+
+    for directory_path, directory_names, filenames in os.walk(
+        self._project_path):
+      relative_directory_path = os.path.relpath(
+          directory_path, self._project_path)
+
+      # Only descend into Python packages.
+      directory_names[:] = [
+          directory_name for directory_name in directory_names
+          if directory_name not in self._EXCLUDED_DIRECTORIES and
+          os.path.exists(os.path.join(
+              directory_path, directory_name, '__init__.py'))]
+
+      for filename in filenames:
+        if not filename.endswith('.py'):
+          continue
+
+        path = os.path.join(directory_path, filename)
+        relative_path = os.path.normpath(
+            os.path.join(relative_directory_path, filename))
+
+        try:
+          stat_object = os.stat(path)
+        except OSError:
+          continue
+
+        modification_time = int(stat_object.st_mtime_ns)
+
+        cached_module = cached_modules.get(relative_path, None)
+        if (cached_module and
+            cached_module.get('mtime', None) == modification_time and
+            cached_module.get('size', None) == stat_object.st_size):
+          modules[relative_path] = cached_module
+          continue
+
+        module_name = self.GetModuleName(relative_path)
+        imported_module_names = self._GetImportedModuleNames(
+            path, module_name, filename == '__init__.py')
+
+        modules[relative_path] = {
+            'imports': imported_module_names,
+            'mtime': modification_time,
+            'size': stat_object.st_size}
+
+    self._WriteCache(modules)
+
+    import_graph = ImportGraph()
+    for relative_path, module in modules.items():
+      import_graph.AddModule(
+          self.GetModuleName(relative_path), module.get('imports', []))
+
+    return import_graph
+
+
+class TestImpactSelector(object):
+  """Selects the test modules impacted by changed files."""
+
+  # Extensions of files that do not affect the outcome of the tests.
+  _DOCUMENTATION_EXTENSIONS = frozenset(['.md', '.rst'])
+
+  def __init__(self, project_path, cache_path=None):
+    """Initializes a test impact selector.
+
+    Args:
+      project_path (str): path of the root of the project.
+      cache_path (Optional[str]): path of the import graph cache file, where
+          None represents no cache is used.
+    """
+    super(TestImpactSelector, self).__init__()
+    self._import_graph_builder = ImportGraphBuilder(
+        project_path, cache_path=cache_path)
+
+  def SelectTestModules(self, changed_files, test_module_names):
+    """Selects the test modules impacted by changed files.
+
+    A test module is impacted if it, directly or transitively, imports a
+    module of which the source file changed. A change to any other file
+    than a Python source file or documentation, such as test data or
+    configuration, can affect any test, in which case all test modules are
+    selected.
+
+    Args:
+      changed_files (list[str]): paths of the changed files relative to the
+          root of the project.
+      test_module_names (list[str]): names of all the test modules.
+
+    Returns:
+      list[str]: names of the impacted test modules.
+    """
+    changed_module_names = []
+    for changed_file in changed_files:
+      if not changed_file:
+        continue
+
+      _, extension = os.path.splitext(changed_file)
+      if extension in self._DOCUMENTATION_EXTENSIONS:
+        continue
+
+      module_name = self._import_graph_builder.GetModuleName(changed_file)
+      if not module_name:
+        return list(test_module_names)
+
+      changed_module_names.append(module_name)
+
+    if not changed_module_names:
+      return []
+
+    import_graph = self._import_graph_builder.Build()
+    dependent_module_names = import_graph.GetDependentModules(
+        changed_module_names)
+
+    return [
+        module_name for module_name in test_module_names
+        if module_name in dependent_module_names]
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""Runner of unit tests sharded across multiple worker processes."""
+
+import concurrent.futures
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+import unittest
+
+
+class TestModuleResult(object):
+  """Result of running the tests of a test module.
+
+  Attributes:
+    duration (float): duration of the test run in seconds.
+    module_name (str): name of the test module, such as "tests.projects".
+    number_of_errors (int): number of tests that raised an error.
+    number_of_failures (int): number of tests that failed.
+    number_of_skipped (int): number of tests that were skipped.
+    number_of_tests (int): number of tests that were run.
+    output (str): output of the test run.
+  """
+
+  def __init__(self, module_name):
+    """Initializes a test module result.
+
+    Args:
+      module_name (str): name of the test module.
+    """
+    super(TestModuleResult, self).__init__()
+    self.duration = 0.0
+    self.module_name = module_name
+    self.number_of_errors = 0
+    self.number_of_failures = 0
+    self.number_of_skipped = 0
+    self.number_of_tests = 0
+    self.output = ''
+
+
+def _InitializeWorker(project_path):
+  """Initializes a test worker process.
+
+  Args:
+    project_path (str): path of the root of the project.
+  """
+  # Test modules can determine paths, such as that of the test data, relative
+  # to the current working directory when imported.
+  os.chdir(project_path)
+  if project_path not in sys.path:
+    sys.path.insert(0, project_path)
+
+
+def _RunTestModule(module_name):
+  """Runs the tests of a test module.
+
+  Args:
+    module_name (str): name of the test module.
+
+  Returns:
+    TestModuleResult: result of the test run.
+  """
+  module_result = TestModuleResult(module_name)
+  output_writer = io.StringIO()
+
+  start_time = time.monotonic()
+
+  try:
+    test_suite = unittest.defaultTestLoader.loadTestsFromName(module_name)
+    test_runner = unittest.TextTestRunner(stream=output_writer, verbosity=2)
+    test_result = test_runner.run(test_suite)
+
+    module_result.number_of_errors = len(test_result.errors)
+    module_result.number_of_failures = len(test_result.failures) + len(
+        test_result.unexpectedSuccesses)
+    module_result.number_of_skipped = len(test_result.skipped)
+    module_result.number_of_tests = test_result.testsRun
+
+  except Exception:  # pylint: disable=broad-except
+    output_writer.write('Unable to run tests of: {0:s}\n{1:s}'.format(
+        module_name, traceback.format_exc()))
+    module_result.number_of_errors = 1
+
+  module_result.duration = time.monotonic() - start_time
+  module_result.output = output_writer.getvalue()
+
+  return module_result
+
+
+class ShardedTestRunner(object):
+  """Runs unit tests sharded across multiple worker processes.
+
+  The test modules are distributed over the worker processes longest first,
+  based on the durations recorded in previous runs, so that the worker
+  processes finish at approximately the same time.
+  """
+
+  def __init__(self, project_path, durations_path=None, number_of_workers=None):
+    """Initializes a sharded test runner.
+
+    Args:
+      project_path (str): path of the root of the project.
+      durations_path (Optional[str]): path of the file to record the durations
+          of the test modules in, where None represents the durations are not
+          recorded.
+      number_of_workers (Optional[int]): number of worker processes, where
+          None represents the number of CPUs.
+    """
+    super(ShardedTestRunner, self).__init__()
+    self._durations_path = durations_path
+    self._number_of_workers = number_of_workers or os.cpu_count() or 1
+    self._project_path = os.path.abspath(project_path)
+
+  def _ReadDurations(self):
+    """Reads the recorded durations of the test modules.
+
+    Returns:
+      dict[str, float]: duration in seconds per test module name.
+    """
+    if not self._durations_path:
+      return {}
+
+    try:
+      with io.open(self._durations_path, 'r', encoding='utf-8') as file_object:
+        durations = json.load(file_object)
+    except (IOError, ValueError):
+      return {}
+
+    if not isinstance(durations, dict):
+      return {}
+
+    return durations
+
+  def _RunTestModules(self, module_names):
+    """Runs the tests of test modules in the worker processes.
+
+    Args:
+      module_names (list[str]): names of the test modules, in the order the
+          worker processes should pick them up.
+
+    Yields:
+      TestModuleResult: result of the test run of a test module, as soon as
+          the test module has been run.
+    """
+    if not module_names:
+      return
+
+    # Use spawn instead of fork since the runner can be used concurrently
+    # with other threads, such as the linter.
+    context = multiprocessing.get_context('spawn')
+    number_of_workers = min(self._number_of_workers, len(module_names))
+
+    # ProcessPoolExecutor supports mp_context and initializer as of Python
+    # 3.7, hence a multiprocessing pool is used on earlier versions.
+    if sys.version_info < (3, 7):
+      with context.Pool(
+          processes=number_of_workers, initializer=_InitializeWorker,
+          initargs=(self._project_path, )) as pool:
+        # The worker processes pick up the test modules in the order they
+        # were submitted, hence longest first.
+        for module_result in pool.imap_unordered(
+            _RunTestModule, module_names, chunksize=1):
+          yield module_result
+
+      return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=number_of_workers, mp_context=context,
+        initializer=_InitializeWorker,
+        initargs=(self._project_path, )) as executor:
+      # The worker processes pick up the test modules in the order they
+      # were submitted, hence longest first.
+      futures = [
+          executor.submit(_RunTestModule, module_name)
+          for module_name in module_names]
+
+      for future in concurrent.futures.as_completed(futures):
+        yield future.result()
+
+  def _SortByDuration(self, module_names, durations):
+    """Sorts test modules longest first.
+
+    Test modules without a recorded duration are sorted first, since their
+    duration is unknown.
+
+    Args:
+      module_names (list[str]): names of the test modules.
+      durations (dict[str, float]): duration in seconds per test module name.
+
+    Returns:
+      list[str]: names of the test modules sorted longest first.
+    """
+    return sorted(module_names, key=lambda module_name: (
+        module_name in durations, -durations.get(module_name, 0.0),
+        module_name))
+
+  def _WriteDurations(self, durations):
+    """Writes the recorded durations of the test modules.
+
+    Args:
+      durations (dict[str, float]): duration in seconds per test module name.
+    """
+    if not self._durations_path:
+      return
+
+    try:
+      with io.open(self._durations_path, 'w', encoding='utf-8') as file_object:
+        json.dump(durations, file_object, indent=1, sort_keys=True)
+    except IOError:
+      pass
+
+  def DiscoverTestModules(self, tests_directory='tests'):
+    """Discovers the test modules of the project.
+
+    Args:
+      tests_directory (Optional[str]): name of the tests directory relative to
+          the root of the project.
+
+    Returns:
+      list[str]: names of the test modules, such as "tests.projects".
+    """
+    module_names = []
+
+    tests_path = os.path.join(self._project_path, tests_directory)
+    for directory_path, directory_names, filenames in os.walk(tests_path):
+      # Only descend into Python packages.
+      directory_names[:] = sorted([
+          directory_name for directory_name in directory_names
+          if os.path.exists(os.path.join(
+              directory_path, directory_name, '__init__.py'))])
+
+      relative_path = os.path.relpath(directory_path, self._project_path)
+      package_name = '.'.join(relative_path.split(os.path.sep))
+
+      for filename in sorted(filenames):
+        if not filename.endswith('.py') or filename == '__init__.py':
+          continue
+
+        module_names.append('{0:s}.{1:s}'.format(package_name, filename[:-3]))
+
+    return module_names
+
+  def Run(self, module_names=None, output_writer=None):
+    """Runs the tests.
+
+    The output of a test module is written as soon as the test module has
+    been run.
+
+    Args:
+      module_names (Optional[list[str]]): names of the test modules to run,
+          where None represents all the test modules of the project.
+      output_writer (Optional[file]): file-like object to write the output
+          to, where None represents stdout.
+
+    Returns:
+      bool: True if all tests passed.
+    """
+    output_writer = output_writer or sys.stdout
+
+    if module_names is None:
+      module_names = self.DiscoverTestModules()
+
+    durations = self._ReadDurations()
+    module_names = self._SortByDuration(module_names, durations)
+
+    number_of_errors = 0
+    number_of_failures = 0
+    number_of_skipped = 0
+    number_of_tests = 0
+
+    start_time = time.monotonic()
+
+    for module_result in self._RunTestModules(module_names):
+      output_writer.write(module_result.output)
+      output_writer.flush()
+
+      durations[module_result.module_name] = module_result.duration
+
+      number_of_errors += module_result.number_of_errors
+      number_of_failures += module_result.number_of_failures
+      number_of_skipped += module_result.number_of_skipped
+      number_of_tests += module_result.number_of_tests
+
+    self._WriteDurations(durations)
+
+    output_writer.write('{0:s}\nRan {1:d} tests in {2:.3f}s\n\n'.format(
+        '-' * 70, number_of_tests, time.monotonic() - start_time))
+
+    if number_of_errors or number_of_failures:
+      output_writer.write('FAILED (failures={0:d}, errors={1:d})\n'.format(
+          number_of_failures, number_of_errors))
+      return False
+
+    if number_of_skipped:
+      output_writer.write('OK (skipped={0:d})\n'.format(number_of_skipped))
+    else:
+      output_writer.write('OK\n')
+
+    return True
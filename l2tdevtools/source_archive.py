@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""Reproducible source archive conversion."""
+
+import calendar
+import collections
+import os
+import struct
+import tarfile
+import zipfile
+import zlib
+
+from concurrent import futures
+
+
+class ParallelGzipWriter(object):
+  """Gzip writer that compresses blocks concurrently.
+
+  The data is split into fixed size blocks, that are compressed independently
+  with the last 32 KiB of the preceding block as dictionary, similar to pigz.
+  The compressed blocks are concatenated into a single deflate stream, which
+  can be decompressed by any gzip implementation. Since the block boundaries
+  do not depend on the number of workers, the output is the same for the same
+  input.
+  """
+
+  _BLOCK_SIZE = 128 * 1024
+
+  _DICTIONARY_SIZE = 32 * 1024
+
+  def __init__(
+      self, file_object, compression_level=9, number_of_workers=None):
+    """Initializes a parallel gzip writer.
+
+    Args:
+      file_object (file): file-like object to write the gzip data to.
+      compression_level (Optional[int]): compression level, from 1 to 9.
+      number_of_workers (Optional[int]): number of blocks to compress
+          concurrently, where None represents the number of CPUs.
+    """
+    super(ParallelGzipWriter, self).__init__()
+    self._buffer = bytearray()
+    self._compression_level = compression_level
+    self._crc32 = 0
+    self._dictionary = b''
+    self._executor = None
+    self._file_object = file_object
+    self._number_of_workers = number_of_workers or os.cpu_count() or 1
+    self._pending_blocks = collections.deque()
+    self._size = 0
+
+  def __enter__(self):
+    """Enters a with statement."""
+    return self
+
+  def __exit__(self, exception_type, value, traceback):
+    """Exits a with statement."""
+    self.close()
+
+  def _CompressBlock(self, data, dictionary, is_last_block):
+    """Compresses a block.
+
+    Args:
+      data (bytes): data of the block.
+      dictionary (bytes): data that precedes the block.
+      is_last_block (bool): True if the block is the last block.
+
+    Returns:
+      bytes: compressed data of the block.
+    """
+    if dictionary:
+      compressor = zlib.compressobj(
+          self._compression_level, zlib.DEFLATED, -zlib.MAX_WBITS,
+          zdict=dictionary)
+    else:
+      compressor = zlib.compressobj(
+          self._compression_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    if is_last_block:
+      flush_mode = zlib.Z_FINISH
+    else:
+      # A sync flush ends the block on a byte boundary without marking it
+      # as the last block, which allows the next block to be appended.
+      flush_mode = zlib.Z_SYNC_FLUSH
+
+    return compressor.compress(data) + compressor.flush(flush_mode)
+
+  def _SubmitBlock(self, data, is_last_block):
+    """Submits a block for compression.
+
+    Args:
+      data (bytes): data of the block.
+      is_last_block (bool): True if the block is the last block.
+    """
+    if not self._executor:
+      self._executor = futures.ThreadPoolExecutor(
+          max_workers=self._number_of_workers)
+
+      self._file_object.write(self._GetHeader())
+
+    # Limit the number of blocks kept in memory.
+    while len(self._pending_blocks) >= self._number_of_workers * 2:
+      self._file_object.write(self._pending_blocks.popleft().result())
+
+    self._pending_blocks.append(self._executor.submit(
+        self._CompressBlock, data, self._dictionary, is_last_block))
+
+    self._dictionary = data[-self._DICTIONARY_SIZE:]
+
+  def _GetHeader(self):
+    """Retrieves the gzip member header.
+
+    Returns:
+      bytes: gzip member header.
+    """
+    if self._compression_level == 9:
+      extra_flags = 2
+    elif self._compression_level == 1:
+      extra_flags = 4
+    else:
+      extra_flags = 0
+
+    # The modification time is 0 and the operating system 255 (unknown),
+    # for the output to be reproducible.
+    return struct.pack('<BBBBIBB', 0x1f, 0x8b, 8, 0, 0, extra_flags, 255)
+
+  # The file-like object interface requires the close and write method names.
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Compresses the remaining data and writes the gzip member trailer."""
+    if self._file_object is None:
+      return
+
+    self._SubmitBlock(bytes(self._buffer), True)
+    self._buffer = bytearray()
+
+    while self._pending_blocks:
+      self._file_object.write(self._pending_blocks.popleft().result())
+
+    self._executor.shutdown()
+    self._executor = None
+
+    self._file_object.write(struct.pack(
+        '<II', self._crc32, self._size & 0xffffffff))
+    self._file_object = None
+
+  def write(self, data):
+    """Writes data.
+
+    Args:
+      data (bytes): data to write.
+
+    Returns:
+      int: number of bytes written.
+    """
+    self._crc32 = zlib.crc32(data, self._crc32)
+    self._size += len(data)
+    self._buffer.extend(data)
+
+    while len(self._buffer) >= self._BLOCK_SIZE:
+      self._SubmitBlock(bytes(self._buffer[:self._BLOCK_SIZE]), False)
+      del self._buffer[:self._BLOCK_SIZE]
+
+    return len(data)
+
+
+class ZipToTarConverter(object):
+  """Converts .zip source packages into reproducible compressed tar archives.
+
+  The members are written ordered by name, owned by root and with the
+  modification time of the most recent member, for the same .zip file to
+  always result in the same tar archive. Launchpad for example refuses
+  re-uploads of an original source package that differs.
+  """
+
+  COMPRESSION_GZIP = 'gz'
+  COMPRESSION_XZ = 'xz'
+
+  _COPY_BUFFER_SIZE = 1024 * 1024
+
+  def __init__(
+      self, compression='gz', compression_level=9, number_of_workers=None):
+    """Initializes a .zip to tar converter.
+
+    Args:
+      compression (Optional[str]): compression method, either "gz" or "xz".
+      compression_level (Optional[int]): compression level, from 1 to 9.
+      number_of_workers (Optional[int]): number of blocks to compress
+          concurrently, where None represents the number of CPUs. Only
+          used for gzip compression.
+
+    Raises:
+      ValueError: if the compression method is not supported.
+    """
+    if compression not in (self.COMPRESSION_GZIP, self.COMPRESSION_XZ):
+      raise ValueError('Unsupported compression method: {0:s}'.format(
+          compression))
+
+    super(ZipToTarConverter, self).__init__()
+    self._compression = compression
+    self._compression_level = compression_level
+    self._number_of_workers = number_of_workers
+
+  def _GetTarInfo(self, zip_info, modification_time):
+    """Retrieves the tar member information of a .zip member.
+
+    Args:
+      zip_info (zipfile.ZipInfo): .zip member information.
+      modification_time (int): POSIX timestamp of the modification time.
+
+    Returns:
+      tarfile.TarInfo: tar member information.
+    """
+    tar_info = tarfile.TarInfo(zip_info.filename.rstrip('/'))
+    tar_info.gid = 0
+    tar_info.gname = ''
+    tar_info.mtime = modification_time
+    tar_info.uid = 0
+    tar_info.uname = ''
+
+    if zip_info.is_dir():
+      tar_info.mode = 0o755
+      tar_info.type = tarfile.DIRTYPE
+    else:
+      tar_info.mode = 0o644
+      tar_info.size = zip_info.file_size
+
+    return tar_info
+
+  def _WriteTarFile(self, zip_file, tar_file):
+    """Writes the members of a .zip file to a tar file.
+
+    Args:
+      zip_file (zipfile.ZipFile): .zip file.
+      tar_file (tarfile.TarFile): tar file.
+    """
+    zip_infos = sorted(
+        zip_file.infolist(), key=lambda zip_info: zip_info.filename)
+
+    # Use the modification time of the most recent member for all members,
+    # as launchpad refuses to build packages containing files with
+    # timestamps too far in the past.
+    modification_time = 0
+    if zip_infos:
+      date_time = max(zip_info.date_time for zip_info in zip_infos)
+      modification_time = calendar.timegm(date_time)
+
+    for zip_info in zip_infos:
+      tar_info = self._GetTarInfo(zip_info, modification_time)
+
+      if zip_info.is_dir():
+        tar_file.addfile(tar_info)
+      else:
+        with zip_file.open(zip_info) as file_object:
+          tar_file.addfile(tar_info, fileobj=file_object)
+
+  def Convert(self, zip_path, tar_path):
+    """Converts a .zip file into a compressed tar file.
+
+    Args:
+      zip_path (str): path of the .zip file.
+      tar_path (str): path of the compressed tar file.
+    """
+    temporary_path = '{0:s}.tmp'.format(tar_path)
+
+    with zipfile.ZipFile(zip_path, 'r') as zip_file:
+      if self._compression == self.COMPRESSION_XZ:
+        with tarfile.open(
+            name=temporary_path, mode='w:xz', format=tarfile.GNU_FORMAT,
+            preset=self._compression_level) as tar_file:
+          self._WriteTarFile(zip_file, tar_file)
+
+      else:
+        with open(temporary_path, 'wb') as file_object:
+          with ParallelGzipWriter(
+              file_object, compression_level=self._compression_level,
+              number_of_workers=self._number_of_workers) as gzip_writer:
+            with tarfile.open(
+                fileobj=gzip_writer, mode='w|', format=tarfile.GNU_FORMAT,
+                bufsize=self._COPY_BUFFER_SIZE) as tar_file:
+              self._WriteTarFile(zip_file, tar_file)
+
+    os.replace(temporary_path, tar_path)
@@ -2,7 +2,6 @@
 """Helper for managing project source code."""
 
 import abc
-import glob
 import logging
 import os
 import re
@@ -11,6 +10,8 @@ import subprocess
 import tarfile
 import zipfile
 
+from l2tdevtools import build_index
+
 
 class SourceHelper(object):
   """Helper to manage project source code."""
@@ -53,17 +54,58 @@ class SourceHelper(object):
 class GitRepositorySourceHelper(SourceHelper):
   """Class that manages the source code from a git repository."""
 
-  def __init__(self, project_name, project_definition):
+  def __init__(
+      self, project_name, project_definition, build_accelerator=None,
+      git_mirror_cache=None, clone_depth=None, clone_filter=None):
     """Initializes a source helper.
 
     Args:
       project_name (str): name of the project.
       project_definition (ProjectDefinition): project definition.
+      build_accelerator (Optional[BuildAccelerator]): build accelerator to
+          run configure with, where None represents configure is run without.
+      git_mirror_cache (Optional[GitMirrorCache]): git mirror cache to clone
+          from, where None represents the git repository is cloned directly.
+      clone_depth (Optional[int]): number of commits of a shallow clone,
+          where None represents the full history.
+      clone_filter (Optional[str]): object filter of a partial clone, such as
+          "blob:none", where None represents all objects.
     """
     super(GitRepositorySourceHelper, self).__init__(
         project_name, project_definition)
+    self._build_accelerator = build_accelerator
+    self._clone_depth = clone_depth
+    self._clone_filter = clone_filter
+    self._git_mirror_cache = git_mirror_cache
     self._git_url = project_definition.git_url
 
+  def _CloneRepository(self):
+    """Clones the git repository into the source directory.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    if self._git_mirror_cache:
+      return self._git_mirror_cache.Clone(
+          self._git_url, self.project_name, depth=self._clone_depth,
+          filter_spec=self._clone_filter)
+
+    command = 'git clone'
+    if self._clone_depth:
+      command = '{0:s} --depth {1:d}'.format(command, self._clone_depth)
+    if self._clone_filter:
+      command = '{0:s} --filter {1:s}'.format(command, self._clone_filter)
+
+    command = '{0:s} {1:s} {2:s}'.format(
+        command, self._git_url, self.project_name)
+    exit_code = subprocess.call(
+        '{0:s}'.format(command), shell=True)
+    if exit_code != 0:
+      logging.error('Running: "{0:s}" failed.'.format(command))
+      return False
+
+    return True
+
   def Clean(self):
     """Removes a previous version of the source directory."""
     if os.path.exists(self.project_name):
@@ -79,11 +121,7 @@ class GitRepositorySourceHelper(SourceHelper):
     if not self.project_name or not self._git_url:
       return None
 
-    command = 'git clone {0:s}'.format(self._git_url)
-    exit_code = subprocess.call(
-        '{0:s}'.format(command), shell=True)
-    if exit_code != 0:
-      logging.error('Running: "{0:s}" failed.'.format(command))
+    if not self._CloneRepository():
       return None
 
     return self.project_name
@@ -111,18 +149,22 @@ class LibyalGitRepositorySourceHelper(GitRepositorySourceHelper):
     if not self.project_name or not self._git_url:
       return None
 
-    command = 'git clone {0:s}'.format(self._git_url)
-    exit_code = subprocess.call(
-        '{0:s}'.format(command), shell=True)
-    if exit_code != 0:
-      logging.error('Running: "{0:s}" failed.'.format(command))
+    if not self._CloneRepository():
       return None
 
     source_directory = self.project_name
 
+    # Have synclibs.sh clone the libraries from their mirrors.
+    env = None
+    if self._git_mirror_cache:
+      git_urls = self._git_mirror_cache.ReadSynclibsURLs(
+          os.path.join(source_directory, 'synclibs.sh'))
+      env = self._git_mirror_cache.GetURLRewriteEnvironment(git_urls)
+
     command = './synclibs.sh'
     exit_code = subprocess.call(
-        '(cd {0:s} && {1:s})'.format(source_directory, command), shell=True)
+        '(cd {0:s} && {1:s})'.format(source_directory, command), env=env,
+        shell=True)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return None
@@ -135,6 +177,11 @@ class LibyalGitRepositorySourceHelper(GitRepositorySourceHelper):
       return None
 
     command = './configure'
+    if self._build_accelerator:
+      command = '{0:s}{1:s}'.format(
+          self._build_accelerator.GetCommandPrefix(build_target='source'),
+          command)
+
     exit_code = subprocess.call(
         '(cd {0:s} && {1:s})'.format(source_directory, command), shell=True)
     if exit_code != 0:
@@ -272,37 +319,22 @@ class SourcePackageHelper(SourceHelper):
     filenames_to_ignore = re.compile(
         '^{0:s}-.*{1!s}'.format(self.project_name, project_version))
 
-    # Remove previous versions of source packages in the format:
-    # <project>-[0-9]*.tar.gz
-    filenames = glob.glob('{0:s}-[0-9]*.tar.gz'.format(self.project_name))
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+    build_directory_index = build_index.GetBuildDirectoryIndex()
 
-    # Remove previous versions of source packages in the format:
+    # Remove previous versions of source packages in the formats:
+    # <project>-[0-9]*.tar.gz
     # <project>-[0-9]*.tgz
-    filenames = glob.glob('{0:s}-[0-9]*.tgz'.format(self.project_name))
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
-
-    # Remove previous versions of source packages in the format:
     # <project>-[0-9]*.zip
-    filenames = glob.glob('{0:s}-[0-9]*.zip'.format(self.project_name))
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+    build_directory_index.RemoveOlderVersions([
+        '{0:s}-[0-9]*.tar.gz'.format(self.project_name),
+        '{0:s}-[0-9]*.tgz'.format(self.project_name),
+        '{0:s}-[0-9]*.zip'.format(self.project_name)], filenames_to_ignore)
 
     # Remove previous versions of source directories in the format:
     # <project>-[0-9]*
-    filenames = glob.glob('{0:s}-[0-9]*'.format(self.project_name))
-    for filename in filenames:
-      if os.path.isdir(filename) and not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        shutil.rmtree(filename)
+    build_directory_index.RemoveOlderVersions(
+        ['{0:s}-[0-9]*'.format(self.project_name)], filenames_to_ignore,
+        directories=True)
 
   def Create(self):
     """Creates the source directory from the source package.
@@ -386,3 +418,23 @@ class SourcePackageHelper(SourceHelper):
       self.Download()
 
     return self._source_package_filename
+
+  def SetSourcePackage(self, project_version, source_package_filename):
+    """Sets a previously downloaded source package.
+
+    This allows a resumed build run to use the source package without
+    retrieving the latest version again.
+
+    Args:
+      project_version (str): version of the project.
+      source_package_filename (str): filename of the source package.
+
+    Returns:
+      bool: True if the source package was set or False if it does not exist.
+    """
+    if not os.path.exists(source_package_filename):
+      return False
+
+    self._project_version = project_version
+    self._source_package_filename = source_package_filename
+    return True
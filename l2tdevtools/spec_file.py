@@ -8,6 +8,108 @@ import os
 import subprocess
 import sys
 
+from l2tdevtools import package_metadata
+
+
+class RPMSpecFileSection(object):
+  """RPM spec file section.
+
+  Attributes:
+    argument (str): argument of the section directive, such as
+        "-n %{name}-data", or an empty string if not set.
+    lines (list[str]): lines of the section, without the section directive.
+    macros (dict[str, str]): values of the macros defined in the section,
+        where the key is the name of the macro.
+    name (str): name of the section, such as "preamble", "package",
+        "description", "files" or "changelog".
+    tags (dict[str, list[str]]): values of the tags in the section, such as
+        "Summary" or "Requires", where the key is the name of the tag.
+  """
+
+  def __init__(self, name, argument=''):
+    """Initializes a RPM spec file section.
+
+    Args:
+      name (str): name of the section.
+      argument (Optional[str]): argument of the section directive.
+    """
+    super(RPMSpecFileSection, self).__init__()
+    self.argument = argument
+    self.lines = []
+    self.macros = {}
+    self.name = name
+    self.tags = {}
+
+  def AppendLine(self, line):
+    """Appends a line to the section.
+
+    Args:
+      line (str): line including the end-of-line character.
+    """
+    self.lines.append(line)
+
+    if line.startswith('%define '):
+      _, _, definition = line.strip().partition(' ')
+      macro_name, _, value = definition.partition(' ')
+      self.macros[macro_name] = value.strip()
+
+    elif self.name in ('package', 'preamble') and not line[:1].isspace():
+      tag_name, separator, value = line.partition(':')
+      if separator and tag_name and ' ' not in tag_name:
+        self.tags.setdefault(tag_name, []).append(value.strip())
+
+  def GetTagValue(self, name):
+    """Retrieves the first value of a tag.
+
+    Args:
+      name (str): name of the tag, such as "Summary".
+
+    Returns:
+      str: value of the tag or an empty string if not set.
+    """
+    values = self.tags.get(name, None)
+    if not values:
+      return ''
+
+    return values[0]
+
+
+class RPMSpecFileParser(object):
+  """RPM spec file parser.
+
+  The parser reads the spec file line by line and yields a section as soon as
+  the next section directive is encountered, hence only one section is kept
+  in memory.
+  """
+
+  _SECTION_NAMES = frozenset([
+      'build', 'changelog', 'check', 'clean', 'description', 'files',
+      'install', 'package', 'post', 'postun', 'pre', 'prep', 'preun'])
+
+  def Parse(self, file_object):
+    """Parses a RPM spec file.
+
+    Args:
+      file_object (file): file-like object to read from.
+
+    Yields:
+      RPMSpecFileSection: section, where the first section is the preamble.
+    """
+    section = RPMSpecFileSection('preamble')
+
+    for line in file_object:
+      if line.startswith('%'):
+        directive, _, argument = line.strip().partition(' ')
+        section_name = directive[1:]
+        if section_name in self._SECTION_NAMES:
+          yield section
+          section = RPMSpecFileSection(section_name, argument=argument.strip())
+          continue
+
+      section.AppendLine(line)
+
+    yield section
+
 
 class RPMSpecFileGenerator(object):
   """Class that helps in generating RPM spec files."""
@@ -195,6 +297,18 @@ class RPMSpecFileGenerator(object):
     output_string = '\n'.join(template)
     output_file_object.write(output_string)
 
+  def _WriteExcludeFiles(self, output_file_object, exclude_files):
+    """Writes the files to exclude from the preceding files section.
+
+    Args:
+      output_file_object (file): output file-like object to write to.
+      exclude_files (list[str]): paths of the files to exclude.
+    """
+    for path in exclude_files:
+      output_file_object.write('%exclude {0:s}\n'.format(path))
+
+    output_file_object.write('\n')
+
   def _WriteHeader(
       self, output_file_object, project_name, unmangled_name, version):
     """Writes the header.
@@ -228,18 +342,19 @@ class RPMSpecFileGenerator(object):
     output_string = output_string.format(**template_mappings)
     output_file_object.write(output_string)
 
-  def _WritePython3Body(self, output_file_object, project_name, unmangled_name):
+  def _WritePython3Body(
+      self, output_file_object, project_definition, unmangled_name):
     """Writes the Python 3 body.
 
     Args:
       output_file_object (file): output file-like object to write to.
-      project_name (str): name of the project.
+      project_definition (ProjectDefinition): project definition.
       unmangled_name (str): unmangled name of the project.
     """
     # TODO: handle GetInstallDefinition
 
-    if project_name == 'psutil':
-      name = '%{name}-release-%{version}'
+    if project_definition.rpm_source_directory:
+      name = project_definition.rpm_source_directory
     elif unmangled_name:
       name = '%{unmangled_name}-%{unmangled_version}'
     else:
@@ -397,7 +512,8 @@ class RPMSpecFileGenerator(object):
     if not project_definition.architecture_dependent:
       template.append('BuildArch: noarch')
 
-    template.append('Vendor: {vendor:s}')
+    if vendor:
+      template.append('Vendor: {vendor:s}')
 
     if packager:
       template.append('Packager: {packager:s}')
@@ -466,10 +582,96 @@ class RPMSpecFileGenerator(object):
 
     return True
 
-  def _RewriteSetupPyGeneratedFile(
+  def _GetDescriptionFromSection(self, section):
+    """Retrieves the description from a description section.
+
+    Args:
+      section (RPMSpecFileSection): description section.
+
+    Returns:
+      str: description.
+    """
+    lines = list(section.lines)
+
+    # Ignore leading white lines in the description.
+    while lines and lines[0] == '\n':
+      lines.pop(0)
+
+    return ''.join(lines)
+
+  def _ReadSetupPyGeneratedFile(self, input_file):
+    """Reads the package metadata from a RPM spec file generated with setup.py.
+
+    The spec file is read in a single pass up to the first %files section.
+
+    Args:
+      input_file (str): path of the input RPM spec file.
+
+    Returns:
+      PythonPackageMetadata: package metadata.
+    """
+    metadata = package_metadata.PythonPackageMetadata()
+    metadata.description = ''
+
+    build_requires = ''
+    requires = ''
+    python_package_requires = ''
+
+    spec_file_parser = RPMSpecFileParser()
+
+    with io.open(input_file, 'r', encoding='utf8') as input_file_object:
+      for section in spec_file_parser.Parse(input_file_object):
+        if section.name == 'preamble':
+          metadata.version = section.macros.get('version', '')
+          metadata.license = section.GetTagValue('License')
+          metadata.maintainer = section.GetTagValue('Vendor')
+          metadata.packager = section.GetTagValue('Packager')
+          metadata.summary = section.GetTagValue('Summary')
+          metadata.url = section.GetTagValue('Url')
+
+          values = section.tags.get('BuildRequires', None)
+          if values:
+            build_requires = 'BuildRequires: {0:s}'.format(values[-1])
+
+          value = section.GetTagValue('Requires')
+          if value:
+            requires = 'Requires: {0:s}'.format(value)
+
+        elif section.name == 'description':
+          if not metadata.description:
+            metadata.description = self._GetDescriptionFromSection(section)
+
+        elif section.name == 'package':
+          if section.argument == '-n %{name}-data':
+            metadata.has_data_package = True
+
+          elif section.argument == '-n %{name}-tools':
+            metadata.has_tools_package = True
+
+          elif (section.argument.startswith('-n python-') or
+                section.argument.startswith('-n python2-') or
+                section.argument.startswith('-n python3-')):
+            value = section.GetTagValue('Requires')
+            if value and not python_package_requires:
+              python_package_requires = 'Requires: {0:s}'.format(value)
+
+        elif section.name == 'files':
+          break
+
+    python3_requires = python_package_requires
+    if not python3_requires:
+      python3_requires = requires
+
+    metadata.build_requires = self._SplitRequires(build_requires)
+    metadata.requires = self._GetPython3Requires(python3_requires)
+
+    return metadata
+
+  def _WriteSpecFile(
       self, project_definition, source_directory, source_filename,
-      project_name, rpm_build_dependencies, input_file, output_file_object):
-    """Rewrites the RPM spec file generated with setup.py.
+      project_name, rpm_build_dependencies, metadata,
+      output_file_object):
+    """Writes a RPM spec file based on package metadata.
 
     Args:
       project_definition (ProjectDefinition): project definition.
@@ -477,29 +679,12 @@ class RPMSpecFileGenerator(object):
       source_filename (str): name of the source package.
       project_name (str): name of the project.
       rpm_build_dependencies (list[str]): RPM build dependencies.
-      input_file (str): path of the input RPM spec file.
+      metadata (PythonPackageMetadata): package metadata.
       output_file_object (file): output file-like object to write to.
 
     Returns:
       bool: True if successful, False otherwise.
     """
-    project_version = ''
-    description = ''
-    package_license = ''
-    packager = ''
-    requires = ''
-    summary = ''
-    url = ''
-    vendor = ''
-    build_requires = ''
-    python_package_requires = ''
-
-    has_data_package = False
-    has_tools_package = False
-
-    in_description = False
-    in_python_package = False
-
     if project_definition.rpm_name:
       package_name = project_definition.rpm_name
     else:
@@ -512,107 +697,42 @@ class RPMSpecFileGenerator(object):
     if package_name != project_name:
       unmangled_name = project_name
 
-    with io.open(input_file, 'r+', encoding='utf8') as input_file_object:
-      for line in input_file_object.readlines():
-        if in_description:
-          if line.startswith('%'):
-            in_description = False
-
-          elif not description and line == '\n':
-            # Ignore leading white lines in the description.
-            continue
-
-          else:
-            description = ''.join([description, line])
-
-        if in_python_package:
-          if line.startswith('%package') or line.startswith('%prep'):
-            in_python_package = False
-
-          elif not python_package_requires and line.startswith('Requires: '):
-            python_package_requires = line
-
-        if in_description or in_python_package:
-          continue
-
-        if line.startswith('%define version '):
-          _, _, project_version = line.strip().rpartition(' ')
-
-        elif line.startswith('BuildRequires: '):
-          build_requires = line
-
-        elif not package_license and line.startswith('License: '):
-          _, _, package_license = line.strip().partition(' ')
-
-        elif not packager and line.startswith('Packager: '):
-          _, _, packager = line.strip().partition(' ')
-
-        elif not summary and line.startswith('Summary: '):
-          _, _, summary = line.strip().partition(' ')
-
-        elif not url and line.startswith('Url: '):
-          _, _, url = line.strip().partition(' ')
-
-        elif not vendor and line.startswith('Vendor: '):
-          _, _, vendor = line.strip().partition(' ')
-
-        elif (not description and not requires and
-              line.startswith('Requires: ')):
-          requires = line
-
-        elif line.startswith('%description') and not description:
-          in_description = True
-
-        elif line.startswith('%package -n %{name}-data'):
-          has_data_package = True
-
-        elif line.startswith('%package -n %{name}-tools'):
-          has_tools_package = True
-
-        elif (line.startswith('%package -n python-') or
-              line.startswith('%package -n python2-') or
-              line.startswith('%package -n python3-')):
-          in_python_package = True
-
-        elif line.startswith('%files'):
-          break
+    project_version = metadata.version or ''
+    summary = metadata.summary or ''
 
     self._WriteHeader(
         output_file_object, project_name, unmangled_name, project_version)
 
     if project_definition.description_long:
       description = '{0:s}\n\n'.format(project_definition.description_long)
+    else:
+      description = metadata.description or ''
 
     if rpm_build_dependencies:
       build_requires = rpm_build_dependencies
     else:
-      build_requires = self._SplitRequires(build_requires)
+      build_requires = metadata.build_requires
 
     self._WriteSourcePackageDefinition(
         output_file_object, source_filename, project_definition, unmangled_name,
-        summary, package_license, url, packager, vendor, build_requires,
-        description)
+        summary, metadata.license or '', metadata.url or '',
+        metadata.packager or '', metadata.maintainer or '',
+        build_requires, description)
 
     if project_name != package_name:
       python_package_name = 'python3-{0:s}'.format(package_name)
     else:
       python_package_name = 'python3-%{name}'
 
-    python3_requires = python_package_requires
-    if not python3_requires:
-      python3_requires = requires
-
-    python3_requires = self._GetPython3Requires(python3_requires)
-
-    if has_data_package:
+    if metadata.has_data_package:
       self._WriteDataPackageDefinition(
           output_file_object, summary, description)
 
     self._WritePython3PackageDefinition(
         output_file_object, python_package_name, summary,
-        python3_requires, description)
+        metadata.requires, description)
 
-    if has_tools_package:
+    if metadata.has_tools_package:
       self._WriteToolsPackageDefinition(
           output_file_object, project_name, summary, description)
 
@@ -620,28 +740,22 @@ class RPMSpecFileGenerator(object):
 
     doc_line = self._GetDocumentationFilesDefinition(source_directory)
 
-    self._WritePython3Body(output_file_object, project_name, unmangled_name)
+    self._WritePython3Body(
+        output_file_object, project_definition, unmangled_name)
 
-    if has_data_package:
+    if metadata.has_data_package:
       self._WriteDataPackageFiles(output_file_object)
 
     self._WritePython3PackageFiles(
         output_file_object, project_definition, project_name,
         python_package_name, license_line, doc_line)
 
-    if has_tools_package:
+    if metadata.has_tools_package:
       self._WriteToolsPackageFiles(output_file_object)
 
-    # TODO make this more generic.
-    if project_name in ('chardet', 'dtfabric', 'pbr'):
-      output_file_object.write((
-          '%exclude %{_bindir}/*\n'
-          '\n'))
-
-    if project_name == 'dfvfs':
-      output_file_object.write((
-          '%exclude %{python3_sitelib}/examples\n'
-          '\n'))
+    if project_definition.rpm_exclude_files:
+      self._WriteExcludeFiles(
+          output_file_object, project_definition.rpm_exclude_files)
 
     self._WriteChangeLog(output_file_object, project_version)
 
@@ -658,7 +772,7 @@ class RPMSpecFileGenerator(object):
     Returns:
       bool: True if successful, False otherwise.
     """
-    for line in input_file_object.readlines():
+    for line in input_file_object:
       output_file_object.write(line)
 
     return True
@@ -743,6 +857,77 @@ class RPMSpecFileGenerator(object):
 
     return True
 
+  def _GetRPMBuildDependencies(self, project_definition):
+    """Retrieves the RPM build dependencies.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      list[str]: RPM build dependencies.
+    """
+    if project_definition.architecture_dependent:
+      rpm_build_dependencies = ['gcc', 'python3-devel', 'python3-setuptools']
+    else:
+      rpm_build_dependencies = ['python3-devel', 'python3-setuptools']
+
+    if project_definition.rpm_build_dependencies:
+      rpm_build_dependencies.extend(project_definition.rpm_build_dependencies)
+
+    # TODO: check if already prefixed with python-
+
+    return rpm_build_dependencies
+
+  def GenerateWithMetadata(
+      self, project_definition, source_directory, source_filename,
+      project_name, project_version, output_file):
+    """Generates the RPM spec file from the package metadata.
+
+    The package metadata is read from PKG-INFO, setup.cfg or pyproject.toml
+    in the source directory, hence setup.py is not run.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      source_directory (str): path of the source directory.
+      source_filename (str): name of the source package.
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+      output_file (str): path of the output RPM spec file.
+
+    Returns:
+      bool: True if successful, False if the package metadata could not be
+          determined, in which case GenerateWithSetupPy should be used instead.
+    """
+    if project_definition.rpm_template_spec:
+      with io.open(output_file, 'w', encoding='utf8') as output_file_object:
+        return self._WriteSpecFileFromTempate(
+            project_definition.rpm_template_spec, project_version,
+            output_file_object)
+
+    metadata_reader = package_metadata.PythonPackageMetadataReader()
+    metadata = metadata_reader.Read(source_directory)
+    if not metadata:
+      return False
+
+    if metadata.description:
+      metadata.description = '{0:s}\n\n'.format(metadata.description)
+
+    # setup.py bdist_rpm replaces "-" in the version by "_".
+    metadata.version = metadata.version.replace('-', '_')
+
+    if metadata.requires:
+      metadata.requires = self._GetPython3Requires(
+          'Requires: {0:s}'.format(', '.join(metadata.requires)))
+
+    rpm_build_dependencies = self._GetRPMBuildDependencies(project_definition)
+
+    with io.open(output_file, 'w', encoding='utf8') as output_file_object:
+      result = self._WriteSpecFile(
+          project_definition, source_directory, source_filename,
+          project_name, rpm_build_dependencies, metadata, output_file_object)
+
+    return result
+
   def RewriteSetupPyGeneratedFile(
       self, project_definition, source_directory, source_filename,
       project_name, project_version, input_file, output_file):
@@ -760,17 +945,7 @@ class RPMSpecFileGenerator(object):
     Returns:
       bool: True if successful, False otherwise.
     """
-    rpm_build_dependencies = []
-
-    if project_definition.architecture_dependent:
-      rpm_build_dependencies = ['gcc', 'python3-devel', 'python3-setuptools']
-    else:
-      rpm_build_dependencies = ['python3-devel', 'python3-setuptools']
-
-    if project_definition.rpm_build_dependencies:
-      rpm_build_dependencies.extend(project_definition.rpm_build_dependencies)
-
-    # TODO: check if already prefixed with python-
+    rpm_build_dependencies = self._GetRPMBuildDependencies(project_definition)
 
     with io.open(output_file, 'w', encoding='utf8') as output_file_object:
       if project_definition.rpm_template_spec:
@@ -778,9 +953,10 @@ class RPMSpecFileGenerator(object):
             project_definition.rpm_template_spec, project_version,
             output_file_object)
       else:
-        result = self._RewriteSetupPyGeneratedFile(
+        metadata = self._ReadSetupPyGeneratedFile(input_file)
+        result = self._WriteSpecFile(
             project_definition, source_directory, source_filename,
-            project_name, rpm_build_dependencies, input_file,
+            project_name, rpm_build_dependencies, metadata,
             output_file_object)
 
     return result
@@ -2,12 +2,34 @@
 # -*- coding: utf-8 -*-
 """Script to run the tests."""
 
+import argparse
+import os
 import unittest
 import sys
 
 
 if __name__ == '__main__':
-  test_suite = unittest.TestLoader().discover('tests', pattern='*.py')
-  test_results = unittest.TextTestRunner(verbosity=2).run(test_suite)
-  if not test_results.wasSuccessful():
+  argument_parser = argparse.ArgumentParser(description='Runs the tests.')
+
+  argument_parser.add_argument(
+      '-j', '--jobs', dest='jobs', type=int, action='store', default=1, help=(
+          'number of worker processes to run the test modules in, where 0 '
+          'represents the number of CPUs.'))
+
+  options = argument_parser.parse_args()
+
+  if options.jobs == 1:
+    test_suite = unittest.TestLoader().discover('tests', pattern='*.py')
+    test_results = unittest.TextTestRunner(verbosity=2).run(test_suite)
+    result = test_results.wasSuccessful()
+
+  else:
+    # pylint: disable=wrong-import-position
+    from l2tdevtools.review_helpers import test_runner
+
+    sharded_test_runner = test_runner.ShardedTestRunner(
+        os.getcwd(), number_of_workers=options.jobs or None)
+    result = sharded_test_runner.Run()
+
+  if not result:
     sys.exit(1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the build accelerator."""
+
+import os
+import unittest
+
+from l2tdevtools.build_helpers import accelerator
+
+from tests import test_lib
+
+
+class BuildAcceleratorTest(test_lib.BaseTestCase):
+  """Tests for the build accelerator."""
+
+  # pylint: disable=protected-access
+
+  def testGetConfigSitePath(self):
+    """Tests the GetConfigSitePath function."""
+    test_accelerator = accelerator.BuildAccelerator()
+    self.assertIsNone(test_accelerator.GetConfigSitePath('focal'))
+
+    with test_lib.TempDirectory() as temp_directory:
+      test_accelerator = accelerator.BuildAccelerator(
+          configure_cache_path=temp_directory)
+
+      config_site_path = test_accelerator.GetConfigSitePath(
+          'focal', build_target='dpkg', environment={})
+      self.assertTrue(os.path.isfile(config_site_path))
+
+      cache_path = os.path.dirname(config_site_path)
+      self.assertEqual(
+          os.path.basename(cache_path), 'focal-dpkg-{0:s}-{1:s}'.format(
+              test_accelerator._GetCompilerFingerprint(),
+              test_accelerator._GetPreciousVariablesFingerprint({})))
+
+      with open(config_site_path, 'r', encoding='utf-8') as file_object:
+        config_site = file_object.read()
+
+      self.assertIn('cache_file="{0:s}"'.format(
+          os.path.join(cache_path, 'config.cache')), config_site)
+
+      host_config_site_path = test_accelerator.GetConfigSitePath(
+          '', build_target='dpkg', environment={})
+      self.assertNotEqual(host_config_site_path, config_site_path)
+
+      # The configure cache is specific to the build target and the compiler
+      # flags, since configure fails when these change.
+      rpm_config_site_path = test_accelerator.GetConfigSitePath(
+          'focal', build_target='rpm', environment={})
+      self.assertNotEqual(rpm_config_site_path, config_site_path)
+
+      cflags_config_site_path = test_accelerator.GetConfigSitePath(
+          'focal', build_target='dpkg', environment={'CFLAGS': '-O2'})
+      self.assertNotEqual(cflags_config_site_path, config_site_path)
+
+      other_cflags_config_site_path = test_accelerator.GetConfigSitePath(
+          'focal', build_target='dpkg', environment={
+              'CFLAGS': '-O2', 'PATH': '/usr/bin'})
+      self.assertEqual(other_cflags_config_site_path, cflags_config_site_path)
+
+      other_cflags_config_site_path = test_accelerator.GetConfigSitePath(
+          'focal', build_target='dpkg', environment={'CFLAGS': '-O0'})
+      self.assertNotEqual(
+          other_cflags_config_site_path, cflags_config_site_path)
+
+  def testGetEnvironment(self):
+    """Tests the GetEnvironment function."""
+    test_accelerator = accelerator.BuildAccelerator(
+        make_jobs=4, use_ccache=False)
+
+    environment = test_accelerator.GetEnvironment(build_target='dpkg')
+    self.assertIn('parallel=4', environment['DEB_BUILD_OPTIONS'].split())
+    self.assertNotIn('CONFIG_SITE', environment)
+    self.assertNotIn('PATH', environment)
+
+    environment = test_accelerator.GetEnvironment()
+    self.assertEqual(environment, {})
+
+    test_accelerator = accelerator.BuildAccelerator()
+    test_accelerator._ccache_wrapper_path = '/usr/lib/ccache'
+
+    environment = test_accelerator.GetEnvironment(build_target='dpkg')
+    self.assertTrue(environment['PATH'].startswith('/usr/lib/ccache'))
+    self.assertNotIn('DEB_BUILD_OPTIONS', environment)
+
+  def testGetCommandPrefix(self):
+    """Tests the GetCommandPrefix function."""
+    test_accelerator = accelerator.BuildAccelerator(
+        make_jobs=2, use_ccache=False)
+
+    command_prefix = test_accelerator.GetCommandPrefix(build_target='dpkg')
+    self.assertTrue(command_prefix.startswith('DEB_BUILD_OPTIONS='))
+    self.assertTrue(command_prefix.endswith(' '))
+
+    test_accelerator = accelerator.BuildAccelerator(use_ccache=False)
+    self.assertEqual(test_accelerator.GetCommandPrefix(), '')
+
+  def testGetMakeFlags(self):
+    """Tests the GetMakeFlags function."""
+    test_accelerator = accelerator.BuildAccelerator(make_jobs=8)
+    self.assertEqual(test_accelerator.GetMakeFlags(), '-j8')
+
+    test_accelerator = accelerator.BuildAccelerator()
+    self.assertEqual(test_accelerator.GetMakeFlags(), '')
+
+  def testGetRPMBuildFlags(self):
+    """Tests the GetRPMBuildFlags function."""
+    test_accelerator = accelerator.BuildAccelerator(make_jobs=8)
+    self.assertEqual(
+        test_accelerator.GetRPMBuildFlags(), '--define \'_smp_mflags -j8\'')
+
+    test_accelerator = accelerator.BuildAccelerator()
+    self.assertEqual(test_accelerator.GetRPMBuildFlags(), '')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -11,6 +11,90 @@ from l2tdevtools.build_helpers import dpkg
 from tests import test_lib
 
 
+class TestSourceHelper(object):
+  """Source helper for testing.
+
+  Attributes:
+    project_name (str): name of the project.
+  """
+
+  def __init__(self, project_name, source_directory):
+    """Initializes a source helper.
+
+    Args:
+      project_name (str): name of the project.
+      source_directory (str): path of the source directory.
+    """
+    super(TestSourceHelper, self).__init__()
+    self._source_directory = source_directory
+    self.project_name = project_name
+
+  def GetProjectVersion(self):
+    """Retrieves the version number for a given project name.
+
+    Returns:
+      str: version number.
+    """
+    return '20210606'
+
+  def GetSourceDirectoryPath(self):
+    """Retrieves the path of the source directory.
+
+    Returns:
+      str: path of the source directory.
+    """
+    return self._source_directory
+
+  def GetSourcePackageFilename(self):
+    """Retrieves the filename of the source package.
+
+    Returns:
+      str: filename of the source package.
+    """
+    return '{0:s}-20210606.tar.gz'.format(self.project_name)
+
+
+class TestSourceDPKGBuildHelper(dpkg.ConfigureMakeSourceDPKGBuildHelper):
+  """Source dpkg build helper for testing that does not run build commands.
+
+  Attributes:
+    build_commands (list[tuple[str, str, str]]): source directory, command and
+        distribution of the build commands that were run.
+  """
+
+  def __init__(
+      self, project_definition, l2tdevtools_path, dependency_definitions):
+    """Initializes a build helper.
+
+    Args:
+      project_definition (ProjectDefinition): definition of the project
+          to build.
+      l2tdevtools_path (str): path to the l2tdevtools directory.
+      dependency_definitions (dict[str, ProjectDefinition]): definitions of all
+          projects, which is used to determine the properties of dependencies.
+    """
+    super(TestSourceDPKGBuildHelper, self).__init__(
+        project_definition, l2tdevtools_path, dependency_definitions)
+    self.build_commands = []
+
+  # pylint: disable=unused-argument
+
+  def _CreateOriginalSourcePackage(
+      self, source_filename, project_name, project_version):
+    """Creates the .orig.tar.gz source package."""
+    return
+
+  def _PrepareSourceDirectory(
+      self, source_directory, project_name, project_version):
+    """Prepares a source directory for building the dpkg packages."""
+    return self.distribution != 'xenial'
+
+  def _RunBuildCommand(self, source_directory, command, distribution=None):
+    """Runs a build command in the source directory."""
+    self.build_commands.append((source_directory, command, distribution))
+    return 1 if distribution == 'bionic' else 0
+
+
 class DPKGBuildHelperTest(test_lib.BaseTestCase):
   """Tests for the helper to build dpkg packages (.deb)."""
 
@@ -67,8 +151,57 @@ class DPKGBuildHelperTest(test_lib.BaseTestCase):
     else:
       self.assertIsNone(output)
 
+  def testBuildForDistributions(self):
+    """Tests the BuildForDistributions function."""
+    project_definition = projects.ProjectDefinition('test')
+
+    l2tdevtools_path = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+
+    test_build_helper = TestSourceDPKGBuildHelper(
+        project_definition, l2tdevtools_path, {})
+
+    with test_lib.TempDirectory() as temp_directory:
+      source_directory = os.path.join(temp_directory, 'test-20210606')
+      os.mkdir(source_directory)
+
+      test_source_helper = TestSourceHelper('test', source_directory)
+
+      failed_distributions = test_build_helper.BuildForDistributions(
+          test_source_helper, ['bionic', 'focal', 'xenial'])
+
+      self.assertEqual(failed_distributions, ['bionic', 'xenial'])
+      self.assertEqual(test_build_helper.distribution, 'bionic')
+      self.assertEqual(os.listdir(temp_directory), ['test-20210606'])
+
+    build_commands = sorted(test_build_helper.build_commands)
+    self.assertEqual(build_commands, [
+        ('{0:s}~bionic'.format(source_directory),
+         'debuild -S -sa > ../build-bionic.log 2>&1', 'bionic'),
+        ('{0:s}~focal'.format(source_directory),
+         'debuild -S -sa > ../build-focal.log 2>&1', 'focal')])
+
+    test_source_helper = TestSourceHelper('test', None)
+
+    failed_distributions = test_build_helper.BuildForDistributions(
+        test_source_helper, ['bionic', 'focal'])
+    self.assertEqual(failed_distributions, ['bionic', 'focal'])
+
   # TODO: add tests for CheckBuildDependencies
 
+  def testGetDistributionLogFilename(self):
+    """Tests the GetDistributionLogFilename function."""
+    project_definition = projects.ProjectDefinition('test')
+
+    l2tdevtools_path = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+
+    test_build_helper = dpkg.DPKGBuildHelper(
+        project_definition, l2tdevtools_path, {})
+
+    log_filename = test_build_helper.GetDistributionLogFilename('focal')
+    self.assertEqual(log_filename, 'build-focal.log')
+
 
 class ConfigureMakeDPKGBuildHelperTest(test_lib.BaseTestCase):
   """Tests for the helper to build dpkg packages (.deb)."""
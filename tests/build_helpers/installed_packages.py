@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the installed package cache."""
+
+import os
+import unittest
+
+from l2tdevtools.build_helpers import installed_packages
+
+from tests import test_lib
+
+
+class InstalledPackageCacheTest(test_lib.BaseTestCase):
+  """Tests for the installed package cache."""
+
+  def testCheckIsInstalled(self):
+    """Tests the CheckIsInstalled function."""
+    with test_lib.TempDirectory() as temp_directory:
+      database_path = os.path.join(temp_directory, 'status')
+      with open(database_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('Package: python3-six\n')
+
+      marker_path = os.path.join(temp_directory, 'installed')
+      command = 'test -f "{0:s}"'.format(marker_path)
+
+      installed_package_cache = installed_packages.InstalledPackageCache(
+          database_paths={'dpkg': [database_path]})
+
+      self.assertFalse(
+          installed_package_cache.CheckIsInstalled('dpkg', command))
+
+      # The result is cached while the package database does not change.
+      with open(marker_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('')
+
+      self.assertFalse(
+          installed_package_cache.CheckIsInstalled('dpkg', command))
+
+      with open(database_path, 'a', encoding='utf-8') as file_object:
+        file_object.write('Package: python3-dfvfs\n')
+
+      self.assertTrue(
+          installed_package_cache.CheckIsInstalled('dpkg', command))
+
+      # Without a package database the result is not cached.
+      os.remove(marker_path)
+      self.assertFalse(
+          installed_package_cache.CheckIsInstalled('rpm', command))
+
+      with open(marker_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('')
+
+      self.assertTrue(
+          installed_package_cache.CheckIsInstalled('rpm', command))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the build sandboxes."""
+
+import os
+import unittest
+
+from l2tdevtools.build_helpers import sandbox
+
+from tests import test_lib
+
+
+class OverlayBuildSandboxTest(test_lib.BaseTestCase):
+  """Tests for the unshare based overlay build sandbox."""
+
+  # pylint: disable=protected-access
+
+  def testGetMountScript(self):
+    """Tests the _GetMountScript function."""
+    with test_lib.TempDirectory() as temp_directory:
+      build_sandbox_pool = sandbox.BuildSandboxPool(temp_directory)
+
+      build_root_path = build_sandbox_pool.GetBuildRootPath('focal')
+      os.makedirs(build_root_path)
+
+      with build_sandbox_pool.CreateSandbox('focal') as build_sandbox:
+        self.assertIsInstance(build_sandbox, sandbox.OverlayBuildSandbox)
+
+        overlay_path = build_sandbox._path
+        self.assertTrue(os.path.isdir(os.path.join(overlay_path, 'upper')))
+
+        script = build_sandbox._GetMountScript(
+            'dpkg-buildpackage -uc -us', '/build/test-1.0')
+
+      self.assertFalse(os.path.exists(overlay_path))
+
+    lines = script.split('\n')
+    self.assertEqual(lines[0], 'set -e')
+    self.assertEqual(lines[1], (
+        'mount -t overlay overlay -o lowerdir={0:s},upperdir={1:s}/upper,'
+        'workdir={1:s}/work {1:s}/merged').format(
+            build_root_path, overlay_path))
+    self.assertEqual(lines[-1], (
+        'exec chroot {0:s}/merged /bin/sh -c '
+        '\'cd /build/test-1.0 && dpkg-buildpackage -uc -us\'').format(
+            overlay_path))
+
+  def testOpen(self):
+    """Tests the Open function."""
+    with test_lib.TempDirectory() as temp_directory:
+      build_sandbox_pool = sandbox.BuildSandboxPool(temp_directory)
+
+      build_sandbox = build_sandbox_pool.CreateSandbox('focal')
+      with self.assertRaises(IOError):
+        build_sandbox.Open()
+
+
+class BuildSandboxPoolTest(test_lib.BaseTestCase):
+  """Tests for the build sandbox pool."""
+
+  # pylint: disable=protected-access
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    build_sandbox_pool = sandbox.BuildSandboxPool('pool')
+    self.assertEqual(build_sandbox_pool.sandbox_type, 'overlay')
+
+    with self.assertRaises(ValueError):
+      sandbox.BuildSandboxPool('pool', sandbox_type='bogus')
+
+  def testCreateSandbox(self):
+    """Tests the CreateSandbox function."""
+    build_sandbox_pool = sandbox.BuildSandboxPool(
+        'pool', sandbox_type='schroot')
+
+    build_sandbox = build_sandbox_pool.CreateSandbox('focal')
+    self.assertIsInstance(build_sandbox, sandbox.SchrootBuildSandbox)
+    self.assertEqual(build_sandbox.distribution, 'focal')
+
+  def testGetBuildRootPath(self):
+    """Tests the GetBuildRootPath function."""
+    build_sandbox_pool = sandbox.BuildSandboxPool('pool')
+
+    path = build_sandbox_pool.GetBuildRootPath('focal')
+    self.assertEqual(path, os.path.abspath(os.path.join(
+        'pool', 'focal', 'root')))
+
+  def testGetSchrootName(self):
+    """Tests the GetSchrootName function."""
+    build_sandbox_pool = sandbox.BuildSandboxPool(
+        'pool', sandbox_type='schroot')
+
+    self.assertEqual(
+        build_sandbox_pool.GetSchrootName('focal'), 'l2tbuilds-focal')
+
+  def testProvisionBuildRoot(self):
+    """Tests the ProvisionBuildRoot function."""
+    build_sandbox_pool = sandbox.BuildSandboxPool(
+        'pool', sandbox_type='schroot')
+
+    result = build_sandbox_pool.ProvisionBuildRoot('focal', ['debhelper'])
+    self.assertTrue(result)
+
+    with test_lib.TempDirectory() as temp_directory:
+      build_sandbox_pool = sandbox.BuildSandboxPool(temp_directory)
+
+      os.makedirs(build_sandbox_pool.GetBuildRootPath('focal'))
+      build_sandbox_pool._WriteProvisionedPackages(
+          'focal', set(['debhelper', 'quilt']))
+
+      # All packages are provisioned, hence no commands are run.
+      result = build_sandbox_pool.ProvisionBuildRoot('focal', ['debhelper'])
+      self.assertTrue(result)
+
+  def testReadProvisionedPackages(self):
+    """Tests the _ReadProvisionedPackages and _WriteProvisionedPackages."""
+    with test_lib.TempDirectory() as temp_directory:
+      build_sandbox_pool = sandbox.BuildSandboxPool(temp_directory)
+
+      package_names = build_sandbox_pool._ReadProvisionedPackages('focal')
+      self.assertEqual(package_names, set())
+
+      os.makedirs(os.path.join(temp_directory, 'focal'))
+      build_sandbox_pool._WriteProvisionedPackages(
+          'focal', set(['quilt', 'debhelper']))
+
+      package_names = build_sandbox_pool._ReadProvisionedPackages('focal')
+      self.assertEqual(package_names, set(['debhelper', 'quilt']))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the build directory index."""
+
+import os
+import re
+import unittest
+
+from l2tdevtools import build_index
+
+from tests import test_lib
+
+
+class BuildDirectoryIndexTest(test_lib.BaseTestCase):
+  """Tests for the build directory index."""
+
+  # pylint: disable=protected-access
+
+  _FILENAMES = [
+      'dfvfs-20230101.tar.gz', 'dfvfs-20240101.tar.gz',
+      'dfvfs_20230101-1_all.deb', 'dfvfs_20240101-1_all.deb',
+      'dtfabric-20240101.tar.gz', 'libyal-20240101.zip']
+
+  def _CreateTestDirectory(self, path):
+    """Creates a test build directory.
+
+    Args:
+      path (str): path of the build directory.
+    """
+    for filename in self._FILENAMES:
+      with open(os.path.join(path, filename), 'wb') as file_object:
+        file_object.write(b'')
+
+    os.mkdir(os.path.join(path, 'dfvfs-20230101'))
+    os.mkdir(os.path.join(path, 'dfvfs-20240101'))
+
+  def testAddPathAndExists(self):
+    """Tests the AddPath and Exists functions."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateTestDirectory(temp_directory)
+
+      test_index = build_index.BuildDirectoryIndex(temp_directory)
+      self.assertTrue(test_index.Exists('dfvfs_20240101-1_all.deb'))
+      self.assertFalse(test_index.Exists('plaso_20240101-1_all.deb'))
+
+      path = os.path.join(temp_directory, 'plaso_20240101-1_all.deb')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'')
+
+      test_index.AddPath('plaso_20240101-1_all.deb')
+      self.assertTrue(test_index.Exists('plaso_20240101-1_all.deb'))
+
+  def testGlob(self):
+    """Tests the Glob function."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateTestDirectory(temp_directory)
+
+      test_index = build_index.BuildDirectoryIndex(temp_directory)
+
+      paths = test_index.Glob('dfvfs-[0-9]*.tar.gz')
+      self.assertEqual(paths, [
+          os.path.join(temp_directory, 'dfvfs-20230101.tar.gz'),
+          os.path.join(temp_directory, 'dfvfs-20240101.tar.gz')])
+
+      paths = test_index.Glob('*-20240101.*')
+      self.assertEqual(len(paths), 3)
+
+      paths = test_index.Glob('bogus-*')
+      self.assertEqual(paths, [])
+
+  def testGlobRescan(self):
+    """Tests that the Glob function rescans a changed build directory."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateTestDirectory(temp_directory)
+
+      test_index = build_index.BuildDirectoryIndex(temp_directory)
+      self.assertEqual(len(test_index.Glob('plaso-*')), 0)
+
+      path = os.path.join(temp_directory, 'plaso-20240101.tar.gz')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'')
+
+      # Make sure the modification time of the directory changes.
+      test_index._modification_time = None
+
+      self.assertEqual(test_index.Glob('plaso-*'), [path])
+
+  def testGlobRacy(self):
+    """Tests that the Glob function rescans within the racy interval."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateTestDirectory(temp_directory)
+
+      test_index = build_index.BuildDirectoryIndex(temp_directory)
+      self.assertEqual(len(test_index.Glob('plaso-*')), 0)
+
+      modification_time = test_index._modification_time
+
+      path = os.path.join(temp_directory, 'plaso-20240101.tar.gz')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'')
+
+      # Simulate a change in the same clock tick as the last scan.
+      os.utime(temp_directory, ns=(modification_time, modification_time))
+
+      self.assertEqual(test_index.Glob('plaso-*'), [path])
+
+  def testRemoveOlderVersions(self):
+    """Tests the RemoveOlderVersions function."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateTestDirectory(temp_directory)
+
+      test_index = build_index.BuildDirectoryIndex(temp_directory)
+
+      # Changes made through the index are tested outside the racy interval.
+      test_index._RACY_INTERVAL = 0
+
+      filenames_to_ignore = re.compile('^{0:s}-.*20240101'.format(
+          re.escape(os.path.join(temp_directory, 'dfvfs'))))
+
+      removed_paths = test_index.RemoveOlderVersions(
+          ['dfvfs-[0-9]*.tar.gz', 'dfvfs-[0-9]*.zip'], filenames_to_ignore)
+      self.assertEqual(removed_paths, [
+          os.path.join(temp_directory, 'dfvfs-20230101.tar.gz')])
+
+      self.assertFalse(test_index.Exists('dfvfs-20230101.tar.gz'))
+      self.assertTrue(test_index.Exists('dfvfs-20240101.tar.gz'))
+      self.assertTrue(test_index.IsDirectory('dfvfs-20230101'))
+
+      removed_paths = test_index.RemoveOlderVersions(
+          ['dfvfs-[0-9]*'], filenames_to_ignore, directories=True)
+      self.assertEqual(removed_paths, [
+          os.path.join(temp_directory, 'dfvfs-20230101')])
+
+      self.assertFalse(os.path.exists(
+          os.path.join(temp_directory, 'dfvfs-20230101')))
+      self.assertTrue(test_index.IsDirectory('dfvfs-20240101'))
+
+      # The index is kept up to date without scanning the directory again.
+      modification_time = test_index._modification_time
+      self.assertEqual(len(test_index.Glob('dfvfs*')), 4)
+      self.assertEqual(test_index._modification_time, modification_time)
+
+  def testRemovePath(self):
+    """Tests the RemovePath function."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateTestDirectory(temp_directory)
+
+      test_index = build_index.BuildDirectoryIndex(temp_directory)
+      test_index.RemovePath('libyal-20240101.zip')
+
+      self.assertFalse(test_index.Exists('libyal-20240101.zip'))
+      self.assertFalse(os.path.exists(
+          os.path.join(temp_directory, 'libyal-20240101.zip')))
+
+
+class BuildIndexFunctionsTest(test_lib.BaseTestCase):
+  """Tests for the build index functions."""
+
+  def testGetBuildDirectoryIndex(self):
+    """Tests the GetBuildDirectoryIndex function."""
+    with test_lib.TempDirectory() as temp_directory:
+      test_index = build_index.GetBuildDirectoryIndex(temp_directory)
+      self.assertIsNotNone(test_index)
+
+      self.assertIs(
+          build_index.GetBuildDirectoryIndex(temp_directory), test_index)
+
+      current_working_directory = os.getcwd()
+      os.chdir(temp_directory)
+
+      try:
+        relative_test_index = build_index.GetBuildDirectoryIndex('.')
+        self.assertIsNot(relative_test_index, test_index)
+
+      finally:
+        os.chdir(current_working_directory)
+
+      self.assertIs(
+          build_index.GetBuildDirectoryIndex(temp_directory), test_index)
+
+  def testGlob(self):
+    """Tests the Glob function."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'dfvfs-20240101.tar.gz')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'')
+
+      paths = build_index.Glob(os.path.join(temp_directory, 'dfvfs-*'))
+      self.assertEqual(paths, [path])
+
+
+if __name__ == '__main__':
+  unittest.main()
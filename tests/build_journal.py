@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the build journal."""
+
+import io
+import os
+import unittest
+
+from l2tdevtools import build_journal
+from l2tdevtools import projects
+
+from tests import test_lib
+
+
+class HashFunctionsTest(test_lib.BaseTestCase):
+  """Tests for the hash functions."""
+
+  def testCalculateFileHash(self):
+    """Tests the CalculateFileHash function."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'dfvfs-20210606.tar.gz')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'test')
+
+      file_hash = build_journal.CalculateFileHash(path)
+      self.assertEqual(file_hash, (
+          '9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08'))
+
+      path = os.path.join(temp_directory, 'bogus.tar.gz')
+      self.assertIsNone(build_journal.CalculateFileHash(path))
+
+  def testCalculateInputsHash(self):
+    """Tests the CalculateInputsHash function."""
+    inputs_hash = build_journal.CalculateInputsHash({'a': 1, 'b': [2, 3]})
+    self.assertEqual(
+        inputs_hash, build_journal.CalculateInputsHash({'b': [2, 3], 'a': 1}))
+
+    project_definition = projects.ProjectDefinition('dfvfs')
+    project_definition.version = '>=20210606'
+    inputs_hash = build_journal.CalculateInputsHash(project_definition)
+
+    project_definition.version = '>=20210707'
+    self.assertNotEqual(
+        inputs_hash, build_journal.CalculateInputsHash(project_definition))
+
+
+class BuildJournalTest(test_lib.BaseTestCase):
+  """Tests for the build journal."""
+
+  def testRecordPhase(self):
+    """Tests the RecordPhase and GetPhase functions."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, build_journal.BuildJournal.FILENAME)
+
+      journal = build_journal.BuildJournal(path)
+      journal.Open()
+      journal.RecordPhase('dfvfs', 'download', 'hash1', values={
+          'source_filename': 'dfvfs-20210606.tar.gz'})
+      journal.RecordPhase('dfvfs', 'build', 'hash2')
+
+      values = journal.GetPhase('dfvfs', 'download', 'hash1')
+      self.assertEqual(values, {'source_filename': 'dfvfs-20210606.tar.gz'})
+
+      journal.Close()
+
+      # The phases of the previous run are read when resuming.
+      journal = build_journal.BuildJournal(path)
+      journal.Open(resume=True)
+
+      values = journal.GetPhase('dfvfs', 'download', 'hash1')
+      self.assertEqual(values, {'source_filename': 'dfvfs-20210606.tar.gz'})
+      self.assertEqual(journal.GetPhase('dfvfs', 'build', 'hash2'), {})
+
+      # Phases with different inputs are not completed.
+      self.assertIsNone(journal.GetPhase('dfvfs', 'build', 'hash3'))
+      self.assertIsNone(journal.GetPhase('six', 'build', 'hash2'))
+
+      journal.Close()
+
+      # A new run starts with an empty journal.
+      journal = build_journal.BuildJournal(path)
+      journal.Open()
+
+      self.assertIsNone(journal.GetPhase('dfvfs', 'download', 'hash1'))
+
+      journal.Close()
+
+      self.assertEqual(os.path.getsize(path), 0)
+
+  def testOpenWithIncompleteLine(self):
+    """Tests the Open function with an interrupted journal."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, build_journal.BuildJournal.FILENAME)
+
+      journal = build_journal.BuildJournal(path)
+      journal.Open()
+      journal.RecordPhase('six', 'download', 'hash1')
+      journal.Close()
+
+      with io.open(path, 'a', encoding='utf-8') as file_object:
+        file_object.write('{"inputs_hash": "hash2", "phase": "bu')
+
+      journal = build_journal.BuildJournal(path)
+      journal.Open(resume=True)
+
+      self.assertEqual(journal.GetPhase('six', 'download', 'hash1'), {})
+      self.assertIsNone(journal.GetPhase('six', 'build', 'hash2'))
+
+      journal.RecordPhase('six', 'build', 'hash3')
+      journal.Close()
+
+      journal = build_journal.BuildJournal(path)
+      journal.Open(resume=True)
+
+      self.assertEqual(journal.GetPhase('six', 'build', 'hash3'), {})
+
+      journal.Close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the structured build log."""
+
+import io
+import json
+import os
+import unittest
+
+from l2tdevtools import build_log
+
+from tests import test_lib
+
+
+class BuildPhaseEventTest(test_lib.BaseTestCase):
+  """Tests for the build phase event."""
+
+  def testCopyToDict(self):
+    """Tests the CopyToDict function."""
+    event = build_log.BuildPhaseEvent('dfvfs', 'build', command='make')
+    event.wall_time = 1.5
+
+    event_values = event.CopyToDict()
+    self.assertEqual(event_values['command'], 'make')
+    self.assertEqual(event_values['exit_code'], 0)
+    self.assertEqual(event_values['phase'], 'build')
+    self.assertEqual(event_values['project'], 'dfvfs')
+    self.assertEqual(event_values['wall_time'], 1.5)
+
+
+class BuildLogRecorderTest(test_lib.BaseTestCase):
+  """Tests for the build log recorder."""
+
+  def testRecordPhase(self):
+    """Tests the RecordPhase function."""
+    build_log_recorder = build_log.BuildLogRecorder()
+
+    with build_log_recorder.RecordPhase('dfvfs', 'download') as event:
+      event.exit_code = 1
+
+    with self.assertRaises(RuntimeError):
+      with build_log_recorder.RecordPhase('dfvfs', 'extract'):
+        raise RuntimeError('extraction failed')
+
+    events = build_log_recorder.GetEvents()
+    self.assertEqual(len(events), 2)
+
+    self.assertEqual(events[0].phase, 'download')
+    self.assertEqual(events[0].exit_code, 1)
+    self.assertIsNotNone(events[0].timestamp)
+    self.assertGreaterEqual(events[0].wall_time, 0.0)
+
+    self.assertEqual(events[1].phase, 'extract')
+    self.assertEqual(events[1].exit_code, 1)
+
+  def testRunCommand(self):
+    """Tests the RunCommand function."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'build.jsonl')
+
+      build_log_recorder = build_log.BuildLogRecorder(path=path)
+      build_log_recorder.Open()
+
+      exit_code = build_log_recorder.RunCommand('dfvfs', 'build', 'exit 0')
+      self.assertEqual(exit_code, 0)
+
+      exit_code = build_log_recorder.RunCommand('dfvfs', 'build', 'exit 3')
+      self.assertEqual(exit_code, 3)
+
+      build_log_recorder.Close()
+
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        lines = file_object.readlines()
+
+    self.assertEqual(len(lines), 2)
+
+    event_values = json.loads(lines[1])
+    self.assertEqual(event_values['command'], 'exit 3')
+    self.assertEqual(event_values['exit_code'], 3)
+    self.assertEqual(event_values['phase'], 'build')
+    self.assertEqual(event_values['project'], 'dfvfs')
+
+    if build_log.resource and hasattr(os, 'wait4'):
+      self.assertIsNotNone(event_values['cpu_time'])
+      self.assertIsNotNone(event_values['peak_rss'])
+
+
+class BuildLogSummaryTest(test_lib.BaseTestCase):
+  """Tests for the build log summary."""
+
+  def _CreateEvent(self, project_name, phase, wall_time):
+    """Creates a build phase event.
+
+    Args:
+      project_name (str): name of the project.
+      phase (str): name of the phase.
+      wall_time (float): elapsed wall clock time in seconds.
+
+    Returns:
+      BuildPhaseEvent: build phase event.
+    """
+    event = build_log.BuildPhaseEvent(project_name, phase)
+    event.wall_time = wall_time
+    return event
+
+  def testGetSlowestProjects(self):
+    """Tests the GetSlowestProjects function."""
+    build_log_summary = build_log.BuildLogSummary()
+    build_log_summary.AddEvent(self._CreateEvent('dfvfs', 'download', 2.0))
+    build_log_summary.AddEvent(self._CreateEvent('dfvfs', 'build', 30.0))
+    build_log_summary.AddEvent(self._CreateEvent('libyal', 'build', 60.0))
+    build_log_summary.AddEvent(self._CreateEvent('six', 'build', 1.0))
+
+    self.assertEqual(build_log_summary.total_wall_time, 93.0)
+    self.assertEqual(build_log_summary.phases, {
+        'build': 91.0, 'download': 2.0})
+
+    projects = build_log_summary.GetSlowestProjects(
+        maximum_number_of_projects=2)
+    self.assertEqual(projects, [('libyal', 60.0), ('dfvfs', 32.0)])
+
+    events = build_log_summary.GetSlowestEvents(maximum_number_of_events=1)
+    self.assertEqual(len(events), 1)
+    self.assertEqual(events[0].project_name, 'libyal')
+
+  def testWrite(self):
+    """Tests the Write function."""
+    build_log_summary = build_log.BuildLogSummary()
+    build_log_summary.AddEvent(self._CreateEvent('dfvfs', 'build', 30.0))
+
+    output_writer = io.StringIO()
+    build_log_summary.Write(output_writer)
+
+    lines = output_writer.getvalue().split('\n')
+    self.assertEqual(lines[0], 'Total wall time: 30.0s')
+    self.assertIn('\tbuild\t30.0s', lines)
+    self.assertIn('\tdfvfs\t30.0s', lines)
+    self.assertIn(
+        '\tdfvfs\tbuild\t30.0s\tcpu: -\tpeak rss: -\texit code: 0', lines)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the build planner."""
+
+import unittest
+
+from l2tdevtools import build_planner
+from l2tdevtools import projects
+
+from tests import test_lib
+
+
+class TestBuildPlanner(build_planner.BuildPlanner):
+  """Build planner with upstream versions for testing.
+
+  Attributes:
+    upstream_versions (dict[str, str]): upstream versions per project name.
+  """
+
+  def __init__(self, project_definitions):
+    """Initializes a build planner for testing.
+
+    Args:
+      project_definitions (dict[str, ProjectDefinition]): project definitions
+          per project name.
+    """
+    super(TestBuildPlanner, self).__init__(project_definitions)
+    self.upstream_versions = {}
+
+  def _GetUpstreamVersion(self, project_name):
+    """Retrieves the latest upstream version of a project.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      str: latest upstream version or None if not available.
+    """
+    return self.upstream_versions.get(project_name, None)
+
+
+class BuildPlannerTest(test_lib.BaseTestCase):
+  """Tests for the build planner."""
+
+  # pylint: disable=protected-access
+
+  def _CreateBuildPlanner(self):
+    """Creates a build planner for testing.
+
+    Returns:
+      TestBuildPlanner: build planner.
+    """
+    project_definitions = {}
+    for name, dpkg_dependencies, dpkg_name in (
+        ('dfvfs', ['python3-dtfabric', 'python3-six'], None),
+        ('dtfabric', ['python3-yaml'], None),
+        ('PyYAML', [], 'python-yaml'),
+        ('six', [], None)):
+      project_definition = projects.ProjectDefinition(name)
+      project_definition.dpkg_dependencies = dpkg_dependencies
+      project_definition.dpkg_name = dpkg_name
+      project_definitions[name] = project_definition
+
+    planner = TestBuildPlanner(project_definitions)
+    planner.upstream_versions = {
+        'dfvfs': '20210606',
+        'dtfabric': '20210606',
+        'PyYAML': '5.4.1',
+        'six': '1:1.16.0'}
+
+    return planner
+
+  def testGetPublishedVersions(self):
+    """Tests the _GetPublishedVersions function."""
+    planner = self._CreateBuildPlanner()
+
+    published_versions = planner._GetPublishedVersions({
+        'dfvfs': '20210404',
+        'python-dfvfs': '20210101',
+        'python3-yaml': '5.4.1',
+        'libbogus': '1.0'})
+    self.assertEqual(published_versions, {
+        'dfvfs': '20210404', 'PyYAML': '5.4.1'})
+
+  def testPlan(self):
+    """Tests the Plan function."""
+    planner = self._CreateBuildPlanner()
+
+    repository_functions = {
+        'copr': lambda: {
+            'dfvfs': '20210606', 'python-dtfabric': '20210404',
+            'python-yaml': '5.4.1', 'six': '1.16.0'},
+        'launchpad': lambda: {
+            'dfvfs': '20210404', 'dtfabric': '20210606', 'PyYAML': '5.3.1'}}
+
+    planned_builds = planner.Plan(
+        ['six', 'dfvfs', 'dtfabric', 'PyYAML', 'bogus'], repository_functions)
+
+    self.assertEqual(
+        [planned_build.name for planned_build in planned_builds],
+        ['PyYAML', 'dtfabric', 'six', 'dfvfs'])
+
+    planned_build = planned_builds[2]
+    self.assertEqual(planned_build.upstream_version, '1.16.0')
+    self.assertEqual(planned_build.published_versions, {
+        'copr': '1.16.0', 'launchpad': None})
+
+    # Repositories that cannot be read are ignored.
+    repository_functions['launchpad'] = lambda: None
+
+    planned_builds = planner.Plan(['six', 'dfvfs'], repository_functions)
+    self.assertEqual(planned_builds, [])
+
+    planned_builds = planner.Plan(['six'], {'launchpad': lambda: None})
+    self.assertIsNone(planned_builds)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the build service."""
+
+import os
+import stat
+import threading
+import unittest
+
+from l2tdevtools import build_service
+from l2tdevtools.lib import errors
+
+from tests import test_lib
+
+
+class BuildServiceTest(test_lib.BaseTestCase):
+  """Tests for the build service."""
+
+  def _CreateBuildService(self):
+    """Creates a build service for testing.
+
+    Returns:
+      tuple[BuildService, threading.Event, list[dict[str, object]]]: build
+          service, event that blocks the build jobs until set and parameters
+          of the build jobs that ran.
+    """
+    build_event = threading.Event()
+    build_parameters = []
+
+    def _Build(parameters):
+      """Runs a build job for testing."""
+      build_event.wait()
+      build_parameters.append(parameters)
+      return {'built': parameters['projects']}
+
+    def _Resolve(parameters):
+      """Runs a resolve job for testing."""
+      if 'bogus' in parameters['projects']:
+        raise ValueError('Undefined project: bogus')
+
+      if 'empty' in parameters['projects']:
+        raise ValueError()
+
+      return {'versions': {name: '1.0' for name in parameters['projects']}}
+
+    service = build_service.BuildService()
+    service.RegisterJobType('build', _Build)
+    service.RegisterJobType('resolve', _Resolve, number_of_workers=2)
+
+    return service, build_event, build_parameters
+
+  def testSubmitJob(self):
+    """Tests the SubmitJob and WaitForJob functions."""
+    service, build_event, build_parameters = self._CreateBuildService()
+
+    try:
+      job = service.SubmitJob('build', {'projects': ['dfvfs']})
+      identical_job = service.SubmitJob('build', {'projects': ['dfvfs']})
+      other_job = service.SubmitJob('build', {'projects': ['six']})
+
+      # Identical jobs that are queued or running are not queued again.
+      self.assertIs(identical_job, job)
+      self.assertNotEqual(other_job.identifier, job.identifier)
+      self.assertIn(job.status, ('queued', 'running'))
+
+      build_event.set()
+
+      job = service.WaitForJob(job.identifier)
+      self.assertEqual(job.status, 'completed')
+      self.assertEqual(job.result, {'built': ['dfvfs']})
+
+      service.WaitForJob(other_job.identifier)
+      self.assertEqual(len(build_parameters), 2)
+
+      # Finished jobs are run again.
+      job = service.SubmitJob('build', {'projects': ['dfvfs']})
+      self.assertNotEqual(job.identifier, identical_job.identifier)
+      service.WaitForJob(job.identifier)
+
+      job = service.SubmitJob('resolve', {'projects': ['bogus']})
+      job = service.WaitForJob(job.identifier)
+      self.assertEqual(job.status, 'failed')
+      self.assertEqual(job.error, 'Undefined project: bogus')
+
+      # Jobs that raise an exception without a description also fail.
+      job = service.SubmitJob('resolve', {'projects': ['empty']})
+      job = service.WaitForJob(job.identifier)
+      self.assertEqual(job.status, 'failed')
+      self.assertEqual(job.error, 'ValueError')
+      self.assertIsNone(job.result)
+
+      self.assertEqual(len(service.GetJobs()), 5)
+
+      with self.assertRaises(ValueError):
+        service.SubmitJob('bogus', {})
+
+    finally:
+      build_event.set()
+      service.Stop()
+
+  def testBuildServiceClient(self):
+    """Tests the build service client."""
+    service, build_event, _ = self._CreateBuildService()
+    build_event.set()
+
+    with test_lib.TempDirectory() as temp_directory:
+      service_path = os.path.join(temp_directory, 'service')
+      os.mkdir(service_path, 0o755)
+
+      path = os.path.join(service_path, 'build_service.sock')
+      service.Start(path)
+
+      # Only the user that runs the service can connect.
+      self.assertEqual(stat.S_IMODE(os.stat(service_path).st_mode), 0o700)
+      self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+
+      thread = threading.Thread(target=service.Serve)
+      thread.daemon = True
+      thread.start()
+
+      try:
+        client = build_service.BuildServiceClient(path)
+
+        job = client.SubmitJob(
+            'resolve', {'projects': ['dfvfs', 'six']}, wait=True)
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(
+            job['result'], {'versions': {'dfvfs': '1.0', 'six': '1.0'}})
+
+        job = client.SubmitJob('build', {'projects': ['dfvfs']})
+        job = client.WaitForJob(job['identifier'])
+        self.assertEqual(job['result'], {'built': ['dfvfs']})
+
+        job = client.GetJob(job['identifier'])
+        self.assertEqual(job['status'], 'completed')
+
+        self.assertEqual(len(client.GetJobs()), 2)
+
+        with self.assertRaises(errors.ProtocolError):
+          client.SubmitJob('bogus', {})
+
+        with self.assertRaises(errors.ProtocolError):
+          client.GetJob(99)
+
+        # Only one service can listen on the Unix socket.
+        with self.assertRaises(OSError):
+          build_service.BuildService().Start(path)
+
+      finally:
+        service.Stop()
+
+      self.assertFalse(os.path.exists(path))
+
+      client = build_service.BuildServiceClient(path)
+      with self.assertRaises(errors.ConnectivityError):
+        client.GetJobs()
+
+
+if __name__ == '__main__':
+  unittest.main()
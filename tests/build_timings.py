@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the historical build timings and build scheduling."""
+
+import os
+import unittest
+
+from l2tdevtools import build_timings
+
+from tests import test_lib
+
+
+class FormatDurationTest(test_lib.BaseTestCase):
+  """Tests for the FormatDuration function."""
+
+  def testFormatDuration(self):
+    """Tests the FormatDuration function."""
+    self.assertEqual(build_timings.FormatDuration(12.4), '12s')
+    self.assertEqual(build_timings.FormatDuration(185.0), '3m05s')
+    self.assertEqual(build_timings.FormatDuration(3720.0), '1h02m')
+
+
+class BuildTimingDatabaseTest(test_lib.BaseTestCase):
+  """Tests for the build timing database."""
+
+  def testAddBuildTime(self):
+    """Tests the AddBuildTime function."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'cache', 'build_timings.db')
+
+      timing_database = build_timings.BuildTimingDatabase(path=path)
+      timing_database.Open()
+      timing_database.AddBuildTime('sleuthkit', 'dpkg', 600.0)
+      timing_database.Close()
+
+      self.assertTrue(os.path.isfile(path))
+
+      timing_database = build_timings.BuildTimingDatabase(path=path)
+      timing_database.Open()
+
+      try:
+        estimated_build_time = timing_database.GetEstimatedBuildTime(
+            'sleuthkit', 'dpkg')
+      finally:
+        timing_database.Close()
+
+      self.assertEqual(estimated_build_time, 600.0)
+
+  def testGetEstimatedBuildTime(self):
+    """Tests the GetEstimatedBuildTime function."""
+    timing_database = build_timings.BuildTimingDatabase()
+    timing_database.Open()
+
+    for timestamp, wall_time in enumerate([
+        100.0, 50.0, 60.0, 70.0, 500.0, 65.0]):
+      timing_database.AddBuildTime(
+          'libewf', 'dpkg', wall_time, timestamp=timestamp)
+
+    timing_database.AddBuildTime(
+        'libewf', 'dpkg', 5.0, exit_code=1, timestamp=10)
+
+    # The median of the 5 most recent successful builds.
+    self.assertEqual(
+        timing_database.GetEstimatedBuildTime('libewf', 'dpkg'), 65.0)
+
+    self.assertIsNone(timing_database.GetEstimatedBuildTime('libewf', 'rpm'))
+    self.assertIsNone(timing_database.GetEstimatedBuildTime('bogus', 'dpkg'))
+
+    timing_database.Close()
+
+  def testCheckRegression(self):
+    """Tests the CheckRegression function."""
+    timing_database = build_timings.BuildTimingDatabase()
+    timing_database.Open()
+
+    self.assertIsNone(timing_database.CheckRegression('dfvfs', 'dpkg', 500.0))
+
+    timing_database.AddBuildTime('dfvfs', 'dpkg', 100.0)
+
+    self.assertIsNone(timing_database.CheckRegression('dfvfs', 'dpkg', 120.0))
+    self.assertEqual(
+        timing_database.CheckRegression('dfvfs', 'dpkg', 500.0), 100.0)
+
+    # Small absolute differences are not regressions.
+    timing_database.AddBuildTime('six', 'dpkg', 2.0)
+    self.assertIsNone(timing_database.CheckRegression('six', 'dpkg', 10.0))
+
+    timing_database.Close()
+
+
+class BuildSchedulerTest(test_lib.BaseTestCase):
+  """Tests for the longest-processing-time-first build scheduler."""
+
+  def _CreateBuildScheduler(self):
+    """Creates a build scheduler for testing.
+
+    Returns:
+      BuildScheduler: build scheduler.
+    """
+    timing_database = build_timings.BuildTimingDatabase()
+    timing_database.Open()
+
+    for project_name, wall_time in (
+        ('dfvfs', 60.0), ('libewf', 300.0), ('six', 10.0),
+        ('sleuthkit', 900.0)):
+      timing_database.AddBuildTime(project_name, 'dpkg', wall_time)
+
+    return build_timings.BuildScheduler(timing_database, 'dpkg')
+
+  def testGetBuildOrder(self):
+    """Tests the GetBuildOrder function."""
+    build_scheduler = self._CreateBuildScheduler()
+
+    build_order = build_scheduler.GetBuildOrder([
+        'six', 'dfvfs', 'sleuthkit', 'libewf'])
+    self.assertEqual(build_order, ['sleuthkit', 'libewf', 'dfvfs', 'six'])
+
+    # Projects without build times are assumed to take the average.
+    build_order = build_scheduler.GetBuildOrder([
+        'six', 'dfvfs', 'plaso', 'sleuthkit', 'libewf'])
+    self.assertEqual(
+        build_order, ['sleuthkit', 'plaso', 'libewf', 'dfvfs', 'six'])
+
+  def testSchedule(self):
+    """Tests the Schedule function."""
+    build_scheduler = self._CreateBuildScheduler()
+
+    schedules, busy_times = build_scheduler.Schedule(
+        ['six', 'dfvfs', 'sleuthkit', 'libewf'], number_of_workers=2)
+    self.assertEqual(schedules, [['sleuthkit'], ['libewf', 'dfvfs', 'six']])
+    self.assertEqual(busy_times, [900.0, 370.0])
+
+  def testEstimateRemainingTime(self):
+    """Tests the EstimateRemainingTime function."""
+    build_scheduler = self._CreateBuildScheduler()
+
+    remaining_time = build_scheduler.EstimateRemainingTime(
+        ['six', 'dfvfs', 'sleuthkit', 'libewf'])
+    self.assertEqual(remaining_time, 1270.0)
+
+    remaining_time = build_scheduler.EstimateRemainingTime(
+        ['six', 'dfvfs', 'sleuthkit', 'libewf'], number_of_workers=2)
+    self.assertEqual(remaining_time, 900.0)
+
+    self.assertEqual(build_scheduler.EstimateRemainingTime([]), 0.0)
+
+
+if __name__ == '__main__':
+  unittest.main()
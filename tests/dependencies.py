@@ -4,6 +4,8 @@
 
 import configparser
 import io
+import json
+import os
 import unittest
 
 from l2tdevtools import dependencies
@@ -111,6 +113,99 @@ class DependencyHelperTest(test_lib.BaseTestCase):
 
     # TODO: add test with version with suffix 17.0.0b1
 
+  def testGetPythonModuleVersion(self):
+    """Tests the _GetPythonModuleVersion function."""
+    dependencies_file = self._GetTestFilePath(['dependencies.ini'])
+    self._SkipIfPathNotExists(dependencies_file)
+
+    with test_lib.TempDirectory() as temp_directory:
+      cache_path = os.path.join(temp_directory, 'dependencies.json')
+
+      dependency_helper = dependencies.DependencyHelper(
+          dependencies_file=dependencies_file, cache_path=cache_path)
+
+      dependency = dependencies.DependencyDefinition('os')
+      is_available, _ = dependency_helper._GetPythonModuleVersion(dependency)
+      self.assertTrue(is_available)
+
+      dependency = dependencies.DependencyDefinition('bogus')
+      is_available, _ = dependency_helper._GetPythonModuleVersion(dependency)
+      self.assertFalse(is_available)
+
+      dependency_helper._WriteCache()
+      self.assertTrue(os.path.exists(cache_path))
+
+      dependency_helper = dependencies.DependencyHelper(
+          dependencies_file=dependencies_file, cache_path=cache_path)
+      dependency_helper._ReadCache()
+
+      self.assertEqual(dependency_helper._module_versions, {
+          'bogus:': (False, None), 'os:': (True, None)})
+
+  def testGetPythonModuleVersionFromMetadata(self):
+    """Tests the _GetPythonModuleVersionFromMetadata function."""
+    dependencies_file = self._GetTestFilePath(['dependencies.ini'])
+    self._SkipIfPathNotExists(dependencies_file)
+
+    dependency_helper = dependencies.DependencyHelper(
+        dependencies_file=dependencies_file)
+
+    dependency = dependencies.DependencyDefinition('bogus')
+    dependency.version_property = '__version__'
+    is_available, module_version = (
+        dependency_helper._GetPythonModuleVersionFromMetadata(dependency))
+    self.assertFalse(is_available)
+    self.assertIsNone(module_version)
+
+    # Modules without distribution metadata need to be imported.
+    dependency = dependencies.DependencyDefinition('os')
+    dependency.version_property = '__version__'
+    is_available, module_version = (
+        dependency_helper._GetPythonModuleVersionFromMetadata(dependency))
+    self.assertIsNone(is_available)
+    self.assertIsNone(module_version)
+
+    if 'setuptools' not in dependency_helper._GetPackagesDistributions():
+      raise unittest.SkipTest('missing setuptools distribution metadata')
+
+    dependency = dependencies.DependencyDefinition('setuptools')
+    dependency.version_property = '__version__'
+    is_available, module_version = (
+        dependency_helper._GetPythonModuleVersionFromMetadata(dependency))
+    self.assertTrue(is_available)
+    self.assertIsNotNone(module_version)
+
+  def testGetPythonModuleVersionWithoutPackagesDistributions(self):
+    """Tests the _GetPythonModuleVersion function without metadata lookup."""
+    dependencies_file = self._GetTestFilePath(['dependencies.ini'])
+    self._SkipIfPathNotExists(dependencies_file)
+
+    dependency_helper = dependencies.DependencyHelper(
+        dependencies_file=dependencies_file)
+
+    # The distributions per top-level module cannot be looked up on Python
+    # versions before 3.10 without the importlib_metadata backport.
+    dependency_helper._packages_distributions = {}
+
+    dependency = dependencies.DependencyDefinition('json')
+    dependency.version_property = '__version__'
+    is_available, module_version = (
+        dependency_helper._GetPythonModuleVersionFromMetadata(dependency))
+    self.assertIsNone(is_available)
+    self.assertIsNone(module_version)
+
+    is_available, module_version = dependency_helper._GetPythonModuleVersion(
+        dependency)
+    self.assertTrue(is_available)
+    self.assertEqual(module_version, json.__version__)
+
+    dependency = dependencies.DependencyDefinition('bogus')
+    dependency.version_property = '__version__'
+    is_available, module_version = dependency_helper._GetPythonModuleVersion(
+        dependency)
+    self.assertFalse(is_available)
+    self.assertIsNone(module_version)
+
   def testImportPythonModule(self):
     """Tests the _ImportPythonModule function."""
     dependencies_file = self._GetTestFilePath(['dependencies.ini'])
@@ -146,6 +241,27 @@ class DependencyHelperTest(test_lib.BaseTestCase):
 
     dependency_helper.CheckTestDependencies(verbose_output=False)
 
+  def testGetDependencyView(self):
+    """Tests the _GetDependencyView function."""
+    dependencies_file = self._GetTestFilePath(['dependencies.ini'])
+    self._SkipIfPathNotExists(dependencies_file)
+
+    dependency_helper = dependencies.DependencyHelper(
+        dependencies_file=dependencies_file)
+
+    dpkg_depends = dependency_helper._GetDependencyView(
+        dependency_helper._GetDPKGDepends, exclude_version=True)
+    self.assertEqual(dpkg_depends, ['python3-yaml'])
+    self.assertEqual(len(dependency_helper._dependency_views), 1)
+
+    # The view is computed once and a copy is returned.
+    dpkg_depends.append('python3-test')
+
+    dpkg_depends = dependency_helper._GetDependencyView(
+        dependency_helper._GetDPKGDepends, exclude_version=True)
+    self.assertEqual(dpkg_depends, ['python3-yaml'])
+    self.assertEqual(len(dependency_helper._dependency_views), 1)
+
   def testGetDPKGDepends(self):
     """Tests the GetDPKGDepends function."""
     dependencies_file = self._GetTestFilePath(['dependencies.ini'])
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 """Tests for the base class for dependency file writers."""
 
+import io
+import os
 import unittest
 
 from l2tdevtools import dependencies
@@ -15,9 +17,13 @@ class DependencyFileWriterTest(test_lib.BaseTestCase):
 
   # pylint: disable=protected-access
 
-  def _CreateTestWriter(self):
+  def _CreateTestWriter(self, check_only=False):
     """Creates a dependency file writer for testing.
 
+    Args:
+      check_only (Optional[bool]): True if the files should only be checked
+          for changes and not written.
+
     Returns:
       DependencyFileWriter: dependency file writer for testing.
     """
@@ -29,7 +35,8 @@ class DependencyFileWriterTest(test_lib.BaseTestCase):
         test_dependencies_file=test_dependencies_file)
 
     return interface.DependencyFileWriter(
-        '/fake/l2tdevtools/', project_definition, dependency_helper)
+        '/fake/l2tdevtools/', project_definition, dependency_helper,
+        check_only=check_only)
 
   # TODO: add tests for _GenerateFromTemplate.
 
@@ -99,6 +106,32 @@ class DependencyFileWriterTest(test_lib.BaseTestCase):
 
   # TODO: add tests for _ReadTemplateFile.
 
+  def testWriteFile(self):
+    """Tests the _WriteFile function."""
+    test_writer = self._CreateTestWriter()
+
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'test.txt')
+
+      test_writer._WriteFile(path, 'test\n')
+      self.assertEqual(test_writer.changed_paths, [path])
+
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        self.assertEqual(file_object.read(), 'test\n')
+
+      # The file is not written again if its content did not change.
+      test_writer.changed_paths = []
+      test_writer._WriteFile(path, 'test\n')
+      self.assertEqual(test_writer.changed_paths, [])
+
+      test_writer = self._CreateTestWriter(check_only=True)
+
+      test_writer._WriteFile(path, 'changed\n')
+      self.assertEqual(test_writer.changed_paths, [path])
+
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        self.assertEqual(file_object.read(), 'test\n')
+
 
 if __name__ == '__main__':
   unittest.main()
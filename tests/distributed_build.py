@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the distributed builds."""
+
+import io
+import json
+import os
+import socket
+import threading
+import unittest
+
+from l2tdevtools import distributed_build
+from l2tdevtools.lib import errors
+
+from tests import test_lib
+
+
+def _BuildJob(job, job_path, l2tdevtools_path):
+  """Builds a job for testing.
+
+  Args:
+    job (BuildJob): job.
+    job_path (str): path of the job directory.
+    l2tdevtools_path (str): path of the directory that contains the data
+        directory with the packaging inputs.
+
+  Returns:
+    tuple[bool, list[str]]: True if the build is successful and the names of
+        the missing build dependencies.
+  """
+  if job.project_name == 'libbogus':
+    return False, ['libbogus-dev']
+
+  projects_file = os.path.join(l2tdevtools_path, 'data', 'projects.ini')
+  source_path = os.path.join(job_path, job.source_filename)
+  if not os.path.isfile(projects_file) or not os.path.isfile(source_path):
+    return False, []
+
+  package_filename = '{0:s}_{1:s}-1_all.deb'.format(
+      job.project_name, job.project_version)
+  with open(os.path.join(job_path, package_filename), 'wb') as file_object:
+    file_object.write(b'package')
+
+  return True, []
+
+
+class ParseAddressTest(test_lib.BaseTestCase):
+  """Tests for the ParseAddress function."""
+
+  def testParseAddress(self):
+    """Tests the ParseAddress function."""
+    self.assertEqual(
+        distributed_build.ParseAddress('build1:8751'), ('build1', 8751))
+    self.assertEqual(
+        distributed_build.ParseAddress('build1'),
+        ('build1', distributed_build.DEFAULT_PORT))
+
+    with self.assertRaises(ValueError):
+      distributed_build.ParseAddress('build1:bogus')
+
+    with self.assertRaises(ValueError):
+      distributed_build.ParseAddress(':8751')
+
+
+class MessageTest(test_lib.BaseTestCase):
+  """Tests for the SendMessage and ReceiveMessage functions."""
+
+  def testSendAndReceiveMessage(self):
+    """Tests the SendMessage and ReceiveMessage functions."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'dfvfs-20210606.tar.gz')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'source' * 1000)
+
+      output_path = os.path.join(temp_directory, 'output')
+      os.mkdir(output_path)
+
+      connection, peer_connection = socket.socketpair()
+      with connection, peer_connection:
+        thread = threading.Thread(
+            target=distributed_build.SendMessage, args=(
+                connection, {'type': 'build'}), kwargs={'paths': [path]})
+        thread.start()
+
+        message, paths = distributed_build.ReceiveMessage(
+            peer_connection, path=output_path)
+        thread.join()
+
+        self.assertEqual(message, {'type': 'build'})
+        self.assertEqual(paths, [
+            os.path.join(output_path, 'dfvfs-20210606.tar.gz')])
+
+        with open(paths[0], 'rb') as file_object:
+          self.assertEqual(file_object.read(), b'source' * 1000)
+
+        # Files are not accepted if no path is provided.
+        distributed_build.SendMessage(
+            connection, {'type': 'build'}, paths=[path])
+
+        with self.assertRaises(errors.ProtocolError):
+          distributed_build.ReceiveMessage(peer_connection)
+
+  def testReceiveMessageWithSecret(self):
+    """Tests the ReceiveMessage function with a secret."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'dfvfs-20210606.tar.gz')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'source')
+
+      output_path = os.path.join(temp_directory, 'output')
+      os.mkdir(output_path)
+
+      connection, peer_connection = socket.socketpair()
+      with connection, peer_connection:
+        distributed_build.SendMessage(
+            connection, {'secret': 'secret', 'type': 'setup'}, paths=[path])
+
+        message, paths = distributed_build.ReceiveMessage(
+            peer_connection, path=output_path, secret='secret')
+        self.assertEqual(message['type'], 'setup')
+        self.assertEqual(len(paths), 1)
+
+        os.remove(paths[0])
+
+        # The secret is checked before the files are received.
+        for message in ({'secret': 'bogus', 'type': 'setup'}, {
+            'type': 'setup'}):
+          distributed_build.SendMessage(connection, message, paths=[path])
+
+          with self.assertRaises(errors.AuthenticationError):
+            distributed_build.ReceiveMessage(
+                peer_connection, path=output_path, secret='secret')
+
+          self.assertEqual(os.listdir(output_path), [])
+
+          peer_connection.recv(len(b'source'))
+
+  def testReceiveMessageWithUnsupportedFilename(self):
+    """Tests the ReceiveMessage function with an unsupported filename."""
+    with test_lib.TempDirectory() as temp_directory:
+      connection, peer_connection = socket.socketpair()
+      with connection, peer_connection:
+        header = json.dumps({
+            'files': [{'name': '../bogus', 'size': 0}]}).encode('utf-8')
+        connection.sendall(len(header).to_bytes(4, 'big') + header)
+
+        with self.assertRaises(errors.ProtocolError):
+          distributed_build.ReceiveMessage(
+              peer_connection, path=temp_directory)
+
+  def testReceiveMessageWithClosedConnection(self):
+    """Tests the ReceiveMessage function with a closed connection."""
+    connection, peer_connection = socket.socketpair()
+    with peer_connection:
+      connection.sendall(b'\x00\x00')
+      connection.close()
+
+      with self.assertRaises(errors.ConnectivityError):
+        distributed_build.ReceiveMessage(peer_connection)
+
+
+class BuildCoordinatorTest(test_lib.BaseTestCase):
+  """Tests for the build coordinator and build workers."""
+
+  def _CreateBuildInputs(self, temp_directory):
+    """Creates the packaging inputs and source packages for testing.
+
+    Args:
+      temp_directory (str): path of the temporary directory.
+
+    Returns:
+      tuple[str, str, str, list[BuildJob]]: path of the data directory, path
+          of the projects.ini file, path of the output directory and jobs.
+    """
+    data_path = os.path.join(temp_directory, 'data')
+    os.makedirs(os.path.join(data_path, 'dpkg_templates'))
+
+    with open(os.path.join(
+        data_path, 'dpkg_templates', 'dfvfs.rules'), 'w') as file_object:
+      file_object.write('rules\n')
+
+    projects_file = os.path.join(temp_directory, 'projects.ini')
+    with open(projects_file, 'w') as file_object:
+      file_object.write('[dfvfs]\n')
+
+    output_path = os.path.join(temp_directory, 'l2tbuilds')
+    os.mkdir(output_path)
+
+    jobs = []
+    for project_name, project_version in (
+        ('dfvfs', '20210606'), ('dtfabric', '20210606'), ('libbogus', '1.0'),
+        ('six', '1.16.0')):
+      source_filename = '{0:s}-{1:s}.tar.gz'.format(
+          project_name, project_version)
+      with open(os.path.join(output_path, source_filename), 'wb') as (
+          file_object):
+        file_object.write(b'source')
+
+      jobs.append(distributed_build.BuildJob(
+          project_name, project_version, source_filename, 'dpkg'))
+
+    return data_path, projects_file, output_path, jobs
+
+  def _StartWorker(self, work_path, secret='secret'):
+    """Starts a build worker on the local host for testing.
+
+    Args:
+      work_path (str): path of the directory to build the jobs in.
+      secret (Optional[str]): secret shared with the coordinators.
+
+    Returns:
+      tuple[BuildWorker, str]: build worker and its address.
+    """
+    build_worker = distributed_build.BuildWorker(
+        _BuildJob, work_path, secret=secret)
+    host, port = build_worker.Start('localhost', 0)
+
+    thread = threading.Thread(target=build_worker.Serve)
+    thread.daemon = True
+    thread.start()
+
+    return build_worker, '{0:s}:{1:d}'.format(host, port)
+
+  def _GetUnusedAddress(self):
+    """Retrieves the address of a port no worker listens on.
+
+    Returns:
+      str: address.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as unused_socket:
+      unused_socket.bind(('localhost', 0))
+      host, port = unused_socket.getsockname()[:2]
+
+    return '{0:s}:{1:d}'.format(host, port)
+
+  def testBuild(self):
+    """Tests the Build function."""
+    with test_lib.TempDirectory() as temp_directory:
+      data_path, projects_file, output_path, jobs = self._CreateBuildInputs(
+          temp_directory)
+
+      build_workers = []
+      worker_addresses = [self._GetUnusedAddress()]
+      for index in range(2):
+        build_worker, worker_address = self._StartWorker(
+            os.path.join(temp_directory, 'worker{0:d}'.format(index)),
+            secret='secret')
+        build_workers.append(build_worker)
+        worker_addresses.append(worker_address)
+
+      build_coordinator = distributed_build.BuildCoordinator(
+          worker_addresses, data_path, projects_file, connection_timeout=5.0,
+          secret='secret')
+
+      try:
+        build_results = build_coordinator.Build(jobs, output_path)
+      finally:
+        for build_worker in build_workers:
+          build_worker.Stop()
+
+      self.assertEqual(sorted(build_results.keys()), [
+          'dfvfs', 'dtfabric', 'libbogus', 'six'])
+
+      build_result = build_results['dfvfs']
+      self.assertTrue(build_result.result)
+      self.assertEqual(build_result.artifacts, ['dfvfs_20210606-1_all.deb'])
+      self.assertIn(build_result.worker, worker_addresses[1:])
+      self.assertIsNotNone(build_result.wall_time)
+
+      build_result = build_results['libbogus']
+      self.assertFalse(build_result.result)
+      self.assertEqual(build_result.missing_dependencies, ['libbogus-dev'])
+
+      self.assertTrue(os.path.isfile(os.path.join(
+          output_path, 'six_1.16.0-1_all.deb')))
+
+      results_path = os.path.join(
+          output_path, distributed_build.BuildCoordinator.RESULTS_FILENAME)
+      with io.open(results_path, 'r', encoding='utf-8') as file_object:
+        results = [json.loads(line) for line in file_object]
+
+      self.assertEqual(len(results), 4)
+
+  def testBuildWithoutWorkers(self):
+    """Tests the Build function without available workers."""
+    with test_lib.TempDirectory() as temp_directory:
+      data_path, projects_file, output_path, jobs = self._CreateBuildInputs(
+          temp_directory)
+
+      build_worker, worker_address = self._StartWorker(
+          os.path.join(temp_directory, 'worker'), secret='secret')
+
+      # The worker does not accept a coordinator with a different secret.
+      build_coordinator = distributed_build.BuildCoordinator(
+          [worker_address], data_path, projects_file, connection_timeout=5.0,
+          secret='bogus')
+
+      try:
+        build_results = build_coordinator.Build(jobs, output_path)
+      finally:
+        build_worker.Stop()
+
+      self.assertEqual(len(build_results), 4)
+
+      build_result = build_results['dfvfs']
+      self.assertFalse(build_result.result)
+      self.assertEqual(build_result.error, 'No worker available.')
+
+
+class BuildWorkerTest(test_lib.BaseTestCase):
+  """Tests for the build worker."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    with self.assertRaises(ValueError):
+      distributed_build.BuildWorker(_BuildJob, 'worker')
+
+    with self.assertRaises(ValueError):
+      distributed_build.BuildCoordinator(
+          ['localhost'], 'data', 'projects.ini', secret='')
+
+  def testHandleConnectionWithInvalidSecret(self):
+    """Tests the HandleConnection function with an invalid secret."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'packaging.tar.gz')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'packaging')
+
+      work_path = os.path.join(temp_directory, 'worker')
+      build_worker = distributed_build.BuildWorker(
+          _BuildJob, work_path, secret='secret')
+
+      for message in (
+          {'packaging_hash': 'bogus', 'secret': 'bogus', 'type': 'setup'},
+          {'packaging_hash': 'bogus', 'type': 'setup'},
+          {'job': {}, 'type': 'build'}):
+        connection, peer_connection = socket.socketpair()
+        with connection, peer_connection:
+          thread = threading.Thread(
+              target=build_worker.HandleConnection, args=(peer_connection, ))
+          thread.start()
+
+          distributed_build.SendMessage(connection, message, paths=[path])
+
+          response, _ = distributed_build.ReceiveMessage(connection)
+          self.assertEqual(response, {
+              'error': 'Invalid secret.', 'type': 'error'})
+
+          thread.join()
+
+        # The files of the message are not written to disk.
+        self.assertEqual(os.listdir(work_path), [])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -4,9 +4,48 @@
 
 import unittest
 
+from l2tdevtools import download_helper
+from l2tdevtools import projects
+
+from tests import test_lib
+
 
 # TODO: add tests for DownloadHelperFactory
 
 
+class DownloadHelperCacheTest(test_lib.BaseTestCase):
+  """Tests for the download helper cache."""
+
+  def testGetDownloadHelper(self):
+    """Tests the GetDownloadHelper function."""
+    project_definition = projects.ProjectDefinition('dfvfs')
+    project_definition.download_url = (
+        'https://github.com/log2timeline/dfvfs/releases')
+
+    download_helper_cache = download_helper.DownloadHelperCache()
+
+    test_download_helper = download_helper_cache.GetDownloadHelper(
+        project_definition)
+    self.assertIsNotNone(test_download_helper)
+    self.assertIs(download_helper_cache.GetDownloadHelper(
+        project_definition), test_download_helper)
+
+    project_definition.download_url = 'https://pypi.org/project/dfvfs'
+    self.assertIsNot(download_helper_cache.GetDownloadHelper(
+        project_definition), test_download_helper)
+
+    # Download helpers are not reused after their lifetime.
+    download_helper_cache = download_helper.DownloadHelperCache(lifetime=0.0)
+
+    test_download_helper = download_helper_cache.GetDownloadHelper(
+        project_definition)
+    self.assertIsNot(download_helper_cache.GetDownloadHelper(
+        project_definition), test_download_helper)
+
+    project_definition.download_url = 'https://example.com/bogus'
+    with self.assertRaises(ValueError):
+      download_helper_cache.GetDownloadHelper(project_definition)
+
+
 if __name__ == '__main__':
   unittest.main()
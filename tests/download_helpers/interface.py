@@ -43,12 +43,14 @@ class DownloadHelperTest(test_lib.BaseTestCase):
     page_content = b''
     with test_lib.TempDirectory() as temporary_directory:
       os.chdir(temporary_directory)
-      filename = download_helper.DownloadFile(self._download_url)
+      try:
+        filename = download_helper.DownloadFile(self._download_url)
 
-      with open(filename, 'rb') as file_object:
-        page_content = file_object.read()
+        with open(filename, 'rb') as file_object:
+          page_content = file_object.read()
 
-    os.chdir(current_working_directory)
+      finally:
+        os.chdir(current_working_directory)
 
     expected_page_content = b''
     with open(self._FILENAME, 'rb') as file_object:
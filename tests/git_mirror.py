@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the cache of local git mirror repositories."""
+
+import os
+import shutil
+import subprocess
+import unittest
+
+from l2tdevtools import git_mirror
+
+from tests import test_lib
+
+
+class GitMirrorCacheTest(test_lib.BaseTestCase):
+  """Tests for the cache of local git mirror repositories."""
+
+  # pylint: disable=protected-access
+
+  def _CreateGitRepository(self, path):
+    """Creates a git repository for testing.
+
+    Args:
+      path (str): path of the git repository.
+    """
+    os.mkdir(path)
+    readme_path = os.path.join(path, 'README')
+    with open(readme_path, 'w', encoding='utf-8') as file_object:
+      file_object.write('test\n')
+
+    for command in (
+        'git init --quiet', 'git add README',
+        ('git -c user.name=test -c user.email=test@example.com '
+         'commit --quiet -m initial')):
+      subprocess.check_call(
+          '(cd {0:s} && {1:s})'.format(path, command), shell=True)
+
+  def _SkipIfGitNotAvailable(self):
+    """Skips the test if git is not available."""
+    if not shutil.which('git'):
+      raise unittest.SkipTest('missing git')
+
+  def testGetGitVersion(self):
+    """Tests the _GetGitVersion function."""
+    self._SkipIfGitNotAvailable()
+
+    test_cache = git_mirror.GitMirrorCache(path='/cache')
+
+    git_version = test_cache._GetGitVersion()
+    self.assertIsNotNone(git_version)
+    self.assertEqual(len(git_version), 2)
+
+  def testGetMirrorPath(self):
+    """Tests the GetMirrorPath function."""
+    test_cache = git_mirror.GitMirrorCache(path='/cache')
+
+    mirror_path = test_cache.GetMirrorPath(
+        'https://github.com/libyal/libcerror.git')
+    self.assertEqual(mirror_path, os.path.join(
+        '/cache', 'github.com', 'libyal', 'libcerror.git'))
+
+    mirror_path = test_cache.GetMirrorPath(
+        'https://github.com/log2timeline/plaso')
+    self.assertEqual(mirror_path, os.path.join(
+        '/cache', 'github.com', 'log2timeline', 'plaso.git'))
+
+  def testClone(self):
+    """Tests the Clone function."""
+    self._SkipIfGitNotAvailable()
+
+    with test_lib.TempDirectory() as temp_directory:
+      git_url = os.path.join(temp_directory, 'origin')
+      self._CreateGitRepository(git_url)
+
+      test_cache = git_mirror.GitMirrorCache(
+          path=os.path.join(temp_directory, 'cache'))
+
+      destination = os.path.join(temp_directory, 'clone')
+      result = test_cache.Clone(git_url, destination)
+      self.assertTrue(result)
+      self.assertTrue(os.path.isfile(os.path.join(destination, 'README')))
+
+      self.assertTrue(os.path.isdir(test_cache.GetMirrorPath(git_url)))
+
+      output = subprocess.check_output(
+          'git -C {0:s} remote get-url origin'.format(destination), shell=True)
+      self.assertEqual(output.decode('utf-8').strip(), git_url)
+
+      destination = os.path.join(temp_directory, 'shallow_clone')
+      result = test_cache.Clone(git_url, destination, depth=1)
+      self.assertTrue(result)
+      self.assertTrue(os.path.isfile(os.path.join(destination, 'README')))
+
+      # Paths with spaces and shell metacharacters are not interpreted.
+      destination = os.path.join(temp_directory, 'clone with $(space);')
+      result = test_cache.Clone(git_url, destination)
+      self.assertTrue(result)
+      self.assertTrue(os.path.isfile(os.path.join(destination, 'README')))
+
+  def testGetURLRewriteEnvironment(self):
+    """Tests the GetURLRewriteEnvironment function."""
+    self._SkipIfGitNotAvailable()
+
+    with test_lib.TempDirectory() as temp_directory:
+      git_url = os.path.join(temp_directory, 'origin')
+      self._CreateGitRepository(git_url)
+
+      test_cache = git_mirror.GitMirrorCache(
+          path=os.path.join(temp_directory, 'cache'))
+
+      env = test_cache.GetURLRewriteEnvironment([git_url])
+      mirror_path = os.path.abspath(test_cache.GetMirrorPath(git_url))
+
+      number_of_rewrites = int(env['GIT_CONFIG_COUNT'], 10)
+      self.assertGreaterEqual(number_of_rewrites, 1)
+
+      index = number_of_rewrites - 1
+      self.assertEqual(
+          env['GIT_CONFIG_KEY_{0:d}'.format(index)],
+          'url.{0:s}.insteadOf'.format(mirror_path))
+      self.assertEqual(env['GIT_CONFIG_VALUE_{0:d}'.format(index)], git_url)
+
+      # URLs are not rewritten by versions of git before 2.31.
+      test_cache._git_version = (2, 30)
+
+      with self.assertLogs(level='WARNING'):
+        env = test_cache.GetURLRewriteEnvironment([git_url])
+
+      self.assertEqual(
+          env.get('GIT_CONFIG_COUNT', None),
+          os.environ.get('GIT_CONFIG_COUNT', None))
+
+  def testReadSynclibsURLs(self):
+    """Tests the ReadSynclibsURLs function."""
+    test_cache = git_mirror.GitMirrorCache(path='/cache')
+
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'synclibs.sh')
+      with open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write((
+            '#!/bin/sh\n'
+            'GIT_URL_PREFIX="https://github.com/libyal";\n'
+            'LOCAL_LIBS="libcerror libcthreads";\n'))
+
+      git_urls = test_cache.ReadSynclibsURLs(path)
+      self.assertEqual(git_urls, [
+          'https://github.com/libyal/libcerror.git',
+          'https://github.com/libyal/libcthreads.git'])
+
+      git_urls = test_cache.ReadSynclibsURLs(
+          os.path.join(temp_directory, 'bogus.sh'))
+      self.assertEqual(git_urls, [])
+
+  def testUpdateMirror(self):
+    """Tests the UpdateMirror function."""
+    self._SkipIfGitNotAvailable()
+
+    with test_lib.TempDirectory() as temp_directory:
+      git_url = os.path.join(temp_directory, 'origin')
+      self._CreateGitRepository(git_url)
+
+      test_cache = git_mirror.GitMirrorCache(
+          path=os.path.join(temp_directory, 'cache'))
+
+      mirror_path = test_cache.UpdateMirror(git_url)
+      self.assertEqual(mirror_path, test_cache.GetMirrorPath(git_url))
+      self.assertTrue(os.path.isdir(mirror_path))
+      self.assertIn(git_url, test_cache._updated_mirrors)
+
+      # An existing mirror is updated by another cache object.
+      test_cache = git_mirror.GitMirrorCache(
+          path=os.path.join(temp_directory, 'cache'))
+      self.assertEqual(test_cache.UpdateMirror(git_url), mirror_path)
+
+      mirror_path = test_cache.UpdateMirror(
+          os.path.join(temp_directory, 'bogus'))
+      self.assertIsNone(mirror_path)
+
+
+if __name__ == '__main__':
+  unittest.main()
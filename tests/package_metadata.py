@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the Python source package metadata."""
+
+import io
+import os
+import tarfile
+import unittest
+
+from l2tdevtools import package_metadata
+
+from tests import test_lib
+
+
+class PythonPackageMetadataReaderTest(test_lib.BaseTestCase):
+  """Tests for the Python source package metadata reader."""
+
+  # pylint: disable=protected-access
+
+  def testGetRequiresFromPythonRequirements(self):
+    """Tests the _GetRequiresFromPythonRequirements function."""
+    metadata_reader = package_metadata.PythonPackageMetadataReader()
+
+    requires = metadata_reader._GetRequiresFromPythonRequirements([
+        'dfdatetime >= 20200809', 'PyYAML>=3.10', 'lz4[all]',
+        'pywin32 ; sys_platform == "win32"'])
+    self.assertEqual(requires, [
+        'python3-dfdatetime >= 20200809', 'python3-pyyaml >= 3.10',
+        'python3-lz4', 'python3-pywin32'])
+
+    requires = metadata_reader._GetRequiresFromPythonRequirements(None)
+    self.assertEqual(requires, [])
+
+  def testSplitConfigList(self):
+    """Tests the _SplitConfigList function."""
+    metadata_reader = package_metadata.PythonPackageMetadataReader()
+
+    values = metadata_reader._SplitConfigList(
+        'python3-dfdatetime >= 20200809\npython3-yaml, python3-six')
+    self.assertEqual(values, [
+        'python3-dfdatetime >= 20200809', 'python3-yaml', 'python3-six'])
+
+  def testRead(self):
+    """Tests the Read function."""
+    test_path = self._GetTestFilePath(['dfdatetime-20190517.tar.gz'])
+    self._SkipIfPathNotExists(test_path)
+
+    metadata_reader = package_metadata.PythonPackageMetadataReader()
+
+    with test_lib.TempDirectory() as temp_directory:
+      with tarfile.open(test_path, 'r:*') as archive:
+        archive.extractall(temp_directory)
+
+      source_directory = os.path.join(temp_directory, 'dfdatetime-20190517')
+      metadata = metadata_reader.Read(source_directory)
+
+      self.assertIsNotNone(metadata)
+      self.assertEqual(metadata.name, 'dfdatetime')
+      self.assertEqual(metadata.version, '20190517')
+      self.assertEqual(
+          metadata.summary, 'Digital Forensics date and time (dfDateTime).')
+      self.assertEqual(metadata.license, 'Apache License, Version 2.0')
+      self.assertEqual(
+          metadata.url, 'https://github.com/log2timeline/dfdatetime')
+      self.assertEqual(metadata.maintainer, (
+          'Log2Timeline maintainers '
+          '<log2timeline-maintainers@googlegroups.com>'))
+      self.assertEqual(metadata.build_requires, ['python2-setuptools'])
+      self.assertFalse(metadata.has_data_package)
+      self.assertFalse(metadata.has_tools_package)
+      self.assertTrue(metadata.description.startswith('dfDateTime, or'))
+
+      metadata = metadata_reader.Read(temp_directory)
+      self.assertIsNone(metadata)
+
+  def testReadSetupCfg(self):
+    """Tests the _ReadSetupCfg function."""
+    metadata_reader = package_metadata.PythonPackageMetadataReader()
+
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'setup.cfg')
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write((
+            '[metadata]\n'
+            'name = test\n'
+            'version = attr: test.__version__\n'
+            'license = Apache License, Version 2.0\n'
+            '\n'
+            '[bdist_rpm]\n'
+            'packager = Test <test@example.com>\n'
+            'requires = python3-dfdatetime >= 20200809\n'
+            '           python3-yaml\n'))
+
+      metadata = package_metadata.PythonPackageMetadata()
+      metadata_reader._ReadSetupCfg(path, metadata)
+
+      self.assertEqual(metadata.name, 'test')
+      self.assertIsNone(metadata.version)
+      self.assertEqual(metadata.packager, 'Test <test@example.com>')
+      self.assertEqual(metadata.requires, [
+          'python3-dfdatetime >= 20200809', 'python3-yaml'])
+
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write((
+            '[metadata]\n'
+            'name = test\n'
+            '\n'
+            '[options]\n'
+            'install_requires =\n'
+            '    dfdatetime >= 20200809\n'
+            '    PyYAML >= 3.10, < 7\n'))
+
+      metadata = package_metadata.PythonPackageMetadata()
+      metadata_reader._ReadSetupCfg(path, metadata)
+
+      self.assertEqual(metadata.requires, [
+          'python3-dfdatetime >= 20200809', 'python3-pyyaml >= 3.10'])
+
+  @unittest.skipIf(not package_metadata.tomllib, 'missing tomllib or tomli')
+  def testReadPyProjectToml(self):
+    """Tests the _ReadPyProjectToml function."""
+    metadata_reader = package_metadata.PythonPackageMetadataReader()
+
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'pyproject.toml')
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write((
+            '[project]\n'
+            'name = "test"\n'
+            'version = "20210606"\n'
+            'description = "Test project"\n'
+            'license = {text = "Apache License, Version 2.0"}\n'
+            'maintainers = [{name = "Test", email = "test@example.com"}]\n'
+            'dependencies = ["dfdatetime >= 20200809"]\n'
+            '\n'
+            '[project.urls]\n'
+            'Homepage = "https://example.com/test"\n'))
+
+      metadata = package_metadata.PythonPackageMetadata()
+      metadata_reader._ReadPyProjectToml(path, metadata)
+
+      self.assertEqual(metadata.name, 'test')
+      self.assertEqual(metadata.version, '20210606')
+      self.assertEqual(metadata.summary, 'Test project')
+      self.assertEqual(metadata.license, 'Apache License, Version 2.0')
+      self.assertEqual(metadata.maintainer, 'Test <test@example.com>')
+      self.assertEqual(metadata.url, 'https://example.com/test')
+      self.assertEqual(metadata.requires, ['python3-dfdatetime >= 20200809'])
+
+  def testReadPyProjectTomlWithoutTomllib(self):
+    """Tests the _ReadPyProjectToml function without tomllib or tomli."""
+    metadata_reader = package_metadata.PythonPackageMetadataReader()
+
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'pyproject.toml')
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write('[project]\nname = "test"\n')
+
+      tomllib = package_metadata.tomllib
+      package_metadata.tomllib = None
+
+      try:
+        metadata = package_metadata.PythonPackageMetadata()
+        with self.assertLogs(level='WARNING'):
+          metadata_reader._ReadPyProjectToml(path, metadata)
+
+      finally:
+        package_metadata.tomllib = tomllib
+
+      self.assertIsNone(metadata.name)
+
+
+if __name__ == '__main__':
+  unittest.main()
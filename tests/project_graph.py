@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the project dependency graph."""
+
+import io
+import os
+import unittest
+
+from l2tdevtools import project_graph
+from l2tdevtools import projects
+
+from tests import test_lib
+
+
+class ProjectDependencyGraphTest(test_lib.BaseTestCase):
+  """Tests for the project dependency graph."""
+
+  # pylint: disable=protected-access
+
+  def _CreateProjectDefinition(self, name, **kwargs):
+    """Creates a project definition for testing.
+
+    Args:
+      name (str): name of the project.
+      kwargs (dict[str, object]): attributes of the project definition.
+
+    Returns:
+      ProjectDefinition: project definition.
+    """
+    project_definition = projects.ProjectDefinition(name)
+    project_definition.build_dependencies = []
+    project_definition.dpkg_build_dependencies = []
+    project_definition.dpkg_dependencies = []
+    project_definition.rpm_build_dependencies = []
+
+    for attribute_name, value in kwargs.items():
+      setattr(project_definition, attribute_name, value)
+
+    return project_definition
+
+  def _CreateGraph(self):
+    """Creates a project dependency graph for testing.
+
+    Returns:
+      ProjectDependencyGraph: project dependency graph.
+    """
+    return project_graph.ProjectDependencyGraph([
+        self._CreateProjectDefinition(
+            'dfvfs', dpkg_dependencies=[
+                'python3-libbde (>= 20140531)', 'python3-six'],
+            rpm_build_dependencies=['python3-setuptools']),
+        self._CreateProjectDefinition(
+            'libbde', build_dependencies=['fuse', 'libcrypto'],
+            dpkg_build_dependencies=['libfuse-dev', 'libbde-dev']),
+        self._CreateProjectDefinition(
+            'plaso', dpkg_dependencies=['python3-dfvfs', 'python3-yaml']),
+        self._CreateProjectDefinition('PyYAML', dpkg_name='python-yaml'),
+        self._CreateProjectDefinition(
+            'six', rpm_build_dependencies=['python3-setuptools_scm']),
+        self._CreateProjectDefinition('setuptools_scm', rpm_name='scm')])
+
+  def testResolveDependency(self):
+    """Tests the ResolveDependency function."""
+    dependency_graph = self._CreateGraph()
+
+    self.assertEqual(
+        dependency_graph.ResolveDependency('python3-six'), 'six')
+    self.assertEqual(
+        dependency_graph.ResolveDependency('python3-six (>= 1.1.0)'), 'six')
+    self.assertEqual(
+        dependency_graph.ResolveDependency('libbde-devel'), 'libbde')
+    self.assertEqual(
+        dependency_graph.ResolveDependency('libbde-python3'), 'libbde')
+    self.assertEqual(
+        dependency_graph.ResolveDependency('python3-yaml'), 'PyYAML')
+    self.assertEqual(
+        dependency_graph.ResolveDependency('pyyaml'), 'PyYAML')
+    self.assertEqual(
+        dependency_graph.ResolveDependency('python3-setuptools-scm'),
+        'setuptools_scm')
+    self.assertEqual(dependency_graph.ResolveDependency('scm'),
+                     'setuptools_scm')
+    self.assertIsNone(dependency_graph.ResolveDependency('libfuse-dev'))
+
+  def testGetBuildOrder(self):
+    """Tests the GetBuildOrder function."""
+    dependency_graph = self._CreateGraph()
+
+    build_order = dependency_graph.GetBuildOrder()
+    self.assertEqual(build_order, [
+        'PyYAML', 'libbde', 'setuptools_scm', 'six', 'dfvfs', 'plaso'])
+
+    build_order = dependency_graph.GetBuildOrder(
+        project_names=['plaso', 'setuptools_scm', 'pyyaml'])
+    self.assertEqual(build_order, ['PyYAML', 'setuptools_scm', 'plaso'])
+
+    with self.assertRaises(KeyError):
+      dependency_graph.GetBuildOrder(project_names=['bogus'])
+
+  def testGetCycles(self):
+    """Tests the GetCycles function."""
+    dependency_graph = self._CreateGraph()
+    self.assertEqual(dependency_graph.GetCycles(), [])
+
+    dependency_graph = project_graph.ProjectDependencyGraph([
+        self._CreateProjectDefinition('a', dpkg_dependencies=['python3-b']),
+        self._CreateProjectDefinition('b', dpkg_dependencies=['python3-c']),
+        self._CreateProjectDefinition('c', dpkg_dependencies=['python3-a']),
+        self._CreateProjectDefinition('d', dpkg_dependencies=['python3-a'])])
+
+    self.assertEqual(dependency_graph.GetCycles(), [['a', 'b', 'c']])
+
+    # Projects that are part of a cycle are ordered last.
+    self.assertEqual(dependency_graph.GetBuildOrder(), ['a', 'b', 'c', 'd'])
+
+    self.assertEqual(
+        dependency_graph.GetDependencies('a', transitive=True), ['b', 'c'])
+    self.assertEqual(
+        dependency_graph.GetReverseDependencies('a', transitive=True),
+        ['b', 'c', 'd'])
+
+  def testGetDependencies(self):
+    """Tests the GetDependencies function."""
+    dependency_graph = self._CreateGraph()
+
+    self.assertEqual(
+        dependency_graph.GetDependencies('plaso'), ['PyYAML', 'dfvfs'])
+    self.assertEqual(
+        dependency_graph.GetDependencies('plaso', transitive=True),
+        ['PyYAML', 'dfvfs', 'libbde', 'setuptools_scm', 'six'])
+
+    # A project that provides its own dependency does not depend on itself.
+    self.assertEqual(dependency_graph.GetDependencies('libbde'), [])
+
+    with self.assertRaises(KeyError):
+      dependency_graph.GetDependencies('bogus')
+
+  def testGetReverseDependencies(self):
+    """Tests the GetReverseDependencies function."""
+    dependency_graph = self._CreateGraph()
+
+    self.assertEqual(
+        dependency_graph.GetReverseDependencies('libbde'), ['dfvfs'])
+    self.assertEqual(
+        dependency_graph.GetReverseDependencies('libbde', transitive=True),
+        ['dfvfs', 'plaso'])
+    self.assertEqual(
+        dependency_graph.GetReverseDependencies(
+            'setuptools_scm', transitive=True), ['dfvfs', 'plaso', 'six'])
+
+    # Results are cached.
+    self.assertIn('libbde', dependency_graph._transitive_reverse_dependencies)
+
+  def testGetUnresolvedDependencies(self):
+    """Tests the GetUnresolvedDependencies function."""
+    dependency_graph = self._CreateGraph()
+
+    self.assertEqual(dependency_graph.GetUnresolvedDependencies(), {
+        'dfvfs': ['python3-setuptools'],
+        'libbde': ['fuse', 'libcrypto', 'libfuse-dev']})
+
+  def testProjectsFile(self):
+    """Tests a dependency graph of the projects configuration file."""
+    config_file = os.path.join('data', 'projects.ini')
+
+    with io.open(config_file, 'r', encoding='utf-8') as file_object:
+      project_definition_reader = projects.ProjectDefinitionReader()
+      dependency_graph = project_graph.ProjectDependencyGraph(
+          project_definition_reader.Read(file_object))
+
+    self.assertEqual(dependency_graph.GetCycles(), [])
+
+    build_order = dependency_graph.GetBuildOrder()
+    build_order_indexes = {
+        name: index for index, name in enumerate(build_order)}
+    for project_name in build_order:
+      for dependency in dependency_graph.GetDependencies(project_name):
+        self.assertLess(
+            build_order_indexes[dependency], build_order_indexes[project_name])
+
+
+if __name__ == '__main__':
+  unittest.main()
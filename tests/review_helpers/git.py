@@ -12,12 +12,86 @@ from tests import test_lib
 class GitHelperTest(test_lib.BaseTestCase):
   """Tests the git helper"""
 
+  def _CreateHelper(self):
+    """Creates a git helper with mock responses.
+
+    Returns:
+      GitHelper: git helper.
+    """
+    helper = git.GitHelper('https://github.com/log2timeline/l2tdevtools.git')
+    helper.mock_responses = {
+        'git status --porcelain=v2 --branch': (0, (
+            '# branch.oid 24aa0891d3d4a77f8b3c5a30d1f1c9e8f2b4a6c7\n'
+            '# branch.head feature\n'
+            '? l2tdevtools/new.py\n'), ''),
+        'git for-each-ref --format=%(refname:short) refs/heads/': (
+            0, 'feature\nmain\n', ''),
+        'git remote -v': (0, (
+            'origin\thttps://github.com/user/l2tdevtools.git (fetch)\n'
+            'origin\thttps://github.com/user/l2tdevtools.git (push)\n'
+            'upstream\thttps://github.com/log2timeline/l2tdevtools.git '
+            '(fetch)\n'), ''),
+        'git diff --name-only origin/main': (
+            0, 'l2tdevtools/projects.py\nREADME.md', ''),
+        'git checkout main': (0, '', '')}
+    return helper
+
   def testInitialize(self):
     """Tests that the helper can be initialized."""
     helper = git.GitHelper(
         u'https://github.com/log2timeline/l2tdevtools.git')
     self.assertIsNotNone(helper)
 
+  def testGetState(self):
+    """Tests the GetState function."""
+    helper = self._CreateHelper()
+
+    state = helper.GetState()
+    self.assertEqual(state.active_branch, 'feature')
+    self.assertEqual(state.branches, ['feature', 'main'])
+    self.assertEqual(
+        state.head, '24aa0891d3d4a77f8b3c5a30d1f1c9e8f2b4a6c7')
+    self.assertEqual(len(state.remotes), 3)
+    self.assertEqual(state.status, ['? l2tdevtools/new.py'])
+
+    # The state is only gathered once.
+    helper.mock_responses = {'bogus': (1, '', '')}
+    self.assertIs(helper.GetState(), state)
+
+  def testCheckFunctions(self):
+    """Tests the Check functions."""
+    helper = self._CreateHelper()
+
+    self.assertTrue(helper.CheckHasBranch('main'))
+    self.assertFalse(helper.CheckHasBranch('bogus'))
+    self.assertTrue(helper.CheckHasProjectUpstream())
+    self.assertFalse(helper.CheckHasProjectOrigin())
+    self.assertTrue(helper.CheckHasUncommittedChanges())
+
+  def testGetFunctions(self):
+    """Tests the Get functions."""
+    helper = self._CreateHelper()
+
+    self.assertEqual(helper.GetActiveBranch(), 'feature')
+    self.assertEqual(
+        helper.GetRemoteOrigin(), 'https://github.com/user/l2tdevtools.git')
+
+    changed_files = helper.GetChangedFiles(diffbase='origin/main')
+    self.assertEqual(changed_files, ['l2tdevtools/projects.py', 'README.md'])
+
+    # The changed files are only determined once per diffbase.
+    del helper.mock_responses['git diff --name-only origin/main']
+    changed_files = helper.GetChangedFiles(diffbase='origin/main')
+    self.assertEqual(changed_files, ['l2tdevtools/projects.py', 'README.md'])
+
+  def testSwitchToMainBranch(self):
+    """Tests that SwitchToMainBranch discards the state."""
+    helper = self._CreateHelper()
+
+    state = helper.GetState()
+    self.assertTrue(helper.SwitchToMainBranch())
+    self.assertIsNot(helper.GetState(), state)
+
 
 if __name__ == '__main__':
   unittest.main()
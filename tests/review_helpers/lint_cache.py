@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the lint result cache."""
+
+import io
+import os
+import unittest
+
+from l2tdevtools.review_helpers import lint_cache
+
+from tests import test_lib
+
+
+class LintResultCacheTest(test_lib.BaseTestCase):
+  """Tests the lint result cache."""
+
+  # pylint: disable=protected-access
+
+  def testGetBlobHash(self):
+    """Tests the _GetBlobHash function."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'test.py')
+      with io.open(path, 'wb') as file_object:
+        file_object.write(b'hello\n')
+
+      lint_result_cache = lint_cache.LintResultCache(
+          os.path.join(temp_directory, 'cache.json'), 'key')
+
+      # The same hash as calculated by: git hash-object test.py
+      blob_hash = lint_result_cache._GetBlobHash(path)
+      self.assertEqual(blob_hash, 'ce013625030ba8dba906f756967f9e9ca394464a')
+
+      blob_hash = lint_result_cache._GetBlobHash(
+          os.path.join(temp_directory, 'bogus.py'))
+      self.assertIsNone(blob_hash)
+
+  def testIsClean(self):
+    """Tests the IsClean, MarkClean and MarkFailed functions."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'test.py')
+      with io.open(path, 'wb') as file_object:
+        file_object.write(b'hello\n')
+
+      lint_result_cache = lint_cache.LintResultCache(
+          os.path.join(temp_directory, 'cache.json'), 'key')
+
+      self.assertFalse(lint_result_cache.IsClean(path))
+
+      lint_result_cache.MarkClean(path)
+      self.assertTrue(lint_result_cache.IsClean(path))
+
+      with io.open(path, 'wb') as file_object:
+        file_object.write(b'changed\n')
+
+      self.assertFalse(lint_result_cache.IsClean(path))
+
+      lint_result_cache.MarkClean(path)
+      lint_result_cache.MarkFailed(path)
+      self.assertFalse(lint_result_cache.IsClean(path))
+
+  def testReadWrite(self):
+    """Tests the Read and Write functions."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'test.py')
+      with io.open(path, 'wb') as file_object:
+        file_object.write(b'hello\n')
+
+      cache_path = os.path.join(temp_directory, 'cache.json')
+
+      lint_result_cache = lint_cache.LintResultCache(cache_path, 'key1')
+      lint_result_cache.Read()
+      lint_result_cache.MarkClean(path)
+      lint_result_cache.Write()
+
+      lint_result_cache = lint_cache.LintResultCache(cache_path, 'key1')
+      lint_result_cache.Read()
+      self.assertTrue(lint_result_cache.IsClean(path))
+
+      # A different configuration invalidates the cached results.
+      lint_result_cache = lint_cache.LintResultCache(cache_path, 'key2')
+      lint_result_cache.Read()
+      self.assertFalse(lint_result_cache.IsClean(path))
+
+      with io.open(cache_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('bogus')
+
+      lint_result_cache = lint_cache.LintResultCache(cache_path, 'key1')
+      lint_result_cache.Read()
+      self.assertFalse(lint_result_cache.IsClean(path))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the pylint helper."""
 
+import os
 import unittest
 
 from l2tdevtools.review_helpers import pylint
@@ -25,7 +26,112 @@ class PylintHelperTest(test_lib.BaseTestCase):
 
     helper._GetVersion()
 
-  # TODO: add tests for CheckFiles
+  def testParseOutput(self):
+    """Tests the _ParseOutput function."""
+    helper = pylint.PylintHelper()
+
+    output = '\n'.join([
+        '************* Module l2tdevtools.projects',
+        ('l2tdevtools/projects.py:10:0: C0301: Line too long (81/80) '
+         '(line-too-long)'),
+        ('l2tdevtools/bogus.py:1:0: F0001: No module named bogus '
+         '(fatal)'),
+        ''])
+
+    messages_per_filename, unattributed_messages = helper._ParseOutput(
+        output, ['l2tdevtools/presets.py', 'l2tdevtools/projects.py'])
+
+    self.assertEqual(messages_per_filename['l2tdevtools/presets.py'], [])
+    self.assertEqual(messages_per_filename['l2tdevtools/projects.py'], [(
+        'l2tdevtools/projects.py:10:0: C0301: Line too long (81/80) '
+        '(line-too-long)')])
+    self.assertEqual(unattributed_messages, [
+        'l2tdevtools/bogus.py:1:0: F0001: No module named bogus (fatal)'])
+
+  def testPartitionFiles(self):
+    """Tests the _PartitionFiles function."""
+    test_path = self._GetTestFilePath(['linter_fail.py'])
+    self._SkipIfPathNotExists(test_path)
+
+    helper = pylint.PylintHelper()
+
+    filenames = [
+        self._GetTestFilePath(['linter_fail.py']),
+        self._GetTestFilePath(['linter_pass.py']),
+        self._GetTestFilePath(['lsb-release'])]
+
+    batches = helper._PartitionFiles(filenames, 2)
+    self.assertEqual(len(batches), 2)
+    self.assertEqual(sorted(sum(batches, [])), sorted(filenames))
+
+    batches = helper._PartitionFiles(filenames, 8)
+    self.assertEqual(len(batches), 3)
+
+  def testCheckFiles(self):
+    """Tests the CheckFiles function."""
+    filenames = [
+        os.path.join('l2tdevtools', 'presets.py'),
+        os.path.join('l2tdevtools', 'projects.py')]
+
+    helper = pylint.PylintHelper()
+    command = helper._GetCommand(filenames, '.pylintrc', (2, 4, 4))
+
+    output = (
+        'l2tdevtools/projects.py:10:0: C0301: Line too long (81/80) '
+        '(line-too-long)\n')
+
+    helper.mock_responses = {
+        'pylint --version': (0, 'pylint 2.4.4\n', ''),
+        command: (16, output, '')}
+
+    result = helper.CheckFiles(filenames, '.pylintrc', number_of_jobs=1)
+    self.assertFalse(result)
+
+    helper.mock_responses[command] = (0, '', '')
+
+    result = helper.CheckFiles(filenames, '.pylintrc', number_of_jobs=1)
+    self.assertTrue(result)
+
+    helper.mock_responses[command] = (32, '', 'usage error')
+
+    result = helper.CheckFiles(filenames, '.pylintrc', number_of_jobs=1)
+    self.assertFalse(result)
+
+  def testCheckFilesWithCache(self):
+    """Tests the CheckFiles function with a lint result cache."""
+    test_path = self._GetTestFilePath(['linter_pass.py'])
+    self._SkipIfPathNotExists(test_path)
+
+    helper = pylint.PylintHelper()
+    command = helper._GetCommand([test_path], '.pylintrc', (2, 4, 4))
+
+    helper.mock_responses = {
+        'pylint --version': (0, 'pylint 2.4.4\n', ''),
+        command: (0, '', '')}
+
+    with test_lib.TempDirectory() as temp_directory:
+      cache_path = os.path.join(temp_directory, 'cache.json')
+
+      result = helper.CheckFiles(
+          [test_path], '.pylintrc', cache_path=cache_path, number_of_jobs=1)
+      self.assertTrue(result)
+      self.assertTrue(os.path.exists(cache_path))
+
+      # The file is not linted again hence pylint is not run.
+      del helper.mock_responses[command]
+
+      result = helper.CheckFiles(
+          [test_path], '.pylintrc', cache_path=cache_path, number_of_jobs=1)
+      self.assertTrue(result)
+
+  def testGetConfigurationKey(self):
+    """Tests the _GetConfigurationKey function."""
+    helper = pylint.PylintHelper()
+
+    configuration_key1 = helper._GetConfigurationKey('.pylintrc', (2, 4, 4))
+    configuration_key2 = helper._GetConfigurationKey('.pylintrc', (2, 0, 0))
+    self.assertNotEqual(configuration_key1, configuration_key2)
+
   # TODO: add tests for CheckUpToDateVersion
   # TODO: add tests for GetRCFile
 
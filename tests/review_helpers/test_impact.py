@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the test impact selection."""
+
+import io
+import os
+import unittest
+
+from l2tdevtools.review_helpers import test_impact
+
+from tests import test_lib
+
+
+class TestImpactTestCase(test_lib.BaseTestCase):
+  """Shared functionality for test impact tests."""
+
+  _SOURCE_FILES = {
+      os.path.join('project', '__init__.py'): '',
+      os.path.join('project', 'errors.py'): '',
+      os.path.join('project', 'helpers', '__init__.py'): '',
+      os.path.join('project', 'helpers', 'cli.py'): (
+          'from project import errors\n'),
+      os.path.join('project', 'helpers', 'git.py'): (
+          'from . import cli\n'),
+      os.path.join('project', 'projects.py'): (
+          'import os\n'),
+      os.path.join('tests', '__init__.py'): '',
+      os.path.join('tests', 'test_lib.py'): (
+          'import unittest\n'),
+      os.path.join('tests', 'git.py'): (
+          'from project.helpers import git\n'
+          'from tests import test_lib\n'),
+      os.path.join('tests', 'projects.py'): (
+          'from project import projects\n'
+          'from tests import test_lib\n')}
+
+  _TEST_MODULE_NAMES = ['tests.git', 'tests.projects']
+
+  def _CreateProject(self, project_path):
+    """Creates the source files of a test project.
+
+    Args:
+      project_path (str): path of the root of the project.
+    """
+    for relative_path, source in self._SOURCE_FILES.items():
+      path = os.path.join(project_path, relative_path)
+      os.makedirs(os.path.dirname(path), exist_ok=True)
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write(source)
+
+
+class ImportGraphTest(test_lib.BaseTestCase):
+  """Tests the import graph."""
+
+  def testGetDependentModules(self):
+    """Tests the GetDependentModules function."""
+    import_graph = test_impact.ImportGraph()
+    import_graph.AddModule('project', [])
+    import_graph.AddModule('project.cli', ['os', 'project'])
+    import_graph.AddModule('project.git', ['project', 'project.cli'])
+    import_graph.AddModule('tests.git', ['project', 'project.git'])
+
+    dependent_module_names = import_graph.GetDependentModules(['project.cli'])
+    self.assertEqual(dependent_module_names, set([
+        'project.cli', 'project.git', 'tests.git']))
+
+    dependent_module_names = import_graph.GetDependentModules(['tests.git'])
+    self.assertEqual(dependent_module_names, set(['tests.git']))
+
+    dependent_module_names = import_graph.GetDependentModules(['bogus'])
+    self.assertEqual(dependent_module_names, set())
+
+
+class ImportGraphBuilderTest(TestImpactTestCase):
+  """Tests the import graph builder."""
+
+  # pylint: disable=protected-access
+
+  def testGetImportedModuleNames(self):
+    """Tests the _GetImportedModuleNames function."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateProject(temp_directory)
+
+      import_graph_builder = test_impact.ImportGraphBuilder(temp_directory)
+
+      path = os.path.join(temp_directory, 'project', 'helpers', 'git.py')
+      imported_module_names = import_graph_builder._GetImportedModuleNames(
+          path, 'project.helpers.git', False)
+      self.assertEqual(imported_module_names, [
+          'project', 'project.helpers', 'project.helpers.cli'])
+
+      path = os.path.join(temp_directory, 'tests', 'git.py')
+      imported_module_names = import_graph_builder._GetImportedModuleNames(
+          path, 'tests.git', False)
+      self.assertEqual(imported_module_names, [
+          'project', 'project.helpers', 'project.helpers.git', 'tests',
+          'tests.test_lib'])
+
+  def testGetModuleName(self):
+    """Tests the GetModuleName function."""
+    import_graph_builder = test_impact.ImportGraphBuilder('.')
+
+    module_name = import_graph_builder.GetModuleName(
+        os.path.join('project', 'helpers', 'git.py'))
+    self.assertEqual(module_name, 'project.helpers.git')
+
+    module_name = import_graph_builder.GetModuleName(
+        os.path.join('project', '__init__.py'))
+    self.assertEqual(module_name, 'project')
+
+    module_name = import_graph_builder.GetModuleName('setup.cfg')
+    self.assertIsNone(module_name)
+
+  def testBuild(self):
+    """Tests the Build function."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateProject(temp_directory)
+
+      cache_path = os.path.join(temp_directory, 'import-graph.json')
+      import_graph_builder = test_impact.ImportGraphBuilder(
+          temp_directory, cache_path=cache_path)
+
+      import_graph = import_graph_builder.Build()
+      self.assertTrue(os.path.exists(cache_path))
+
+      dependent_module_names = import_graph.GetDependentModules([
+          'project.errors'])
+      self.assertEqual(dependent_module_names, set([
+          'project.errors', 'project.helpers.cli', 'project.helpers.git',
+          'tests.git']))
+
+      # Modules that did not change are read from the cache.
+      path = os.path.join(temp_directory, 'tests', 'projects.py')
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write('from project import errors\n')
+
+      import_graph = import_graph_builder.Build()
+
+      dependent_module_names = import_graph.GetDependentModules([
+          'project.errors'])
+      self.assertIn('tests.projects', dependent_module_names)
+
+
+class TestImpactSelectorTest(TestImpactTestCase):
+  """Tests the test impact selector."""
+
+  def testSelectTestModules(self):
+    """Tests the SelectTestModules function."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateProject(temp_directory)
+
+      test_impact_selector = test_impact.TestImpactSelector(temp_directory)
+
+      module_names = test_impact_selector.SelectTestModules(
+          [os.path.join('project', 'helpers', 'cli.py')],
+          self._TEST_MODULE_NAMES)
+      self.assertEqual(module_names, ['tests.git'])
+
+      module_names = test_impact_selector.SelectTestModules(
+          [os.path.join('tests', 'projects.py'), 'README.md'],
+          self._TEST_MODULE_NAMES)
+      self.assertEqual(module_names, ['tests.projects'])
+
+      module_names = test_impact_selector.SelectTestModules(
+          [os.path.join('tests', 'test_lib.py')], self._TEST_MODULE_NAMES)
+      self.assertEqual(module_names, self._TEST_MODULE_NAMES)
+
+      module_names = test_impact_selector.SelectTestModules(
+          ['README.md'], self._TEST_MODULE_NAMES)
+      self.assertEqual(module_names, [])
+
+      # Changes to files other than Python source files select all tests.
+      module_names = test_impact_selector.SelectTestModules(
+          [os.path.join('test_data', 'projects.ini')], self._TEST_MODULE_NAMES)
+      self.assertEqual(module_names, self._TEST_MODULE_NAMES)
+
+
+if __name__ == '__main__':
+  unittest.main()
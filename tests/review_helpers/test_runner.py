@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the sharded test runner."""
+
+import io
+import json
+import os
+import unittest
+
+from l2tdevtools.review_helpers import test_runner
+
+from tests import test_lib
+
+
+class ShardedTestRunnerTest(test_lib.BaseTestCase):
+  """Tests the sharded test runner."""
+
+  # pylint: disable=protected-access
+
+  _PASSING_TEST_MODULE = '\n'.join([
+      'import unittest',
+      '',
+      'class PassingTest(unittest.TestCase):',
+      '  def testPass(self):',
+      '    self.assertTrue(True)',
+      ''])
+
+  _FAILING_TEST_MODULE = '\n'.join([
+      'import unittest',
+      '',
+      'class FailingTest(unittest.TestCase):',
+      '  def testFail(self):',
+      '    self.assertTrue(False)',
+      ''])
+
+  def _CreateTestProject(self, path, test_modules):
+    """Creates a project with test modules.
+
+    Args:
+      path (str): path of the root of the project.
+      test_modules (dict[str, str]): source of the test modules per filename.
+    """
+    tests_path = os.path.join(path, 'tests')
+    os.mkdir(tests_path)
+    os.mkdir(os.path.join(tests_path, 'helpers'))
+    os.mkdir(os.path.join(tests_path, 'data'))
+
+    test_modules = dict(test_modules)
+    test_modules['__init__.py'] = ''
+    test_modules[os.path.join('helpers', '__init__.py')] = ''
+    test_modules[os.path.join('data', 'ignored.py')] = ''
+
+    for filename, source in test_modules.items():
+      with io.open(
+          os.path.join(tests_path, filename), 'w',
+          encoding='utf-8') as file_object:
+        file_object.write(source)
+
+  def testDiscoverTestModules(self):
+    """Tests the DiscoverTestModules function."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateTestProject(temp_directory, {
+          'pass.py': self._PASSING_TEST_MODULE,
+          os.path.join('helpers', 'fail.py'): self._FAILING_TEST_MODULE})
+
+      sharded_test_runner = test_runner.ShardedTestRunner(temp_directory)
+      module_names = sharded_test_runner.DiscoverTestModules()
+
+    self.assertEqual(module_names, ['tests.pass', 'tests.helpers.fail'])
+
+  def testSortByDuration(self):
+    """Tests the _SortByDuration function."""
+    sharded_test_runner = test_runner.ShardedTestRunner('.')
+
+    module_names = sharded_test_runner._SortByDuration(
+        ['tests.a', 'tests.b', 'tests.c', 'tests.d'],
+        {'tests.a': 1.0, 'tests.b': 10.0, 'tests.d': 5.0})
+    self.assertEqual(module_names, ['tests.c', 'tests.b', 'tests.d', 'tests.a'])
+
+  def testRun(self):
+    """Tests the Run function."""
+    with test_lib.TempDirectory() as temp_directory:
+      self._CreateTestProject(temp_directory, {
+          'pass.py': self._PASSING_TEST_MODULE,
+          os.path.join('helpers', 'fail.py'): self._FAILING_TEST_MODULE})
+
+      durations_path = os.path.join(temp_directory, 'durations.json')
+      sharded_test_runner = test_runner.ShardedTestRunner(
+          temp_directory, durations_path=durations_path, number_of_workers=2)
+
+      output_writer = io.StringIO()
+      result = sharded_test_runner.Run(
+          module_names=['tests.pass'], output_writer=output_writer)
+      self.assertTrue(result)
+      self.assertIn('Ran 1 tests', output_writer.getvalue())
+
+      output_writer = io.StringIO()
+      result = sharded_test_runner.Run(output_writer=output_writer)
+      self.assertFalse(result)
+      self.assertIn('FAILED (failures=1, errors=0)', output_writer.getvalue())
+
+      with io.open(durations_path, 'r', encoding='utf-8') as file_object:
+        durations = json.load(file_object)
+
+    self.assertEqual(sorted(durations.keys()), [
+        'tests.helpers.fail', 'tests.pass'])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the reproducible source archive conversion."""
+
+import gzip
+import io
+import os
+import random
+import tarfile
+import unittest
+import zipfile
+
+from l2tdevtools import source_archive
+
+from tests import test_lib
+
+
+class ParallelGzipWriterTest(test_lib.BaseTestCase):
+  """Tests for the parallel gzip writer."""
+
+  def _Compress(self, data, number_of_workers):
+    """Compresses data.
+
+    Args:
+      data (bytes): data to compress.
+      number_of_workers (int): number of blocks to compress concurrently.
+
+    Returns:
+      bytes: gzip compressed data.
+    """
+    file_object = io.BytesIO()
+    with source_archive.ParallelGzipWriter(
+        file_object, number_of_workers=number_of_workers) as gzip_writer:
+      for offset in range(0, len(data), 10000):
+        gzip_writer.write(data[offset:offset + 10000])
+
+    return file_object.getvalue()
+
+  def testWrite(self):
+    """Tests the write function."""
+    random_generator = random.Random(1)
+    data = b''.join([
+        random_generator.choice([b'devtools', b'plaso', b'dfvfs', b'\n'])
+        for _ in range(200000)])
+
+    compressed_data = self._Compress(data, 4)
+    self.assertEqual(gzip.decompress(compressed_data), data)
+    self.assertLess(len(compressed_data), len(data))
+
+    # The output does not depend on the number of workers.
+    self.assertEqual(self._Compress(data, 1), compressed_data)
+
+  def testWriteEmpty(self):
+    """Tests the write function without data."""
+    compressed_data = self._Compress(b'', 2)
+    self.assertEqual(gzip.decompress(compressed_data), b'')
+
+
+class ZipToTarConverterTest(test_lib.BaseTestCase):
+  """Tests for the .zip to tar converter."""
+
+  def _CreateZipFile(self, path):
+    """Creates a .zip file for testing.
+
+    Args:
+      path (str): path of the .zip file.
+    """
+    with zipfile.ZipFile(path, 'w') as zip_file:
+      zip_info = zipfile.ZipInfo(
+          'test-20240101/setup.py', date_time=(2024, 1, 1, 12, 0, 0))
+      zip_file.writestr(zip_info, b'# setup.py\n')
+
+      zip_info = zipfile.ZipInfo(
+          'test-20240101/', date_time=(2023, 6, 1, 12, 0, 0))
+      zip_file.writestr(zip_info, b'')
+
+      zip_info = zipfile.ZipInfo(
+          'test-20240101/README', date_time=(2023, 6, 1, 12, 0, 0))
+      zip_file.writestr(zip_info, b'README\n' * 1000)
+
+  def testConvert(self):
+    """Tests the Convert function."""
+    with test_lib.TempDirectory() as temp_directory:
+      zip_path = os.path.join(temp_directory, 'test-20240101.zip')
+      self._CreateZipFile(zip_path)
+
+      tar_path = os.path.join(temp_directory, 'test_20240101.orig.tar.gz')
+
+      converter = source_archive.ZipToTarConverter()
+      converter.Convert(zip_path, tar_path)
+
+      with tarfile.open(tar_path, 'r:gz') as tar_file:
+        tar_infos = tar_file.getmembers()
+
+        self.assertEqual([tar_info.name for tar_info in tar_infos], [
+            'test-20240101', 'test-20240101/README', 'test-20240101/setup.py'])
+
+        self.assertTrue(tar_infos[0].isdir())
+        self.assertEqual(tar_infos[1].size, 7000)
+
+        for tar_info in tar_infos:
+          self.assertEqual(tar_info.mtime, 1704110400)
+          self.assertEqual(tar_info.uid, 0)
+          self.assertEqual(tar_info.gid, 0)
+
+        file_object = tar_file.extractfile('test-20240101/setup.py')
+        self.assertEqual(file_object.read(), b'# setup.py\n')
+
+      with open(tar_path, 'rb') as file_object:
+        tar_data = file_object.read()
+
+      # The output is the same for every conversion.
+      converter = source_archive.ZipToTarConverter(number_of_workers=1)
+      converter.Convert(zip_path, tar_path)
+
+      with open(tar_path, 'rb') as file_object:
+        self.assertEqual(file_object.read(), tar_data)
+
+  def testConvertXZ(self):
+    """Tests the Convert function with xz compression."""
+    with test_lib.TempDirectory() as temp_directory:
+      zip_path = os.path.join(temp_directory, 'test-20240101.zip')
+      self._CreateZipFile(zip_path)
+
+      tar_path = os.path.join(temp_directory, 'test_20240101.orig.tar.xz')
+
+      converter = source_archive.ZipToTarConverter(compression='xz')
+      converter.Convert(zip_path, tar_path)
+
+      with tarfile.open(tar_path, 'r:xz') as tar_file:
+        self.assertEqual(len(tar_file.getmembers()), 3)
+
+    with self.assertRaises(ValueError):
+      source_archive.ZipToTarConverter(compression='bz2')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,13 +2,129 @@
 # -*- coding: utf-8 -*-
 """Tests for the RPM spec file generator."""
 
+import io
+import os
+import tarfile
 import unittest
 
+from l2tdevtools import projects
 from l2tdevtools import spec_file
 
 from tests import test_lib
 
 
+_SETUP_PY_GENERATED_SPEC_FILE = '''%define name plaso
+%define version 20210606
+%define unmangled_version 20210606
+%define release 1
+
+Summary: Super timeline all the things.
+Name: %{name}
+Version: %{version}
+Release: %{release}
+Source0: %{name}-%{unmangled_version}.tar.gz
+License: Apache License, Version 2.0
+Group: Development/Libraries
+BuildRoot: %{_tmppath}/%{name}-%{version}-%{release}-buildroot
+Prefix: %{_prefix}
+BuildArch: noarch
+Vendor: Log2Timeline maintainers <log2timeline-maintainers@googlegroups.com>
+Packager: Log2Timeline maintainers <log2timeline-maintainers@googlegroups.com>
+Url: https://github.com/log2timeline/plaso
+BuildRequires: python3-setuptools, python3-devel
+
+%description
+
+Plaso is a tool designed to extract timestamps.
+
+%package -n %{name}-data
+Summary: Data files for Super timeline all the things.
+
+%description -n %{name}-data
+Plaso is a tool designed to extract timestamps.
+
+%package -n python3-%{name}
+Requires: plaso-data >= %{version} python3-dfvfs >= 20210606 python3-yaml
+Summary: Python 3 module of Super timeline all the things.
+
+%description -n python3-%{name}
+Plaso is a tool designed to extract timestamps.
+
+%package -n %{name}-tools
+Requires: python3-plaso >= %{version}
+Summary: Tools for Super timeline all the things.
+
+%description -n %{name}-tools
+Plaso is a tool designed to extract timestamps.
+
+%prep
+%setup -n %{name}-%{unmangled_version}
+
+%build
+%py3_build
+
+%files -n %{name}-data
+%{_datadir}/%{name}/*
+'''
+
+
+class RPMSpecFileParserTest(test_lib.BaseTestCase):
+  """Tests for the RPM spec file parser."""
+
+  def testParse(self):
+    """Tests the Parse function."""
+    spec_file_parser = spec_file.RPMSpecFileParser()
+
+    file_object = io.StringIO(_SETUP_PY_GENERATED_SPEC_FILE)
+    sections = list(spec_file_parser.Parse(file_object))
+
+    section_names = [section.name for section in sections]
+    self.assertEqual(section_names, [
+        'preamble', 'description', 'package', 'description', 'package',
+        'description', 'package', 'description', 'prep', 'build', 'files'])
+
+    section = sections[0]
+    self.assertEqual(section.macros.get('version', None), '20210606')
+    self.assertEqual(section.GetTagValue('License'), (
+        'Apache License, Version 2.0'))
+    self.assertEqual(section.GetTagValue('Url'), (
+        'https://github.com/log2timeline/plaso'))
+    self.assertEqual(section.GetTagValue('Bogus'), '')
+
+    section = sections[4]
+    self.assertEqual(section.argument, '-n python3-%{name}')
+    self.assertEqual(section.GetTagValue('Requires'), (
+        'plaso-data >= %{version} python3-dfvfs >= 20210606 python3-yaml'))
+
+    section = sections[10]
+    self.assertEqual(section.argument, '-n %{name}-data')
+    self.assertEqual(section.lines, ['%{_datadir}/%{name}/*\n'])
+
+  def testParseLargeSpecFile(self):
+    """Tests the Parse function on a large synthetic spec file."""
+    spec_file_parser = spec_file.RPMSpecFileParser()
+
+    lines = [_SETUP_PY_GENERATED_SPEC_FILE]
+    for index in range(10000):
+      lines.append('%{{python3_sitelib}}/plaso/module{0:d}.py\n'.format(index))
+
+    lines.append('%changelog\n')
+    for index in range(10000):
+      lines.append('- Change {0:d}\n'.format(index))
+
+    file_object = io.StringIO(''.join(lines))
+
+    number_of_sections = 0
+    for section in spec_file_parser.Parse(file_object):
+      number_of_sections += 1
+      if section.name == 'files':
+        self.assertEqual(len(section.lines), 10001)
+      elif section.name == 'changelog':
+        self.assertEqual(len(section.lines), 10000)
+
+    self.assertEqual(number_of_sections, 12)
+
+
 class RPMSpecFileGeneratorTest(test_lib.BaseTestCase):
   """Tests for the RPM spec file generator."""
 
@@ -29,8 +145,86 @@ class RPMSpecFileGeneratorTest(test_lib.BaseTestCase):
   # TODO: test _WritePython2PackageFiles function.
   # TODO: test _WritePython3PackageDefinition function.
   # TODO: test _WritePython3PackageFiles function.
+  def testGenerateWithMetadata(self):
+    """Tests the GenerateWithMetadata function."""
+    test_path = self._GetTestFilePath(['dfdatetime-20190517.tar.gz'])
+    self._SkipIfPathNotExists(test_path)
+
+    project_definition = projects.ProjectDefinition('dfdatetime')
+
+    spec_file_generator = spec_file.RPMSpecFileGenerator('')
+
+    with test_lib.TempDirectory() as temp_directory:
+      with tarfile.open(test_path, 'r:*') as archive:
+        archive.extractall(temp_directory)
+
+      source_directory = os.path.join(temp_directory, 'dfdatetime-20190517')
+      output_file = os.path.join(temp_directory, 'dfdatetime.spec')
+
+      result = spec_file_generator.GenerateWithMetadata(
+          project_definition, source_directory, 'dfdatetime-20190517.tar.gz',
+          'dfdatetime', '20190517', output_file)
+      self.assertTrue(result)
+
+      with io.open(output_file, 'r', encoding='utf-8') as file_object:
+        lines = file_object.read().split('\n')
+
+      self.assertEqual(lines[0], '%define name dfdatetime')
+      self.assertEqual(lines[1], '%define version 20190517')
+      self.assertIn(
+          'Summary: Digital Forensics date and time (dfDateTime).', lines)
+      self.assertIn('License: Apache License, Version 2.0', lines)
+      self.assertIn('BuildArch: noarch', lines)
+      self.assertIn('BuildRequires: python3-devel, python3-setuptools', lines)
+      self.assertIn('%package -n python3-%{name}', lines)
+      self.assertIn('%files -n python3-%{name}', lines)
+      self.assertIn('%changelog', lines)
+
+      result = spec_file_generator.GenerateWithMetadata(
+          project_definition, temp_directory, 'dfdatetime-20190517.tar.gz',
+          'dfdatetime', '20190517', output_file)
+      self.assertFalse(result)
+
   # TODO: test GenerateWithSetupPy function.
-  # TODO: test _RewriteSetupPyGeneratedFile function.
+  def testReadSetupPyGeneratedFile(self):
+    """Tests the _ReadSetupPyGeneratedFile function."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator('')
+
+    with test_lib.TempDirectory() as temp_directory:
+      input_file = os.path.join(temp_directory, 'plaso.spec')
+      with io.open(input_file, 'w', encoding='utf-8') as file_object:
+        file_object.write(_SETUP_PY_GENERATED_SPEC_FILE)
+
+      metadata = spec_file_generator._ReadSetupPyGeneratedFile(input_file)
+
+    self.assertEqual(metadata.version, '20210606')
+    self.assertEqual(metadata.summary, 'Super timeline all the things.')
+    self.assertEqual(metadata.license, 'Apache License, Version 2.0')
+    self.assertEqual(metadata.url, 'https://github.com/log2timeline/plaso')
+    self.assertEqual(metadata.maintainer, (
+        'Log2Timeline maintainers <log2timeline-maintainers@googlegroups.com>'))
+    self.assertEqual(metadata.build_requires, [
+        'python3-devel', 'python3-setuptools'])
+    self.assertEqual(metadata.description, (
+        'Plaso is a tool designed to extract timestamps.\n\n'))
+    self.assertEqual(metadata.requires, [
+        'plaso-data >= %{version}', 'python3-dfvfs >= 20210606',
+        'python3-yaml'])
+    self.assertTrue(metadata.has_data_package)
+    self.assertTrue(metadata.has_tools_package)
+
+  def testWriteExcludeFiles(self):
+    """Tests the _WriteExcludeFiles function."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator('')
+
+    output_file_object = io.StringIO()
+    spec_file_generator._WriteExcludeFiles(
+        output_file_object, ['%{_bindir}/*', '%{python3_sitelib}/examples'])
+
+    self.assertEqual(output_file_object.getvalue(), (
+        '%exclude %{_bindir}/*\n'
+        '%exclude %{python3_sitelib}/examples\n'
+        '\n'))
 
   def testSplitRequires(self):
     """Tests the _SplitRequires function."""
@@ -0,0 +1,537 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the stats tool."""
+
+import email.message
+import gzip
+import io
+import json
+import os
+import unittest
+
+from tools import stats
+
+from tests import test_lib
+
+
+class TestGithubContributionsHelper(stats.GithubContributionsHelper):
+  """GitHub contributions helper for testing.
+
+  Attributes:
+    requests (list[tuple[str, dict[str, str]]]): URLs and headers of the
+        requests.
+  """
+
+  _RETRY_BACKOFF = 0.0
+
+  def __init__(self, responses, cache_path=None):
+    """Initializes a GitHub contributions helper for testing.
+
+    Args:
+      responses (dict[str, list[tuple[int, object, dict[str, str]]]]): HTTP
+          status code, JSON formatted response and response headers per URL,
+          in the order they should be returned.
+      cache_path (Optional[str]): path of the directory to cache responses in.
+    """
+    super(TestGithubContributionsHelper, self).__init__(
+        cache_path=cache_path, number_of_workers=2)
+    self._responses = responses
+    self.requests = []
+
+  def _RequestURL(self, download_url, request_headers):
+    """Requests an URL.
+
+    Args:
+      download_url (str): URL to request.
+      request_headers (dict[str, str]): HTTP request headers.
+
+    Returns:
+      tuple[int, bytes, email.message.Message]: HTTP status code, response
+          data and response headers.
+    """
+    self.requests.append((download_url, dict(request_headers)))
+
+    status_code, response_json, headers = self._responses[download_url].pop(0)
+
+    response_headers = email.message.Message()
+    for key, value in headers.items():
+      response_headers[key] = value
+
+    return (
+        status_code, json.dumps(response_json).encode('utf-8'),
+        response_headers)
+
+
+class TestOutputWriter(stats.OutputWriter):
+  """Output writer for testing.
+
+  Attributes:
+    contributions (list[tuple[object]]): contributions.
+    reviews (list[tuple[object]]): reviews.
+  """
+
+  def __init__(self, user_mappings=None, batch_size=1000):
+    """Initializes an output writer for testing.
+
+    Args:
+      user_mappings (Optional[dict[str, str]]): mapping between GitHub
+          username and another username.
+      batch_size (Optional[int]): maximum number of records per batch.
+    """
+    super(TestOutputWriter, self).__init__(
+        user_mappings or {}, batch_size=batch_size)
+    self.contributions = []
+    self.reviews = []
+
+  def _WriteContributionBatch(self, contributions):
+    """Writes a batch of contributions.
+
+    Args:
+      contributions (list[tuple[object]]): contributions.
+    """
+    self.contributions.extend(contributions)
+
+  def _WriteReviewBatch(self, reviews):
+    """Writes a batch of reviews.
+
+    Args:
+      reviews (list[tuple[object]]): reviews.
+    """
+    self.reviews.extend(reviews)
+
+
+class StatsDefinitionReaderTest(test_lib.BaseTestCase):
+  """Tests for the stats definition reader."""
+
+  def testReadProjectsPerOrganization(self):
+    """Tests the ReadProjectsPerOrganization function."""
+    file_object = io.StringIO(
+        '[organizations]\nlog2timeline: dfvfs,plaso\n')
+
+    stats_definition_reader = stats.StatsDefinitionReader()
+    projects_per_organization = (
+        stats_definition_reader.ReadProjectsPerOrganization(file_object))
+
+    self.assertEqual(projects_per_organization, {
+        'log2timeline': ['dfvfs', 'plaso']})
+
+
+class StatsStoreTest(test_lib.BaseTestCase):
+  """Tests for the statistics store."""
+
+  def _CreateContributorsJSON(self, weeks):
+    """Creates JSON formatted contributors objects.
+
+    Args:
+      weeks (list[tuple[int, int]]): POSIX timestamp of the start of the week
+          and number of contributions.
+
+    Returns:
+      list[object]: JSON formatted contributors objects.
+    """
+    return [{
+        'author': {'login': 'joachimmetz'},
+        'weeks': [
+            {'a': 10, 'c': number_of_contributions, 'd': 1, 'w': timestamp}
+            for timestamp, number_of_contributions in weeks]}]
+
+  def testAddContributions(self):
+    """Tests the AddContributions function."""
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'stats.db')
+
+      stats_store = stats.StatsStore(path=path)
+      stats_store.Open()
+
+      contributors_json = self._CreateContributorsJSON([
+          (1609632000, 2), (1610236800, 1)])
+      number_of_records = stats_store.AddContributions(
+          'log2timeline', 'dfvfs', contributors_json)
+      self.assertEqual(number_of_records, 2)
+
+      stats_store.Close()
+
+      # Only the last ingested week and later weeks are ingested again.
+      stats_store = stats.StatsStore(path=path)
+      stats_store.Open()
+
+      self.assertEqual(stats_store.GetLastContributionWeek(
+          'log2timeline', 'dfvfs'), 1610236800)
+
+      contributors_json = self._CreateContributorsJSON([
+          (1609632000, 2), (1610236800, 3), (1610841600, 1)])
+      number_of_records = stats_store.AddContributions(
+          'log2timeline', 'dfvfs', contributors_json)
+      self.assertEqual(number_of_records, 2)
+
+      contributions = list(stats_store.GetContributions(
+          start_time=1610236800))
+      self.assertEqual(contributions, [
+          ('log2timeline', 'dfvfs', 'joachimmetz', 1610236800, 3, 10, 1),
+          ('log2timeline', 'dfvfs', 'joachimmetz', 1610841600, 1, 10, 1)])
+
+      stats_store.Close()
+
+  def testAddPullRequests(self):
+    """Tests the AddPullRequests function."""
+    stats_store = stats.StatsStore()
+    stats_store.Open()
+
+    pulls_json = [
+        {'created_at': '2021-01-04T10:00:00Z', 'number': 1,
+         'state': 'open', 'title': 'First',
+         'updated_at': '2021-01-04T10:00:00Z', 'user': {'login': 'onager'}}]
+    number_of_records = stats_store.AddPullRequests(
+        'log2timeline', 'dfvfs', pulls_json)
+    self.assertEqual(number_of_records, 1)
+
+    pulls_json[0]['state'] = 'closed'
+    number_of_records = stats_store.AddPullRequests(
+        'log2timeline', 'dfvfs', pulls_json)
+    self.assertEqual(number_of_records, 0)
+
+    pulls_json[0]['updated_at'] = '2021-01-05T10:00:00Z'
+    number_of_records = stats_store.AddPullRequests(
+        'log2timeline', 'dfvfs', pulls_json)
+    self.assertEqual(number_of_records, 1)
+
+    pull_requests = list(stats_store.GetPullRequests(login_name='onager'))
+    self.assertEqual(pull_requests, [(
+        'log2timeline', 'dfvfs', 1, '2021-01-04T10:00:00Z', 'onager', 'First',
+        '', 'closed')])
+
+    stats_store.Close()
+
+  def testGetContributionTotals(self):
+    """Tests the GetContributionTotals function."""
+    stats_store = stats.StatsStore()
+    stats_store.Open()
+
+    contributors_json = self._CreateContributorsJSON([
+        (1609632000, 2), (1610236800, 1)])
+    stats_store.AddContributions('log2timeline', 'dfvfs', contributors_json)
+    stats_store.AddContributions('log2timeline', 'plaso', contributors_json)
+    stats_store.AddContributions('google', 'turbinia', contributors_json)
+
+    totals = stats_store.GetContributionTotals(group_by='organization')
+    self.assertEqual(totals, [
+        ('log2timeline', 6, 40, 4), ('google', 3, 20, 2)])
+
+    totals = stats_store.GetContributionTotals(
+        organization='log2timeline', end_time=1610236800)
+    self.assertEqual(totals, [('joachimmetz', 4, 20, 2)])
+
+    with self.assertRaises(ValueError):
+      stats_store.GetContributionTotals(group_by='bogus')
+
+    stats_store.Close()
+
+
+class GithubContributionsHelperTest(test_lib.BaseTestCase):
+  """Tests for the GitHub contributions helper."""
+
+  _PULLS_URL = (
+      'https://api.github.com/repos/log2timeline/{0:s}/pulls?state=all&'
+      'sort=updated&direction=desc&per_page=100')
+
+  _STATS_URL = (
+      'https://api.github.com/repos/log2timeline/{0:s}/stats/contributors')
+
+  def testIngestPullRequests(self):
+    """Tests the IngestPullRequests function."""
+    pulls_url = self._PULLS_URL.format('dfvfs')
+    next_url = pulls_url + '&page=2'
+
+    stats_store = stats.StatsStore()
+    stats_store.Open()
+
+    stats_store.AddPullRequests('log2timeline', 'dfvfs', [{
+        'created_at': '2021-01-04T10:00:00Z', 'number': 1, 'state': 'open',
+        'title': 'First', 'updated_at': '2021-01-04T10:00:00Z',
+        'user': {'login': 'onager'}}])
+
+    # The first page contains a pull request that was not updated after the
+    # last ingested update, hence the next page is not retrieved.
+    responses = {
+        pulls_url: [
+            (200, [
+                {'created_at': '2021-01-05T10:00:00Z', 'number': 2,
+                 'state': 'open', 'title': 'Second',
+                 'updated_at': '2021-01-05T10:00:00Z'},
+                {'created_at': '2021-01-04T10:00:00Z', 'number': 1,
+                 'state': 'open', 'title': 'First',
+                 'updated_at': '2021-01-04T10:00:00Z'}], {
+                     'Link': '<{0:s}>; rel="next"'.format(next_url)})],
+        next_url: [
+            (200, [{'number': 0, 'state': 'closed', 'title': 'Zero'}], {})]}
+
+    contributions_helper = TestGithubContributionsHelper(responses)
+    contributions_helper.IngestPullRequests(
+        {'log2timeline': ['dfvfs']}, stats_store)
+
+    self.assertEqual(contributions_helper.requests, [(pulls_url, {
+        'Accept': 'application/vnd.github+json'})])
+
+    pull_requests = list(stats_store.GetPullRequests())
+    self.assertEqual([pull_request[2] for pull_request in pull_requests], [
+        1, 2])
+
+    stats_store.Close()
+
+  def testListContributions(self):
+    """Tests the ListContributions function."""
+    contributors_json = [{
+        'author': {'login': 'joachimmetz'},
+        'weeks': [{'a': 10, 'c': 2, 'd': 1, 'w': 1609632000}]}]
+
+    responses = {
+        self._STATS_URL.format('dfvfs'): [
+            (202, {}, {}),
+            (200, contributors_json, {})],
+        self._STATS_URL.format('plaso'): [
+            (200, contributors_json, {})]}
+
+    contributions_helper = TestGithubContributionsHelper(responses)
+    output_writer = TestOutputWriter()
+
+    contributions_helper.ListContributions(
+        {'log2timeline': ['dfvfs', 'plaso']}, output_writer)
+
+    self.assertEqual(output_writer.contributions, [
+        ('2021', '01', 'joachimmetz', 'dfvfs', 2, 10, 1),
+        ('2021', '01', 'joachimmetz', 'plaso', 2, 10, 1)])
+
+  def testListPullRequests(self):
+    """Tests the ListPullRequests function."""
+    next_url = self._PULLS_URL.format('dfvfs') + '&page=2'
+
+    responses = {
+        self._PULLS_URL.format('dfvfs'): [
+            (200, [{'number': 2, 'state': 'open', 'title': 'Second'}], {
+                'ETag': '"1234"',
+                'Link': '<{0:s}>; rel="next"'.format(next_url)})],
+        next_url: [
+            (200, [{'number': 1, 'state': 'closed', 'title': 'First'}], {})]}
+
+    contributions_helper = TestGithubContributionsHelper(responses)
+    output_writer = TestOutputWriter()
+
+    contributions_helper.ListPullRequests(
+        {'log2timeline': ['dfvfs']}, output_writer)
+
+    self.assertEqual(output_writer.reviews, [
+        ('', '', 1, 'First', '', 'closed'),
+        ('', '', 2, 'Second', '', 'open')])
+
+  def testListPullRequestsWithCache(self):
+    """Tests the ListPullRequests function with a response cache."""
+    pulls_url = self._PULLS_URL.format('dfvfs')
+    pulls_json = [{'number': 1, 'state': 'open', 'title': 'First'}]
+
+    responses = {
+        pulls_url: [
+            (200, pulls_json, {'ETag': '"1234"'}),
+            (304, None, {})]}
+
+    with test_lib.TempDirectory() as temp_directory:
+      contributions_helper = TestGithubContributionsHelper(
+          responses, cache_path=temp_directory)
+
+      for _ in range(2):
+        output_writer = TestOutputWriter()
+        contributions_helper.ListPullRequests(
+            {'log2timeline': ['dfvfs']}, output_writer)
+
+        self.assertEqual(output_writer.reviews, [
+            ('', '', 1, 'First', '', 'open')])
+
+      self.assertTrue(os.path.exists(os.path.join(
+          temp_directory, 'log2timeline_dfvfs.json')))
+
+    _, request_headers = contributions_helper.requests[1]
+    self.assertEqual(request_headers.get('If-None-Match', None), '"1234"')
+
+  def testListPullRequestsWithCacheAndMultiplePages(self):
+    """Tests the ListPullRequests function with cached multiple pages."""
+    pulls_url = self._PULLS_URL.format('dfvfs')
+    next_url = pulls_url + '&page=2'
+
+    # The 304 (Not Modified) responses do not contain a Link header.
+    responses = {
+        pulls_url: [
+            (200, [{'number': 2, 'state': 'open', 'title': 'Second'}], {
+                'ETag': '"1234"',
+                'Link': '<{0:s}>; rel="next"'.format(next_url)}),
+            (304, None, {})],
+        next_url: [
+            (200, [{'number': 1, 'state': 'closed', 'title': 'First'}], {
+                'ETag': '"5678"'}),
+            (304, None, {})]}
+
+    with test_lib.TempDirectory() as temp_directory:
+      contributions_helper = TestGithubContributionsHelper(
+          responses, cache_path=temp_directory)
+
+      for _ in range(2):
+        output_writer = TestOutputWriter()
+        contributions_helper.ListPullRequests(
+            {'log2timeline': ['dfvfs']}, output_writer)
+
+        self.assertEqual(output_writer.reviews, [
+            ('', '', 1, 'First', '', 'closed'),
+            ('', '', 2, 'Second', '', 'open')])
+
+    self.assertEqual(len(contributions_helper.requests), 4)
+
+    download_url, request_headers = contributions_helper.requests[3]
+    self.assertEqual(download_url, next_url)
+    self.assertEqual(request_headers.get('If-None-Match', None), '"5678"')
+
+  def testUpdateRateLimit(self):
+    """Tests the _UpdateRateLimit function."""
+    contributions_helper = stats.GithubContributionsHelper()
+
+    response_headers = email.message.Message()
+    response_headers['X-RateLimit-Remaining'] = '0'
+    response_headers['X-RateLimit-Reset'] = '1609632000'
+
+    # pylint: disable=protected-access
+    contributions_helper._UpdateRateLimit(403, response_headers)
+    self.assertEqual(contributions_helper._rate_limit_reset_time, 1609632000)
+
+    contributions_helper._UpdateRateLimit(200, email.message.Message())
+    self.assertIsNone(contributions_helper._rate_limit_reset_time)
+
+
+class OutputWriterTest(test_lib.BaseTestCase):
+  """Tests for the output writers."""
+
+  # pylint: disable=protected-access
+
+  def _CreateStatsStore(self):
+    """Creates a statistics store with test data.
+
+    Returns:
+      StatsStore: statistics store.
+    """
+    stats_store = stats.StatsStore()
+    stats_store.Open()
+
+    for login_name in ('joachimmetz', 'Onager', 'unmapped'):
+      stats_store.AddContributions('log2timeline', 'dfvfs', [{
+          'author': {'login': login_name},
+          'weeks': [{'a': 10, 'c': 2, 'd': 1, 'w': 1609632000}]}])
+
+    stats_store.AddPullRequests('log2timeline', 'dfvfs', [{
+        'created_at': '2021-01-04T10:00:00Z', 'number': 1, 'state': 'open',
+        'title': 'First', 'updated_at': '2021-01-04T10:00:00Z',
+        'user': {'login': 'onager'}}])
+
+    return stats_store
+
+  def testGetUsername(self):
+    """Tests the _GetUsername function."""
+    output_writer = TestOutputWriter(user_mappings={
+        'joachimmetz': 'joachim', 'onager': 'onager'})
+
+    self.assertEqual(output_writer._GetUsername('Onager'), 'onager')
+    self.assertIsNone(output_writer._GetUsername('unmapped'))
+    self.assertEqual(output_writer._usernames, {
+        'Onager': 'onager', 'unmapped': None})
+
+    output_writer = TestOutputWriter()
+    self.assertEqual(output_writer._GetUsername('Onager'), 'Onager')
+
+  def testWriteContributions(self):
+    """Tests the WriteContributions function."""
+    stats_store = self._CreateStatsStore()
+
+    output_writer = TestOutputWriter(
+        user_mappings={'joachimmetz': 'joachim', 'onager': 'onager'},
+        batch_size=1)
+    output_writer.WriteContributions(stats_store)
+
+    self.assertEqual(output_writer.contributions, [
+        ('2021', '01', 'onager', 'dfvfs', 2, 10, 1),
+        ('2021', '01', 'joachim', 'dfvfs', 2, 10, 1)])
+
+    stats_store.Close()
+
+  def testCSVOutputWriter(self):
+    """Tests the CSV output writer."""
+    stats_store = self._CreateStatsStore()
+
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'stats.csv')
+
+      output_writer = stats.CSVOutputWriter({}, path=path)
+      self.assertTrue(output_writer.Open())
+      output_writer.WriteContributions(stats_store)
+      output_writer.WriteContributions(stats_store)
+      output_writer.Close()
+
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        lines = file_object.readlines()
+
+    stats_store.Close()
+
+    self.assertEqual(len(lines), 7)
+    self.assertEqual(lines[0], (
+        'year\tweek number\tlogin name\tproject\tnumber of contributions\t'
+        'number lines added\tnumber lines deleted\n'))
+    self.assertEqual(lines[1], '2021\t01\tOnager\tdfvfs\t2\t10\t1\n')
+
+  def testJSONLinesOutputWriter(self):
+    """Tests the JSON Lines output writer."""
+    stats_store = self._CreateStatsStore()
+
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'stats.jsonl')
+
+      output_writer = stats.JSONLinesOutputWriter({}, path=path)
+      self.assertTrue(output_writer.Open())
+      output_writer.WriteReviews(stats_store)
+      output_writer.Close()
+
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        lines = file_object.readlines()
+
+    stats_store.Close()
+
+    self.assertEqual(len(lines), 1)
+    self.assertEqual(json.loads(lines[0]), {
+        'created_by': 'onager', 'creation_time': '2021-01-04T10:00:00Z',
+        'description': 'First', 'issue_number': 1, 'reviewers': '',
+        'status': 'open'})
+
+  def testColumnarOutputWriter(self):
+    """Tests the columnar output writer."""
+    stats_store = self._CreateStatsStore()
+
+    output_writer = stats.ColumnarOutputWriter({})
+    self.assertFalse(output_writer.Open())
+
+    with test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'stats.parquet')
+
+      output_writer = stats.ColumnarOutputWriter({}, path=path)
+      self.assertTrue(output_writer.Open())
+      output_writer.WriteContributions(stats_store)
+      output_writer.Close()
+
+      if stats.pyarrow:
+        table = stats.pyarrow_parquet.read_table(path)
+        self.assertEqual(table.num_rows, 3)
+
+      else:
+        with gzip.open(path, 'rt', encoding='utf-8') as file_object:
+          lines = file_object.readlines()
+
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[1], '2021\t1\tOnager\tdfvfs\t2\t10\t1\n')
+
+    stats_store.Close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -3,17 +3,35 @@
 """Script to automate creating builds of projects."""
 
 import argparse
+import concurrent.futures
+import contextlib
+import copy
+import functools
 import io
 import logging
 import os
 import subprocess
 import sys
+import threading
+import time
 
 from l2tdevtools import build_helper
+from l2tdevtools import build_journal
+from l2tdevtools import build_log
+from l2tdevtools import build_planner
+from l2tdevtools import build_service
+from l2tdevtools import build_timings
+from l2tdevtools import distributed_build
 from l2tdevtools import download_helper
+from l2tdevtools import package_repositories
 from l2tdevtools import presets
 from l2tdevtools import projects
 from l2tdevtools import source_helper
+from l2tdevtools.build_helpers import accelerator
+from l2tdevtools.build_helpers import installed_packages
+from l2tdevtools.build_helpers import sandbox
+from l2tdevtools.lib import definitions
+from l2tdevtools.lib import errors
 
 
 # Since os.path.abspath() uses the current working directory (cwd)
@@ -28,25 +46,67 @@ class ProjectBuilder(object):
   """Class that helps in building projects.
 
   Attributes:
+    build_time_regressions (dict[str, tuple[float, float]]): estimated and
+        actual build time in seconds per project name, of the builds that
+        took considerably longer than earlier builds.
     project_definitions (dict[str, ProjectDefinition]): project definitions.
   """
 
   # The distributions to build dpkg-source packages for.
   _DPKG_SOURCE_DISTRIBUTIONS = frozenset(['bionic'])
 
-  def __init__(self, build_target, l2tdevtools_path):
+  # The build targets that support building in a build sandbox. Source dpkg
+  # packages are signed by debuild, which requires the GPG keyring of the
+  # host, hence these are not built in a build sandbox.
+  _SANDBOX_BUILD_TARGETS = frozenset(['dpkg'])
+
+  def __init__(
+      self, build_target, l2tdevtools_path, build_accelerator=None,
+      build_journal_object=None, build_log_recorder=None,
+      build_sandbox_pool=None, build_timing_database=None,
+      download_helper_cache=None, installed_package_cache=None):
     """Initializes the project builder.
 
     Args:
       build_target (str): build target.
       l2tdevtools_path (str): path to l2tdevtools.
+      build_accelerator (Optional[BuildAccelerator]): build accelerator of
+          configure and make based builds, where None represents builds are
+          run without.
+      build_journal_object (Optional[BuildJournal]): journal to record the
+          completed build phases in and to resume from, where None
+          represents the build phases are not journaled.
+      build_log_recorder (Optional[BuildLogRecorder]): build log recorder to
+          record the timing and resource usage of the build phases, where None
+          represents the build phases are not recorded.
+      build_sandbox_pool (Optional[BuildSandboxPool]): pool of build roots to
+          build in, where None represents building on the host.
+      build_timing_database (Optional[BuildTimingDatabase]): database to
+          record the build times in, where None represents build times are
+          not recorded.
+      download_helper_cache (Optional[DownloadHelperCache]): cache of the
+          download helpers to reuse, where None represents a new download
+          helper is created per project.
+      installed_package_cache (Optional[InstalledPackageCache]): cache of the
+          installed package checks of the build dependencies, where None
+          represents the checks are not cached.
     """
     super(ProjectBuilder, self).__init__()
+    self._build_accelerator = build_accelerator
     self._build_helpers = {}
+    self._build_journal = build_journal_object
+    self._build_log_recorder = build_log_recorder
+    self._build_sandbox_pool = build_sandbox_pool
     self._build_target = build_target
+    self._build_timing_database = build_timing_database
+    self._definition_hashes = {}
+    self._download_helper_cache = download_helper_cache
+    self._installed_package_cache = installed_package_cache
     self._l2tdevtools_path = l2tdevtools_path
+    self._source_hashes = {}
     self._source_helpers = {}
 
+    self.build_time_regressions = {}
     self.project_definitions = {}
 
   def _BuildProject(
@@ -69,7 +129,16 @@ class ProjectBuilder(object):
 
     build_helper_object.Clean(source_helper_object)
 
-    if not build_required or build_helper_object.Build(source_helper_object):
+    if not build_required:
+      return True
+
+    start_time = time.monotonic()
+    result = build_helper_object.Build(source_helper_object)
+    self._RecordBuildTime(
+        source_helper_object.project_name, time.monotonic() - start_time,
+        result)
+
+    if result:
       return True
 
     if not os.path.exists(build_helper_object.LOG_FILENAME):
@@ -92,6 +161,159 @@ class ProjectBuilder(object):
 
     return False
 
+  def _GetDownloadHelper(self, project_definition):
+    """Retrieves the download helper of a project.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      DownloadHelper: download helper.
+
+    Raises:
+      ValueError: if the project download URL is not supported.
+    """
+    if self._download_helper_cache:
+      return self._download_helper_cache.GetDownloadHelper(project_definition)
+
+    return download_helper.DownloadHelperFactory.NewDownloadHelper(
+        project_definition)
+
+  def _GetInputsHash(self, project_definition, phase, distributions=None):
+    """Retrieves the hash of the inputs of a build phase.
+
+    The inputs of the download phase are the project definition. The inputs
+    of the later phases are also the build target and the source package.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      phase (str): name of the phase.
+      distributions (Optional[list[str]]): distributions to build.
+
+    Returns:
+      str: hash of the inputs.
+    """
+    # The hash of the project definition is determined before the build
+    # changes the definition, such as setting the build system.
+    definition_hash = self._definition_hashes.get(
+        project_definition.name, None)
+    if not definition_hash:
+      definition_hash = build_journal.CalculateInputsHash(project_definition)
+      self._definition_hashes[project_definition.name] = definition_hash
+
+    inputs = {'definition': definition_hash, 'phase': phase}
+    if phase != 'download':
+      inputs['build_target'] = self._build_target
+      inputs['source_hash'] = self._source_hashes.get(
+          project_definition.name, None)
+
+    if phase == 'build':
+      inputs['distributions'] = sorted(filter(None, distributions or []))
+
+    return build_journal.CalculateInputsHash(inputs)
+
+  @contextlib.contextmanager
+  def _RecordPhase(self, project_name, phase):
+    """Records a build phase.
+
+    Args:
+      project_name (str): name of the project.
+      phase (str): name of the phase.
+
+    Yields:
+      BuildPhaseEvent: build phase event or None if no build log recorder
+          is set.
+    """
+    if not self._build_log_recorder:
+      yield None
+    else:
+      with self._build_log_recorder.RecordPhase(project_name, phase) as event:
+        yield event
+
+  def _RecordBuildTime(self, project_name, wall_time, result):
+    """Records the build time of a project.
+
+    Args:
+      project_name (str): name of the project.
+      wall_time (float): elapsed wall clock time of the build in seconds.
+      result (bool): True if the build was successful.
+    """
+    if not self._build_timing_database:
+      return
+
+    if result:
+      estimated_build_time = self._build_timing_database.CheckRegression(
+          project_name, self._build_target, wall_time)
+      if estimated_build_time is not None:
+        logging.warning((
+            'Build time of: {0:s} regressed from: {1:s} to: {2:s}').format(
+                project_name,
+                build_timings.FormatDuration(estimated_build_time),
+                build_timings.FormatDuration(wall_time)))
+        self.build_time_regressions[project_name] = (
+            estimated_build_time, wall_time)
+
+    self._build_timing_database.AddBuildTime(
+        project_name, self._build_target, wall_time,
+        exit_code=0 if result else 1)
+
+  def _BuildProjectForDistributions(
+      self, build_helper_object, source_helper_object, distributions):
+    """Builds a project for multiple distributions concurrently.
+
+    Args:
+      build_helper_object (BuildHelper): build helper.
+      source_helper_object (SourceHelper): source helper.
+      distributions (list[str]): names of the distributions.
+
+    Returns:
+      bool: True if the build is successful or False on error.
+    """
+    start_time = time.monotonic()
+    failed_distributions = build_helper_object.BuildForDistributions(
+        source_helper_object, distributions)
+    wall_time = time.monotonic() - start_time
+
+    # Only the distributions that required a build have a build log.
+    build_required = bool(failed_distributions)
+
+    for distribution in distributions:
+      distribution_log_filename = (
+          build_helper_object.GetDistributionLogFilename(distribution))
+      if not os.path.exists(distribution_log_filename):
+        if distribution in failed_distributions:
+          logging.warning('Build of: {0:s} for: {1:s} failed.'.format(
+              source_helper_object.project_name, distribution))
+        continue
+
+      build_required = True
+
+      if distribution not in failed_distributions:
+        logging.info('Removing: {0:s}'.format(distribution_log_filename))
+        os.remove(distribution_log_filename)
+        continue
+
+      log_filename = '{0:s}_{1:s}'.format(
+          source_helper_object.project_name, distribution_log_filename)
+
+      # Remove older logfiles if they exists otherwise the rename
+      # fails on Windows.
+      if os.path.exists(log_filename):
+        os.remove(log_filename)
+
+      os.rename(distribution_log_filename, log_filename)
+      logging.warning((
+          'Build of: {0:s} for: {1:s} failed, for more information check '
+          '{2:s}').format(
+              source_helper_object.project_name, distribution, log_filename))
+
+    if build_required:
+      self._RecordBuildTime(
+          source_helper_object.project_name, wall_time,
+          not failed_distributions)
+
+    return not failed_distributions
+
   def Build(self, project_definition, distributions=None):
     """Builds a project.
 
@@ -114,24 +336,132 @@ class ProjectBuilder(object):
       logging.warning('Missing source helper.')
       return False
 
+    inputs_hash = None
+    if self._build_journal:
+      inputs_hash = self._GetInputsHash(
+          project_definition, 'build', distributions=distributions)
+
     if not distributions:
       if self._build_target == 'dpkg-source':
         distributions = self._DPKG_SOURCE_DISTRIBUTIONS
       else:
         distributions = [None]
 
-    for distribution in distributions:
-      if not self._BuildProject(
-          build_helper_object, source_helper_object, distribution):
+    # The source dpkg packages of the different distributions only differ in
+    # their packaging files, hence they can be built concurrently.
+    if self._build_target == 'dpkg-source' and len(distributions) > 1:
+      if not self._BuildProjectForDistributions(
+          build_helper_object, source_helper_object, sorted(distributions)):
         return False
 
+    else:
+      for distribution in distributions:
+        if not self._BuildProject(
+            build_helper_object, source_helper_object, distribution):
+          return False
+
     if os.path.exists(build_helper_object.LOG_FILENAME):
       logging.info('Removing: {0:s}'.format(
           build_helper_object.LOG_FILENAME))
       os.remove(build_helper_object.LOG_FILENAME)
 
+    if self._build_journal:
+      self._build_journal.RecordPhase(
+          project_definition.name, 'build', inputs_hash)
+
     return True
 
+  def BuildOnWorkers(
+      self, build_coordinator, project_definitions, distributions=None):
+    """Builds projects on build workers.
+
+    The source packages of the projects must have been downloaded before.
+
+    Args:
+      build_coordinator (BuildCoordinator): coordinator of the workers.
+      project_definitions (list[ProjectDefinition]): project definitions.
+      distributions (Optional[list[str]]): distributions to build.
+
+    Returns:
+      dict[str, BuildResult]: result per project name.
+    """
+    inputs_hashes = {}
+    jobs = []
+    for project_definition in project_definitions:
+      source_helper_object = self._source_helpers.get(
+          project_definition.name, None)
+      if not source_helper_object:
+        logging.warning('Missing source helper of: {0:s}.'.format(
+            project_definition.name))
+        continue
+
+      if self._build_journal:
+        inputs_hashes[project_definition.name] = self._GetInputsHash(
+            project_definition, 'build', distributions=distributions)
+
+      jobs.append(distributed_build.BuildJob(
+          project_definition.name, source_helper_object.GetProjectVersion(),
+          source_helper_object.GetSourcePackageFilename(), self._build_target,
+          distributions=distributions))
+
+    build_results = build_coordinator.Build(jobs, '.')
+
+    for project_name, build_result in build_results.items():
+      if build_result.wall_time is not None:
+        self._RecordBuildTime(
+            project_name, build_result.wall_time, build_result.result)
+
+      if build_result.result and self._build_journal:
+        self._build_journal.RecordPhase(
+            project_name, 'build', inputs_hashes[project_name])
+
+    return build_results
+
+  def BuildSourcePackage(
+      self, project_name, project_version, source_filename,
+      distributions=None):
+    """Builds a project from a source package that was downloaded before.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+      source_filename (str): filename of the source package.
+      distributions (Optional[list[str]]): distributions to build.
+
+    Returns:
+      tuple[bool, list[str]]: True if the build is successful and the names
+          of the missing build dependencies.
+
+    Raises:
+      ValueError: if the project download URL is not supported.
+    """
+    project_definition = self.project_definitions.get(project_name, None)
+    if not project_definition:
+      logging.error('Undefined project: {0:s}'.format(project_name))
+      return False, []
+
+    download_helper_object = self._GetDownloadHelper(project_definition)
+
+    source_helper_object = source_helper.SourcePackageHelper(
+        project_definition.name, project_definition, download_helper_object)
+
+    if not source_helper_object.SetSourcePackage(
+        project_version, source_filename):
+      logging.error('Missing source package: {0:s}'.format(source_filename))
+      return False, []
+
+    self._source_helpers[project_definition.name] = source_helper_object
+
+    missing_packages = self.CheckBuildDependencies(project_definition)
+    if missing_packages:
+      return False, missing_packages
+
+    if not self.CheckProjectConfiguration(project_definition):
+      logging.warning('Detected error in configuration of: {0:s}'.format(
+          project_definition.name))
+
+    return self.Build(project_definition, distributions=distributions), []
+
   def CheckBuildDependencies(self, project_definition):
     """Checks if the build dependencies of a project are met.
 
@@ -153,7 +483,12 @@ class ProjectBuilder(object):
           source_helper_object.project_name))
       return []
 
-    if not source_helper_object.Create():
+    with self._RecordPhase(project_definition.name, 'extract') as event:
+      result = source_helper_object.Create()
+      if event and not result:
+        event.exit_code = 1
+
+    if not result:
       logging.error('Extraction of source package: {0:s} failed'.format(
           source_filename))
       return []
@@ -182,9 +517,30 @@ class ProjectBuilder(object):
           project_definition.name))
       return []
 
+    if (self._build_sandbox_pool and
+        self._build_target in self._SANDBOX_BUILD_TARGETS):
+      build_helper_object.build_sandbox_pool = self._build_sandbox_pool
+
+    build_helper_object.build_accelerator = self._build_accelerator
+    build_helper_object.build_log_recorder = self._build_log_recorder
+    build_helper_object.installed_package_cache = (
+        self._installed_package_cache)
+
     self._build_helpers[project_definition.name] = build_helper_object
 
-    return build_helper_object.CheckBuildDependencies()
+    if self._build_journal:
+      inputs_hash = self._GetInputsHash(project_definition, 'dependencies')
+      if self._build_journal.GetPhase(
+          project_definition.name, 'dependencies', inputs_hash) is not None:
+        return []
+
+    missing_packages = build_helper_object.CheckBuildDependencies()
+
+    if self._build_journal and not missing_packages:
+      self._build_journal.RecordPhase(
+          project_definition.name, 'dependencies', inputs_hash)
+
+    return missing_packages
 
   def CheckProjectConfiguration(self, project_definition):
     """Checks if the project configuration is correct.
@@ -215,19 +571,37 @@ class ProjectBuilder(object):
     Raises:
       ValueError: if the project download URL is not supported.
     """
-    download_helper_object = (
-        download_helper.DownloadHelperFactory.NewDownloadHelper(
-            project_definition))
+    download_helper_object = self._GetDownloadHelper(project_definition)
 
     source_helper_object = source_helper.SourcePackageHelper(
         project_definition.name, project_definition, download_helper_object)
 
+    if self._build_journal:
+      inputs_hash = self._GetInputsHash(project_definition, 'download')
+      values = self._build_journal.GetPhase(
+          project_definition.name, 'download', inputs_hash)
+
+      # The source package is only reused if it did not change.
+      if values and build_journal.CalculateFileHash(
+          values['source_filename']) == values['source_hash']:
+        if source_helper_object.SetSourcePackage(
+            values['project_version'], values['source_filename']):
+          logging.info('Resuming with source package: {0:s}'.format(
+              values['source_filename']))
+
+          self._source_hashes[project_definition.name] = values['source_hash']
+          self._source_helpers[project_definition.name] = source_helper_object
+          return True
+
     source_helper_object.Clean()
 
     # TODO: add a step to make sure build environment is sane
     # e.g. _CheckStatusIsClean()
 
-    source_filename = source_helper_object.Download()
+    with self._RecordPhase(project_definition.name, 'download') as event:
+      source_filename = source_helper_object.Download()
+      if event and not source_filename:
+        event.exit_code = 1
 
     if self._build_target == 'download':
       # If available run the script post-download.sh after download.
@@ -240,8 +614,118 @@ class ProjectBuilder(object):
 
     self._source_helpers[project_definition.name] = source_helper_object
 
+    if source_filename:
+      source_hash = build_journal.CalculateFileHash(source_filename)
+      self._source_hashes[project_definition.name] = source_hash
+
+      if self._build_journal:
+        self._build_journal.RecordPhase(
+            project_definition.name, 'download', inputs_hash, values={
+                'project_version': source_helper_object.GetProjectVersion(),
+                'source_filename': source_filename,
+                'source_hash': source_hash})
+
     return True
 
+  def GetLatestVersion(self, project_definition):
+    """Retrieves the latest upstream version of a project.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      str: latest upstream version or None if not available.
+    """
+    try:
+      download_helper_object = self._GetDownloadHelper(project_definition)
+    except ValueError as exception:
+      logging.warning((
+          'Unable to determine upstream version of: {0:s} with error: '
+          '{1!s}').format(project_definition.name, exception))
+      return None
+
+    version_definition = getattr(project_definition, 'version', None)
+    return download_helper_object.GetLatestVersion(
+        project_definition.name, version_definition)
+
+  def IsBuildCompleted(self, project_definition, distributions=None):
+    """Determines if a project was built by the run that is resumed.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      distributions (Optional[list[str]]): distributions to build.
+
+    Returns:
+      bool: True if the project was built with the same inputs.
+    """
+    if (not self._build_journal or
+        project_definition.name not in self._source_hashes):
+      return False
+
+    inputs_hash = self._GetInputsHash(
+        project_definition, 'build', distributions=distributions)
+    return self._build_journal.GetPhase(
+        project_definition.name, 'build', inputs_hash) is not None
+
+  def Plan(self, project_names, build_targets, distributions=None,
+           track='testing'):
+    """Determines the projects that need to be built.
+
+    A project needs to be built if its latest upstream version is not
+    published in the package repositories of the build targets, which are
+    the Launchpad PPA for dpkg-source, the COPR project for rpm and srpm and
+    l2tbinaries for msi.
+
+    Args:
+      project_names (list[str]): names of the projects to consider.
+      build_targets (list[str]): build targets to compare the published
+          packages of.
+      distributions (Optional[list[str]]): names of the Ubuntu distributions
+          to compare the published dpkg-source packages of, where None
+          represents the default distribution.
+      track (Optional[str]): name of the track of the package repositories.
+
+    Returns:
+      list[PlannedBuild]: builds that are needed, in build order, or None if
+          the published packages could not be determined.
+
+    Raises:
+      ValueError: if a build target has no package repository.
+    """
+    repository_functions = {}
+    for build_target in build_targets:
+      if build_target == 'dpkg-source':
+        for distribution in (
+            distributions or [definitions.DEFAULT_UBUNTU_DISTRIBUTION]):
+          repository_name = 'launchpad:{0:s}:{1:s}'.format(
+              track, distribution)
+          launchpad_ppa_manager = package_repositories.LaunchpadPPAManager(
+              'gift', distribution=distribution)
+          repository_functions[repository_name] = functools.partial(
+              launchpad_ppa_manager.GetPackages, track)
+
+      elif build_target in ('rpm', 'srpm'):
+        repository_name = 'copr:{0:s}'.format(track)
+        copr_project_manager = package_repositories.COPRProjectManager('gift')
+        repository_functions[repository_name] = functools.partial(
+            copr_project_manager.GetPackages, track)
+
+      elif build_target == 'msi':
+        for sub_directory in ('win32', 'win64'):
+          repository_name = 'l2tbinaries:{0:s}:{1:s}'.format(
+              track, sub_directory)
+          github_repo_manager = package_repositories.GithubRepoManager()
+          repository_functions[repository_name] = functools.partial(
+              github_repo_manager.GetPackages, sub_directory, track)
+
+      else:
+        raise ValueError(
+            'Unsupported build target: {0:s} has no package repository.'.format(
+                build_target))
+
+    planner = build_planner.BuildPlanner(self.project_definitions)
+    return planner.Plan(project_names, repository_functions)
+
   def ReadProjectDefinitions(self, path):
     """Reads project definitions.
 
@@ -291,6 +775,234 @@ class ProjectBuilder(object):
     return project_names
 
 
+class ProjectBuildService(object):
+  """Runs the jobs of the build service with warm caches.
+
+  The project definitions are read again only when the projects.ini file
+  changed. The download helpers and the installed package checks are shared
+  by the jobs.
+  """
+
+  _BUILD_TARGETS = frozenset([
+      'download', 'dpkg', 'dpkg-source', 'msi', 'osc', 'rpm', 'source', 'srpm',
+      'wheel'])
+
+  # Maximum number of projects to resolve the upstream version concurrently.
+  _MAXIMUM_NUMBER_OF_RESOLVE_WORKERS = 8
+
+  def __init__(
+      self, projects_file, l2tdevtools_path, build_accelerator=None,
+      build_sandbox_pool=None, build_timing_database=None):
+    """Initializes a project build service.
+
+    Args:
+      projects_file (str): path of the projects.ini file.
+      l2tdevtools_path (str): path to l2tdevtools.
+      build_accelerator (Optional[BuildAccelerator]): build accelerator of
+          configure and make based builds.
+      build_sandbox_pool (Optional[BuildSandboxPool]): pool of build roots to
+          build in.
+      build_timing_database (Optional[BuildTimingDatabase]): database to
+          record the build times in.
+    """
+    super(ProjectBuildService, self).__init__()
+    self._build_accelerator = build_accelerator
+    self._build_sandbox_pool = build_sandbox_pool
+    self._build_timing_database = build_timing_database
+    self._download_helper_cache = download_helper.DownloadHelperCache()
+    self._installed_package_cache = installed_packages.InstalledPackageCache()
+    self._l2tdevtools_path = l2tdevtools_path
+    self._lock = threading.Lock()
+    self._project_definitions = {}
+    self._projects_file = projects_file
+    self._projects_file_fingerprint = None
+
+  def _CreateProjectBuilder(self, build_target):
+    """Creates a project builder.
+
+    Args:
+      build_target (str): build target.
+
+    Returns:
+      ProjectBuilder: project builder.
+    """
+    project_builder = ProjectBuilder(
+        build_target, self._l2tdevtools_path,
+        build_accelerator=self._build_accelerator,
+        build_sandbox_pool=self._build_sandbox_pool,
+        build_timing_database=self._build_timing_database,
+        download_helper_cache=self._download_helper_cache,
+        installed_package_cache=self._installed_package_cache)
+
+    with self._lock:
+      stat_object = os.stat(self._projects_file)
+      fingerprint = (stat_object.st_mtime_ns, stat_object.st_size)
+      if fingerprint != self._projects_file_fingerprint:
+        logging.info('Reading: {0:s}'.format(self._projects_file))
+        project_builder.ReadProjectDefinitions(self._projects_file)
+
+        self._project_definitions = project_builder.project_definitions
+        self._projects_file_fingerprint = fingerprint
+
+      # The project definitions are copied since builds change them.
+      project_builder.project_definitions = copy.deepcopy(
+          self._project_definitions)
+
+    return project_builder
+
+  def Build(self, parameters):
+    """Runs a build job.
+
+    Builds change the current working directory, hence only one build job
+    should run at a time.
+
+    Args:
+      parameters (dict[str, object]): parameters of the job, which are
+          "build_directory", "build_target", "distributions" and "projects".
+
+    Returns:
+      dict[str, list[str]]: names of the projects that were built, that
+          failed to download or build and that are not defined, and the
+          missing build dependencies.
+
+    Raises:
+      ValueError: if the build target or build directory is not supported.
+    """
+    build_target = parameters.get('build_target', None)
+    if build_target not in self._BUILD_TARGETS:
+      raise ValueError('Unsupported build target: {0!s}'.format(build_target))
+
+    build_directory = parameters.get('build_directory', None)
+    if not build_directory or not os.path.isabs(build_directory):
+      raise ValueError('Unsupported build directory: {0!s}'.format(
+          build_directory))
+
+    distributions = parameters.get('distributions', None) or None
+    project_builder = self._CreateProjectBuilder(build_target)
+
+    result = {
+        'built': [], 'failed_builds': [], 'failed_downloads': [],
+        'missing_dependencies': [], 'undefined_projects': []}
+
+    os.makedirs(build_directory, exist_ok=True)
+
+    current_working_directory = os.getcwd()
+    os.chdir(build_directory)
+
+    try:
+      for project_name in parameters.get('projects', None) or []:
+        project_definition = project_builder.project_definitions.get(
+            project_name, None)
+        if not project_definition:
+          result['undefined_projects'].append(project_name)
+          continue
+
+        if not project_builder.Download(project_definition):
+          result['failed_downloads'].append(project_name)
+          continue
+
+        if build_target != 'download':
+          dependencies = project_builder.CheckBuildDependencies(
+              project_definition)
+          if dependencies:
+            result['missing_dependencies'].extend([
+                dependency for dependency in dependencies
+                if dependency not in result['missing_dependencies']])
+            continue
+
+          if not project_builder.CheckProjectConfiguration(
+              project_definition):
+            logging.warning('Detected error in configuration of: {0:s}'.format(
+                project_name))
+
+          if not project_builder.Build(
+              project_definition, distributions=distributions):
+            result['failed_builds'].append(project_name)
+            continue
+
+        result['built'].append(project_name)
+
+    finally:
+      os.chdir(current_working_directory)
+
+    return result
+
+  def Resolve(self, parameters):
+    """Runs a resolve job, which determines the latest upstream versions.
+
+    Args:
+      parameters (dict[str, object]): parameters of the job, which are
+          "projects".
+
+    Returns:
+      dict[str, object]: latest upstream version per project name, where
+          None represents the version is not available, and the names of
+          the projects that are not defined.
+    """
+    project_builder = self._CreateProjectBuilder('download')
+
+    project_definitions = []
+    undefined_projects = []
+    for project_name in parameters.get('projects', None) or []:
+      project_definition = project_builder.project_definitions.get(
+          project_name, None)
+      if project_definition:
+        project_definitions.append(project_definition)
+      else:
+        undefined_projects.append(project_name)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=self._MAXIMUM_NUMBER_OF_RESOLVE_WORKERS) as executor:
+      latest_versions = executor.map(
+          project_builder.GetLatestVersion, project_definitions)
+
+      versions = {
+          project_definition.name: version
+          for project_definition, version in zip(
+              project_definitions, latest_versions)}
+
+    return {'undefined_projects': undefined_projects, 'versions': versions}
+
+
+def BuildWorkerJob(
+    job, job_path, l2tdevtools_path, build_accelerator=None,
+    build_sandbox_pool=None):
+  """Builds a job received by a build worker.
+
+  Args:
+    job (BuildJob): job.
+    job_path (str): path of the job directory that contains the source
+        package.
+    l2tdevtools_path (str): path of the directory that contains the data
+        directory with the packaging inputs of the coordinator.
+    build_accelerator (Optional[BuildAccelerator]): build accelerator of
+        configure and make based builds.
+    build_sandbox_pool (Optional[BuildSandboxPool]): pool of build roots to
+        build in.
+
+  Returns:
+    tuple[bool, list[str]]: True if the build is successful and the names
+        of the missing build dependencies.
+  """
+  project_builder = ProjectBuilder(
+      job.build_target, l2tdevtools_path, build_accelerator=build_accelerator,
+      build_sandbox_pool=build_sandbox_pool)
+
+  project_builder.ReadProjectDefinitions(
+      os.path.join(l2tdevtools_path, 'data', 'projects.ini'))
+
+  current_working_directory = os.getcwd()
+  os.chdir(job_path)
+
+  try:
+    return project_builder.BuildSourcePackage(
+        job.project_name, job.project_version, job.source_filename,
+        distributions=job.distributions)
+
+  finally:
+    os.chdir(current_working_directory)
+
+
 def Main():
   """The main program function.
 
@@ -298,15 +1010,20 @@ def Main():
     bool: True if successful or False if not.
   """
   build_targets = frozenset([
-      'download', 'dpkg', 'dpkg-source', 'msi', 'osc', 'rpm', 'source', 'srpm',
-      'wheel'])
+      'download', 'dpkg', 'dpkg-source', 'msi', 'osc', 'plan', 'resolve', 'rpm',
+      'service', 'source', 'srpm', 'wheel', 'worker'])
 
   argument_parser = argparse.ArgumentParser(description=(
       'Downloads and builds the latest versions of projects.'))
 
   argument_parser.add_argument(
       'build_target', choices=sorted(build_targets), action='store',
-      metavar='BUILD_TARGET', default=None, help='The build target.')
+      metavar='BUILD_TARGET', default=None, help=(
+          'The build target, where "plan" lists the projects whose latest '
+          'upstream version is not published in the package repositories of '
+          'the plan targets, "resolve" lists the latest upstream versions of '
+          'the projects, "service" runs the build service and "worker" builds '
+          'the jobs of coordinators that build with --workers.'))
 
   argument_parser.add_argument(
       '--build-directory', '--build_directory', action='store',
@@ -314,17 +1031,63 @@ def Main():
       default=os.path.join('..', 'l2tbuilds'), help=(
           'The location of the build directory.'))
 
+  argument_parser.add_argument(
+      '--build-log', '--build_log', action='store', metavar='PATH',
+      dest='build_log', type=str, default=None, help=(
+          'path of the structured build log file. If set the wall clock time, '
+          'CPU time, peak resident set size and exit code of every build '
+          'phase are appended to the file as JSON-lines and a summary of the '
+          'slowest projects and phases is printed after the build.'))
+
   argument_parser.add_argument(
       '-c', '--config', dest='config_path', action='store',
       metavar='CONFIG_PATH', default=None, help=(
           'path of the directory containing the build configuration '
           'files e.g. projects.ini.'))
 
+  argument_parser.add_argument(
+      '--configure-cache', '--configure_cache', dest='configure_cache',
+      action='store', metavar='DIRECTORY', default=None, help=(
+          'path of the directory with the shared configure caches. If set '
+          'configure results are cached per distribution and compiler and '
+          'reused by the configure runs of subsequent builds.'))
+
   argument_parser.add_argument(
       '--distributions', dest='distributions', action='store',
       metavar='NAME(S)', default='', help=(
           'comma separated list of specific distribution names to build.'))
 
+  argument_parser.add_argument(
+      '--make-jobs', '--make_jobs', dest='make_jobs', action='store',
+      metavar='NUMBER', type=int, default=None, help=(
+          'number of jobs make should run concurrently. The default is '
+          'determined by the build system.'))
+
+  argument_parser.add_argument(
+      '--no-ccache', '--no_ccache', dest='use_ccache', action='store_false',
+      default=True, help=(
+          'do not compile through ccache. By default ccache is used when '
+          'it is installed.'))
+
+  argument_parser.add_argument(
+      '--plan', dest='plan', action='store_true', default=False, help=(
+          'only build the projects whose latest upstream version is not '
+          'published in the package repository of the build target, in build '
+          'order.'))
+
+  argument_parser.add_argument(
+      '--plan-file', '--plan_file', dest='plan_file', action='store',
+      metavar='PATH', default=None, help=(
+          'path of the file to write the names of the planned projects to, '
+          'one per line.'))
+
+  argument_parser.add_argument(
+      '--plan-targets', '--plan_targets', dest='plan_targets',
+      action='store', metavar='BUILD_TARGET(S)', default='dpkg-source,srpm',
+      help=(
+          'comma separated list of the build targets whose package '
+          'repositories the plan build target compares with.'))
+
   argument_parser.add_argument(
       '--preset', dest='preset', action='store',
       metavar='PRESET_NAME', default=None, help=(
@@ -339,6 +1102,67 @@ def Main():
           'default is to build all project defined in the projects.ini '
           'configuration file.'))
 
+  argument_parser.add_argument(
+      '--resume', dest='resume', action='store_true', default=False, help=(
+          'resume the previous build run, where the build phases that '
+          'completed successfully with unchanged inputs, as recorded in the '
+          'build journal in the build directory, are skipped.'))
+
+  argument_parser.add_argument(
+      '--sandbox-pool', '--sandbox_pool', dest='sandbox_pool', action='store',
+      metavar='DIRECTORY', default=None, help=(
+          'path of the directory with the pre-provisioned build roots per '
+          'distribution. If set dpkg packages are built in a copy-on-write '
+          'overlay of the build root instead of on the host.'))
+
+  argument_parser.add_argument(
+      '--service-socket', '--service_socket', dest='service_socket',
+      action='store', metavar='PATH', default=None, help=(
+          'path of the Unix socket of the build service. If set the build '
+          'and resolve jobs are submitted to the build service, which keeps '
+          'the project definitions, download helpers and installed package '
+          'checks warm, instead of run by this process. The default socket '
+          'of the service is ~/.cache/l2tdevtools/build_service.sock.'))
+
+  argument_parser.add_argument(
+      '--timing-database', '--timing_database', dest='timing_database',
+      action='store', metavar='PATH', default=None, help=(
+          'path of the database with the historical build times, which are '
+          'used to estimate the remaining build time and to report builds '
+          'that became considerably slower. The default is '
+          '~/.cache/l2tdevtools/build_timings.db.'))
+
+  argument_parser.add_argument(
+      '--track', dest='track', action='store', metavar='NAME',
+      default='testing', help=(
+          'name of the track of the package repositories to plan with.'))
+
+  argument_parser.add_argument(
+      '--worker-address', '--worker_address', dest='worker_address',
+      action='store', metavar='HOST:PORT', default='localhost:{0:d}'.format(
+          distributed_build.DEFAULT_PORT), help=(
+              'address the worker listens on. The default is to only accept '
+              'coordinators on the local host.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='workers', action='store', metavar='HOST:PORT(S)',
+      default=None, help=(
+          'comma separated list of the addresses of the workers to build on '
+          'instead of on the local host. The workers are started with the '
+          '"worker" build target. Workers on other hosts are best reached '
+          'through an SSH tunnel, for example "ssh -L 8751:localhost:{0:d} '
+          'host". The {1:s} environment variable sets the secret shared by '
+          'the coordinator and the workers, which is required.').format(
+              distributed_build.DEFAULT_PORT,
+              distributed_build.SECRET_ENVIRONMENT_VARIABLE))
+
+  argument_parser.add_argument(
+      '--sandbox-type', '--sandbox_type', dest='sandbox_type', action='store',
+      choices=sorted(sandbox.BuildSandboxPool.SANDBOX_TYPES),
+      default='overlay', help=(
+          'type of the build sandboxes, where "overlay" uses an unshare based '
+          'overlay file system and "schroot" uses schroot sessions.'))
+
   options = argument_parser.parse_args()
 
   if not options.build_target:
@@ -361,7 +1185,8 @@ def Main():
     l2tdevtools_path = os.path.dirname(l2tdevtools_path)
     config_path = os.path.join(l2tdevtools_path, 'data')
 
-  if not options.preset and not options.projects:
+  if (options.build_target not in ('service', 'worker') and
+      not options.preset and not options.projects):
     print('Please define a preset or projects to build.')
     print('')
     return False
@@ -390,7 +1215,158 @@ def Main():
 
   distributions = options.distributions.split(',') or None
 
-  project_builder = ProjectBuilder(options.build_target, l2tdevtools_path)
+  build_sandbox_pool = None
+  if options.sandbox_pool:
+    build_sandbox_pool = sandbox.BuildSandboxPool(
+        options.sandbox_pool, sandbox_type=options.sandbox_type)
+
+  if options.make_jobs is not None and options.make_jobs < 1:
+    print('Number of make jobs must be 1 or more.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  build_accelerator = accelerator.BuildAccelerator(
+      configure_cache_path=options.configure_cache,
+      make_jobs=options.make_jobs, use_ccache=options.use_ccache)
+
+  if options.build_target == 'worker':
+    try:
+      host, port = distributed_build.ParseAddress(options.worker_address)
+    except ValueError as exception:
+      print(exception)
+      print('')
+      return False
+
+    try:
+      build_worker = distributed_build.BuildWorker(
+          functools.partial(
+              BuildWorkerJob, build_accelerator=build_accelerator,
+              build_sandbox_pool=build_sandbox_pool),
+          options.build_directory, secret=os.environ.get(
+              distributed_build.SECRET_ENVIRONMENT_VARIABLE, None))
+    except ValueError as exception:
+      print('{0!s} Set the secret with the {1:s} environment variable.'.format(
+          exception, distributed_build.SECRET_ENVIRONMENT_VARIABLE))
+      print('')
+      return False
+
+    try:
+      host, port = build_worker.Start(host, port)
+    except OSError as exception:
+      print('Unable to listen on: {0:s} with error: {1!s}'.format(
+          options.worker_address, exception))
+      print('')
+      return False
+
+    logging.info('Build worker listening on: {0:s}:{1:d}'.format(host, port))
+
+    try:
+      build_worker.Serve()
+    except KeyboardInterrupt:
+      pass
+    finally:
+      build_worker.Stop()
+
+    return True
+
+  timing_database_path = options.timing_database
+  if not timing_database_path:
+    timing_database_path = os.path.join(
+        os.path.expanduser('~'), '.cache', 'l2tdevtools', 'build_timings.db')
+
+  build_timing_database = build_timings.BuildTimingDatabase(
+      path=os.path.abspath(timing_database_path))
+
+  if options.build_target == 'service':
+    service_socket = options.service_socket
+    if not service_socket:
+      service_socket = os.path.join(
+          os.path.expanduser('~'), '.cache', 'l2tdevtools',
+          'build_service.sock')
+
+    project_build_service = ProjectBuildService(
+        os.path.abspath(projects_file), l2tdevtools_path,
+        build_accelerator=build_accelerator,
+        build_sandbox_pool=build_sandbox_pool,
+        build_timing_database=build_timing_database)
+
+    build_service_object = build_service.BuildService()
+
+    # Builds change the current working directory, hence only one build job
+    # runs at a time.
+    build_service_object.RegisterJobType(
+        'build', project_build_service.Build, number_of_workers=1)
+    build_service_object.RegisterJobType(
+        'resolve', project_build_service.Resolve, number_of_workers=4)
+
+    try:
+      build_service_object.Start(service_socket)
+    except OSError as exception:
+      print('Unable to listen on: {0:s} with error: {1!s}'.format(
+          service_socket, exception))
+      print('')
+      return False
+
+    logging.info('Build service listening on: {0:s}'.format(service_socket))
+
+    build_timing_database.Open()
+
+    try:
+      build_service_object.Serve()
+    except KeyboardInterrupt:
+      pass
+    finally:
+      build_service_object.Stop()
+      build_timing_database.Close()
+
+    return True
+
+  if options.service_socket:
+    unsupported_options = [
+        name for name, value in (
+            ('--build-log', options.build_log),
+            ('--resume', options.resume),
+            ('--workers', options.workers)) if value]
+    if unsupported_options:
+      print('Unsupported option(s) with --service-socket: {0:s}.'.format(
+          ', '.join(unsupported_options)))
+      print('')
+      return False
+
+  build_journal_object = build_journal.BuildJournal(os.path.join(
+      os.path.abspath(options.build_directory),
+      build_journal.BuildJournal.FILENAME))
+
+  build_log_recorder = None
+  if options.build_log:
+    build_log_recorder = build_log.BuildLogRecorder(
+        path=os.path.abspath(options.build_log))
+    build_log_recorder.Open()
+
+  build_coordinator = None
+  if options.workers:
+    try:
+      build_coordinator = distributed_build.BuildCoordinator(
+          options.workers.split(','), os.path.join(l2tdevtools_path, 'data'),
+          os.path.abspath(projects_file),
+          build_scheduler=build_timings.BuildScheduler(
+              build_timing_database, options.build_target),
+          secret=os.environ.get(
+              distributed_build.SECRET_ENVIRONMENT_VARIABLE, None))
+    except ValueError as exception:
+      print(exception)
+      print('')
+      return False
+
+  project_builder = ProjectBuilder(
+      options.build_target, l2tdevtools_path,
+      build_accelerator=build_accelerator,
+      build_journal_object=build_journal_object,
+      build_log_recorder=build_log_recorder,
+      build_sandbox_pool=build_sandbox_pool,
+      build_timing_database=build_timing_database)
 
   project_names = []
   if options.preset:
@@ -406,6 +1382,52 @@ def Main():
 
   project_builder.ReadProjectDefinitions(projects_file)
 
+  if options.build_target == 'plan' or options.plan:
+    if options.build_target == 'plan':
+      plan_targets = options.plan_targets.split(',')
+    else:
+      plan_targets = [options.build_target]
+
+    try:
+      planned_builds = project_builder.Plan(
+          project_names, plan_targets,
+          distributions=[name for name in distributions if name] or None,
+          track=options.track)
+    except ValueError as exception:
+      print(exception)
+      print('')
+      return False
+
+    if planned_builds is None:
+      print('Unable to determine the published packages.')
+      print('')
+      return False
+
+    print('Planned builds:')
+    for planned_build in planned_builds:
+      published_versions = ', '.join([
+          '{0:s}: {1:s}'.format(repository_name, version or 'missing')
+          for repository_name, version in sorted(
+              planned_build.published_versions.items())])
+      print('\t{0:s} {1:s} ({2:s})'.format(
+          planned_build.name, planned_build.upstream_version,
+          published_versions))
+    print('')
+
+    project_names = [planned_build.name for planned_build in planned_builds]
+
+    if options.plan_file:
+      with io.open(options.plan_file, 'w', encoding='utf-8') as file_object:
+        file_object.write(''.join([
+            '{0:s}\n'.format(project_name) for project_name in project_names]))
+
+    if options.build_target == 'plan':
+      return True
+
+    if not project_names:
+      print('Nothing to build.')
+      return True
+
   builds = []
   disabled_projects = []
   for name, definition in project_builder.project_definitions.items():
@@ -426,6 +1448,69 @@ def Main():
     else:
       builds.append(definition)
 
+  if options.plan:
+    builds.sort(key=lambda definition: project_names.index(definition.name))
+
+  if options.service_socket or options.build_target == 'resolve':
+    project_names = [
+        name for name in project_names if name not in disabled_projects]
+
+    if options.build_target == 'resolve':
+      job_type = 'resolve'
+      parameters = {'projects': project_names}
+    else:
+      job_type = 'build'
+      parameters = {
+          'build_directory': os.path.abspath(options.build_directory),
+          'build_target': options.build_target,
+          'distributions': [name for name in distributions if name],
+          'projects': project_names}
+
+    if not options.service_socket:
+      project_build_service = ProjectBuildService(
+          os.path.abspath(projects_file), l2tdevtools_path)
+      result = project_build_service.Resolve(parameters)
+
+    else:
+      build_service_client = build_service.BuildServiceClient(
+          options.service_socket)
+
+      try:
+        job = build_service_client.SubmitJob(job_type, parameters, wait=True)
+      except errors.Error as exception:
+        print(exception)
+        print('')
+        return False
+
+      if job['status'] != 'completed' or job['result'] is None:
+        print('Job: {0:d} failed with error: {1!s}'.format(
+            job['identifier'], job['error'] or 'missing result'))
+        return False
+
+      result = job['result']
+
+    for key, description in (
+        ('undefined_projects', 'Undefined projects'),
+        ('failed_downloads', 'Failed downloading'),
+        ('missing_dependencies', 'Missing build dependencies'),
+        ('failed_builds', 'Failed building')):
+      if result.get(key, None):
+        print('')
+        print('{0:s}:'.format(description))
+        for name in result[key]:
+          print('\t{0:s}'.format(name))
+
+    if job_type == 'resolve':
+      print('Latest upstream versions:')
+      for name, version in sorted(result['versions'].items()):
+        print('\t{0:s} {1:s}'.format(name, version or 'not available'))
+      print('')
+
+    return (
+        not result.get('failed_downloads', None) and
+        not result.get('missing_dependencies', None) and
+        not result.get('failed_builds', None))
+
   if not os.path.exists(options.build_directory):
     os.mkdir(options.build_directory)
 
@@ -438,6 +1523,9 @@ def Main():
   failed_downloads = set()
   missing_build_dependencies = set()
 
+  build_journal_object.Open(resume=options.resume)
+  build_timing_database.Open()
+
   current_working_directory = os.getcwd()
   os.chdir(options.build_directory)
 
@@ -456,6 +1544,35 @@ def Main():
         failed_downloads.add(project_definition.name)
 
     if options.build_target != 'download':
+      for project_definition in list(builds):
+        if project_builder.IsBuildCompleted(
+            project_definition, distributions=distributions):
+          logging.info('Skipping completed build of: {0:s}'.format(
+              project_definition.name))
+          builds.remove(project_definition)
+
+      if build_coordinator:
+        build_results = project_builder.BuildOnWorkers(
+            build_coordinator, builds, distributions=distributions)
+
+        for project_definition in builds:
+          build_result = build_results.get(project_definition.name, None)
+          if build_result and build_result.missing_dependencies:
+            print((
+                'Unable to build: {0:s} on: {1:s} missing build dependencies: '
+                '{2:s}').format(
+                    project_definition.name, build_result.worker,
+                    ', '.join(build_result.missing_dependencies)))
+            missing_build_dependencies.update(
+                build_result.missing_dependencies)
+
+          elif not build_result or not build_result.result:
+            print('Failed building: {0:s}'.format(project_definition.name))
+            failed_builds.add(project_definition.name)
+
+        # The projects were built by the workers.
+        builds = []
+
       for project_definition in list(builds):
         dependencies = project_builder.CheckBuildDependencies(
             project_definition)
@@ -473,8 +1590,23 @@ def Main():
               project_definition.name))
           configuration_errors.add(project_definition.name)
 
-      for project_definition in list(builds):
-        logging.info('Building: {0:s}'.format(project_definition.name))
+      build_scheduler = build_timings.BuildScheduler(
+          build_timing_database, options.build_target)
+
+      remaining_projects = [
+          project_definition.name for project_definition in builds]
+      number_of_builds = len(remaining_projects)
+
+      for index, project_definition in enumerate(list(builds)):
+        estimated_remaining_time = build_scheduler.EstimateRemainingTime(
+            remaining_projects)
+        remaining_projects.remove(project_definition.name)
+
+        logging.info((
+            'Building: {0:s} ({1:d} of {2:d}, estimated remaining time: '
+            '{3:s})').format(
+                project_definition.name, index + 1, number_of_builds,
+                build_timings.FormatDuration(estimated_remaining_time)))
 
         # TODO: add support for dokan, bzip2
         # TODO: setup sqlite in build directory.
@@ -486,6 +1618,21 @@ def Main():
   finally:
     os.chdir(current_working_directory)
 
+    if build_log_recorder:
+      build_log_recorder.Close()
+
+    build_journal_object.Close()
+    build_timing_database.Close()
+
+  if build_log_recorder:
+    build_log_summary = build_log.BuildLogSummary()
+    for event in build_log_recorder.GetEvents():
+      build_log_summary.AddEvent(event)
+
+    print('')
+    print('Build log summary:')
+    build_log_summary.Write(sys.stdout)
+
   if undefined_projects:
     print('')
     print('Undefined projects:')
@@ -510,6 +1657,15 @@ def Main():
     for dependency in missing_build_dependencies:
       print('\t{0:s}'.format(dependency))
 
+  if project_builder.build_time_regressions:
+    print('')
+    print('Build time regressions:')
+    for name, (estimated_build_time, wall_time) in sorted(
+        project_builder.build_time_regressions.items()):
+      print('\t{0:s}: {1:s} -> {2:s}'.format(
+          name, build_timings.FormatDuration(estimated_build_time),
+          build_timings.FormatDuration(wall_time)))
+
   if failed_builds:
     print('')
     print('Failed building:')
@@ -4,337 +4,20 @@
 
 import argparse
 import csv
-import gzip
 import io
-import json
 import logging
 import os
 import platform
 import re
 import sys
-import zlib
-
-from xml.etree import ElementTree
 
+from l2tdevtools import package_repositories
 from l2tdevtools import projects
 from l2tdevtools import versions
 from l2tdevtools.download_helpers import interface
 from l2tdevtools.lib import definitions
 
 
-class COPRProjectManager(object):
-  """Defines a COPR project manager."""
-
-  _COPR_BASE_URL = 'https://copr.fedorainfracloud.org{0:s}'
-
-  _COPR_URL = (
-      'https://copr.fedorainfracloud.org/api_2/projects?group={name:s}&'
-      'name={project:s}')
-
-  _COPR_REPO_URL = (
-      'https://copr-be.cloud.fedoraproject.org/results/%40{name:s}/'
-      '{project:s}/fedora-{fedora_version:s}-i386')
-
-  _PRIMARY_XML_XPATH = (
-      './{http://linux.duke.edu/metadata/repo}data[@type="primary"]/'
-      '{http://linux.duke.edu/metadata/repo}location')
-
-  def __init__(self, name, distribution=None):
-    """Initializes a COPR manager.
-
-    Args:
-      name (str): name of the group.
-      distribution (Optional[str]): name of the distribution.
-    """
-    super(COPRProjectManager, self).__init__()
-    self._distribution = distribution or definitions.DEFAULT_FEDORA_DISTRIBUTION
-    self._download_helper = interface.DownloadHelper('')
-    self._name = name
-
-  def GetPackages(self, project):
-    """Retrieves a list of packages of a specific project.
-
-    Args:
-      project (str): project name.
-
-    Returns:
-      dict[str, str]: package names and versions as values or None if
-          the packages cannot be determined.
-    """
-    # TODO: do not use builds information, it is incomplete
-    # instead use https://copr-be.cloud.fedoraproject.org/results/%40gift/
-    # testing/fedora-26-x86_64/repodata/repomd.xml
-    # to find primary.xml.gz or primary.sqlite.bz2
-
-    kwargs = {
-        'fedora_version': self._distribution,
-        'name': self._name,
-        'project': project}
-    copr_repo_url = self._COPR_REPO_URL.format(**kwargs)
-
-    download_url = '/'.join([copr_repo_url, 'repodata', 'repomd.xml'])
-    page_content = self._download_helper.DownloadPageContent(download_url)
-    if not page_content:
-      logging.error('Unable to retrieve repomd.xml.')
-      return None
-
-    repomd_xml = ElementTree.fromstring(page_content)
-    xml_elements = repomd_xml.findall(self._PRIMARY_XML_XPATH)
-    if not xml_elements or not xml_elements[0].items():
-      logging.error('Primary data type missing from repomd.xml.')
-      return None
-
-    href_value_tuple = xml_elements[0].items()[0]
-    if not href_value_tuple[1]:
-      logging.error('Primary data type missing from repomd.xml.')
-      return None
-
-    download_url = '/'.join([copr_repo_url, href_value_tuple[1]])
-    page_content = self._download_helper.DownloadPageContent(
-        download_url, encoding=None)
-    if not page_content:
-      _, _, download_url = download_url.rpartition('/')
-      logging.error('Unable to retrieve primary.xml.gz.')
-      return None
-
-    with gzip.GzipFile(fileobj=io.BytesIO(page_content)) as file_object:
-      page_content = file_object.read()
-
-    primary_xml = ElementTree.fromstring(page_content)
-    # Note explicitly checking xml.Element against None because of deprecation
-    # warning.
-    if primary_xml is None:
-      logging.error('Packages missing from primary.xml.')
-      return None
-
-    packages = {}
-    for project_xml in primary_xml:
-      arch_xml = project_xml.find('{http://linux.duke.edu/metadata/common}arch')
-      if arch_xml is None or arch_xml.text != 'src':
-        continue
-
-      package_name_xml = project_xml.find(
-          '{http://linux.duke.edu/metadata/common}name')
-      package_version_xml = project_xml.find(
-          '{http://linux.duke.edu/metadata/common}version')
-      if package_name_xml is None or package_version_xml is None:
-        continue
-
-      package_name = package_name_xml.text
-      package_version = package_version_xml.attrib['ver']
-
-      if not package_name or not package_version:
-        continue
-
-      if package_name in packages:
-        package_version_tuple = package_version.split('.')
-        version_tuple = packages[package_name].split('.')
-        compare_result = versions.CompareVersions(
-            package_version_tuple, version_tuple)
-        if compare_result < 0:
-          continue
-
-      packages[package_name] = package_version
-
-    return packages
-
-
-class GithubRepoManager(object):
-  """Defines a GitHub repository manager."""
-
-  _GITHUB_REPO_API_URL = (
-      'https://api.github.com/repos/log2timeline/l2tbinaries')
-
-  _GITHUB_REPO_URL = (
-      'https://github.com/log2timeline/l2tbinaries')
-
-  def __init__(self):
-    """Initializes a GitHub repository manager."""
-    super(GithubRepoManager, self).__init__()
-    self._download_helper = interface.DownloadHelper('')
-
-  def _GetDownloadURL(self, sub_directory, track, use_api=False):
-    """Retrieves the download URL.
-
-    Args:
-      sub_directory (str): machine type sub directory.
-      track (str): track name.
-      use_api (Optional[bool]): True if the API should be used.
-
-    Returns:
-      str: download URL or None if sub directory is missing.
-    """
-    if not sub_directory:
-      return None
-
-    if track == 'stable':
-      branch = 'main'
-    else:
-      branch = track
-
-    if use_api:
-      download_url = '{0:s}/contents/{1:s}?ref={2:s}'.format(
-          self._GITHUB_REPO_API_URL, sub_directory, branch)
-
-    else:
-      download_url = '{0:s}/tree/{1:s}/{2:s}'.format(
-          self._GITHUB_REPO_URL, branch, sub_directory)
-
-    return download_url
-
-  def GetPackages(self, sub_directory, track, use_api=False):
-    """Retrieves a list of packages of a specific sub directory.
-
-    Args:
-      sub_directory (str): machine type sub directory.
-      track (str): track name.
-      use_api (Optional[bool]): True if the API should be used.
-
-    Returns:
-      dict[str, str]: package names and versions as values or None if
-          the packages cannot be determined.
-    """
-    if not sub_directory:
-      logging.info('Missing machine type sub directory.')
-      return None
-
-    download_url = self._GetDownloadURL(sub_directory, track, use_api=use_api)
-    if not download_url:
-      logging.info('Missing download URL.')
-      return None
-
-    page_content = self._download_helper.DownloadPageContent(download_url)
-    if not page_content:
-      return None
-
-    filenames = []
-    if use_api:
-      # The page content consist of JSON data that contains a list of dicts.
-      # Each dict consists of:
-      # {
-      #   "name":"PyYAML-3.11.win-amd64-py2.7.msi",
-      #   "path":"win64/PyYAML-3.11.win-amd64-py2.7.msi",
-      #   "sha":"8fca8c1e2549cf54bf993c55930365d01658f418",
-      #   "size":196608,
-      #   "url":"https://api.github.com/...",
-      #   "html_url":"https://github.com/...",
-      #   "git_url":"https://api.github.com/...",
-      #   "download_url":"https://raw.githubusercontent.com/...",
-      #   "type":"file",
-      #   "_links":{
-      #     "self":"https://api.github.com/...",
-      #     "git":"https://api.github.com/...",
-      #     "html":"https://github.com/..."
-      #   }
-      # }
-
-      for directory_entry in json.loads(page_content):
-        filename = directory_entry.get('name', None)
-        if filename:
-          filenames.append(filename)
-
-    else:
-      # The format of the download URL is:
-      # <a class="js-navigation-open" title="{title}" id="{id}" href="{path}"
-      expression_string = (
-          '<a class="js-navigation-open" title="[^"]*" id="[^"]*" '
-          'href="([^"]*)"')
-      matches = re.findall(expression_string, page_content)
-
-      for match in matches:
-        _, _, filename = match.rpartition('/')
-        filenames.append(filename)
-
-    packages = {}
-    for filename in filenames:
-      if not filename or not filename.endswith('.msi'):
-        continue
-
-      if sub_directory == 'win32':
-        filename, _, _ = filename.rpartition('.win32')
-      elif sub_directory == 'win64':
-        filename, _, _ = filename.rpartition('.win-amd64')
-      else:
-        continue
-
-      name, _, version = filename.rpartition('-')
-      packages[name] = version
-
-    return packages
-
-
-class LaunchpadPPAManager(object):
-  """Defines a Launchpad PPA manager."""
-
-  _LAUNCHPAD_URL = (
-      'http://ppa.launchpad.net/{name:s}/{track:s}/ubuntu/dists'
-      '/{distribution:s}/main/source/Sources.gz')
-
-  def __init__(self, name, distribution=None):
-    """Initializes a Launchpad PPA manager.
-
-    Args:
-      name (str): name of the PPA.
-      distribution (Optional[str]): name of the distribution.
-    """
-    super(LaunchpadPPAManager, self).__init__()
-    self._distribution = distribution or definitions.DEFAULT_UBUNTU_DISTRIBUTION
-    self._download_helper = interface.DownloadHelper('')
-    self._name = name
-
-  def CopyPackages(self):
-    """Copies packages."""
-    # TODO: implement:
-    # send post to https://launchpad.net/~gift/+archive/ubuntu/testing
-    #              /+copy-packages
-    return
-
-  def GetPackages(self, track):
-    """Retrieves a list of packages of a specific PPA track.
-
-    Args:
-      track (str): PPA track name.
-
-    Returns:
-      dict[str, str]: package names and versions as values or None if
-          the packages cannot be determined.
-    """
-    kwargs = {
-        'distribution': self._distribution,
-        'name': self._name,
-        'track': track}
-    download_url = self._LAUNCHPAD_URL.format(**kwargs)
-
-    ppa_sources = self._download_helper.DownloadPageContent(
-        download_url, encoding=None)
-    if not ppa_sources:
-      logging.error('Unable to retrieve PPA sources list.')
-      return None
-
-    ppa_sources = zlib.decompress(ppa_sources, 16 + zlib.MAX_WBITS)
-
-    try:
-      ppa_sources = ppa_sources.decode('utf-8')
-    except UnicodeDecodeError as exception:
-      logging.error(
-          'Unable to decode PPA sources list with error: {0!s}'.format(
-              exception))
-      return None
-
-    packages = {}
-    for line in ppa_sources.split('\n'):
-      if line.startswith('Package: '):
-        _, _, package = line.rpartition('Package: ')
-
-      elif line.startswith('Version: '):
-        _, _, version = line.rpartition('Version: ')
-        version, _, _ = version.rpartition('-')
-
-        packages[package] = version
-
-    return packages
-
-
 class OpenSuseBuildServiceManager(object):
   """Defines an OpenSuse build service manager object."""
 
@@ -435,10 +118,10 @@ class PackagesManager(object):
         distribution or definitions.DEFAULT_UBUNTU_DISTRIBUTION)
 
     super(PackagesManager, self).__init__()
-    self._copr_project_manager = COPRProjectManager(
+    self._copr_project_manager = package_repositories.COPRProjectManager(
         'gift', distribution=fedora_distribution)
-    self._github_repo_manager = GithubRepoManager()
-    self._launchpad_ppa_manager = LaunchpadPPAManager(
+    self._github_repo_manager = package_repositories.GithubRepoManager()
+    self._launchpad_ppa_manager = package_repositories.LaunchpadPPAManager(
         'gift', distribution=ubuntu_distribution)
     self._pypi_manager = PyPIManager(projects_file)
     self._ubuntu_distribution = ubuntu_distribution
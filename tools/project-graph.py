@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=invalid-name
+"""Script to query the dependency graph of the projects."""
+
+import argparse
+import io
+import os
+import sys
+
+from l2tdevtools import project_graph
+from l2tdevtools import projects
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  actions = frozenset([
+      'cycles', 'depends', 'order', 'rdepends', 'unresolved'])
+
+  argument_parser = argparse.ArgumentParser(description=(
+      'Queries the dependency graph of the projects, for example which '
+      'projects must be rebuilt if a project changes: rdepends libbde'))
+
+  argument_parser.add_argument(
+      'action', choices=sorted(actions), action='store',
+      metavar='ACTION', default=None, help=(
+          'The action: cycles, depends, order, rdepends or unresolved.'))
+
+  argument_parser.add_argument(
+      'projects', action='store', metavar='PROJECTS', nargs='?', default=None,
+      help=(
+          'Comma separated list of project names, required by depends and '
+          'rdepends. The order action orders all projects if not provided.'))
+
+  argument_parser.add_argument(
+      '-c', '--config', dest='config_path', action='store',
+      metavar='CONFIG_PATH', default=None, help=(
+          'path of the directory containing the build configuration '
+          'files e.g. projects.ini.'))
+
+  argument_parser.add_argument(
+      '--direct', dest='direct', action='store_true', default=False, help=(
+          'only include direct dependencies instead of transitive '
+          'dependencies.'))
+
+  options = argument_parser.parse_args()
+
+  project_names = []
+  if options.projects:
+    project_names = options.projects.split(',')
+
+  if options.action in ('depends', 'rdepends') and not project_names:
+    print('Missing projects.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  config_path = options.config_path
+  if not config_path:
+    config_path = os.path.dirname(__file__)
+    config_path = os.path.dirname(config_path)
+    config_path = os.path.join(config_path, 'data')
+
+  projects_file = os.path.join(config_path, 'projects.ini')
+  if not os.path.exists(projects_file):
+    print('No such config file: {0:s}.'.format(projects_file))
+    print('')
+    return False
+
+  with io.open(projects_file, 'r', encoding='utf-8') as file_object:
+    project_definition_reader = projects.ProjectDefinitionReader()
+    dependency_graph = project_graph.ProjectDependencyGraph(
+        project_definition_reader.Read(file_object))
+
+  try:
+    if options.action == 'cycles':
+      cycles = dependency_graph.GetCycles()
+      for cycle in cycles:
+        print(' -> '.join(cycle + cycle[:1]))
+
+      return not cycles
+
+    if options.action == 'order':
+      for project_name in dependency_graph.GetBuildOrder(
+          project_names=project_names or None):
+        print(project_name)
+
+    elif options.action == 'unresolved':
+      unresolved_dependencies = dependency_graph.GetUnresolvedDependencies()
+      for project_name, package_names in sorted(
+          unresolved_dependencies.items()):
+        print('{0:s}: {1:s}'.format(project_name, ', '.join(package_names)))
+
+    else:
+      if options.action == 'depends':
+        lookup_function = dependency_graph.GetDependencies
+      else:
+        lookup_function = dependency_graph.GetReverseDependencies
+
+      results = set()
+      for project_name in project_names:
+        results.update(lookup_function(
+            project_name, transitive=not options.direct))
+
+      for project_name in dependency_graph.GetBuildOrder(
+          project_names=results):
+        print(project_name)
+
+  except KeyError as exception:
+    print(exception.args[0])
+    return False
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
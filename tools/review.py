@@ -27,7 +27,21 @@ def Main():
       '--allfiles', '--all-files', '--all_files', dest='all_files',
       action='store_true', default=False, help=(
           'Apply command to all files, currently only affects the lint '
-          'command.'))
+          'command and the tests selected by --test-impact.'))
+
+  argument_parser.add_argument(
+      '--test-impact', '--test_impact', dest='test_impact',
+      action='store_true', default=False, help=(
+          'only run the test modules that import, directly or transitively, '
+          'the files changed compared to origin/main. Changes to files other '
+          'than Python source files or documentation run all test modules.'))
+
+  argument_parser.add_argument(
+      '--test-jobs', '--test_jobs', dest='test_jobs', type=int,
+      action='store', default=None, metavar='NUMBER', help=(
+          'number of worker processes to run the test modules in, where 0 '
+          'represents the number of CPUs. The default is to run the tests '
+          'with run_tests.py.'))
 
   commands_parser = argument_parser.add_subparsers(dest='command')
 
@@ -79,7 +93,9 @@ def Main():
       options.project_path,
       github_origin,
       feature_branch,
-      all_files=options.all_files)
+      all_files=options.all_files,
+      number_of_test_workers=options.test_jobs,
+      only_impacted_tests=options.test_impact)
 
   if not review_helper.InitializeHelpers():
     return False
@@ -87,11 +103,16 @@ def Main():
   if not review_helper.CheckLocalGitState():
     return False
 
-  if not review_helper.Lint():
-    return False
+  if options.command in ('lint-test', 'lint_test'):
+    if not review_helper.LintAndTest():
+      return False
 
-  if not review_helper.Test():
-    return False
+  else:
+    if not review_helper.Lint():
+      return False
+
+    if not review_helper.Test():
+      return False
 
   result = False
   if options.command == 'close':
@@ -3,16 +3,29 @@
 """Script to retrieve GitHub project statistics."""
 
 import argparse
+import calendar
+import concurrent.futures
 import configparser
 import datetime
+import gzip
 import json
 import logging
 import os
+import re
+import sqlite3
 import sys
+import threading
 import time
 
 import urllib.error as urllib_error
-from urllib.request import urlopen
+import urllib.request as urllib_request
+
+try:
+  import pyarrow
+  import pyarrow.parquet as pyarrow_parquet
+except ImportError:
+  pyarrow = None
+  pyarrow_parquet = None
 
 
 class StatsDefinitionReader(object):
@@ -53,7 +66,7 @@ class StatsDefinitionReader(object):
 
       if project_names is None:
         project_names = []
-      elif isinstance(project_names, bytes):
+      elif isinstance(project_names, str):
         project_names = project_names.split(',')
 
       projects_per_organization[option_name] = project_names
@@ -107,89 +120,181 @@ class StatsDefinitionReader(object):
 class DownloadHelper(object):
   """Class that defines a download helper."""
 
-  def _DownloadPageContent(self, download_url):
-    """Downloads the page content from the URL.
+  def _RequestURL(self, download_url, request_headers):
+    """Requests an URL.
 
     Args:
-      download_url (str): URL where to download the page content.
+      download_url (str): URL to request.
+      request_headers (dict[str, str]): HTTP request headers.
 
     Returns:
-      tuple[bytes, TODO]: page content and response headers if successful or
-          None otherwise.
+      tuple[int, bytes, email.message.Message]: HTTP status code, response
+          data and response headers, where the status code is None if the
+          request failed.
     """
-    if not download_url:
-      return None, None
+    request = urllib_request.Request(download_url, headers=request_headers)
 
     try:
-      url_object = urlopen(download_url)
+      url_object = urllib_request.urlopen(request)
+    except urllib_error.HTTPError as exception:
+      # Note that urlopen() raises HTTPError for status codes such as 304
+      # (Not Modified) and 403 (Forbidden).
+      return exception.code, exception.read(), exception.headers
     except urllib_error.URLError as exception:
       logging.warning(
           'Unable to download URL: {0:s} with error: {1!s}'.format(
               download_url, exception))
-      return None, None
+      return None, None, None
 
-    if url_object.code != 200:
-      return None, None
+    return url_object.code, url_object.read(), url_object.info()
 
-    return url_object.read(), url_object.info()
 
+class GithubResponseCache(object):
+  """Cache of GitHub API responses of a project.
 
-class GithubContributionsHelper(DownloadHelper):
-  """Class that defines a GitHub contributions helper."""
+  The responses are cached per URL together with their ETag so that they can
+  be revalidated with a conditional request, which does not count against
+  the rate limit when the response is not modified. The URL of the next page
+  is cached as well, since a 304 (Not Modified) response does not necessarily
+  contain a Link header.
+  """
 
-  def _ListContributionsForProject(
-      self, organization, project_name, output_writer):
-    """Lists the contributions of a specific project.
+  def __init__(self, path):
+    """Initializes a GitHub response cache.
 
     Args:
-      organization (str): name of the organization.
-      project_name (str): name of the project.
-      output_writer (OutputWriter): output writer.
+      path (str): path of the cache file.
+    """
+    super(GithubResponseCache, self).__init__()
+    self._path = path
+    self._responses = {}
+
+  def GetResponse(self, url):
+    """Retrieves a cached response.
+
+    Args:
+      url (str): URL of the response.
+
+    Returns:
+      tuple[str, str, str]: ETag, response data and URL of the next page or
+          None if not cached.
     """
-    download_url = (
-        'https://api.github.com/repos/{0:s}/{1:s}/stats/contributors').format(
-            organization, project_name)
+    response = self._responses.get(url, None)
+    if not response:
+      return None, None, None
 
-    contributors_data, response = self._DownloadPageContent(download_url)
-    if not contributors_data:
+    return (
+        response.get('etag', None), response.get('data', None),
+        response.get('next_url', None))
+
+  def Read(self):
+    """Reads the cache file."""
+    self._responses = {}
+
+    try:
+      with open(self._path, 'r', encoding='utf-8') as file_object:
+        responses = json.load(file_object)
+    except (IOError, ValueError):
       return
 
-    # TODO: check if response is not None
-    _ = response
+    if isinstance(responses, dict):
+      self._responses = responses
+
+  def SetResponse(self, url, etag, data, next_url=None):
+    """Caches a response.
+
+    Args:
+      url (str): URL of the response.
+      etag (str): ETag of the response.
+      data (str): response data.
+      next_url (Optional[str]): URL of the next page, where None represents
+          the response is the last page.
+    """
+    self._responses[url] = {'data': data, 'etag': etag, 'next_url': next_url}
+
+  def Write(self):
+    """Writes the cache file."""
+    temporary_path = '{0:s}.tmp'.format(self._path)
+    try:
+      with open(temporary_path, 'w', encoding='utf-8') as file_object:
+        json.dump(self._responses, file_object, sort_keys=True)
+
+      os.replace(temporary_path, self._path)
+
+    except (IOError, OSError):
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
 
-    contributors_json = json.loads(contributors_data)
-    self._WriteContributions(project_name, contributors_json, output_writer)
 
-  def _ListPullRequestsForProject(
-      self, organization, project_name, output_writer):
-    """Lists the pull requests of a specific project.
+class StatsStore(object):
+  """SQLite-backed store of GitHub project statistics.
+
+  Contributions are stored per week and pull requests per number. Records
+  are ingested incrementally: only contributions of the last ingested week
+  and later, and pull requests updated after the last ingested update, are
+  written, since earlier records do not change.
+  """
+
+  _SCHEMA = [
+      ('CREATE TABLE IF NOT EXISTS contributions ('
+       'organization TEXT, project TEXT, login_name TEXT, '
+       'week_timestamp INTEGER, number_of_contributions INTEGER, '
+       'number_of_lines_added INTEGER, number_of_lines_deleted INTEGER, '
+       'PRIMARY KEY (organization, project, login_name, week_timestamp))'),
+      ('CREATE TABLE IF NOT EXISTS pull_requests ('
+       'organization TEXT, project TEXT, number INTEGER, creation_time TEXT, '
+       'update_time TEXT, created_by TEXT, description TEXT, '
+       'reviewers TEXT, status TEXT, '
+       'PRIMARY KEY (organization, project, number))'),
+      ('CREATE INDEX IF NOT EXISTS contributions_week_timestamp '
+       'ON contributions (week_timestamp)')]
+
+  def __init__(self, path=':memory:'):
+    """Initializes a statistics store.
 
     Args:
-      organization (str): name of the organization.
-      project_name (str): name of the project.
-      output_writer (OutputWriter): output writer.
+      path (Optional[str]): path of the SQLite database file, where
+          ":memory:" represents an in-memory database.
     """
-    download_url = (
-        'https://api.github.com/repos/{0:s}/{1:s}/pulls?state=all').format(
-            organization, project_name)
+    super(StatsStore, self).__init__()
+    self._connection = None
+    self._path = path
 
-    pulls_data, response = self._DownloadPageContent(download_url)
-    if not pulls_data:
-      return
+  def _GetTimeRangeConditions(self, column_name, start_time, end_time):
+    """Determines the SQL conditions of a time range.
+
+    Args:
+      column_name (str): name of the column that contains the time.
+      start_time (object): inclusive start of the time range or None.
+      end_time (object): exclusive end of the time range or None.
+
+    Returns:
+      tuple[list[str], list[object]]: SQL conditions and their parameters.
+    """
+    conditions = []
+    parameters = []
+
+    if start_time is not None:
+      conditions.append('{0:s} >= ?'.format(column_name))
+      parameters.append(start_time)
 
-    # TODO: check if response is not None
-    _ = response
+    if end_time is not None:
+      conditions.append('{0:s} < ?'.format(column_name))
+      parameters.append(end_time)
 
-    pulls_json = json.loads(pulls_data)
-    self._WritePullRequests(project_name, pulls_json, output_writer)
+    return conditions, parameters
 
-  def _WriteContributions(self, project_name, contributors_json, output_writer):
-    """Writes the contributions to the output writer.
+  def AddContributions(self, organization, project_name, contributors_json):
+    """Adds contributions of a project.
 
     Args:
+      organization (str): name of the organization.
       project_name (str): name of the project.
-      contributors_json (list[object]): JSON formatted contributors objects.
-      output_writer (OutputWriter): output writer.
+      contributors_json (list[object]): JSON formatted contributors objects
+          as returned by the stats/contributors endpoint.
+
+    Returns:
+      int: number of contribution records written.
     """
     # https://developer.github.com/v3/repos/statistics/
     # [{
@@ -205,74 +310,571 @@ class GithubContributionsHelper(DownloadHelper):
     #   }, ...],
     # }, ...]
 
-    contributions_per_week = {}
-    for contributions_per_author_json in contributors_json:
-      author_json = contributions_per_author_json.get("author", None)
-      if not author_json:
-        logging.error('Missing author JSON dictionary.')
-        continue
+    last_week_timestamp = self.GetLastContributionWeek(
+        organization, project_name)
 
-      weeks_json = contributions_per_author_json.get("weeks", None)
-      if not weeks_json:
-        logging.error('Missing weeks JSON list.')
-        continue
-
-      login_name = author_json.get("login", None)
+    rows = []
+    for contributions_per_author_json in contributors_json:
+      author_json = contributions_per_author_json.get('author', None) or {}
+      login_name = author_json.get('login', None)
       if not login_name:
-        logging.error('Missing login name JSON value.')
         continue
 
-      # TODO: map login name to username
+      for week_json in contributions_per_author_json.get('weeks', None) or []:
+        week_timestamp = week_json.get('w', None)
+        if not week_timestamp:
+          continue
+
+        # The last ingested week can have gained contributions since.
+        if last_week_timestamp and week_timestamp < last_week_timestamp:
+          continue
 
-      for week_json in weeks_json:
-        number_of_lines_added = week_json.get('a', 0)
         number_of_contributions = week_json.get('c', 0)
+        number_of_lines_added = week_json.get('a', 0)
         number_of_lines_deleted = week_json.get('d', 0)
 
         if (not number_of_lines_added and not number_of_contributions and
             not number_of_lines_deleted):
           continue
 
-        week_timestamp = week_json.get('w', None)
-        if not week_timestamp:
-          logging.error('Missing week timestamp JSON value.')
-          continue
-
-        time_elements = time.gmtime(week_timestamp)
-        year = time.strftime('%Y', time_elements)
-        week_number = time.strftime('%U', time_elements)
-
-        if week_number not in contributions_per_week:
-          contributions_per_week[week_number] = {}
-
-        contributions_per_week[week_number][login_name] = (
+        rows.append((
+            organization, project_name, login_name, week_timestamp,
             number_of_contributions, number_of_lines_added,
-            number_of_lines_deleted)
+            number_of_lines_deleted))
 
-        output_writer.WriteContribution(
-            year, week_number, login_name, project_name,
-            number_of_contributions, number_of_lines_added,
-            number_of_lines_deleted)
+    with self._connection:
+      self._connection.executemany(
+          'INSERT OR REPLACE INTO contributions VALUES (?, ?, ?, ?, ?, ?, ?)',
+          rows)
 
-  def _WritePullRequests(self, project_name, pulls_json, output_writer):
-    """Writes the pull requests to the output writer.
+    return len(rows)
+
+  def AddPullRequests(self, organization, project_name, pulls_json):
+    """Adds pull requests of a project.
 
     Args:
+      organization (str): name of the organization.
       project_name (str): name of the project.
-      pulls_json (list[object]): JSON formatted pull objects.
-      output_writer (OutputWriter): output writer.
+      pulls_json (list[object]): JSON formatted pull objects as returned by
+          the pulls endpoint.
+
+    Returns:
+      int: number of pull request records written.
     """
     # https://developer.github.com/v3/pulls/#list-pull-requests
     # [{
     #  "created_at": creation date and time of the CL.
+    #  "number": number of the CL.
+    #  "requested_reviewers": [{
+    #    "login": github username.
+    #   }, ...]
     #  "state": state of the CL.
     #  "title": string containing the CL description.
+    #  "updated_at": last update date and time of the CL.
     #  "user": {
     #    "login": github username.
     #   }, ...]
     #  ...
     # }, ...]
 
+    last_update_time = self.GetLastPullRequestUpdate(
+        organization, project_name)
+
+    rows = []
+    for pull_json in pulls_json:
+      number = pull_json.get('number', None)
+      if not number:
+        continue
+
+      update_time = pull_json.get('updated_at', None) or ''
+      if last_update_time and update_time and update_time <= last_update_time:
+        continue
+
+      user_json = pull_json.get('user', None) or {}
+      reviewers = [
+          reviewer_json.get('login', '')
+          for reviewer_json in pull_json.get('requested_reviewers', None) or []]
+
+      rows.append((
+          organization, project_name, number,
+          pull_json.get('created_at', None) or '', update_time,
+          user_json.get('login', None) or '',
+          pull_json.get('title', None) or '', ','.join(reviewers),
+          pull_json.get('state', None) or ''))
+
+    with self._connection:
+      self._connection.executemany(
+          'INSERT OR REPLACE INTO pull_requests VALUES '
+          '(?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    return len(rows)
+
+  def Close(self):
+    """Closes the store."""
+    if self._connection:
+      self._connection.close()
+      self._connection = None
+
+  def GetContributions(
+      self, organization=None, login_name=None, start_time=None,
+      end_time=None):
+    """Retrieves contributions.
+
+    Args:
+      organization (Optional[str]): name of the organization, where None
+          represents all organizations.
+      login_name (Optional[str]): login name, where None represents all
+          users.
+      start_time (Optional[int]): inclusive POSIX timestamp of the start of
+          the time range.
+      end_time (Optional[int]): exclusive POSIX timestamp of the end of the
+          time range.
+
+    Yields:
+      tuple[str, str, str, int, int, int, int]: organization, project, login
+          name, POSIX timestamp of the start of the week, number of
+          contributions, number of lines added and number of lines deleted,
+          ordered by project and week.
+    """
+    conditions, parameters = self._GetTimeRangeConditions(
+        'week_timestamp', start_time, end_time)
+
+    if organization:
+      conditions.append('organization = ?')
+      parameters.append(organization)
+
+    if login_name:
+      conditions.append('login_name = ?')
+      parameters.append(login_name)
+
+    query = 'SELECT * FROM contributions'
+    if conditions:
+      query = '{0:s} WHERE {1:s}'.format(query, ' AND '.join(conditions))
+
+    query = (
+        '{0:s} ORDER BY organization, project, week_timestamp, '
+        'login_name').format(query)
+
+    for row in self._connection.execute(query, parameters):
+      yield tuple(row)
+
+  def GetContributionTotals(
+      self, group_by='login_name', organization=None, start_time=None,
+      end_time=None):
+    """Retrieves aggregated contributions.
+
+    Args:
+      group_by (Optional[str]): column to aggregate by, either "login_name",
+          "organization" or "project".
+      organization (Optional[str]): name of the organization, where None
+          represents all organizations.
+      start_time (Optional[int]): inclusive POSIX timestamp of the start of
+          the time range.
+      end_time (Optional[int]): exclusive POSIX timestamp of the end of the
+          time range.
+
+    Returns:
+      list[tuple[str, int, int, int]]: name, number of contributions, number
+          of lines added and number of lines deleted, ordered by number of
+          contributions in descending order.
+
+    Raises:
+      ValueError: if the column to aggregate by is not supported.
+    """
+    if group_by not in ('login_name', 'organization', 'project'):
+      raise ValueError('Unsupported group by: {0:s}'.format(group_by))
+
+    conditions, parameters = self._GetTimeRangeConditions(
+        'week_timestamp', start_time, end_time)
+
+    if organization:
+      conditions.append('organization = ?')
+      parameters.append(organization)
+
+    query = (
+        'SELECT {0:s}, SUM(number_of_contributions), '
+        'SUM(number_of_lines_added), SUM(number_of_lines_deleted) '
+        'FROM contributions').format(group_by)
+    if conditions:
+      query = '{0:s} WHERE {1:s}'.format(query, ' AND '.join(conditions))
+
+    query = '{0:s} GROUP BY {1:s} ORDER BY 2 DESC, 1'.format(query, group_by)
+
+    return [tuple(row) for row in self._connection.execute(query, parameters)]
+
+  def GetLastContributionWeek(self, organization, project_name):
+    """Retrieves the last ingested contribution week of a project.
+
+    Args:
+      organization (str): name of the organization.
+      project_name (str): name of the project.
+
+    Returns:
+      int: POSIX timestamp of the start of the last ingested week or None if
+          no contributions were ingested.
+    """
+    cursor = self._connection.execute(
+        'SELECT MAX(week_timestamp) FROM contributions '
+        'WHERE organization = ? AND project = ?', (organization, project_name))
+    return cursor.fetchone()[0]
+
+  def GetLastPullRequestUpdate(self, organization, project_name):
+    """Retrieves the last ingested pull request update of a project.
+
+    Args:
+      organization (str): name of the organization.
+      project_name (str): name of the project.
+
+    Returns:
+      str: ISO 8601 date and time of the last ingested update or None if no
+          pull requests were ingested.
+    """
+    cursor = self._connection.execute(
+        'SELECT MAX(update_time) FROM pull_requests '
+        'WHERE organization = ? AND project = ?', (organization, project_name))
+    return cursor.fetchone()[0] or None
+
+  def GetPullRequests(
+      self, organization=None, login_name=None, start_time=None,
+      end_time=None):
+    """Retrieves pull requests.
+
+    Args:
+      organization (Optional[str]): name of the organization, where None
+          represents all organizations.
+      login_name (Optional[str]): login name of the creator, where None
+          represents all users.
+      start_time (Optional[str]): inclusive ISO 8601 date and time of the
+          start of the creation time range.
+      end_time (Optional[str]): exclusive ISO 8601 date and time of the end
+          of the creation time range.
+
+    Yields:
+      tuple[str, str, int, str, str, str, str, str]: organization, project,
+          number, creation time, created by, description, reviewers and
+          status, ordered by project and creation time.
+    """
+    conditions, parameters = self._GetTimeRangeConditions(
+        'creation_time', start_time, end_time)
+
+    if organization:
+      conditions.append('organization = ?')
+      parameters.append(organization)
+
+    if login_name:
+      conditions.append('created_by = ?')
+      parameters.append(login_name)
+
+    query = (
+        'SELECT organization, project, number, creation_time, created_by, '
+        'description, reviewers, status FROM pull_requests')
+    if conditions:
+      query = '{0:s} WHERE {1:s}'.format(query, ' AND '.join(conditions))
+
+    query = (
+        '{0:s} ORDER BY organization, project, creation_time, '
+        'number').format(query)
+
+    for row in self._connection.execute(query, parameters):
+      yield tuple(row)
+
+  def Open(self):
+    """Opens the store and creates the tables if needed."""
+    if not self._connection:
+      self._connection = sqlite3.connect(self._path)
+
+      with self._connection:
+        for statement in self._SCHEMA:
+          self._connection.execute(statement)
+
+
+class GithubContributionsHelper(DownloadHelper):
+  """Class that defines a GitHub contributions helper.
+
+  The projects are retrieved concurrently. Paginated responses are followed
+  through their Link headers, 202 (Accepted) responses of the statistics
+  endpoints, which GitHub returns while computing the statistics, are retried
+  with backoff and requests are delayed while the rate limit is exhausted.
+  """
+
+  _LINK_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+  _MAXIMUM_NUMBER_OF_RETRIES = 6
+
+  # Maximum number of seconds to wait for the rate limit to reset.
+  _MAXIMUM_RATE_LIMIT_WAIT = 3600
+
+  _RETRY_BACKOFF = 1.0
+
+  def __init__(self, cache_path=None, number_of_workers=8):
+    """Initializes a GitHub contributions helper.
+
+    Args:
+      cache_path (Optional[str]): path of the directory to cache responses in,
+          where None represents responses are not cached.
+      number_of_workers (Optional[int]): number of projects to retrieve
+          concurrently.
+    """
+    super(GithubContributionsHelper, self).__init__()
+    self._cache_path = cache_path
+    self._number_of_workers = number_of_workers
+    self._rate_limit_lock = threading.Lock()
+    self._rate_limit_reset_time = None
+
+  def _GetJSON(self, download_url, response_cache=None):
+    """Retrieves a JSON formatted response.
+
+    Args:
+      download_url (str): URL to retrieve.
+      response_cache (Optional[GithubResponseCache]): response cache.
+
+    Returns:
+      tuple[object, str]: JSON formatted response and URL of the next page or
+          None if not available.
+    """
+    cached_etag, cached_data, cached_next_url = None, None, None
+    if response_cache:
+      cached_etag, cached_data, cached_next_url = response_cache.GetResponse(
+          download_url)
+
+    request_headers = {'Accept': 'application/vnd.github+json'}
+    if cached_etag and cached_data is not None:
+      request_headers['If-None-Match'] = cached_etag
+
+    for retry_number in range(self._MAXIMUM_NUMBER_OF_RETRIES):
+      self._WaitForRateLimit()
+
+      status_code, data, response_headers = self._RequestURL(
+          download_url, request_headers)
+      if status_code is None:
+        return None, None
+
+      self._UpdateRateLimit(status_code, response_headers)
+
+      if status_code == 202 or (
+          status_code in (403, 429) and self._rate_limit_reset_time):
+        if status_code == 202:
+          time.sleep(self._RETRY_BACKOFF * (2 ** retry_number))
+        continue
+
+      # Note that GitHub does not reliably return a Link header in a 304
+      # (Not Modified) response, hence the cached URL of the next page is
+      # used.
+      if status_code == 304:
+        return json.loads(cached_data), cached_next_url
+
+      next_url = None
+      link_header = response_headers.get('Link', None)
+      if link_header:
+        match = self._LINK_NEXT_RE.search(link_header)
+        if match:
+          next_url = match.group(1)
+
+      if status_code != 200:
+        logging.warning(
+            'Unable to download URL: {0:s} with status code: {1:d}'.format(
+                download_url, status_code))
+        return None, None
+
+      data = data.decode('utf-8')
+      etag = response_headers.get('ETag', None)
+      if response_cache and etag:
+        response_cache.SetResponse(
+            download_url, etag, data, next_url=next_url)
+
+      return json.loads(data), next_url
+
+    logging.warning('Unable to download URL: {0:s} after {1:d} tries'.format(
+        download_url, self._MAXIMUM_NUMBER_OF_RETRIES))
+    return None, None
+
+  def _GetPaginatedJSON(
+      self, download_url, last_update_time=None, response_cache=None):
+    """Retrieves a paginated JSON formatted list.
+
+    Args:
+      download_url (str): URL of the first page.
+      last_update_time (Optional[str]): ISO 8601 date and time of the last
+          ingested update, where None represents all pages are retrieved.
+          The objects must be sorted by their last update, most recent first,
+          so that no further pages are retrieved once a page contains an
+          object that was not updated after the last ingested update.
+      response_cache (Optional[GithubResponseCache]): response cache.
+
+    Returns:
+      list[object]: JSON formatted objects of all pages or None if not
+          available.
+    """
+    result_json = None
+    while download_url:
+      page_json, download_url = self._GetJSON(
+          download_url, response_cache=response_cache)
+      if page_json is None:
+        return None
+
+      if result_json is None:
+        result_json = []
+
+      if not isinstance(page_json, list):
+        page_json = [page_json]
+
+      result_json.extend(page_json)
+
+      if last_update_time:
+        for object_json in page_json:
+          update_time = object_json.get('updated_at', None)
+          if update_time and update_time <= last_update_time:
+            download_url = None
+            break
+
+    return result_json
+
+  def _GetProjectJSON(
+      self, organization, project_name, download_url, last_update_time=None):
+    """Retrieves the JSON formatted objects of a specific project.
+
+    Args:
+      organization (str): name of the organization.
+      project_name (str): name of the project.
+      download_url (str): URL of the first page.
+      last_update_time (Optional[str]): ISO 8601 date and time of the last
+          ingested update, where None represents all pages are retrieved.
+
+    Returns:
+      list[object]: JSON formatted objects or None if not available.
+    """
+    response_cache = None
+    if self._cache_path:
+      path = os.path.join(self._cache_path, '{0:s}_{1:s}.json'.format(
+          organization, project_name))
+      response_cache = GithubResponseCache(path)
+      response_cache.Read()
+
+    result_json = self._GetPaginatedJSON(
+        download_url, last_update_time=last_update_time,
+        response_cache=response_cache)
+
+    if response_cache:
+      response_cache.Write()
+
+    return result_json
+
+  def _GetProjectsJSON(
+      self, projects_per_organization, url_format, last_update_times=None):
+    """Retrieves the JSON formatted objects of projects concurrently.
+
+    Args:
+      projects_per_organization (dict[str, list[str]]): organization names
+          with corresponding projects names.
+      url_format (str): format of the URL of the first page, with the name
+          of the organization as first and the name of the project as second
+          argument.
+      last_update_times (Optional[dict[tuple[str, str], str]]): ISO 8601 date
+          and time of the last ingested update per organization and project
+          name, where None represents all pages are retrieved.
+
+    Yields:
+      tuple[str, str, list[object]]: organization, project name and JSON
+          formatted objects, in the order of the organizations and projects.
+    """
+    if self._cache_path and not os.path.isdir(self._cache_path):
+      os.makedirs(self._cache_path)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=self._number_of_workers) as executor:
+      futures = []
+      for organization, projects in iter(projects_per_organization.items()):
+        for project_name in projects:
+          download_url = url_format.format(organization, project_name)
+          last_update_time = (last_update_times or {}).get(
+              (organization, project_name), None)
+          future = executor.submit(
+              self._GetProjectJSON, organization, project_name, download_url,
+              last_update_time=last_update_time)
+          futures.append((organization, project_name, future))
+
+      for organization, project_name, future in futures:
+        result_json = future.result()
+        if result_json:
+          yield organization, project_name, result_json
+
+  def _UpdateRateLimit(self, status_code, response_headers):
+    """Updates the rate limit state from a response.
+
+    Args:
+      status_code (int): HTTP status code.
+      response_headers (email.message.Message): response headers.
+    """
+    reset_time = None
+
+    retry_after = response_headers.get('Retry-After', None)
+    if status_code in (403, 429) and retry_after:
+      try:
+        reset_time = time.time() + int(retry_after, 10)
+      except ValueError:
+        pass
+
+    elif response_headers.get('X-RateLimit-Remaining', None) == '0':
+      try:
+        reset_time = int(response_headers.get('X-RateLimit-Reset', ''), 10)
+      except ValueError:
+        pass
+
+    with self._rate_limit_lock:
+      self._rate_limit_reset_time = reset_time
+
+  def _WaitForRateLimit(self):
+    """Waits until the rate limit has reset, when exhausted."""
+    with self._rate_limit_lock:
+      reset_time = self._rate_limit_reset_time
+
+    if reset_time:
+      wait_time = min(reset_time - time.time(), self._MAXIMUM_RATE_LIMIT_WAIT)
+      if wait_time > 0:
+        logging.info('Rate limit exhausted, waiting {0:.0f} seconds'.format(
+            wait_time))
+        time.sleep(wait_time)
+
+  def IngestContributions(self, projects_per_organization, stats_store):
+    """Ingests the contributions of projects into a statistics store.
+
+    Args:
+      projects_per_organization (dict[str, list[str]]): organization names
+          with corresponding projects names.
+      stats_store (StatsStore): statistics store.
+    """
+    url_format = 'https://api.github.com/repos/{0:s}/{1:s}/stats/contributors'
+
+    for organization, project_name, contributors_json in self._GetProjectsJSON(
+        projects_per_organization, url_format):
+      stats_store.AddContributions(
+          organization, project_name, contributors_json)
+
+  def IngestPullRequests(self, projects_per_organization, stats_store):
+    """Ingests the pull requests of projects into a statistics store.
+
+    Args:
+      projects_per_organization (dict[str, list[str]]): organization names
+          with corresponding projects names.
+      stats_store (StatsStore): statistics store.
+    """
+    # The pull requests are retrieved most recently updated first, such that
+    # the pages with pull requests that were already ingested are skipped.
+    url_format = (
+        'https://api.github.com/repos/{0:s}/{1:s}/pulls?state=all&'
+        'sort=updated&direction=desc&per_page=100')
+
+    last_update_times = {}
+    for organization, projects in iter(projects_per_organization.items()):
+      for project_name in projects:
+        last_update_times[(organization, project_name)] = (
+            stats_store.GetLastPullRequestUpdate(organization, project_name))
+
+    for organization, project_name, pulls_json in self._GetProjectsJSON(
+        projects_per_organization, url_format,
+        last_update_times=last_update_times):
+      stats_store.AddPullRequests(organization, project_name, pulls_json)
+
   def ListContributions(self, projects_per_organization, output_writer):
     """Lists the contributions of projects.
 
@@ -281,10 +883,14 @@ class GithubContributionsHelper(DownloadHelper):
           with corresponding projects names.
       output_writer (OutputWriter): output writer.
     """
-    for organization, projects in iter(projects_per_organization.items()):
-      for project_name in projects:
-        self._ListContributionsForProject(
-            organization, project_name, output_writer)
+    stats_store = StatsStore()
+    stats_store.Open()
+
+    try:
+      self.IngestContributions(projects_per_organization, stats_store)
+      output_writer.WriteContributions(stats_store)
+    finally:
+      stats_store.Close()
 
   def ListPullRequests(self, projects_per_organization, output_writer):
     """Lists the pull requests of projects.
@@ -294,27 +900,117 @@ class GithubContributionsHelper(DownloadHelper):
           with corresponding projects names.
       output_writer (OutputWriter): output writer.
     """
-    for organization, projects in iter(projects_per_organization.items()):
-      for project_name in projects:
-        self._ListPullRequestsForProject(
-            organization, project_name, output_writer)
+    stats_store = StatsStore()
+    stats_store.Open()
+
+    try:
+      self.IngestPullRequests(projects_per_organization, stats_store)
+      output_writer.WriteReviews(stats_store)
+    finally:
+      stats_store.Close()
+
+
+class OutputWriter(object):
+  """Class that defines an output writer.
+
+  Records are read from the statistics store and written in batches. The
+  username of a login name is looked up once per login name.
+  """
 
+  NAME = ''
 
-class StdoutWriter(object):
-  """Class that defines a stdout output writer."""
+  _CONTRIBUTION_COLUMNS = [
+      'year', 'week_number', 'username', 'project', 'number_of_contributions',
+      'number_of_lines_added', 'number_of_lines_deleted']
 
-  def __init__(self, user_mappings, output_format='csv'):
-    """Initializes a stdout output writer.
+  _REVIEW_COLUMNS = [
+      'creation_time', 'created_by', 'issue_number', 'description',
+      'reviewers', 'status']
+
+  def __init__(self, user_mappings, batch_size=1000, path=None):
+    """Initializes an output writer.
 
     Args:
       user_mappings (dict[str, str]): mapping between GitHub username and
           another username.
-      output_format (Optional[str]): output format.
+      batch_size (Optional[int]): maximum number of records per batch.
+      path (Optional[str]): path of the output file, where None represents
+          stdout.
     """
-    super(StdoutWriter, self).__init__()
-    self._header_written = False
-    self._output_format = output_format
+    super(OutputWriter, self).__init__()
+    self._batch_size = batch_size
+    self._file_object = None
+    self._path = path
     self._user_mappings = user_mappings
+    self._usernames = {}
+
+  def _GetUsername(self, login_name):
+    """Retrieves the username of a login name.
+
+    Args:
+      login_name (str): login name.
+
+    Returns:
+      str: username or None if the login name has no username mapping.
+    """
+    if login_name not in self._usernames:
+      username = login_name
+      if self._user_mappings:
+        # TODO: add flag to control this behavior.
+        # Login names without a username mapping are skipped.
+        username = self._user_mappings.get(login_name.lower(), None)
+
+      self._usernames[login_name] = username
+
+    return self._usernames[login_name]
+
+  def _OpenFileObject(self):
+    """Opens the output file object.
+
+    Returns:
+      file: file-like object to write to.
+    """
+    if not self._path:
+      return sys.stdout
+
+    return open(self._path, 'w', encoding='utf-8')
+
+  def _WriteContributionBatch(self, contributions):
+    """Writes a batch of contributions.
+
+    Args:
+      contributions (list[tuple[str, str, str, str, int, int, int]]): year,
+          week number, username, project, number of contributions, number
+          of lines added and number of lines deleted per contribution.
+
+    Raises:
+      NotImplementedError: since this method needs to be implemented by
+          a subclass.
+    """
+    raise NotImplementedError
+
+  def _WriteReviewBatch(self, reviews):
+    """Writes a batch of reviews.
+
+    Args:
+      reviews (list[tuple[str, str, int, str, str, str]]): creation time,
+          created by, issue number, description, reviewers and status per
+          review.
+
+    Raises:
+      NotImplementedError: since this method needs to be implemented by
+          a subclass.
+    """
+    raise NotImplementedError
+
+  def Close(self):
+    """Closes the output writer object."""
+    if self._file_object:
+      self._file_object.flush()
+      if self._file_object is not sys.stdout:
+        self._file_object.close()
+
+      self._file_object = None
 
   def Open(self):
     """Opens the output writer object.
@@ -322,93 +1018,317 @@ class StdoutWriter(object):
     Returns:
       bool: True if successful or False if not.
     """
+    try:
+      self._file_object = self._OpenFileObject()
+    except IOError as exception:
+      logging.error('Unable to open output file with error: {0!s}'.format(
+          exception))
+      return False
+
     return True
 
-  def Close(self):
-    """Closes the output writer object."""
-    return
+  def WriteContributions(self, stats_store, start_time=None, end_time=None):
+    """Writes the contributions of a statistics store.
+
+    Args:
+      stats_store (StatsStore): statistics store.
+      start_time (Optional[int]): inclusive POSIX timestamp of the start of
+          the time range.
+      end_time (Optional[int]): exclusive POSIX timestamp of the end of the
+          time range.
+    """
+    batch = []
+    for (_, project_name, login_name, week_timestamp, number_of_contributions,
+         number_of_lines_added, number_of_lines_deleted) in (
+             stats_store.GetContributions(
+                 start_time=start_time, end_time=end_time)):
+      username = self._GetUsername(login_name)
+      if not username:
+        continue
+
+      time_elements = time.gmtime(week_timestamp)
+      year = time.strftime('%Y', time_elements)
+      week_number = time.strftime('%U', time_elements)
+
+      batch.append((
+          year, week_number, username, project_name, number_of_contributions,
+          number_of_lines_added, number_of_lines_deleted))
+
+      if len(batch) >= self._batch_size:
+        self._WriteContributionBatch(batch)
+        batch = []
+
+    if batch:
+      self._WriteContributionBatch(batch)
+
+  def WriteReviews(self, stats_store, start_time=None, end_time=None):
+    """Writes the pull requests of a statistics store.
+
+    Args:
+      stats_store (StatsStore): statistics store.
+      start_time (Optional[str]): inclusive ISO 8601 date and time of the
+          start of the creation time range.
+      end_time (Optional[str]): exclusive ISO 8601 date and time of the end
+          of the creation time range.
+    """
+    batch = []
+    for (_, _, issue_number, creation_time, created_by, description,
+         reviewers, status) in stats_store.GetPullRequests(
+             start_time=start_time, end_time=end_time):
+      batch.append((
+          creation_time, created_by, issue_number, description, reviewers,
+          status))
+
+      if len(batch) >= self._batch_size:
+        self._WriteReviewBatch(batch)
+        batch = []
+
+    if batch:
+      self._WriteReviewBatch(batch)
 
-  def Write(self, data):
-    """Writes the data to stdout (without the default trailing newline).
+
+class CSVOutputWriter(OutputWriter):
+  """Class that defines a tab-separated values output writer."""
+
+  NAME = 'csv'
+
+  _CONTRIBUTIONS_HEADER = (
+      'year\tweek number\tlogin name\tproject\tnumber of contributions\t'
+      'number lines added\tnumber lines deleted\n')
+
+  _REVIEWS_HEADER = (
+      'creation time\tcreated by\tissue number\tdescription\treviewers\t'
+      'status\n')
+
+  def __init__(self, user_mappings, batch_size=1000, path=None):
+    """Initializes a tab-separated values output writer.
 
     Args:
-      data (str): data to write.
+      user_mappings (dict[str, str]): mapping between GitHub username and
+          another username.
+      batch_size (Optional[int]): maximum number of records per batch.
+      path (Optional[str]): path of the output file, where None represents
+          stdout.
     """
-    print(data, end='')
+    super(CSVOutputWriter, self).__init__(
+        user_mappings, batch_size=batch_size, path=path)
+    self._headers_written = set()
 
-  def WriteContribution(
-      self, year, week_number, login_name, project_name,
-      number_of_contributions, number_of_lines_added, number_of_lines_deleted):
-    """Writes a contribution to stdout.
+  def _WriteBatch(self, header, rows):
+    """Writes a batch of rows.
 
     Args:
-      year (int): year of the contribution.
-      week_number (int): week number of the contribution.
-      login_name (str): log-in name.
-      project_name (str): project name.
-      number_of_contributions (int): number of contributed CLs.
-      number_of_lines_added (int): total number of lines added.
-      number_of_lines_deleted (int): total number of lines deleted.
+      header (str): header to write before the first batch.
+      rows (list[tuple[object]]): rows.
     """
-    username = login_name
+    lines = []
+    if header not in self._headers_written:
+      lines.append(header)
+      self._headers_written.add(header)
 
-    if self._user_mappings:
-      username = username.lower()
-      username = self._user_mappings.get(username, None)
-      # TODO: add flag to control this behavior.
-      if not username:
-        # Skip login names without a username mapping.
-        return
+    lines.extend([
+        '\t'.join([str(value) for value in row]) + '\n' for row in rows])
 
-    if self._output_format == 'csv':
-      if not self._header_written:
-        self.Write(
-            'year\tweek number\tlogin name\tproject\tnumber of contributions\t'
-            'number lines added\tnumber lines deleted\n')
+    self._file_object.write(''.join(lines))
 
-        self._header_written = True
+  def _WriteContributionBatch(self, contributions):
+    """Writes a batch of contributions.
+
+    Args:
+      contributions (list[tuple[str, str, str, str, int, int, int]]): year,
+          week number, username, project, number of contributions, number
+          of lines added and number of lines deleted per contribution.
+    """
+    self._WriteBatch(self._CONTRIBUTIONS_HEADER, contributions)
+
+  def _WriteReviewBatch(self, reviews):
+    """Writes a batch of reviews.
+
+    Args:
+      reviews (list[tuple[str, str, int, str, str, str]]): creation time,
+          created by, issue number, description, reviewers and status per
+          review.
+    """
+    self._WriteBatch(self._REVIEWS_HEADER, reviews)
 
-      self.Write('{0:s}\t{1:s}\t{2:s}\t{3:s}\t{4:d}\t{5:d}\t{6:d}\n'.format(
-          year, week_number, username, project_name, number_of_contributions,
-          number_of_lines_added, number_of_lines_deleted))
 
-    elif self._output_format == 'tilde':
+class JSONLinesOutputWriter(OutputWriter):
+  """Class that defines a JSON Lines output writer."""
+
+  NAME = 'jsonl'
+
+  def _WriteBatch(self, columns, rows):
+    """Writes a batch of rows.
+
+    Args:
+      columns (list[str]): names of the columns.
+      rows (list[tuple[object]]): rows.
+    """
+    self._file_object.write(''.join([
+        json.dumps(dict(zip(columns, row)), sort_keys=True) + '\n'
+        for row in rows]))
+
+  def _WriteContributionBatch(self, contributions):
+    """Writes a batch of contributions.
+
+    Args:
+      contributions (list[tuple[str, str, str, str, int, int, int]]): year,
+          week number, username, project, number of contributions, number
+          of lines added and number of lines deleted per contribution.
+    """
+    self._WriteBatch(self._CONTRIBUTION_COLUMNS, [
+        (int(year, 10), int(week_number, 10)) + tuple(values)
+        for year, week_number, *values in contributions])
+
+  def _WriteReviewBatch(self, reviews):
+    """Writes a batch of reviews.
+
+    Args:
+      reviews (list[tuple[str, str, int, str, str, str]]): creation time,
+          created by, issue number, description, reviewers and status per
+          review.
+    """
+    self._WriteBatch(self._REVIEW_COLUMNS, reviews)
+
+
+class ColumnarOutputWriter(OutputWriter):
+  """Class that defines a columnar output writer.
+
+  Writes Parquet when pyarrow is available, otherwise gzip compressed
+  tab-separated values. Both require an output file.
+  """
+
+  NAME = 'columnar'
+
+  def __init__(self, user_mappings, batch_size=1000, path=None):
+    """Initializes a columnar output writer.
+
+    Args:
+      user_mappings (dict[str, str]): mapping between GitHub username and
+          another username.
+      batch_size (Optional[int]): maximum number of records per batch.
+      path (Optional[str]): path of the output file.
+    """
+    super(ColumnarOutputWriter, self).__init__(
+        user_mappings, batch_size=batch_size, path=path)
+    self._columns = None
+    self._parquet_writer = None
+
+  def _OpenFileObject(self):
+    """Opens the output file object.
+
+    Returns:
+      file: file-like object to write to.
+
+    Raises:
+      OSError: if no output file was provided.
+    """
+    if not self._path:
+      raise OSError('Columnar output requires an output file.')
+
+    if pyarrow:
+      return open(self._path, 'wb')
+
+    return gzip.open(self._path, 'wt', encoding='utf-8')
+
+  def _WriteBatch(self, columns, rows):
+    """Writes a batch of rows.
+
+    Args:
+      columns (list[str]): names of the columns.
+      rows (list[tuple[object]]): rows.
+    """
+    if self._columns is None:
+      self._columns = columns
+      if not pyarrow:
+        self._file_object.write('\t'.join(columns) + '\n')
+
+    if not pyarrow:
+      self._file_object.write(''.join([
+          '\t'.join([str(value) for value in row]) + '\n' for row in rows]))
+      return
+
+    record_batch = pyarrow.RecordBatch.from_arrays(
+        [pyarrow.array(values) for values in zip(*rows)], names=columns)
+
+    if not self._parquet_writer:
+      self._parquet_writer = pyarrow_parquet.ParquetWriter(
+          self._file_object, record_batch.schema)
+
+    self._parquet_writer.write_batch(record_batch)
+
+  def _WriteContributionBatch(self, contributions):
+    """Writes a batch of contributions.
+
+    Args:
+      contributions (list[tuple[str, str, str, str, int, int, int]]): year,
+          week number, username, project, number of contributions, number
+          of lines added and number of lines deleted per contribution.
+    """
+    self._WriteBatch(self._CONTRIBUTION_COLUMNS, [
+        (int(year, 10), int(week_number, 10)) + tuple(values)
+        for year, week_number, *values in contributions])
+
+  def _WriteReviewBatch(self, reviews):
+    """Writes a batch of reviews.
+
+    Args:
+      reviews (list[tuple[str, str, int, str, str, str]]): creation time,
+          created by, issue number, description, reviewers and status per
+          review.
+    """
+    self._WriteBatch(self._REVIEW_COLUMNS, reviews)
+
+  def Close(self):
+    """Closes the output writer object."""
+    if self._parquet_writer:
+      self._parquet_writer.close()
+      self._parquet_writer = None
+
+    super(ColumnarOutputWriter, self).Close()
+
+
+class TildeOutputWriter(OutputWriter):
+  """Class that defines a tilde-separated output writer."""
+
+  NAME = 'tilde'
+
+  def _WriteContributionBatch(self, contributions):
+    """Writes a batch of contributions.
+
+    Args:
+      contributions (list[tuple[str, str, str, str, int, int, int]]): year,
+          week number, username, project, number of contributions, number
+          of lines added and number of lines deleted per contribution.
+    """
+    lines = []
+    for (year, week_number, username, project_name, number_of_contributions,
+         number_of_lines_added, number_of_lines_deleted) in contributions:
       date_time_string = '{0:s}-W{1:s}-0'.format(year, week_number)
       date_time = datetime.datetime.strptime(date_time_string, '%Y-W%W-%w')
       date_time_string = date_time.isoformat()
 
       # TODO: add description.
-      self.Write((
+      lines.append((
           '{0:s} [github] ~ author:{1:s} ~ project:{2:s} ~ '
           'number_of_cls:{3:d} ~ delta_added:{4:d} ~ delta_deleted:{5:d} '
           '~ py:{4:d} ~ file_type:py ~ op_type:ADD ~\n').format(
               date_time_string, username, project_name, number_of_contributions,
               number_of_lines_added, number_of_lines_deleted))
 
-  def WriteReview(
-      self, creation_time, created_by, issue_number, description, reviewers,
-      status):
-    """Writes a review to stdout.
+    self._file_object.write(''.join(lines))
 
-    Args:
-      creation_time (str): creation date and time.
-      created_by (str): created by.
-      issue_number (int): code review issue number.
-      description (str): description.
-      reviewers (str): reviewers.
-      status (str): status.
-    """
-    if self._output_format == 'csv':
-      if not self._header_written:
-        self.Write(
-            'creation time\tcreated by\tissue number\tdescription\treviewers\t'
-            'status\n')
+  def _WriteReviewBatch(self, reviews):
+    """Writes a batch of reviews.
 
-        self._header_written = True
+    Reviews are not supported by the tilde-separated output format.
 
-      self.Write('{0:s}\t{1:s}\t{2:d}\t{3:s}\t{4:s}\t{5:s}\n'.format(
-          creation_time, created_by, issue_number, description, reviewers,
-          status))
+    Args:
+      reviews (list[tuple[str, str, int, str, str, str]]): creation time,
+          created by, issue number, description, reviewers and status per
+          review.
+    """
+    return
 
 
 def Main():
@@ -417,7 +1337,13 @@ def Main():
   Returns:
     bool: True if successful or False if not.
   """
-  statistics_types = frozenset(['contributions'])
+  statistics_types = frozenset(['contributions', 'pull-requests'])
+
+  output_writer_classes = {
+      output_writer_class.NAME: output_writer_class
+      for output_writer_class in (
+          ColumnarOutputWriter, CSVOutputWriter, JSONLinesOutputWriter,
+          TildeOutputWriter)}
 
   argument_parser = argparse.ArgumentParser(description=(
       'Generates an overview of project statistics of github projects.'))
@@ -428,10 +1354,45 @@ def Main():
           'path of the directory containing the statistics configuration '
           'files e.g. stats.ini.'))
 
+  argument_parser.add_argument(
+      '--cache', dest='cache_path', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the directory to cache GitHub API responses in, responses '
+          'that were not modified since they were cached do not count '
+          'against the rate limit.'))
+
+  argument_parser.add_argument(
+      '--database', dest='database_path', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the SQLite database to store the statistics in, only '
+          'records newer than those already in the database are ingested. '
+          'The default is to use an in-memory database.'))
+
+  argument_parser.add_argument(
+      '--offline', dest='offline', action='store_true', default=False, help=(
+          'do not retrieve statistics from GitHub, only output the statistics '
+          'already in the database.'))
+
+  argument_parser.add_argument(
+      '--since', dest='since', action='store', metavar='YYYY-MM-DD',
+      default=None, help='only output statistics of this date and later.')
+
+  argument_parser.add_argument(
+      '--until', dest='until', action='store', metavar='YYYY-MM-DD',
+      default=None, help='only output statistics before this date.')
+
   argument_parser.add_argument(
       '-f', '--format', dest='output_format', action='store',
-      metavar='FORMAT', choices=['csv', 'tilde'], default='csv',
-      help='output format.')
+      metavar='FORMAT', choices=sorted(output_writer_classes.keys()),
+      default='csv', help=(
+          'output format, where columnar writes Parquet if pyarrow is '
+          'available or gzip compressed tab-separated values otherwise.'))
+
+  argument_parser.add_argument(
+      '-o', '--output', dest='output_path', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the output file, where the default is stdout. Required by '
+          'the columnar output format.'))
 
   argument_parser.add_argument(
       'statistics_type', action='store', metavar='TYPE',
@@ -447,6 +1408,24 @@ def Main():
     print('')
     return False
 
+  if options.offline and not options.database_path:
+    print('Offline requires a database.')
+    print('')
+    return False
+
+  date_times = []
+  for date_string in (options.since, options.until):
+    date_time = None
+    if date_string:
+      try:
+        date_time = datetime.datetime.strptime(date_string, '%Y-%m-%d')
+      except ValueError:
+        print('Unsupported date: {0:s}.'.format(date_string))
+        print('')
+        return False
+
+    date_times.append(date_time)
+
   config_path = options.config_path
   if not config_path:
     config_path = os.path.dirname(__file__)
@@ -465,26 +1444,56 @@ def Main():
   with open(stats_file) as file_object:
     user_mappings = stats_definition_reader.ReadUserMappings(file_object)
 
-  output_writer = StdoutWriter(
-      user_mappings, output_format=options.output_format)
+  output_writer_class = output_writer_classes[options.output_format]
+  output_writer = output_writer_class(
+      user_mappings, path=options.output_path)
 
   if not output_writer.Open():
     print('Unable to open output writer.')
     print('')
     return False
 
-  if options.statistics_type == 'contributions':
-    projects_per_organization = {}
-    with open(stats_file) as file_object:
-      stats_definition_reader = StatsDefinitionReader()
-      projects_per_organization = (
-          stats_definition_reader.ReadProjectsPerOrganization(file_object))
+  projects_per_organization = {}
+  with open(stats_file) as file_object:
+    stats_definition_reader = StatsDefinitionReader()
+    projects_per_organization = (
+        stats_definition_reader.ReadProjectsPerOrganization(file_object))
+
+  contributions_helper = GithubContributionsHelper(
+      cache_path=options.cache_path)
+
+  stats_store = StatsStore(path=options.database_path or ':memory:')
+  stats_store.Open()
+
+  try:
+    if options.statistics_type == 'contributions':
+      if not options.offline:
+        contributions_helper.IngestContributions(
+            projects_per_organization, stats_store)
+
+      start_time, end_time = [
+          calendar.timegm(date_time.timetuple()) if date_time else None
+          for date_time in date_times]
+
+      output_writer.WriteContributions(
+          stats_store, start_time=start_time, end_time=end_time)
+
+    elif options.statistics_type == 'pull-requests':
+      if not options.offline:
+        contributions_helper.IngestPullRequests(
+            projects_per_organization, stats_store)
+
+      start_time, end_time = [
+          date_time.strftime('%Y-%m-%dT%H:%M:%SZ') if date_time else None
+          for date_time in date_times]
+
+      output_writer.WriteReviews(
+          stats_store, start_time=start_time, end_time=end_time)
 
-    contributions_helper = GithubContributionsHelper()
-    contributions_helper.ListContributions(
-        projects_per_organization, output_writer)
+  finally:
+    stats_store.Close()
+    output_writer.Close()
 
-  # TODO: add support for pull requests
   # TODO: add support for more granular CL information
 
   return True
@@ -3,11 +3,14 @@
 # pylint: disable=invalid-name
 """Script to update the dependencies in various configuration files."""
 
+import argparse
 import io
 import os
 import shutil
 import sys
 
+from concurrent import futures
+
 from l2tdevtools import dependencies
 from l2tdevtools.helpers import project
 
@@ -28,12 +31,58 @@ from l2tdevtools.dependency_writers import sphinx_docs
 from l2tdevtools.dependency_writers import tox_ini
 
 
+def _ReadUtilsDependencies(l2tdevtools_path):
+  """Reads the content of utils/dependencies.py from l2tdevtools.
+
+  Args:
+    l2tdevtools_path (str): path to l2tdevtools.
+
+  Returns:
+    str: content of utils/dependencies.py.
+  """
+  input_path = os.path.join(
+      l2tdevtools_path, 'l2tdevtools', 'dependencies.py')
+  file_data = []
+  with io.open(input_path, 'r', encoding='utf-8') as file_object:
+    for line in file_object.readlines():
+      if '# The following functions should not be included in ' in line:
+        break
+
+      file_data.append(line)
+
+  file_data.pop()
+  return ''.join(file_data)
+
+
 def Main():
   """The main program function.
 
   Returns:
     bool: True if successful or False if not.
   """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Updates the dependencies in various configuration files.'))
+
+  argument_parser.add_argument(
+      '--check', dest='check_only', action='store_true', default=False,
+      help=(
+          'only check if the configuration files are up to date, without '
+          'changing them.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='number_of_workers', action='store', type=int,
+      default=4, metavar='NUMBER', help=(
+          'number of configuration files to generate concurrently.'))
+
+  options = argument_parser.parse_args()
+
+  if options.number_of_workers < 1:
+    print('Number of workers must be 1 or more.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
   l2tdevtools_path = os.path.abspath(__file__)
   l2tdevtools_path = os.path.dirname(l2tdevtools_path)
   l2tdevtools_path = os.path.dirname(l2tdevtools_path)
@@ -44,13 +93,10 @@ def Main():
 
   dependencies_helper = dependencies.DependencyHelper()
 
-  for writer_class in (
+  writer_classes = [
       pylint_rc.PylintRcWriter, requirements.RequirementsWriter,
       requirements.TestRequirementsWriter, setup.SetupCfgWriter,
-      setup.SetupPyWriter):
-    writer = writer_class(
-        l2tdevtools_path, project_definition, dependencies_helper)
-    writer.Write()
+      setup.SetupPyWriter]
 
   for writer_class in (
       github_actions.GitHubActionsTestDockerYmlWriter,
@@ -69,47 +115,67 @@ def Main():
       linux_scripts.UbuntuInstallationScriptWriter,
       sphinx_docs.SphinxBuildConfigurationWriter,
       sphinx_docs.SphinxBuildRequirementsWriter, tox_ini.ToxIniWriter):
-    if not os.path.exists(writer_class.PATH):
-      continue
-
-    writer = writer_class(
-        l2tdevtools_path, project_definition, dependencies_helper)
-    writer.Write()
+    if os.path.exists(writer_class.PATH):
+      writer_classes.append(writer_class)
+
+  writers = [
+      writer_class(
+          l2tdevtools_path, project_definition, dependencies_helper,
+          check_only=options.check_only)
+      for writer_class in writer_classes]
+
+  # The writers write distinct files and share the dependency views and
+  # templates, hence they can be run concurrently.
+  with futures.ThreadPoolExecutor(
+      max_workers=options.number_of_workers) as executor:
+    for future in [executor.submit(writer.Write) for writer in writers]:
+      future.result()
+
+  changed_paths = []
+  for writer in writers:
+    changed_paths.extend(writer.changed_paths)
 
   output_path = os.path.join('utils', 'dependencies.py')
   if os.path.exists(output_path):
-    input_path = os.path.join(
-        l2tdevtools_path, 'l2tdevtools', 'dependencies.py')
-    file_data = []
-    with io.open(input_path, 'r', encoding='utf-8') as file_object:
-      for line in file_object.readlines():
-        if '# The following functions should not be included in ' in line:
-          break
+    file_data = _ReadUtilsDependencies(l2tdevtools_path)
 
-        file_data.append(line)
+    with io.open(output_path, 'r', encoding='utf-8') as file_object:
+      is_changed = file_object.read() != file_data
 
-    file_data.pop()
-    file_data = ''.join(file_data)
+    if is_changed:
+      changed_paths.append(output_path)
 
-    with io.open(output_path, 'w', encoding='utf-8') as file_object:
-      file_object.write(file_data)
+      if not options.check_only:
+        with io.open(output_path, 'w', encoding='utf-8') as file_object:
+          file_object.write(file_data)
 
   # Remove old configurations and scripts.
-  script_path = os.path.join('config', 'linux', 'gift_ppa_install.sh')
-  if os.path.isfile(script_path):
-    os.remove(script_path)
+  for script_path in (
+      os.path.join('config', 'linux', 'gift_ppa_install.sh'),
+      os.path.join('.travis.yml')):
+    if os.path.isfile(script_path):
+      changed_paths.append(script_path)
+
+      if not options.check_only:
+        os.remove(script_path)
+
+  for script_path in (
+      os.path.join('config', 'macos'),
+      os.path.join('config', 'travis')):
+    if os.path.isfile(script_path):
+      changed_paths.append(script_path)
+
+      if not options.check_only:
+        shutil.rmtree(script_path)
 
-  script_path = os.path.join('config', 'macos')
-  if os.path.isfile(script_path):
-    shutil.rmtree(script_path)
+  if options.check_only:
+    for path in changed_paths:
+      print('Out of date: {0:s}'.format(path))
 
-  script_path = os.path.join('.travis.yml')
-  if os.path.isfile(script_path):
-    os.remove(script_path)
+    return not changed_paths
 
-  script_path = os.path.join('config', 'travis')
-  if os.path.isfile(script_path):
-    shutil.rmtree(script_path)
+  for path in changed_paths:
+    print('Updated: {0:s}'.format(path))
 
   return True
 